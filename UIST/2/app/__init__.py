@@ -77,6 +77,14 @@ def creer_application(config_name=None):
     from app import db
     db.init_app(app)
     
+    # Journal d'audit différé (vidé à l'arrêt du processus)
+    from app.utils.journal_audit import init_journal_audit
+    init_journal_audit(app)
+    
+    # Travaux de fond (bulletins, imports, promotions, rapports)
+    from app.utils.travaux import init_travaux
+    init_travaux(app)
+    
     # Message si la base n'existe pas
     if not os.path.exists(app.config['DB_PATH']):
         print("\n" + "="*70)
@@ -136,6 +144,12 @@ def creer_application(config_name=None):
     except ImportError:
         print("⚠️ Blueprint parent non trouvé")
     
+    try:
+        from app.blueprints.suivi.routes import suivi_bp
+        app.register_blueprint(suivi_bp, url_prefix='/api')
+    except ImportError:
+        print("⚠️ Blueprint suivi non trouvé")
+    
     # Initialiser les middlewares si nécessaire
     try:
         from app.middleware import initialize_middleware
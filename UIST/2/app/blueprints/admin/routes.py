@@ -140,25 +140,24 @@ def tableau_bord():
     enseignants = Enseignant.obtenir_tous()
     cours = Cours.obtenir_tous()
     filieres = Filiere.obtenir_toutes()
-    creneaux = EmploiDuTemps.obtenir_tous()
     etudiants = Etudiant.obtenir_tous()
 
+    # Les grandes tables sont comptées en flux, sans matérialiser la liste
     stats = {
         'nb_salles': len(salles) if salles else 0,
         'nb_enseignants': len(enseignants) if enseignants else 0,
         'nb_cours': len(cours) if cours else 0,
         'nb_filieres': len(filieres) if filieres else 0,
-        'nb_creneaux': len(creneaux) if creneaux else 0,
+        'nb_creneaux': sum(1 for _ in EmploiDuTemps.obtenir_tous(flux=True)),
         'nb_etudiants': len(etudiants) if etudiants else 0
     }
 
     # Statistiques supplémentaires
     from app.models import Note, Presence, Utilisateur
-    notes_total = Note.obtenir_toutes()
     presences_total = Presence.obtenir_toutes_presences()
 
     stats.update({
-        'nb_notes': len(notes_total) if notes_total else 0,
+        'nb_notes': sum(1 for _ in Note.obtenir_toutes(flux=True)),
         'nb_presences': len(presences_total) if presences_total else 0,
         'nb_utilisateurs': len(Utilisateur.obtenir_tous()) if Utilisateur.obtenir_tous() else 0
     })
@@ -1385,80 +1384,24 @@ def importer_notes_web():
         return redirect(url_for('admin.import_notes_page'))
 
     try:
-        # Charger le fichier Excel
-        wb = openpyxl.load_workbook(file)
-        ws = wb.active
-
-        notes_importees = 0
-        erreurs = []
-
-        # Parcourir les lignes (ignorer l'en-tête)
-        for row in ws.iter_rows(min_row=2, values_only=True):
-            if not row[0]:  # Ligne vide
-                continue
-
-            try:
-                # Format attendu: Matiere, Eleve, Note, Coefficient, TypeEvaluation, Date
-                matiere_nom = str(row[0]).strip()
-                eleve_matricule = str(row[1]).strip()
-                note_val = float(row[2])
-                coefficient = float(row[3]) if row[3] else 1.0
-                type_eval = str(row[4]).strip() if row[4] else 'CC'
-                date_eval = str(row[5]).strip() if len(row) > 5 and row[5] else None
-
-                # Validation
-                if not (0 <= note_val <= 20):
-                    erreurs.append(f'Note invalide pour {eleve_matricule}: {note_val}')
-                    continue
-                if coefficient <= 0:
-                    erreurs.append(f'Coefficient invalide pour {eleve_matricule}: {coefficient}')
-                    continue
-
-                # Résoudre cours_id depuis nom matière (simplifié)
-                cours_id_resolved = int(cours_id)  # Pour l'instant, utiliser celui fourni
-
-                # Résoudre etudiant_id depuis matricule
-                etudiant = Utilisateur.obtenir_par_matricule(eleve_matricule)
-                if not etudiant:
-                    erreurs.append(f'Étudiant non trouvé: {eleve_matricule}')
-                    continue
-                etudiant_id = etudiant['id']
-
-                # Créer la note
-                Note.creer(
-                    etudiant_id, cours_id_resolved, note_val, coefficient,
-                    type_eval, date_eval, session['utilisateur_id']
-                )
-                notes_importees += 1
-
-            except (ValueError, TypeError) as e:
-                erreurs.append(f'Erreur ligne {ws.iter_rows().index(row) + 1}: {str(e)}')
-                continue
-
-        # Enregistrer l'import
-        role_initiateur = session.get('role')
-        import_id = ImportNote.creer(
-            int(cours_id), int(filiere_id), session['utilisateur_id'],
-            file.filename, notes_importees, role_initiateur
-        )
-
-        # Audit (commenté car AuditUsage n'existe pas)
-        # AuditUsage.creer(session['utilisateur_id'], 'IMPORT_NOTES', meta={
-        #     'import_id': import_id,
-        #     'nb_lignes': notes_importees,
-        #     'fichier': file.filename,
-        #     'erreurs': len(erreurs)
-        # })
+        # Import exécuté en travail de fond, suivi par la page via /api/travaux/<id>
+        from app.utils import travaux
+        from app.services.taches import deposer_fichier_travail
+        id_travail = travaux.soumettre('import_notes', {
+            'fichier': deposer_fichier_travail(file),
+            'nom_fichier': file.filename,
+            'cours_id': int(cours_id),
+            'filiere_id': int(filiere_id),
+            'utilisateur_id': session['utilisateur_id'],
+            'role_initiateur': session.get('role')
+        }, cree_par=session['utilisateur_id'])
 
         result = {
             'success': True,
-            'imported': notes_importees,
-            'errors': erreurs
+            'travail_id': id_travail
         }
 
-        flash(f'{notes_importees} notes importées avec succès', 'success')
-        if erreurs:
-            flash(f'Erreurs: {len(erreurs)}', 'warning')
+        flash('Import en cours de traitement', 'info')
 
     except Exception as e:
         result = {'success': False, 'errors': [f'Erreur traitement fichier: {str(e)}']}
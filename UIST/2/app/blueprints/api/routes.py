@@ -6,6 +6,9 @@ Système de validation temps réel
 from flask import Blueprint, request, jsonify, session, Response
 from app.models import Utilisateur, Note, ImportNote, Cours, Filiere, Message, Bulletin, AuditUsage
 from app.utils import role_required, role_requis, generer_matricule
+from app.utils.versions import reponse_versionnee
+from app.utils import travaux
+from app.blueprints.suivi.routes import reponse_travail_accepte
 from werkzeug.security import generate_password_hash
 import json
 import io
@@ -119,78 +122,18 @@ def importer_notes():
         return jsonify({'error': 'cours_id et filiere_id requis'}), 400
 
     try:
-        # Charger le fichier Excel
-        wb = openpyxl.load_workbook(file)
-        ws = wb.active
-
-        notes_importees = 0
-        erreurs = []
-
-        # Parcourir les lignes (ignorer l'en-tête)
-        for row in ws.iter_rows(min_row=2, values_only=True):
-            if not row[0]:  # Ligne vide
-                continue
-
-            try:
-                # Format attendu: Matiere, Eleve, Note, Coefficient, TypeEvaluation, Date
-                matiere_nom = str(row[0]).strip()
-                eleve_matricule = str(row[1]).strip()
-                note_val = float(row[2])
-                coefficient = float(row[3]) if row[3] else 1.0
-                type_eval = str(row[4]).strip() if row[4] else 'CC'
-                date_eval = str(row[5]).strip() if len(row) > 5 and row[5] else None
-
-                # Validation
-                if not (0 <= note_val <= 20):
-                    erreurs.append(f'Note invalide pour {eleve_matricule}: {note_val}')
-                    continue
-                if coefficient <= 0:
-                    erreurs.append(f'Coefficient invalide pour {eleve_matricule}: {coefficient}')
-                    continue
-
-                # Résoudre cours_id depuis nom matière (simplifié)
-                # TODO: Implémenter résolution par nom matière
-                cours_id_resolved = int(cours_id)  # Pour l'instant, utiliser celui fourni
-
-                # Résoudre etudiant_id depuis matricule
-                etudiant = Utilisateur.obtenir_par_matricule(eleve_matricule)
-                if not etudiant:
-                    erreurs.append(f'Étudiant non trouvé: {eleve_matricule}')
-                    continue
-                etudiant_id = etudiant['id']
-
-                # Créer la note
-                Note.creer(
-                    etudiant_id, cours_id_resolved, note_val, coefficient,
-                    type_eval, date_eval, session['utilisateur_id']
-                )
-                notes_importees += 1
-
-            except (ValueError, TypeError) as e:
-                erreurs.append(f'Erreur ligne {ws.iter_rows().index(row) + 1}: {str(e)}')
-                continue
-
-        # Enregistrer l'import
-        role_initiateur = session.get('role')
-        import_id = ImportNote.creer(
-            int(cours_id), int(filiere_id), session['utilisateur_id'],
-            file.filename, notes_importees, role_initiateur
-        )
-
-        # Audit (commenté car AuditUsage n'existe pas)
-        # AuditUsage.creer(session['utilisateur_id'], 'IMPORT_NOTES', meta={
-        #     'import_id': import_id,
-        #     'nb_lignes': notes_importees,
-        #     'fichier': file.filename,
-        #     'erreurs': len(erreurs)
-        # })
-
-        return jsonify({
-            'success': True,
-            'imported': notes_importees,
-            'errors': erreurs,
-            'message': f'{notes_importees} notes importées'
-        }), 200
+        # Import exécuté en travail de fond ; résultat via /api/travaux/<id>
+        from app.services.taches import deposer_fichier_travail
+        id_travail = travaux.soumettre('import_notes', {
+            'fichier': deposer_fichier_travail(file),
+            'nom_fichier': file.filename,
+            'cours_id': int(cours_id),
+            'filiere_id': int(filiere_id),
+            'utilisateur_id': session['utilisateur_id'],
+            'role_initiateur': session.get('role')
+        }, cree_par=session['utilisateur_id'])
+
+        return reponse_travail_accepte(id_travail, 'Import des notes en file')
 
     except Exception as e:
         return jsonify({'error': f'Erreur traitement fichier: {str(e)}'}), 500
@@ -314,159 +257,87 @@ def rapport_usage():
     debut = request.args.get('start')
     fin = request.args.get('end')
 
-    # Statistiques utilisateurs
-    stats_roles = Utilisateur.compter_par_role()
-    utilisateurs_actifs = Utilisateur.lister_avec_last_login()
-
-    # Statistiques bulletins (commenté car BulletinGeneration n'existe pas)
-    # bulletins_stats = BulletinGeneration.stats()
-    bulletins_stats = []
-
-    # Statistiques imports
-    imports_count = len(ImportNote.obtenir_historique())
+    if format_type == 'pdf':
+        # Mise en page PDF hors requête ; téléchargement via /api/travaux/<id>/fichier
+        id_travail = travaux.soumettre('rapport_usage_pdf', {
+            'debut': debut,
+            'fin': fin,
+            'utilisateur_id': session['utilisateur_id']
+        }, cree_par=session['utilisateur_id'])
+        return reponse_travail_accepte(id_travail, "Rapport d'usage PDF en préparation")
 
-    # Statistiques audit (commenté car AuditUsage n'existe pas)
-    # audit_stats = AuditUsage.statistiques_actions(debut, fin)
-    audit_stats = []
-
-    data = {
-        'generated_at': datetime.now().isoformat(),
-        'period': {'start': debut, 'end': fin},
-        'users_by_role': stats_roles,
-        'active_users': len([u for u in utilisateurs_actifs if u['effective_last_login']]),
-        'bulletins_generated': len(bulletins_stats) if bulletins_stats else 0,
-        'notes_imports': imports_count,
-        'audit_actions': audit_stats
-    }
+    from app.services.rapport_service import RapportUsageService
+    data = RapportUsageService.collecter(debut, fin)
+    stats_roles = data['users_by_role']
 
     if format_type == 'csv':
-        import csv
-        output = io.StringIO()
-        writer = csv.writer(output)
-
-        # En-têtes
-        writer.writerow(['Métrique', 'Valeur'])
-
-        # Données
-        writer.writerow(['Date génération', data['generated_at']])
-        writer.writerow(['Utilisateurs actifs', data['active_users']])
-        writer.writerow(['Bulletins générés', data['bulletins_generated']])
-        writer.writerow(['Imports de notes', data['notes_imports']])
-
-        for role_stat in stats_roles:
-            writer.writerow([f'Rôle {role_stat["role"]}', role_stat['count']])
+        from flask import stream_with_context
+        from app.utils.helpers import generer_csv
+
+        def lignes_rapport():
+            # Synthèse
+            yield ['Date génération', data['generated_at']]
+            yield ['Utilisateurs actifs', data['active_users']]
+            yield ['Bulletins générés', data['bulletins_generated']]
+            yield ['Imports de notes', data['notes_imports']]
+
+            for role_stat in stats_roles:
+                yield [f'Rôle {role_stat["role"]}', role_stat['count']]
+
+            # Détail des actions de la période, lu en flux
+            yield []
+            yield ['Date', 'Action', 'Matricule', 'Nom', 'Prénom', 'Rôle', 'Adresse IP']
+            for entree in AuditUsage.obtenir_rapport_usage(debut, fin, flux=True):
+                yield [
+                    entree['created_at'], entree['action'], entree['matricule'],
+                    entree['nom'], entree['prenom'], entree['role'], entree.get('ip_address') or ''
+                ]
 
-        output.seek(0)
         return Response(
-            output.getvalue(),
+            stream_with_context(generer_csv(['Métrique', 'Valeur'], lignes_rapport())),
             mimetype='text/csv',
             headers={'Content-Disposition': 'attachment; filename=usage_report.csv'}
         )
 
-    elif format_type == 'pdf':
-        buffer = io.BytesIO()
-        doc = SimpleDocTemplate(buffer, pagesize=letter)
-        styles = getSampleStyleSheet()
-        elements = []
-
-        elements.append(Paragraph("RAPPORT D'USAGE DU SYSTÈME", styles['Heading1']))
-        elements.append(Spacer(1, 12))
-
-        # Statistiques générales
-        elements.append(Paragraph("Statistiques Générales", styles['Heading2']))
-        elements.append(Paragraph(f"Date de génération: {data['generated_at']}", styles['Normal']))
-        elements.append(Paragraph(f"Utilisateurs actifs: {data['active_users']}", styles['Normal']))
-        elements.append(Paragraph(f"Bulletins générés: {data['bulletins_generated']}", styles['Normal']))
-        elements.append(Paragraph(f"Imports de notes: {data['notes_imports']}", styles['Normal']))
-        elements.append(Spacer(1, 12))
-
-        # Utilisateurs par rôle
-        elements.append(Paragraph("Utilisateurs par Rôle", styles['Heading2']))
-        role_data = [['Rôle', 'Nombre']]
-        for stat in stats_roles:
-            role_data.append([stat['role'], str(stat['count'])])
-        role_table = Table(role_data)
-        role_table.setStyle(TableStyle([
-            ('BACKGROUND', (0, 0), (-1, 0), colors.grey),
-            ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
-            ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
-            ('GRID', (0, 0), (-1, -1), 1, colors.black)
-        ]))
-        elements.append(role_table)
-
-        doc.build(elements)
-        buffer.seek(0)
-        return Response(
-            buffer.getvalue(),
-            mimetype='application/pdf',
-            headers={'Content-Disposition': 'attachment; filename=usage_report.pdf'}
-        )
-
     # Audit
     AuditUsage.creer(session['utilisateur_id'], 'USAGE_REPORT', meta={
         'format': format_type,
         'period': f"{debut} to {fin}" if debut and fin else 'all'
     })
 
+    return jsonify({'success': True, 'data': data})
+
 
 # ==================== API NOTES - WORKFLOW UNICAMPUS ====================
 
-@api_bp.route('/notes/en-attente', methods=['GET'])
-@role_required(['DIRECTEUR', 'ADMIN', 'SUPER_ADMIN'])
-def obtenir_notes_en_attente():
+def _acces_dossier_etudiant(etudiant_id):
     """
-    Récupère toutes les notes en attente de validation (pour le Directeur)
-    Polling endpoint - appelé toutes les 5 secondes
+    Contrôle d'accès aux notes et bulletins d'un étudiant (refait à chaque
+    requête par reponse_versionnee, y compris pour un 304 ou un corps en cache)
+    Les étudiants ne voient que leur propre dossier, les parents celui de leurs enfants
+
+    Returns:
+        None si l'accès est autorisé, sinon la réponse 403
     """
-    filiere_id = request.args.get('filiere_id', type=int)
+    user_id = session['utilisateur_id']
+    user_role = session['role']
     
-    try:
-        notes = Note.obtenir_notes_en_attente(filiere_id)
-        
-        # Formater les données pour le frontend
-        notes_formatted = []
-        for note in notes:
-            notes_formatted.append({
-                'id': note['id'],
-                'etudiant': {
-                    'id': note['etudiant_id'],
-                    'nom': note['etudiant_nom'],
-                    'prenom': note['etudiant_prenom'],
-                    'matricule': note['matricule']
-                },
-                'cours': {
-                    'id': note['cours_id'],
-                    'nom': note['nom_cours'],
-                    'type': note['type_cours']
-                },
-                'filiere': {
-                    'id': note.get('filiere_id'),
-                    'nom': note['nom_filiere'],
-                    'niveau': note['niveau']
-                },
-                'type_evaluation': note['type_evaluation'],
-                'note': float(note['note']),
-                'coefficient': float(note['coefficient']),
-                'date_evaluation': note['date_evaluation'].strftime('%Y-%m-%d') if note.get('date_evaluation') else None,
-                'commentaire': note.get('commentaire', ''),
-                'saisi_par': {
-                    'nom': note['saisi_par_nom'],
-                    'prenom': note['saisi_par_prenom']
-                },
-                'date_creation': note['date_creation'].strftime('%Y-%m-%d %H:%M:%S') if note.get('date_creation') else None
-            })
-        
-        return jsonify({
-            'success': True,
-            'count': len(notes_formatted),
-            'notes': notes_formatted
-        }), 200
-        
-    except Exception as e:
+    if user_role == 'ETUDIANT' and user_id != etudiant_id:
         return jsonify({
             'success': False,
-            'error': str(e)
-        }), 500
+            'error': 'Accès non autorisé'
+        }), 403
+    
+    if user_role == 'PARENT':
+        from app.models import Parent
+        enfants = Parent.obtenir_enfants(user_id)
+        if etudiant_id not in [e['etudiant_id'] for e in enfants]:
+            return jsonify({
+                'success': False,
+                'error': 'Accès non autorisé'
+            }), 403
+    
+    return None
 
 
 @api_bp.route('/notes/valider/<int:note_id>', methods=['POST'])
@@ -600,37 +471,13 @@ def modifier_note_non_validee(note_id):
 
 @api_bp.route('/notes/etudiant/<int:etudiant_id>', methods=['GET'])
 @role_required(['ETUDIANT', 'PARENT', 'ENSEIGNANT', 'ADMIN', 'SUPER_ADMIN', 'DIRECTEUR'])
+@reponse_versionnee('notes', 'cours', 'filieres', 'utilisateurs', acces=_acces_dossier_etudiant)
 def obtenir_notes_etudiant(etudiant_id):
     """
     Récupère les notes validées d'un étudiant
-    Les étudiants ne voient que leurs propres notes
-    Les parents voient les notes de leurs enfants
+    Accès contrôlé par _acces_dossier_etudiant (étudiant lui-même, ses parents)
     """
     try:
-        user_id = session['utilisateur_id']
-        user_role = session['role']
-        
-        # Vérification des permissions
-        if user_role == 'ETUDIANT':
-            # Un étudiant ne peut voir que ses propres notes
-            if user_id != etudiant_id:
-                return jsonify({
-                    'success': False,
-                    'error': 'Accès non autorisé'
-                }), 403
-        
-        elif user_role == 'PARENT':
-            # Un parent ne peut voir que les notes de ses enfants
-            from app.models import Parent
-            enfants = Parent.obtenir_enfants(user_id)
-            enfants_ids = [e['etudiant_id'] for e in enfants]
-            
-            if etudiant_id not in enfants_ids:
-                return jsonify({
-                    'success': False,
-                    'error': 'Accès non autorisé'
-                }), 403
-        
         # Récupérer les notes validées
         notes = Note.obtenir_notes_validees_etudiant(etudiant_id)
         
@@ -684,7 +531,7 @@ def obtenir_notes_etudiant(etudiant_id):
 def obtenir_messages_non_lus():
     """
     Récupère les messages non lus de l'utilisateur connecté
-    Polling endpoint
+    Mode de secours du flux /api/evenements (ETag / If-None-Match)
     """
     try:
         user_id = session['utilisateur_id']
@@ -707,11 +554,13 @@ def obtenir_messages_non_lus():
                 'date_creation': msg['date_creation'].strftime('%Y-%m-%d %H:%M:%S') if msg.get('date_creation') else None
             })
         
-        return jsonify({
+        reponse = jsonify({
             'success': True,
             'count': len(messages_formatted),
             'messages': messages_formatted
-        }), 200
+        })
+        reponse.add_etag()
+        return reponse.make_conditional(request)
         
     except Exception as e:
         return jsonify({
@@ -866,91 +715,15 @@ def marquer_message_lu(message_id):
 
 # ==================== API BULLETINS ====================
 
-@api_bp.route('/bulletins/generer', methods=['POST'])
-@role_requis('GESTIONNAIRE_PV', 'ADMIN', 'SUPER_ADMIN')
-def creer_bulletin():
-    """
-    Génère un bulletin PDF pour un étudiant
-    """
-    try:
-        data = request.get_json()
-        
-        # Validation
-        required_fields = ['etudiant_id', 'semestre', 'annee_academique']
-        for field in required_fields:
-            if field not in data:
-                return jsonify({
-                    'success': False,
-                    'error': f'Champ {field} requis'
-                }), 400
-        
-        etudiant_id = data['etudiant_id']
-        semestre = data['semestre']
-        annee_academique = data['annee_academique']
-        genere_par = session['utilisateur_id']
-        
-        # Générer le bulletin
-        bulletin_id = Bulletin.generer_bulletin(
-            etudiant_id,
-            semestre,
-            annee_academique,
-            genere_par
-        )
-        
-        if bulletin_id:
-            # Audit
-            AuditUsage.creer(genere_par, 'GENERATE_BULLETIN', meta={
-                'bulletin_id': bulletin_id,
-                'etudiant_id': etudiant_id,
-                'semestre': semestre
-            })
-            
-            return jsonify({
-                'success': True,
-                'bulletin_id': bulletin_id,
-                'message': 'Bulletin généré avec succès'
-            }), 201
-        else:
-            return jsonify({
-                'success': False,
-                'error': 'Erreur lors de la génération'
-            }), 500
-            
-    except Exception as e:
-        return jsonify({
-            'success': False,
-            'error': str(e)
-        }), 500
-
-
 @api_bp.route('/bulletins/etudiant/<int:etudiant_id>', methods=['GET'])
 @role_requis('ETUDIANT', 'PARENT', 'GESTIONNAIRE_PV', 'ADMIN', 'SUPER_ADMIN')
+@reponse_versionnee('bulletins', 'filieres', 'utilisateurs', acces=_acces_dossier_etudiant)
 def obtenir_bulletins_etudiant(etudiant_id):
     """
     Récupère tous les bulletins d'un étudiant
+    Accès contrôlé par _acces_dossier_etudiant (étudiant lui-même, ses parents)
     """
     try:
-        user_id = session['utilisateur_id']
-        user_role = session['role']
-        
-        # Vérification des permissions
-        if user_role == 'ETUDIANT' and user_id != etudiant_id:
-            return jsonify({
-                'success': False,
-                'error': 'Accès non autorisé'
-            }), 403
-        
-        elif user_role == 'PARENT':
-            from app.models import Parent
-            enfants = Parent.obtenir_enfants(user_id)
-            enfants_ids = [e['etudiant_id'] for e in enfants]
-            
-            if etudiant_id not in enfants_ids:
-                return jsonify({
-                    'success': False,
-                    'error': 'Accès non autorisé'
-                }), 403
-        
         # Récupérer les bulletins
         bulletins = Bulletin.obtenir_bulletins_etudiant(etudiant_id)
         
@@ -986,6 +759,7 @@ def obtenir_bulletins_etudiant(etudiant_id):
 
 @api_bp.route('/presences/enseignants', methods=['GET'])
 @role_requis('administration', 'sous_admin', 'ADMIN', 'SUPER_ADMIN')
+@reponse_versionnee('presences', 'emploi_du_temps', 'enseignants', 'utilisateurs', 'cours', 'salles')
 def obtenir_presences_enseignants():
     """
     Récupère les présences des enseignants avec filtres
@@ -1164,3 +938,26 @@ def marquer_presence_api():
 
     except Exception as e:
         return jsonify({'success': False, 'error': str(e)}), 500
+
+
+# ==================== TRAVAUX DE FOND ====================
+# Suivi des travaux (/api/travaux/<id>) : blueprint suivi
+
+@api_bp.route('/promotions', methods=['POST'])
+@role_requis('DIRECTEUR', 'ADMIN', 'SUPER_ADMIN')
+def promouvoir_etudiants():
+    """
+    Met en file la promotion des étudiants d'un niveau au suivant
+    Corps JSON: {'niveau_actuel': 'L1', 'filiere_id': 3, 'annee_academique': '2025-2026'}
+    """
+    data = request.get_json() or {}
+    if not data.get('niveau_actuel'):
+        return jsonify({'success': False, 'error': 'Champ niveau_actuel requis'}), 400
+
+    id_travail = travaux.soumettre('promotion_niveau', {
+        'niveau_actuel': data['niveau_actuel'],
+        'filiere_id': data.get('filiere_id'),
+        'annee_academique': data.get('annee_academique'),
+        'validateur_id': session['utilisateur_id']
+    }, cree_par=session['utilisateur_id'])
+    return reponse_travail_accepte(id_travail, 'Promotion en file')
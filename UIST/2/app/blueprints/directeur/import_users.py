@@ -7,7 +7,8 @@ import openpyxl
 from werkzeug.security import generate_password_hash
 from app.db import executer_requete, executer_requete_unique
 from app.exceptions import ValidationException, log_user_action, handle_exception
-from app.utils import generer_matricule
+from app.services.matricule_service import MatriculeService
+from collections import Counter
 from datetime import datetime
 
 
@@ -50,7 +51,13 @@ class ImportUtilisateurs:
             'erreurs': []
         }
         
-        # Parcourir les lignes (skip header row 1)
+        # 1re passe : lecture des lignes et recherche des utilisateurs existants
+        # (skip header row 1) ; les nouveaux sont comptés par rôle
+        lignes = []
+        nouveaux_par_role = Counter()
+        emails_nouveaux = set()
+        noms_nouveaux = set()
+        
         for row_num, row in enumerate(ws.iter_rows(min_row=2, values_only=True), start=2):
             stats['total'] += 1
             
@@ -68,19 +75,50 @@ class ImportUtilisateurs:
                 if not nom or not prenom:
                     raise ValidationException("Nom et prénom obligatoires")
                 
-                # Vérifier si l'utilisateur existe déjà (par email ou combinaison nom/prénom)
-                utilisateur_existant = None
+                ligne = {
+                    'row_num': row_num, 'nom': nom, 'prenom': prenom, 'email': email,
+                    'telephone': telephone, 'role': role, 'filiere_nom': filiere_nom,
+                    'niveau': niveau, 'existant': ImportUtilisateurs._rechercher_existant(email, nom, prenom),
+                    'a_relire': False
+                }
+                
+                if not ligne['existant']:
+                    if (email and email in emails_nouveaux) or (nom.lower(), prenom.lower()) in noms_nouveaux:
+                        # Même personne qu'une ligne précédente du fichier : créée par celle-ci
+                        ligne['a_relire'] = True
+                    else:
+                        nouveaux_par_role[role] += 1
+                        if email:
+                            emails_nouveaux.add(email)
+                        noms_nouveaux.add((nom.lower(), prenom.lower()))
                 
-                if email:
-                    utilisateur_existant = executer_requete_unique("""
-                        SELECT id, matricule, role FROM Utilisateurs WHERE email = %s
-                    """, (email,))
+                lignes.append(ligne)
                 
-                if not utilisateur_existant:
-                    utilisateur_existant = executer_requete_unique("""
-                        SELECT id, matricule, role FROM Utilisateurs 
-                        WHERE LOWER(nom) = %s AND LOWER(prenom) = %s
-                    """, (nom.lower(), prenom.lower()))
+            except ValidationException as e:
+                lignes.append({'row_num': row_num, 'erreur': e.message})
+            except Exception as e:
+                lignes.append({'row_num': row_num, 'erreur': f"Erreur - {str(e)}"})
+        
+        # Matricules des nouveaux utilisateurs réservés en une plage par rôle
+        matricules = {
+            role: iter(MatriculeService.generer_lot(role, nombre))
+            for role, nombre in nouveaux_par_role.items()
+        }
+        # 2e passe : écritures, dans l'ordre du fichier
+        for ligne in lignes:
+            row_num = ligne['row_num']
+            
+            try:
+                if 'erreur' in ligne:
+                    raise ValidationException(ligne['erreur'])
+                
+                nom, prenom, email = ligne['nom'], ligne['prenom'], ligne['email']
+                telephone, role = ligne['telephone'], ligne['role']
+                filiere_nom, niveau = ligne['filiere_nom'], ligne['niveau']
+                
+                utilisateur_existant = ligne['existant']
+                if ligne['a_relire']:
+                    utilisateur_existant = ImportUtilisateurs._rechercher_existant(email, nom, prenom)
                 
                 if utilisateur_existant:
                     # Utilisateur existe déjà
@@ -114,8 +152,8 @@ class ImportUtilisateurs:
                     stats['existants_maj'] += 1
                     
                 else:
-                    # Nouvel utilisateur - Créer
-                    matricule = generer_matricule(role)
+                    # Nouvel utilisateur - Créer (matricule pris dans la plage du rôle)
+                    matricule = next(matricules[role])
                     mot_de_passe_defaut = 'UIST2026'  # Mot de passe par défaut
                     mot_de_passe_hash = generate_password_hash(mot_de_passe_defaut)
                     
@@ -176,6 +214,24 @@ class ImportUtilisateurs:
         )
         
         return stats
+    
+    @staticmethod
+    def _rechercher_existant(email, nom, prenom):
+        """Utilisateur déjà enregistré (par email, sinon par nom et prénom) ou None"""
+        utilisateur_existant = None
+        
+        if email:
+            utilisateur_existant = executer_requete_unique("""
+                SELECT id, matricule, role FROM Utilisateurs WHERE email = %s
+            """, (email,))
+        
+        if not utilisateur_existant:
+            utilisateur_existant = executer_requete_unique("""
+                SELECT id, matricule, role FROM Utilisateurs 
+                WHERE LOWER(nom) = %s AND LOWER(prenom) = %s
+            """, (nom.lower(), prenom.lower()))
+        
+        return utilisateur_existant
 
 
 class PromotionEtudiants:
@@ -183,7 +239,7 @@ class PromotionEtudiants:
     
     @staticmethod
     @handle_exception
-    def promouvoir_niveau(filiere_id=None, niveau_actuel='L1', annee_academique=None):
+    def promouvoir_niveau(filiere_id=None, niveau_actuel='L1', annee_academique=None, validateur_id=None):
         """
         Promeut les étudiants d'un niveau au suivant
         
@@ -191,6 +247,7 @@ class PromotionEtudiants:
             filiere_id: ID de la filière (None = toutes)
             niveau_actuel: Niveau actuel (L1, L2, etc.)
             annee_academique: Année académique (ex: 2025-2026)
+            validateur_id: ID du validateur (défaut: utilisateur connecté)
         
         Returns:
             dict: Résumé de la promotion
@@ -243,7 +300,8 @@ class PromotionEtudiants:
             'erreurs': []
         }
         
-        validateur_id = session.get('utilisateur_id')
+        if validateur_id is None:
+            validateur_id = session.get('utilisateur_id')
         
         for etudiant in etudiants:
             try:
@@ -65,7 +65,8 @@ def validation_notes():
     resultats = GestionnaireNotes.lister_notes(
         filiere_id=filiere_id,
         statut='En attente',
-        page=page
+        page=page,
+        curseur=request.args.get('curseur')
     )
     
     # Récupérer les filières pour le filtre
@@ -165,7 +166,8 @@ def gestion_utilisateurs():
     resultats = GestionnaireUtilisateurs.lister_utilisateurs(
         role=role_filtre if role_filtre else None,
         recherche=recherche if recherche else None,
-        page=page
+        page=page,
+        curseur=request.args.get('curseur')
     )
     
     contexte = {
@@ -184,17 +186,39 @@ def gestion_utilisateurs():
 @role_required(['DIRECTEUR', 'SUPER_ADMIN'])
 def conflits_edt():
     """
-    Affiche les conflits d'emploi du temps
+    Affiche les conflits d'emploi du temps (balayage de tous les créneaux)
     """
-    # À implémenter: détecter et lister les conflits
+    semaine = request.args.get('semaine', type=int)
+    
     contexte = {
         'titre_page': 'Gestion des Conflits EDT',
-        'conflits': []
+        'conflits': GestionnaireEDT.balayer_conflits(semaine),
+        'semaine_filtre': semaine
     }
     
     return render_template('directeur/conflits_edt.html', **contexte)
 
 
+@directeur_bp.route('/conflits-edt/enregistrer', methods=['POST'])
+@role_required(['DIRECTEUR', 'SUPER_ADMIN'])
+def enregistrer_conflits_edt():
+    """
+    Enregistre les conflits détectés (les paires déjà actives sont ignorées)
+    """
+    semaine = request.form.get('semaine', type=int)
+    
+    nb_enregistres = GestionnaireEDT.enregistrer_conflits(
+        GestionnaireEDT.balayer_conflits(semaine)
+    )
+    
+    if nb_enregistres > 0:
+        flash(f'{nb_enregistres} conflit(s) enregistré(s)', 'success')
+    else:
+        flash('Aucun nouveau conflit à enregistrer', 'info')
+    
+    return redirect(url_for('directeur.conflits_edt', semaine=semaine))
+
+
 @directeur_bp.route('/rapports-pedagogiques')
 @role_required(['DIRECTEUR', 'SUPER_ADMIN'])
 def rapports_pedagogiques():
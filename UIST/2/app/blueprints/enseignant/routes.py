@@ -511,41 +511,32 @@ def exporter_notes(cours_id):
             flash('Vous n\'êtes pas autorisé à exporter ce cours.', 'danger')
             return redirect(url_for('enseignant.gestion_notes'))
         
-        # Récupérer les notes
-        notes = Note.obtenir_par_cours(cours_id)
-        cours = Cours.obtenir_par_id(cours_id)
-        
-        # Créer le fichier CSV
-        output = io.StringIO()
-        writer = csv.writer(output)
-        
-        # En-têtes
-        writer.writerow(['Matricule', 'Nom', 'Prénom', 'Type', 'Note', 'Coefficient', 'Date', 'Commentaire'])
-        
-        # Données
-        if notes:
-            for note in notes:
-                writer.writerow([
-                    note['matricule'],
-                    note['etudiant_nom'],
-                    note['etudiant_prenom'],
-                    note['type_evaluation'],
-                    note['note'],
-                    note['coefficient'],
-                    note['date_evaluation'] if note['date_evaluation'] else '',
-                    note['commentaire'] if note['commentaire'] else ''
-                ])
-        
-        # Préparer le fichier pour téléchargement
-        output.seek(0)
+        from flask import Response, stream_with_context
+        from app.utils.helpers import generer_csv
         
+        cours = Cours.obtenir_par_id(cours_id)
         nom_fichier = f"notes_{cours['nom_cours'].replace(' ', '_')}_{datetime.now().strftime('%Y%m%d')}.csv"
         
-        return send_file(
-            io.BytesIO(output.getvalue().encode('utf-8')),
+        # Les notes sont lues et écrites au fil de l'eau (mémoire constante)
+        lignes = (
+            [
+                note['matricule'],
+                note['etudiant_nom'],
+                note['etudiant_prenom'],
+                note['type_evaluation'],
+                note['note'],
+                note['coefficient'],
+                note['date_evaluation'] if note['date_evaluation'] else '',
+                note['commentaire'] if note['commentaire'] else ''
+            ]
+            for note in Note.obtenir_par_cours(cours_id, flux=True)
+        )
+        entetes = ['Matricule', 'Nom', 'Prénom', 'Type', 'Note', 'Coefficient', 'Date', 'Commentaire']
+        
+        return Response(
+            stream_with_context(generer_csv(entetes, lignes)),
             mimetype='text/csv',
-            as_attachment=True,
-            download_name=nom_fichier
+            headers={'Content-Disposition': f'attachment; filename={nom_fichier}'}
         )
         
     except Exception as e:
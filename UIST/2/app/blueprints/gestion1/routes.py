@@ -45,7 +45,8 @@ def liste_salles():
     
     resultats = GestionnaireCours.lister_salles(
         batiment=batiment if batiment else None,
-        page=page
+        page=page,
+        curseur=request.args.get('curseur')
     )
     
     return render_template('gestion1/salles.html',
@@ -88,7 +89,8 @@ def liste_filieres():
     
     resultats = GestionnaireCours.lister_filieres(
         niveau=niveau if niveau else None,
-        page=page
+        page=page,
+        curseur=request.args.get('curseur')
     )
     
     niveaux = ['L1', 'L2', 'L3', 'M1', 'M2']
@@ -110,7 +112,8 @@ def liste_cours():
     
     resultats = GestionnaireCours.lister_cours(
         filiere_id=filiere_id,
-        page=page
+        page=page,
+        curseur=request.args.get('curseur')
     )
     
     # Récupérer les filières pour le filtre
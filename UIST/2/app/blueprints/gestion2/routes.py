@@ -44,7 +44,8 @@ def liste_etudiants():
     resultats = GestionnaireUtilisateurs.lister_utilisateurs(
         role='ETUDIANT',
         recherche=recherche if recherche else None,
-        page=page
+        page=page,
+        curseur=request.args.get('curseur')
     )
     
     return render_template('gestion2/etudiants.html',
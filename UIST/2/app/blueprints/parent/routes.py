@@ -30,6 +30,9 @@ def tableau_bord():
     nb_alertes = 0
     alertes = []
     
+    # Les fiches des enfants sont chargées en une seule requête
+    Etudiant.prevoir(enfant.get('etudiant_id') for enfant in enfants)
+    
     for enfant in enfants:
         try:
             # Récupérer les notes validées uniquement
@@ -0,0 +1,3 @@
+"""
+Blueprint de suivi temps réel (flux d'événements)
+"""
@@ -0,0 +1,220 @@
+"""
+Routes de suivi temps réel, servies sous /api
+Flux Server-Sent Events et lectures versionnées (ETag / 304) lus par
+static/js/polling.js, mise en file et suivi des travaux de fond
+
+Architecture simplifiée:
+- Routes légères déléguant aux gestionnaires et aux utilitaires
+- Code procédural en français
+"""
+import os
+from flask import Blueprint, Response, jsonify, request, session, url_for
+from app.utils.decorators import role_required
+from app.utils import travaux
+from app.utils.versions import reponse_versionnee
+from app.gestionnaires.notes import GestionnaireNotes
+
+suivi_bp = Blueprint('suivi', __name__)
+
+TOUS_LES_ROLES = ['SUPER_ADMIN', 'DIRECTEUR', 'GESTION_1', 'GESTION_2', 'GESTION_3',
+                  'ENSEIGNANT', 'ETUDIANT', 'PARENT']
+
+# Rôles qui valident les notes : abonnés au canal des notes
+ROLES_VALIDATION_NOTES = ('DIRECTEUR', 'SUPER_ADMIN')
+
+ROLES_BULLETINS = ['GESTION_2', 'DIRECTEUR', 'SUPER_ADMIN']
+
+
+@suivi_bp.route('/evenements')
+@role_required(TOUS_LES_ROLES)
+def flux_evenements():
+    """
+    Flux text/event-stream : le client recharge la liste concernée à la
+    réception de note_creee / note_validee / message / notification
+    """
+    from app.utils.evenements import flux_sse, CANAL_NOTES, canal_utilisateur
+
+    canaux = [canal_utilisateur(session['utilisateur_id'])]
+    if session.get('role') in ROLES_VALIDATION_NOTES:
+        canaux.append(CANAL_NOTES)
+
+    return Response(
+        flux_sse(canaux),
+        mimetype='text/event-stream',
+        headers={
+            'Cache-Control': 'no-cache',
+            'X-Accel-Buffering': 'no'
+        }
+    )
+
+
+@suivi_bp.route('/notes/en-attente')
+@role_required(list(ROLES_VALIDATION_NOTES))
+@reponse_versionnee('notes', 'etudiants', 'utilisateurs', 'cours', 'filieres')
+def notes_en_attente():
+    """
+    Première page des notes en attente de validation
+    Contrôle lent pendant le flux /api/evenements : la réponse porte un ETag
+    et If-None-Match renvoie 304 sans corps quand la liste n'a pas changé
+    """
+    resultats = GestionnaireNotes.lister_notes(
+        filiere_id=request.args.get('filiere', type=int),
+        statut='En attente'
+    )
+    
+    notes = [{
+        'id': note['id_note'],
+        'etudiant': {
+            'id': note['id_etudiant'],
+            'nom': note['etudiant_nom'],
+            'prenom': note['etudiant_prenom'],
+            'matricule': note['etudiant_matricule']
+        },
+        'cours': {
+            'id': note['id_cours'],
+            'code': note['code_cours'],
+            'libelle': note['cours_libelle']
+        },
+        'filiere': {
+            'nom': note['nom_filiere'],
+            'niveau': note['niveau']
+        },
+        'type_evaluation': note['type_evaluation'],
+        'note': float(note['valeur_note']),
+        'date_saisie': note['date_saisie']
+    } for note in resultats['elements']]
+    
+    return jsonify({
+        'success': True,
+        'count': resultats['total_elements'],
+        'notes': notes
+    })
+
+
+# ==================== TRAVAUX DE FOND ====================
+
+def reponse_travail_accepte(id_travail, message):
+    """Réponse 202 d'une opération mise en file"""
+    return jsonify({
+        'success': True,
+        'travail_id': id_travail,
+        'statut_url': url_for('suivi.obtenir_travail', id_travail=id_travail),
+        'message': message
+    }), 202
+
+
+def _travail_autorise(id_travail):
+    """Travail visible par l'utilisateur connecté (demandeur ou SUPER_ADMIN), sinon None"""
+    travail = travaux.obtenir_travail(id_travail)
+    if travail is None:
+        return None
+    if travail['cree_par'] != session.get('utilisateur_id') and session.get('role') != 'SUPER_ADMIN':
+        return None
+    return travail
+
+
+@suivi_bp.route('/bulletins/generer', methods=['POST'])
+@role_required(ROLES_BULLETINS)
+def generer_bulletins():
+    """
+    Met en file le bulletin d'un étudiant, ou ceux de toute une filière si
+    filiere_id est fourni à la place de etudiant_id ; réponse 202 avec
+    l'URL de suivi du travail
+    Corps JSON: {'semestre': 1, 'annee_academique': '2025-2026', 'filiere_id': 3}
+    """
+    data = request.get_json(silent=True) or {}
+    
+    for champ in ('semestre', 'annee_academique'):
+        if not data.get(champ):
+            return jsonify({'success': False, 'error': f'Champ {champ} requis'}), 400
+    if not data.get('etudiant_id') and not data.get('filiere_id'):
+        return jsonify({'success': False, 'error': 'Champ etudiant_id ou filiere_id requis'}), 400
+    
+    # 1, 2, 'S1' ou 'S2' (colonne bulletins.semestre : 1 ou 2)
+    semestre = str(data['semestre']).upper().lstrip('S')
+    if semestre not in ('1', '2'):
+        return jsonify({'success': False, 'error': 'Semestre invalide (1 ou 2)'}), 400
+    
+    genere_par = session['utilisateur_id']
+    parametres = {
+        'semestre': int(semestre),
+        'annee_academique': data['annee_academique'],
+        'genere_par': genere_par
+    }
+    
+    if data.get('etudiant_id'):
+        parametres['etudiant_id'] = int(data['etudiant_id'])
+        id_travail = travaux.soumettre('bulletin_etudiant', parametres, cree_par=genere_par)
+        return reponse_travail_accepte(id_travail, 'Génération du bulletin en file')
+    
+    parametres['filiere_id'] = int(data['filiere_id'])
+    id_travail = travaux.soumettre('bulletins_filiere', parametres, cree_par=genere_par)
+    return reponse_travail_accepte(id_travail, 'Génération des bulletins de la filière en file')
+
+
+@suivi_bp.route('/travaux/<int:id_travail>')
+@role_required(TOUS_LES_ROLES)
+def obtenir_travail(id_travail):
+    """
+    État d'un travail de fond : statut, progression, résultat ou erreur
+    (à interroger jusqu'à un statut TERMINE, ECHEC ou ANNULE)
+    """
+    travail = _travail_autorise(id_travail)
+    if travail is None:
+        return jsonify({'success': False, 'error': 'Travail introuvable'}), 404
+
+    resultat = travail['resultat']
+    if isinstance(resultat, dict) and 'fichier' in resultat:
+        # Le chemin sur disque n'est pas exposé
+        resultat = {cle: valeur for cle, valeur in resultat.items() if cle != 'fichier'}
+        resultat['fichier_url'] = url_for('suivi.telecharger_fichier_travail', id_travail=id_travail)
+
+    return jsonify({
+        'success': True,
+        'travail': {
+            'id': travail['id_travail'],
+            'type': travail['type_travail'],
+            'statut': travail['statut'],
+            'termine': travail['statut'] in travaux.STATUTS_FINAUX,
+            'progression': travail['progression'],
+            'message': travail['message'],
+            'resultat': resultat,
+            'erreur': travail['erreur'].splitlines()[0] if travail['erreur'] else None,
+            'tentatives': travail['tentatives'],
+            'max_tentatives': travail['max_tentatives'],
+            'date_creation': travail['date_creation'],
+            'date_fin': travail['date_fin']
+        }
+    })
+
+
+@suivi_bp.route('/travaux/<int:id_travail>/annuler', methods=['POST'])
+@role_required(TOUS_LES_ROLES)
+def annuler_travail(id_travail):
+    """Annule un travail en file ou en cours"""
+    if _travail_autorise(id_travail) is None:
+        return jsonify({'success': False, 'error': 'Travail introuvable'}), 404
+
+    if not travaux.annuler_travail(id_travail):
+        return jsonify({'success': False, 'error': 'Travail déjà terminé'}), 409
+    return jsonify({'success': True, 'message': 'Annulation demandée'})
+
+
+@suivi_bp.route('/travaux/<int:id_travail>/fichier')
+@role_required(TOUS_LES_ROLES)
+def telecharger_fichier_travail(id_travail):
+    """Fichier produit par un travail terminé (rapport PDF)"""
+    from flask import send_file
+
+    travail = _travail_autorise(id_travail)
+    if travail is None or travail['statut'] != 'TERMINE' or not isinstance(travail['resultat'], dict) \
+            or 'fichier' not in travail['resultat']:
+        return jsonify({'success': False, 'error': 'Fichier introuvable'}), 404
+
+    resultat = travail['resultat']
+    return send_file(
+        os.path.abspath(resultat['fichier']),
+        mimetype=resultat.get('mimetype'),
+        as_attachment=True,
+        download_name=resultat.get('nom')
+    )
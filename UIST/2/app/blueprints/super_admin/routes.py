@@ -9,6 +9,7 @@ Architecture simplifiée:
 """
 from flask import Blueprint, render_template, request, redirect, url_for, flash, jsonify, session
 from app.utils.decorators import role_required
+from app.utils.versions import reponse_versionnee
 from app.gestionnaires.utilisateurs import GestionnaireUtilisateurs
 from app.gestionnaires.base import GestionnaireBase
 
@@ -52,7 +53,8 @@ def liste_utilisateurs():
     resultats = GestionnaireUtilisateurs.lister_utilisateurs(
         role=role_filtre if role_filtre else None,
         recherche=recherche if recherche else None,
-        page=page
+        page=page,
+        curseur=request.args.get('curseur')
     )
     
     # Liste des rôles pour le filtre
@@ -314,9 +316,11 @@ def statistiques():
 # API pour le chargement lazy
 @super_admin_bp.route('/api/statistiques-rapides')
 @role_required(['SUPER_ADMIN'])
+@reponse_versionnee('stats_daily')
 def api_statistiques_rapides():
     """
     Retourne les statistiques en JSON pour le chargement lazy
+    (ETag suivant l'instantané stats_daily, 304 tant qu'il n'est pas rafraîchi)
     """
     stats = GestionnaireUtilisateurs.obtenir_statistiques()
     return jsonify(stats)
\ No newline at end of file
@@ -1,41 +1,208 @@
 """
 Module de gestion de la connexion à la base de données SQLite3
 Fournit des fonctions utilitaires pour exécuter des requêtes
+
+Les connexions sont ouvertes en mode WAL (les lectures ne bloquent plus
+derrière les écritures) et réutilisées d'une requête HTTP à l'autre via
+un petit pool : chaque requête emprunte une connexion et la rend à la fin.
 """
 import sqlite3
 import os
-from flask import g, current_app
+import threading
+from collections import namedtuple
+from flask import g, current_app, has_app_context
 from contextlib import contextmanager
 
+# Réglages par défaut, surchargés par la configuration (DB_*)
+DB_POOL_TAILLE = 8
+DB_BUSY_TIMEOUT_MS = 5000
+DB_CACHE_SIZE_KO = 20000
+DB_MMAP_SIZE = 256 * 1024 * 1024
+DB_CACHE_REQUETES = 256
+
+# Lignes lues par aller-retour dans iterer_requete
+TAILLE_LOT_FLUX = 500
+FORMATS_LIGNE = ('dict', 'tuple', 'namedtuple')
+
+class PoolConnexions:
+    """
+    Pool de connexions SQLite pour un fichier de base
+    
+    Une connexion n'est utilisée que par un thread à la fois (celui de la
+    requête qui l'a empruntée) ; au-delà de `taille` connexions libres, les
+    connexions rendues sont fermées.
+    """
+    
+    def __init__(self, chemin, taille=DB_POOL_TAILLE, busy_timeout_ms=DB_BUSY_TIMEOUT_MS,
+                 cache_size_ko=DB_CACHE_SIZE_KO, mmap_size=DB_MMAP_SIZE, cache_requetes=DB_CACHE_REQUETES):
+        self.chemin = chemin
+        self.taille = taille
+        self.busy_timeout_ms = busy_timeout_ms
+        self.cache_size_ko = cache_size_ko
+        self.mmap_size = mmap_size
+        self.cache_requetes = cache_requetes
+        self._libres = []
+        self._verrou = threading.Lock()
+    
+    def _ouvrir(self):
+        """Ouvre et règle une nouvelle connexion"""
+        os.makedirs(os.path.dirname(self.chemin) or '.', exist_ok=True)
+        
+        connexion = sqlite3.connect(
+            self.chemin,
+            detect_types=sqlite3.PARSE_DECLTYPES,
+            timeout=self.busy_timeout_ms / 1000,
+            check_same_thread=False,  # empruntée par des threads successifs
+            cached_statements=self.cache_requetes  # requêtes préparées réutilisées
+        )
+        connexion.row_factory = sqlite3.Row
+        connexion.execute('PRAGMA journal_mode = WAL')
+        connexion.execute('PRAGMA synchronous = NORMAL')
+        connexion.execute(f'PRAGMA busy_timeout = {int(self.busy_timeout_ms)}')
+        connexion.execute(f'PRAGMA cache_size = -{int(self.cache_size_ko)}')
+        connexion.execute(f'PRAGMA mmap_size = {int(self.mmap_size)}')
+        connexion.execute('PRAGMA temp_store = MEMORY')
+        # Activer les contraintes de clés étrangères
+        connexion.execute('PRAGMA foreign_keys = ON')
+        return connexion
+    
+    def acquerir(self):
+        """Emprunte une connexion libre (ou en ouvre une nouvelle)"""
+        with self._verrou:
+            if self._libres:
+                return self._libres.pop()
+        return self._ouvrir()
+    
+    def liberer(self, connexion):
+        """Rend une connexion au pool (transaction oubliée annulée)"""
+        if connexion.in_transaction:
+            connexion.rollback()
+        with self._verrou:
+            if len(self._libres) < self.taille:
+                self._libres.append(connexion)
+                return
+        connexion.close()
+    
+    def fermer(self):
+        """Ferme toutes les connexions libres"""
+        with self._verrou:
+            libres, self._libres = self._libres, []
+        for connexion in libres:
+            connexion.close()
+
+_pools = {}
+_verrou_pools = threading.Lock()
+
+def obtenir_pool():
+    """
+    Retourne le pool de la base configurée (DB_PATH)
+    
+    Returns:
+        PoolConnexions: Pool partagé par tous les threads
+    """
+    config = current_app.config
+    chemin = config.get('DB_PATH', 'database/uist_2its.db')
+    
+    with _verrou_pools:
+        pool = _pools.get(chemin)
+        if pool is None:
+            pool = _pools[chemin] = PoolConnexions(
+                chemin,
+                taille=config.get('DB_POOL_TAILLE', DB_POOL_TAILLE),
+                busy_timeout_ms=config.get('DB_BUSY_TIMEOUT_MS', DB_BUSY_TIMEOUT_MS),
+                cache_size_ko=config.get('DB_CACHE_SIZE_KO', DB_CACHE_SIZE_KO),
+                mmap_size=config.get('DB_MMAP_SIZE', DB_MMAP_SIZE),
+                cache_requetes=config.get('DB_CACHE_REQUETES', DB_CACHE_REQUETES)
+            )
+        return pool
+
+def fermer_pools():
+    """Ferme les connexions libres de tous les pools (arrêt, tests)"""
+    with _verrou_pools:
+        pools = list(_pools.values())
+        _pools.clear()
+    for pool in pools:
+        pool.fermer()
+
 def obtenir_connexion():
     """
-    Établit et retourne une connexion à la base de données SQLite3
+    Retourne la connexion empruntée par le contexte courant
     
     Returns:
         sqlite3.Connection: Connexion à la DB
     """
     if 'db' not in g:
-        db_path = current_app.config.get('DB_PATH', 'database/uist_2its.db')
-        
-        # Créer le dossier database s'il n'existe pas
-        os.makedirs(os.path.dirname(db_path), exist_ok=True)
-        
-        g.db = sqlite3.connect(
-            db_path,
-            detect_types=sqlite3.PARSE_DECLTYPES
-        )
-        g.db.row_factory = sqlite3.Row
-        # Activer les contraintes de clés étrangères
-        g.db.execute('PRAGMA foreign_keys = ON')
+        g.db_pool = obtenir_pool()
+        g.db = g.db_pool.acquerir()
     
     return g.db
 
 def fermer_connexion(e=None):
-    """Ferme la connexion à la base de données"""
+    """Rend la connexion au pool en fin de contexte"""
     db = g.pop('db', None)
+    pool = g.pop('db_pool', None)
+    g.pop('transaction_profondeur', None)
+    g.pop('apres_validation', None)
     
     if db is not None:
-        db.close()
+        pool.liberer(db)
+
+@contextmanager
+def transaction():
+    """
+    Regroupe plusieurs écritures dans une seule transaction
+    
+    Les appels à executer_requete / executer_requete_multiple faits dans le
+    bloc ne valident plus individuellement : tout est validé à la sortie du
+    bloc le plus externe, ou annulé si une exception le traverse (les erreurs
+    SQL sont alors propagées au lieu d'être affichées). Le verrou d'écriture
+    est pris dès l'entrée (BEGIN IMMEDIATE) pour éviter les échecs de
+    promotion lecture -> écriture sous concurrence.
+    
+    Usage:
+        with transaction():
+            executer_requete(...)
+            executer_requete(...)
+    
+    Yields:
+        sqlite3.Connection: Connexion de la transaction
+    """
+    db = obtenir_connexion()
+    profondeur = g.get('transaction_profondeur', 0)
+    
+    if profondeur == 0 and not db.in_transaction:
+        db.execute('BEGIN IMMEDIATE')
+    g.transaction_profondeur = profondeur + 1
+    
+    try:
+        yield db
+    except BaseException:
+        g.transaction_profondeur = profondeur
+        if profondeur == 0:
+            db.rollback()
+            g.pop('apres_validation', None)
+        raise
+    
+    g.transaction_profondeur = profondeur
+    if profondeur == 0:
+        db.commit()
+        for fonction in g.pop('apres_validation', []):
+            fonction()
+
+def en_transaction():
+    """True si un bloc transaction() est ouvert dans le contexte courant"""
+    return g.get('transaction_profondeur', 0) > 0
+
+def apres_validation(fonction):
+    """
+    Exécute fonction une fois les écritures validées : tout de suite hors
+    transaction, à la sortie du bloc transaction() le plus externe sinon
+    (abandonnée si la transaction est annulée)
+    """
+    if has_app_context() and en_transaction():
+        g.setdefault('apres_validation', []).append(fonction)
+    else:
+        fonction()
 
 def init_db():
     """Initialise la base de données avec le schéma"""
@@ -67,14 +234,91 @@ def executer_requete(requete, parametres=None, obtenir_resultats=False):
             resultats = [dict(row) for row in cur.fetchall()]
             return resultats
         else:
-            db.commit()
+            if not en_transaction():
+                db.commit()
             return cur.lastrowid if cur.lastrowid > 0 else cur.rowcount
             
     except sqlite3.Error as e:
+        if en_transaction():
+            raise
         print(f"Erreur lors de l'exécution de la requête: {e}")
         db.rollback()
         return None if obtenir_resultats else 0
 
+def executer_requete_multiple(requete, liste_parametres):
+    """
+    Exécute une même requête pour une liste de paramètres (executemany)
+    dans une seule transaction
+    
+    Args:
+        requete (str): La requête SQL à exécuter
+        liste_parametres (list): Liste de tuples de paramètres
+    
+    Returns:
+        int: Nombre de lignes affectées (0 en cas d'erreur)
+    """
+    if not liste_parametres:
+        return 0
+    
+    englobante = en_transaction()
+    try:
+        with transaction() as db:
+            cur = db.executemany(requete, liste_parametres)
+        return cur.rowcount
+            
+    except sqlite3.Error as e:
+        if englobante:
+            raise
+        print(f"Erreur lors de l'exécution de la requête multiple: {e}")
+        return 0
+
+def iterer_requete(requete, parametres=None, format_ligne='dict', taille_lot=TAILLE_LOT_FLUX):
+    """
+    Exécute une requête SELECT et produit les lignes au fil de l'eau
+    
+    Les lignes sont lues par lots de `taille_lot` (fetchmany) : la mémoire
+    reste constante quelle que soit la taille du résultat. À consommer dans
+    le contexte applicatif (stream_with_context pour une réponse en flux).
+    
+    Args:
+        requete (str): La requête SQL à exécuter
+        parametres (tuple): Les paramètres de la requête (optionnel)
+        format_ligne (str): 'dict', 'tuple' ou 'namedtuple'
+        taille_lot (int): Nombre de lignes lues par aller-retour
+    
+    Yields:
+        dict, tuple ou namedtuple: Une ligne du résultat
+    """
+    if format_ligne not in FORMATS_LIGNE:
+        raise ValueError(f"Format de ligne inconnu: {format_ligne}")
+    
+    db = obtenir_connexion()
+    cur = db.cursor()
+    try:
+        cur.execute(requete, parametres or ())
+        
+        if format_ligne == 'namedtuple':
+            Ligne = namedtuple('Ligne', [colonne[0] for colonne in cur.description], rename=True)
+            convertir = lambda row: Ligne(*row)
+        elif format_ligne == 'tuple':
+            convertir = tuple
+        else:
+            convertir = dict
+        
+        while True:
+            lot = cur.fetchmany(taille_lot)
+            if not lot:
+                break
+            for row in lot:
+                yield convertir(row)
+    
+    except sqlite3.Error as e:
+        if en_transaction():
+            raise
+        print(f"Erreur lors de la lecture en flux: {e}")
+    finally:
+        cur.close()
+
 def executer_requete_unique(requete, parametres=None):
     """
     Exécute une requête SELECT et retourne un seul résultat
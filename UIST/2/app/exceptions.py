@@ -5,7 +5,7 @@ Gestion centralisée des erreurs, logs d'audit et événements de sécurité
 import logging
 from datetime import datetime
 from functools import wraps
-from flask import session, request, flash, redirect, url_for
+from flask import session, request, flash, redirect, url_for, has_request_context
 from werkzeug.exceptions import HTTPException
 import traceback
 
@@ -101,9 +101,13 @@ def log_user_action(action_type, action_description, details=None):
         action_description: Description de l'action
         details: Détails supplémentaires (dict)
     """
-    user_id = session.get('utilisateur_id', 'anonymous')
-    role = session.get('role', 'unknown')
-    matricule = session.get('matricule', 'unknown')
+    if has_request_context():
+        user_id = session.get('utilisateur_id', 'anonymous')
+        role = session.get('role', 'unknown')
+        matricule = session.get('matricule', 'unknown')
+    else:
+        # Action exécutée hors requête (travail de fond)
+        user_id, role, matricule = 'systeme', 'unknown', 'unknown'
     
     log_data = {
         'timestamp': datetime.now().isoformat(),
@@ -10,6 +10,7 @@ from .notes import GestionnaireNotes
 from .edt import GestionnaireEDT
 from .presences import GestionnairePresences
 from .bulletins import GestionnaireBulletins
+from .statistiques import GestionnaireStatistiques
 
 __all__ = [
     'GestionnaireBase',
@@ -18,5 +19,6 @@ __all__ = [
     'GestionnaireNotes',
     'GestionnaireEDT',
     'GestionnairePresences',
-    'GestionnaireBulletins'
+    'GestionnaireBulletins',
+    'GestionnaireStatistiques'
 ]
\ No newline at end of file
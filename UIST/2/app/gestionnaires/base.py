@@ -2,7 +2,10 @@
 Gestionnaire de Base
 Classe mère pour tous les gestionnaires avec fonctionnalités communes
 """
-from flask import session, flash, request
+import base64
+import json
+
+from flask import session, flash, request, has_request_context
 from app.db import executer_requete, executer_requete_unique
 
 
@@ -52,7 +55,8 @@ class GestionnaireBase:
         return role_courant in roles_autorises
     
     @staticmethod
-    def enregistrer_audit(action, table_affectee=None, id_enregistrement=None, details=None):
+    def enregistrer_audit(action, table_affectee=None, id_enregistrement=None, details=None,
+                          utilisateur_id=None):
         """
         Enregistre une action dans l'audit
         
@@ -61,17 +65,22 @@ class GestionnaireBase:
             table_affectee (str): Table concernée
             id_enregistrement (int): ID de l'enregistrement
             details (str): Détails supplémentaires
+            utilisateur_id (int): Auteur, hors requête (travail de fond) ;
+                                  par défaut l'utilisateur de la session
         """
         try:
-            utilisateur_id = session.get('utilisateur_id')
-            ip_address = request.remote_addr
+            ip_address = None
+            if has_request_context():
+                utilisateur_id = utilisateur_id or session.get('utilisateur_id')
+                ip_address = request.remote_addr
             
             requete = """
                 INSERT INTO audit_usage 
                 (id_user, action, table_affectee, id_enregistrement, details, ip_address)
                 VALUES (?, ?, ?, ?, ?, ?)
             """
-            executer_requete(requete, (
+            from app.utils.journal_audit import enregistrer_audit
+            enregistrer_audit(requete, (
                 utilisateur_id, action, table_affectee, 
                 id_enregistrement, details, ip_address
             ))
@@ -115,4 +124,114 @@ class GestionnaireBase:
             'total_elements': total,
             'a_page_precedente': page > 1,
             'a_page_suivante': page < total_pages
-        }
\ No newline at end of file
+        }
+    
+    @staticmethod
+    def paginer_requete(requete, parametres=(), cles_tri=('id',), page=1, par_page=20,
+                        curseur=None, descendant=False):
+        """
+        Pagine une requête directement en SQL
+        
+        Avec un curseur, la page est lue par recherche sur la clé de tri
+        (WHERE (cle1, cle2, id) > (?, ?, ?) LIMIT n) : la page N coûte le même
+        prix que la page 1. Sans curseur, la page demandée est lue par OFFSET.
+        Le total n'est compté qu'une fois puis transporté dans le curseur.
+        
+        Args:
+            requete (str): Requête SELECT sans ORDER BY ni LIMIT
+            parametres (tuple): Paramètres de la requête
+            cles_tri (tuple): Colonnes du résultat servant au tri, non nulles,
+                              la dernière étant unique (identifiant)
+            page (int): Numéro de page, utilisé sans curseur
+            par_page (int): Nombre d'éléments par page
+            curseur (str): Curseur renvoyé par une page précédente
+            descendant (bool): Tri décroissant
+            
+        Returns:
+            dict: Mêmes clés que paginer_resultats, plus curseur_precedent
+                  et curseur_suivant (None en bout de liste)
+        """
+        parametres = tuple(parametres or ())
+        page = max(page or 1, 1)
+        position = GestionnaireBase._decoder_curseur(curseur)
+        if position and len(position['v']) != len(cles_tri):
+            position = None
+        
+        # Total : compté à la première page puis transporté par le curseur
+        if position and position.get('t') is not None:
+            total = position['t']
+        else:
+            ligne = executer_requete_unique(
+                f"SELECT COUNT(*) AS total FROM ({requete}) AS pagination", parametres
+            )
+            total = ligne['total'] if ligne else 0
+        
+        # "avant" : lecture à rebours depuis le premier élément affiché
+        inverse = bool(position) and position['s'] == 'avant'
+        decroissant = descendant != inverse
+        
+        colonnes = ', '.join(f"pagination.{cle}" for cle in cles_tri)
+        sens = 'DESC' if decroissant else 'ASC'
+        requete_page = f"SELECT * FROM ({requete}) AS pagination"
+        parametres_page = parametres
+        
+        if position:
+            page = max(position['p'], 1)
+            marqueurs = ', '.join(['?'] * len(cles_tri))
+            requete_page += f" WHERE ({colonnes}) {'<' if decroissant else '>'} ({marqueurs})"
+            parametres_page += tuple(position['v'])
+        
+        requete_page += " ORDER BY " + ', '.join(
+            f"pagination.{cle} {sens}" for cle in cles_tri
+        )
+        requete_page += " LIMIT ?"
+        parametres_page += (par_page + 1,)
+        if not position:
+            requete_page += " OFFSET ?"
+            parametres_page += ((page - 1) * par_page,)
+        
+        lignes = executer_requete(requete_page, parametres_page, obtenir_resultats=True) or []
+        
+        encore = len(lignes) > par_page
+        lignes = lignes[:par_page]
+        if inverse:
+            lignes.reverse()
+        
+        a_page_precedente = encore if inverse else page > 1
+        a_page_suivante = True if inverse else encore
+        total_pages = (total + par_page - 1) // par_page
+        
+        def curseur_vers(ligne, direction, numero):
+            valeurs = [ligne[cle] for cle in cles_tri]
+            return GestionnaireBase._encoder_curseur(valeurs, direction, numero, total)
+        
+        return {
+            'elements': lignes,
+            'page_courante': page,
+            'total_pages': total_pages,
+            'total_elements': total,
+            'a_page_precedente': a_page_precedente,
+            'a_page_suivante': a_page_suivante,
+            'curseur_precedent': curseur_vers(lignes[0], 'avant', page - 1) if lignes and a_page_precedente else None,
+            'curseur_suivant': curseur_vers(lignes[-1], 'apres', page + 1) if lignes and a_page_suivante else None
+        }
+    
+    @staticmethod
+    def _encoder_curseur(valeurs, sens, page, total):
+        """Curseur opaque transmis dans l'URL (?curseur=...)"""
+        contenu = json.dumps({'v': valeurs, 's': sens, 'p': page, 't': total}, separators=(',', ':'))
+        return base64.urlsafe_b64encode(contenu.encode()).decode().rstrip('=')
+    
+    @staticmethod
+    def _decoder_curseur(curseur):
+        """Décode un curseur, None s'il est absent ou invalide"""
+        if not curseur:
+            return None
+        try:
+            contenu = json.loads(base64.urlsafe_b64decode(curseur + '=' * (-len(curseur) % 4)))
+            if (not isinstance(contenu, dict) or contenu.get('s') not in ('apres', 'avant')
+                    or not isinstance(contenu.get('v'), list) or not isinstance(contenu.get('p'), int)):
+                return None
+            return contenu
+        except (ValueError, TypeError):
+            return None
@@ -20,7 +20,7 @@ class GestionnaireBulletins(GestionnaireBase):
         
         Args:
             id_etudiant (int): ID de l'étudiant
-            semestre (str): Semestre (S1, S2)
+            semestre (int): Semestre (1, 2)
             annee_academique (str): Année académique (2024-2025)
             
         Returns:
@@ -98,12 +98,22 @@ class GestionnaireBulletins(GestionnaireBase):
             if not succes_pdf:
                 return False, None, "Erreur lors de la génération du PDF"
             
-            # 6. Enregistrer dans la base
-            bulletin_id = executer_requete("""
+            # 6. Enregistrer dans la base (une régénération remplace le bulletin)
+            executer_requete("""
                 INSERT INTO bulletins 
-                (id_etudiant, semestre, annee_academique, moyenne, rang, chemin_pdf)
+                (id_etudiant, semestre, annee_academique, moyenne_generale, rang, chemin_pdf)
                 VALUES (?, ?, ?, ?, ?, ?)
+                ON CONFLICT(id_etudiant, annee_academique, semestre) DO UPDATE SET
+                    moyenne_generale = excluded.moyenne_generale,
+                    rang = excluded.rang,
+                    chemin_pdf = excluded.chemin_pdf,
+                    date_generation = CURRENT_TIMESTAMP
             """, (id_etudiant, semestre, annee_academique, moyenne, rang, chemin_bulletin))
+            bulletin = executer_requete_unique("""
+                SELECT id_bulletin FROM bulletins
+                WHERE id_etudiant = ? AND annee_academique = ? AND semestre = ?
+            """, (id_etudiant, annee_academique, semestre))
+            bulletin_id = bulletin['id_bulletin'] if bulletin else None
             
             if bulletin_id:
                 GestionnaireBase.enregistrer_audit(
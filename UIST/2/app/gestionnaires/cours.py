@@ -14,13 +14,14 @@ class GestionnaireCours(GestionnaireBase):
     # ============ GESTION DES FILIÈRES ============
     
     @staticmethod
-    def lister_filieres(niveau=None, page=1):
+    def lister_filieres(niveau=None, page=1, curseur=None):
         """
         Liste toutes les filières
         
         Args:
             niveau (str): Filtrer par niveau (L1, L2, L3, M1, M2)
             page (int): Numéro de page
+            curseur (str): Curseur de page (prioritaire sur page)
             
         Returns:
             dict: Résultats paginés
@@ -40,11 +41,12 @@ class GestionnaireCours(GestionnaireBase):
             requete += " AND f.niveau = ?"
             parametres.append(niveau)
         
-        requete += " GROUP BY f.id_filiere ORDER BY f.niveau, f.nom_filiere"
+        requete += " GROUP BY f.id_filiere"
         
-        resultats = executer_requete(requete, tuple(parametres), obtenir_resultats=True)
-        
-        return GestionnaireBase.paginer_resultats(resultats or [], page, par_page=20)
+        return GestionnaireBase.paginer_requete(
+            requete, parametres, ('niveau', 'nom_filiere', 'id_filiere'),
+            page=page, par_page=20, curseur=curseur
+        )
     
     @staticmethod
     def obtenir_filiere(filiere_id):
@@ -114,19 +116,20 @@ class GestionnaireCours(GestionnaireBase):
     # ============ GESTION DES COURS ============
     
     @staticmethod
-    def lister_cours(filiere_id=None, page=1):
+    def lister_cours(filiere_id=None, page=1, curseur=None):
         """
         Liste tous les cours
         
         Args:
             filiere_id (int): Filtrer par filière
             page (int): Numéro de page
+            curseur (str): Curseur de page (prioritaire sur page)
             
         Returns:
             dict: Résultats paginés
         """
         requete = """
-            SELECT c.*, f.nom_filiere, f.niveau
+            SELECT c.*, f.nom_filiere, COALESCE(f.niveau, '') AS niveau
             FROM cours c
             LEFT JOIN filieres f ON c.id_filiere = f.id_filiere
             WHERE 1=1
@@ -137,11 +140,10 @@ class GestionnaireCours(GestionnaireBase):
             requete += " AND c.id_filiere = ?"
             parametres.append(filiere_id)
         
-        requete += " ORDER BY f.niveau, c.libelle"
-        
-        resultats = executer_requete(requete, tuple(parametres), obtenir_resultats=True)
-        
-        return GestionnaireBase.paginer_resultats(resultats or [], page, par_page=20)
+        return GestionnaireBase.paginer_requete(
+            requete, parametres, ('niveau', 'libelle', 'id_cours'),
+            page=page, par_page=20, curseur=curseur
+        )
     
     @staticmethod
     def creer_cours(donnees):
@@ -190,29 +192,30 @@ class GestionnaireCours(GestionnaireBase):
     # ============ GESTION DES SALLES ============
     
     @staticmethod
-    def lister_salles(batiment=None, page=1):
+    def lister_salles(batiment=None, page=1, curseur=None):
         """
         Liste toutes les salles
         
         Args:
             batiment (str): Filtrer par bâtiment
             page (int): Numéro de page
+            curseur (str): Curseur de page (prioritaire sur page)
             
         Returns:
             dict: Résultats paginés
         """
-        requete = "SELECT * FROM salles WHERE 1=1"
+        # Bâtiment facultatif : clé de tri non nulle pour le curseur
+        requete = "SELECT *, COALESCE(batiment, '') AS batiment_tri FROM salles WHERE 1=1"
         parametres = []
         
         if batiment:
             requete += " AND batiment = ?"
             parametres.append(batiment)
         
-        requete += " ORDER BY batiment, nom_salle"
-        
-        resultats = executer_requete(requete, tuple(parametres), obtenir_resultats=True)
-        
-        return GestionnaireBase.paginer_resultats(resultats or [], page, par_page=20)
+        return GestionnaireBase.paginer_requete(
+            requete, parametres, ('batiment_tri', 'nom_salle', 'id_salle'),
+            page=page, par_page=20, curseur=curseur
+        )
     
     @staticmethod
     def creer_salle(donnees):
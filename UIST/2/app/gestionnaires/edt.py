@@ -3,7 +3,7 @@ Gestionnaire de l'Emploi du Temps
 Gère la planification et les créneaux
 """
 from .base import GestionnaireBase
-from app.db import executer_requete, executer_requete_unique
+from app.db import executer_requete, executer_requete_unique, executer_requete_multiple
 
 
 class GestionnaireEDT(GestionnaireBase):
@@ -11,6 +11,16 @@ class GestionnaireEDT(GestionnaireBase):
     Gestionnaire pour l'emploi du temps
     """
     
+    # Ordre des jours pour le balayage des conflits
+    ORDRE_JOURS = {'Lundi': 0, 'Mardi': 1, 'Mercredi': 2, 'Jeudi': 3, 'Vendredi': 4, 'Samedi': 5}
+    
+    # Type le plus grave en premier : (type, type_conflit, sévérité, description)
+    TYPES_CONFLIT = [
+        ('enseignant', 'Enseignant_Double', 'Haute', "L'enseignant a deux cours en même temps"),
+        ('salle', 'Salle_Double', 'Haute', "La salle est occupée par deux cours en même temps"),
+        ('filiere', 'Filiere_Double', 'Moyenne', "La filière a deux cours en même temps"),
+    ]
+    
     @staticmethod
     def lister_creneaux(semaine=None, enseignant_id=None, filiere_id=None):
         """
@@ -128,68 +138,187 @@ class GestionnaireEDT(GestionnaireBase):
         """
         Vérifie les conflits pour un créneau
         
+        Une seule requête teste l'enseignant, la salle et la filière du cours
+        sur les créneaux qui chevauchent le nouveau (même jour, même semaine)
+        
         Args:
             donnees (dict): Données du créneau à vérifier
             
         Returns:
-            list: Liste des conflits détectés
+            list: Liste des conflits détectés (enseignant, salle, filière)
         """
-        conflits = []
-        
-        # Conflit enseignant
-        requete_ens = """
-            SELECT COUNT(*) as count
-            FROM emploi_du_temps
-            WHERE id_enseignant = ?
-              AND jour = ?
-              AND semaine_numero = ?
-              AND (
-                  (heure_debut < ? AND heure_fin > ?) OR
-                  (heure_debut < ? AND heure_fin > ?) OR
-                  (heure_debut >= ? AND heure_fin <= ?)
-              )
+        requete = """
+            SELECT
+                COALESCE(MAX(edt.id_enseignant = ?), 0) AS enseignant,
+                COALESCE(MAX(edt.id_salle = ?), 0) AS salle,
+                COALESCE(MAX(c.id_filiere = cn.id_filiere), 0) AS filiere
+            FROM emploi_du_temps edt
+            JOIN cours c ON edt.id_cours = c.id_cours
+            JOIN cours cn ON cn.id_cours = ?
+            WHERE edt.jour = ?
+              AND edt.semaine_numero = ?
+              AND edt.annee_academique = ?
+              AND edt.heure_debut < ? AND edt.heure_fin > ?
+              AND (edt.id_enseignant = ? OR edt.id_salle = ? OR c.id_filiere = cn.id_filiere)
         """
-        result = executer_requete_unique(requete_ens, (
+        result = executer_requete_unique(requete, (
             donnees['id_enseignant'],
+            donnees['id_salle'],
+            donnees['id_cours'],
             donnees['jour'],
             donnees['semaine_numero'],
+            donnees['annee_academique'],
             donnees['heure_fin'], donnees['heure_debut'],
-            donnees['heure_fin'], donnees['heure_debut'],
-            donnees['heure_debut'], donnees['heure_fin']
+            donnees['id_enseignant'],
+            donnees['id_salle']
         ))
         
-        if result and result['count'] > 0:
+        conflits = []
+        if not result:
+            return conflits
+        
+        if result['enseignant']:
             conflits.append({
                 'type': 'enseignant',
                 'description': "L'enseignant a déjà un cours à cet horaire"
             })
         
-        # Conflit salle
-        requete_salle = """
-            SELECT COUNT(*) as count
-            FROM emploi_du_temps
-            WHERE id_salle = ?
-              AND jour = ?
-              AND semaine_numero = ?
-              AND (
-                  (heure_debut < ? AND heure_fin > ?) OR
-                  (heure_debut < ? AND heure_fin > ?) OR
-                  (heure_debut >= ? AND heure_fin <= ?)
-              )
-        """
-        result = executer_requete_unique(requete_salle, (
-            donnees['id_salle'],
-            donnees['jour'],
-            donnees['semaine_numero'],
-            donnees['heure_fin'], donnees['heure_debut'],
-            donnees['heure_fin'], donnees['heure_debut'],
-            donnees['heure_debut'], donnees['heure_fin']
-        ))
-        
-        if result and result['count'] > 0:
+        if result['salle']:
             conflits.append({
                 'type': 'salle',
                 'description': "La salle est déjà occupée à cet horaire"
             })
         
-        return conflits
\ No newline at end of file
+        if result['filiere']:
+            conflits.append({
+                'type': 'filiere',
+                'description': "La filière a déjà un cours à cet horaire"
+            })
+        
+        return conflits
+    
+    @staticmethod
+    def balayer_conflits(semaine=None):
+        """
+        Détecte tous les conflits de l'emploi du temps par balayage
+        
+        Les créneaux sont chargés en une requête et triés une seule fois par
+        (année, semaine, jour, heure_debut). Chaque créneau n'est comparé qu'aux
+        créneaux encore ouverts quand il commence : O(n log n + conflits).
+        Chaque paire n'est émise qu'une fois, avec son type le plus grave
+        (enseignant > salle > filière) et la liste de ses types.
+        
+        Args:
+            semaine (int): Numéro de semaine (toutes si None)
+            
+        Returns:
+            list: [{'creneau_1', 'creneau_2', 'type', 'types', 'type_conflit',
+                    'severite', 'description'}]
+        """
+        requete = """
+            SELECT 
+                edt.id_edt, edt.id_enseignant, edt.id_salle, edt.jour,
+                edt.heure_debut, edt.heure_fin, edt.semaine_numero,
+                edt.annee_academique, c.id_filiere, c.code_cours,
+                c.libelle as cours_libelle, s.nom_salle,
+                u.nom as enseignant_nom, u.prenom as enseignant_prenom
+            FROM emploi_du_temps edt
+            JOIN cours c ON edt.id_cours = c.id_cours
+            JOIN salles s ON edt.id_salle = s.id_salle
+            JOIN enseignants ens ON edt.id_enseignant = ens.id_enseignant
+            JOIN utilisateurs u ON ens.id_user = u.id_user
+        """
+        parametres = []
+        
+        if semaine:
+            requete += " WHERE edt.semaine_numero = ?"
+            parametres.append(semaine)
+        
+        creneaux = executer_requete(requete, tuple(parametres), obtenir_resultats=True) or []
+        creneaux.sort(key=lambda c: (c['annee_academique'], c['semaine_numero'],
+                                     GestionnaireEDT.ORDRE_JOURS.get(c['jour'], 6),
+                                     c['heure_debut'], c['id_edt']))
+        
+        conflits = []
+        actifs = []
+        journee = None
+        
+        for creneau in creneaux:
+            cle = (creneau['annee_academique'], creneau['semaine_numero'], creneau['jour'])
+            if cle != journee:
+                journee = cle
+                actifs = []
+            
+            # Retirer les créneaux terminés avant le début du créneau courant
+            actifs = [a for a in actifs if a['heure_fin'] > creneau['heure_debut']]
+            
+            for actif in actifs:
+                egalites = {
+                    'enseignant': actif['id_enseignant'] == creneau['id_enseignant'],
+                    'salle': actif['id_salle'] == creneau['id_salle'],
+                    'filiere': actif['id_filiere'] == creneau['id_filiere']
+                }
+                types = [t for t in GestionnaireEDT.TYPES_CONFLIT if egalites[t[0]]]
+                
+                if types:
+                    conflits.append({
+                        'creneau_1': actif,
+                        'creneau_2': creneau,
+                        'type': types[0][0],
+                        'types': [t[0] for t in types],
+                        'type_conflit': types[0][1],
+                        'severite': types[0][2],
+                        'description': types[0][3]
+                    })
+            
+            actifs.append(creneau)
+        
+        return conflits
+    
+    @staticmethod
+    def enregistrer_conflits(conflits):
+        """
+        Enregistre en une seule transaction les conflits issus du balayage
+        
+        Les paires déjà enregistrées comme actives ne sont pas dupliquées.
+        
+        Args:
+            conflits (list): Résultat de balayer_conflits
+            
+        Returns:
+            int: Nombre de conflits enregistrés
+        """
+        existants = executer_requete(
+            "SELECT id_edt_1, id_edt_2 FROM conflits WHERE statut = 'Actif'",
+            obtenir_resultats=True
+        ) or []
+        paires = {frozenset((e['id_edt_1'], e['id_edt_2'])) for e in existants}
+        
+        lignes = []
+        for conflit in conflits:
+            paire = frozenset((conflit['creneau_1']['id_edt'], conflit['creneau_2']['id_edt']))
+            if paire in paires:
+                continue
+            paires.add(paire)
+            lignes.append((
+                conflit['type_conflit'],
+                conflit['creneau_1']['id_edt'],
+                conflit['creneau_2']['id_edt'],
+                conflit['description'],
+                conflit['severite']
+            ))
+        
+        nb_enregistres = executer_requete_multiple("""
+            INSERT INTO conflits (type_conflit, id_edt_1, id_edt_2, description, severite, statut)
+            VALUES (?, ?, ?, ?, ?, 'Actif')
+        """, lignes)
+        
+        if nb_enregistres:
+            GestionnaireBase.enregistrer_audit(
+                'detection_conflits_edt',
+                'conflits',
+                None,
+                f"{nb_enregistres} conflit(s) enregistré(s)"
+            )
+        
+        return nb_enregistres
@@ -4,6 +4,7 @@ Gère toutes les opérations liées aux notes et évaluations
 """
 from .base import GestionnaireBase
 from app.db import executer_requete, executer_requete_unique
+from app.utils import evenements
 
 
 class GestionnaireNotes(GestionnaireBase):
@@ -12,7 +13,7 @@ class GestionnaireNotes(GestionnaireBase):
     """
     
     @staticmethod
-    def lister_notes(filiere_id=None, cours_id=None, statut=None, page=1):
+    def lister_notes(filiere_id=None, cours_id=None, statut=None, page=1, curseur=None):
         """
         Liste les notes avec filtres
         
@@ -21,13 +22,13 @@ class GestionnaireNotes(GestionnaireBase):
             cours_id (int): Filtrer par cours
             statut (str): Filtrer par statut ('En attente', 'Valide')
             page (int): Numéro de page
+            curseur (str): Curseur de page (prioritaire sur page)
             
         Returns:
             dict: Résultats paginés
         """
         requete = """
             SELECT n.*,
-                   e.id_etudiant,
                    u.nom as etudiant_nom,
                    u.prenom as etudiant_prenom,
                    u.matricule as etudiant_matricule,
@@ -57,11 +58,10 @@ class GestionnaireNotes(GestionnaireBase):
             requete += " AND n.statut_validation = ?"
             parametres.append(statut)
         
-        requete += " ORDER BY n.date_saisie DESC"
-        
-        resultats = executer_requete(requete, tuple(parametres), obtenir_resultats=True)
-        
-        return GestionnaireBase.paginer_resultats(resultats or [], page, par_page=50)
+        return GestionnaireBase.paginer_requete(
+            requete, parametres, ('date_saisie', 'id_note'),
+            page=page, par_page=50, curseur=curseur, descendant=True
+        )
     
     @staticmethod
     def saisir_note(id_etudiant, id_cours, valeur_note, type_evaluation='Examen'):
@@ -100,6 +100,9 @@ class GestionnaireNotes(GestionnaireBase):
                     note_id,
                     f"Note saisie: {valeur_note}/20"
                 )
+                evenements.publier(evenements.CANAL_NOTES, 'note_creee', {
+                    'id': note_id, 'etudiant_id': id_etudiant, 'cours_id': id_cours, 'statut': 'En attente'
+                })
                 return True, "Note saisie avec succès", note_id
             
             return False, "Erreur lors de la saisie", None
@@ -136,6 +139,7 @@ class GestionnaireNotes(GestionnaireBase):
                 note_id,
                 f"Note validée par {validateur_id}"
             )
+            evenements.publier(evenements.CANAL_NOTES, 'note_validee', {'id': note_id})
             
             return True, "Note validée avec succès"
             
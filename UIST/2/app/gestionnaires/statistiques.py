@@ -0,0 +1,148 @@
+"""
+Gestionnaire des Statistiques
+Instantanés quotidiens (table stats_daily) des indicateurs des tableaux de bord
+"""
+from datetime import date, datetime, timedelta
+
+from .base import GestionnaireBase
+from app.db import executer_requete, executer_requete_unique, transaction
+
+SCHEMA_STATS_DAILY = """
+    CREATE TABLE IF NOT EXISTS stats_daily (
+        jour DATE NOT NULL,
+        indicateur VARCHAR(50) NOT NULL,
+        cle VARCHAR(50) NOT NULL DEFAULT '',
+        valeur REAL NOT NULL DEFAULT 0,
+        date_maj DATETIME NOT NULL,
+        PRIMARY KEY (jour, indicateur, cle)
+    )
+"""
+
+# Indicateurs détaillés par clé (les autres sont globaux)
+INDICATEURS_PAR_CLE = ('utilisateurs_role', 'utilisateurs_role_actifs', 'etudiants_filiere')
+
+
+class GestionnaireStatistiques(GestionnaireBase):
+    """
+    Gestionnaire des instantanés de statistiques
+    Les tableaux de bord lisent le dernier instantané ; il est recalculé
+    hors requête toutes les STATS_RAFRAICHISSEMENT_MINUTES par le travail
+    périodique stats_instantane (app/services/taches.py).
+    """
+
+    _table_prete = False
+
+    @staticmethod
+    def _preparer_table(connexion=None):
+        if GestionnaireStatistiques._table_prete:
+            return
+        if connexion is not None:
+            connexion.execute(SCHEMA_STATS_DAILY)
+        else:
+            executer_requete(SCHEMA_STATS_DAILY)
+        GestionnaireStatistiques._table_prete = True
+
+    @staticmethod
+    def calculer_instantane(jour=None):
+        """
+        Enregistre l'instantané du jour (remplace celui déjà pris ce jour-là)
+
+        Args:
+            jour (date): Jour de l'instantané (défaut: aujourd'hui)
+
+        Returns:
+            int: Nombre d'indicateurs enregistrés
+        """
+        jour = (jour or date.today()).isoformat()
+        maintenant = datetime.utcnow().strftime('%Y-%m-%d %H:%M:%S.%f')
+
+        with transaction() as connexion:
+            GestionnaireStatistiques._preparer_table(connexion)
+            mesures = []
+
+            for ligne in connexion.execute("""
+                SELECT role,
+                       COUNT(*) AS total,
+                       SUM(CASE WHEN est_actif = 1 THEN 1 ELSE 0 END) AS actifs
+                FROM utilisateurs
+                GROUP BY role
+            """):
+                mesures.append(('utilisateurs_role', ligne['role'], ligne['total']))
+                mesures.append(('utilisateurs_role_actifs', ligne['role'], ligne['actifs'] or 0))
+
+            for ligne in connexion.execute(
+                "SELECT id_filiere, COUNT(*) AS total FROM etudiants GROUP BY id_filiere"
+            ):
+                mesures.append(('etudiants_filiere', str(ligne['id_filiere']), ligne['total']))
+
+            mesures.append(('etudiants_total', '', connexion.execute(
+                "SELECT COUNT(*) FROM etudiants").fetchone()[0]))
+            mesures.append(('notes_en_attente', '', connexion.execute(
+                "SELECT COUNT(*) FROM notes WHERE statut_validation = 'En attente'").fetchone()[0]))
+
+            presences = connexion.execute("""
+                SELECT SUM(CASE WHEN statut IN ('Present', 'Retard') THEN 1 ELSE 0 END) AS presents,
+                       COUNT(*) AS total
+                FROM presences
+            """).fetchone()
+            mesures.append(('taux_presence', '', round(
+                100.0 * (presences['presents'] or 0) / presences['total'], 2) if presences['total'] else 0))
+
+            mesures.append(('creneaux_semaine', '', connexion.execute(
+                "SELECT COUNT(*) FROM emploi_du_temps WHERE semaine_numero = ?",
+                (date.today().isocalendar()[1],)).fetchone()[0]))
+            mesures.append(('creneaux_total', '', connexion.execute(
+                "SELECT COUNT(*) FROM emploi_du_temps").fetchone()[0]))
+
+            connexion.execute("DELETE FROM stats_daily WHERE jour = ?", (jour,))
+            connexion.executemany("""
+                INSERT INTO stats_daily (jour, indicateur, cle, valeur, date_maj)
+                VALUES (?, ?, ?, ?, ?)
+            """, [(jour, indicateur, cle, valeur, maintenant) for indicateur, cle, valeur in mesures])
+
+        return len(mesures)
+
+    @staticmethod
+    def obtenir_instantane():
+        """
+        Dernier instantané des indicateurs (lecture seule : jamais recalculé
+        pendant la requête, voir le travail stats_instantane)
+
+        Returns:
+            dict: {indicateur: valeur} pour les indicateurs globaux,
+                  {indicateur: {cle: valeur}} pour INDICATEURS_PAR_CLE,
+                  plus 'jour' et 'date_maj' (None avant le premier instantané)
+        """
+        GestionnaireStatistiques._preparer_table()
+        dernier = executer_requete_unique("SELECT MAX(jour) AS jour, MAX(date_maj) AS date_maj FROM stats_daily") or {}
+
+        stats = {indicateur: {} for indicateur in INDICATEURS_PAR_CLE}
+        for ligne in executer_requete(
+            "SELECT indicateur, cle, valeur FROM stats_daily WHERE jour = ?",
+            (dernier.get('jour'),), obtenir_resultats=True
+        ) or []:
+            valeur = ligne['valeur'] if ligne['indicateur'] == 'taux_presence' else int(ligne['valeur'])
+            if ligne['indicateur'] in INDICATEURS_PAR_CLE:
+                stats[ligne['indicateur']][ligne['cle']] = valeur
+            else:
+                stats[ligne['indicateur']] = valeur
+
+        stats['jour'] = dernier.get('jour')
+        stats['date_maj'] = dernier.get('date_maj')
+        return stats
+
+    @staticmethod
+    def obtenir_tendance(indicateur, cle='', jours=30):
+        """
+        Série quotidienne d'un indicateur (graphiques de tendance)
+
+        Returns:
+            list: [{'jour': 'AAAA-MM-JJ', 'valeur': float}, ...] par date croissante
+        """
+        GestionnaireStatistiques._preparer_table()
+        debut = (date.today() - timedelta(days=jours - 1)).isoformat()
+        return executer_requete("""
+            SELECT jour, valeur FROM stats_daily
+            WHERE indicateur = ? AND cle = ? AND jour >= ?
+            ORDER BY jour
+        """, (indicateur, str(cle), debut), obtenir_resultats=True) or []
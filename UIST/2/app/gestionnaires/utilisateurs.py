@@ -14,7 +14,7 @@ class GestionnaireUtilisateurs(GestionnaireBase):
     """
     
     @staticmethod
-    def lister_utilisateurs(role=None, recherche=None, page=1):
+    def lister_utilisateurs(role=None, recherche=None, page=1, curseur=None):
         """
         Liste les utilisateurs avec filtres optionnels
         
@@ -22,6 +22,7 @@ class GestionnaireUtilisateurs(GestionnaireBase):
             role (str): Filtrer par rôle
             recherche (str): Rechercher par nom/prénom/matricule
             page (int): Numéro de page
+            curseur (str): Curseur de page (prioritaire sur page)
             
         Returns:
             dict: Résultats paginés
@@ -57,12 +58,11 @@ class GestionnaireUtilisateurs(GestionnaireBase):
             terme = f"%{recherche}%"
             parametres.extend([terme, terme, terme, terme])
         
-        requete += " ORDER BY u.nom, u.prenom"
-        
-        resultats = executer_requete(requete, tuple(parametres), obtenir_resultats=True)
-        
-        # Pagination
-        return GestionnaireBase.paginer_resultats(resultats or [], page, par_page=20)
+        # Pagination en SQL, triée par nom, prénom
+        return GestionnaireBase.paginer_requete(
+            requete, parametres, ('nom', 'prenom', 'id_user'),
+            page=page, par_page=20, curseur=curseur
+        )
     
     @staticmethod
     def obtenir_utilisateur(utilisateur_id):
@@ -305,46 +305,46 @@ class GestionnaireUtilisateurs(GestionnaireBase):
         Returns:
             str: Matricule généré
         """
+        from app.utils.sequences import reserver_plage
+        
         annee = datetime.now().year
+        prefixe = f"UIST-{annee}-"
         
-        # Compter les utilisateurs de ce rôle cette année
-        requete = """
-            SELECT COUNT(*) as count 
-            FROM utilisateurs 
-            WHERE matricule LIKE ? AND role = ?
-        """
-        resultat = executer_requete_unique(requete, (f"UIST-{annee}-%", role))
-        count = resultat['count'] if resultat else 0
+        def dernier_numero(connexion):
+            # Reprise d'une base existante : plus grand numéro déjà attribué
+            ligne = connexion.execute("""
+                SELECT MAX(CAST(SUBSTR(matricule, ?) AS INTEGER))
+                FROM utilisateurs
+                WHERE matricule LIKE ?
+            """, (len(prefixe) + 1, f"{prefixe}%")).fetchone()
+            return ligne[0] if ligne else 0
+        
+        # Séquence par année (numéro attribué en une instruction, sans doublon)
+        numero, _ = reserver_plage(f"matricule_UIST_{annee}", 1, depart=dernier_numero)
         
         # Format: UIST-2025-00001
-        numero = str(count + 1).zfill(5)
-        return f"UIST-{annee}-{numero}"
+        return f"{prefixe}{numero:05d}"
     
     @staticmethod
     def obtenir_statistiques():
         """
         Récupère les statistiques des utilisateurs
+        (dernier instantané stats_daily)
         
         Returns:
             dict: Statistiques par rôle
         """
-        requete = """
-            SELECT 
-                role,
-                COUNT(*) as total,
-                SUM(CASE WHEN est_actif = 1 THEN 1 ELSE 0 END) as actifs,
-                SUM(CASE WHEN est_actif = 0 THEN 1 ELSE 0 END) as inactifs
-            FROM utilisateurs
-            GROUP BY role
-        """
-        resultats = executer_requete(requete, obtenir_resultats=True)
+        from .statistiques import GestionnaireStatistiques
+        
+        instantane = GestionnaireStatistiques.obtenir_instantane()
+        actifs = instantane['utilisateurs_role_actifs']
         
         stats = {}
-        for row in resultats or []:
-            stats[row['role']] = {
-                'total': row['total'],
-                'actifs': row['actifs'],
-                'inactifs': row['inactifs']
+        for role, total in instantane['utilisateurs_role'].items():
+            stats[role] = {
+                'total': total,
+                'actifs': actifs.get(role, 0),
+                'inactifs': total - actifs.get(role, 0)
             }
         
         return stats
\ No newline at end of file
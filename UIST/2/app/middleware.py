@@ -152,6 +152,34 @@ def csrf_protect(f):
     return decorated_function
 
 
+def setup_chargeurs_middleware(app):
+    """
+    Libère les chargeurs par lots en fin de requête et expose en mode
+    debug le nombre de requêtes SQL évitées (en-tête X-Requetes-Evitees)
+    
+    Args:
+        app: Instance Flask
+    """
+    
+    @app.after_request
+    def compter_requetes_evitees(response):
+        """Ajoute le compteur des chargeurs à la réponse"""
+        if app.debug and 'chargeurs' in g:
+            from app.utils.chargeurs import statistiques_chargeurs
+            stats = statistiques_chargeurs()
+            response.headers['X-Requetes-Evitees'] = str(stats['requetes_evitees'])
+            app.logger.debug(
+                f"Chargeurs {request.path}: {stats['appels']} appels, "
+                f"{stats['chargements']} chargements, {stats['requetes_evitees']} requêtes évitées"
+            )
+        return response
+    
+    @app.teardown_request
+    def liberer_chargeurs(exception=None):
+        """Le mémo des chargeurs ne survit pas à la requête"""
+        g.pop('chargeurs', None)
+
+
 def initialize_middleware(app):
     """
     Initialise tous les middlewares
@@ -161,4 +189,5 @@ def initialize_middleware(app):
     """
     setup_request_logging(app)
     setup_security_middleware(app)
-    setup_error_middleware(app)
\ No newline at end of file
+    setup_error_middleware(app)
+    setup_chargeurs_middleware(app)
\ No newline at end of file
@@ -2,7 +2,8 @@
 Modèles de données pour l'application UIST-Planify
 Classes Python représentant les tables de la base de données
 """
-from app.db import executer_requete, executer_requete_unique
+from app.db import executer_requete, executer_requete_unique, executer_requete_multiple, iterer_requete
+from app.utils import chargeurs, evenements
 from werkzeug.security import generate_password_hash
 
 class Utilisateur:
@@ -47,6 +48,9 @@ class Utilisateur:
         """
         Récupère un utilisateur par son ID
         
+        Pendant une requête HTTP, la lecture passe par le chargeur par lots
+        (voir Utilisateur.prevoir)
+        
         Args:
             utilisateur_id (int): ID de l'utilisateur
         
@@ -54,7 +58,27 @@ class Utilisateur:
             dict: Données de l'utilisateur ou None
         """
         requete = "SELECT * FROM Utilisateurs WHERE id = %s"
-        return executer_requete_unique(requete, (utilisateur_id,))
+        return chargeurs.charger(
+            'utilisateurs', utilisateur_id, Utilisateur._charger_lot,
+            lambda cle: executer_requete_unique(requete, (cle,))
+        )
+    
+    @staticmethod
+    def prevoir(utilisateur_ids):
+        """
+        Annonce les utilisateurs qui seront lus pendant la requête : le
+        prochain obtenir_par_id les charge tous en une seule requête
+        
+        Args:
+            utilisateur_ids (iterable): IDs des utilisateurs
+        """
+        chargeurs.prevoir('utilisateurs', utilisateur_ids, Utilisateur._charger_lot)
+    
+    @staticmethod
+    def _charger_lot(utilisateur_ids):
+        """Charge un lot d'utilisateurs: {id: ligne}"""
+        requete = "SELECT * FROM Utilisateurs WHERE id IN ({})"
+        return chargeurs.lignes_par_ids(requete, utilisateur_ids)
     
     @staticmethod
     def obtenir_tous():
@@ -87,6 +111,8 @@ class Utilisateur:
             SET nom = %s, prenom = %s, matricule = %s, role = %s
             WHERE id = %s
         """
+        chargeurs.oublier('utilisateurs', utilisateur_id)
+        chargeurs.oublier('etudiants', utilisateur_id)
         return executer_requete(requete, (nom, prenom, matricule, role, utilisateur_id))
     
     @staticmethod
@@ -101,6 +127,8 @@ class Utilisateur:
             int: Nombre de lignes affectées
         """
         requete = "DELETE FROM Utilisateurs WHERE id = %s"
+        chargeurs.oublier('utilisateurs', utilisateur_id)
+        chargeurs.oublier('etudiants', utilisateur_id)
         return executer_requete(requete, (utilisateur_id,))
     
     @staticmethod
@@ -174,7 +202,14 @@ class Utilisateur:
         Returns:
             int: ID de l'utilisateur créé
         """
+        import sqlite3
+        from app.db import transaction
         from app.utils import generer_matricule
+        
+        # Un étudiant sans filière n'est pas créé
+        if role in ['ETUDIANT', 'etudiant'] and not filiere_id:
+            return None
+        
         if matricule is None:
             matricule = generer_matricule(role)
         
@@ -183,21 +218,22 @@ class Utilisateur:
             VALUES (%s, %s, %s, %s, %s, %s, %s)
         """
         params = (email, password_hash, nom, prenom, matricule, role, created_by_id)
-        user_id = executer_requete(requete, params)
         
-        if user_id:
-            # Créer profils spécifiques
-            if role in ['ENSEIGNANT', 'enseignant']:
-                from app.models import Enseignant
-                Enseignant.creer(user_id, specialite or '')
-            elif role in ['ETUDIANT', 'etudiant']:
-                from app.models import Etudiant
-                if filiere_id:
+        # Utilisateur et profil sont validés ensemble
+        try:
+            with transaction():
+                user_id = executer_requete(requete, params)
+                
+                # Créer profils spécifiques
+                if role in ['ENSEIGNANT', 'enseignant']:
+                    from app.models import Enseignant
+                    Enseignant.creer(user_id, specialite or '')
+                elif role in ['ETUDIANT', 'etudiant']:
+                    from app.models import Etudiant
                     Etudiant.creer(user_id, filiere_id)
-                else:
-                    # Supprimer si pas de filière
-                    Utilisateur.supprimer(user_id)
-                    return None
+        except sqlite3.Error as e:
+            print(f"Erreur lors de la création de l'utilisateur: {e}")
+            return None
         
         return user_id
 
@@ -213,6 +249,7 @@ class Utilisateur:
             int: Nombre de lignes affectées
         """
         requete = "UPDATE Utilisateurs SET last_login = NOW() WHERE id = %s"
+        chargeurs.oublier('utilisateurs', user_id)
         return executer_requete(requete, (user_id,))
 
     @staticmethod
@@ -299,6 +336,8 @@ class Utilisateur:
             SET nom = %s, prenom = %s, matricule = %s, role = %s
             WHERE id = %s
         """
+        chargeurs.oublier('utilisateurs', utilisateur_id)
+        chargeurs.oublier('etudiants', utilisateur_id)
         return executer_requete(requete, (nom, prenom, matricule, role, utilisateur_id))
 
 
@@ -460,7 +499,32 @@ class Etudiant:
             JOIN Filieres f ON e.filiere_id = f.id
             WHERE e.utilisateur_id = %s
         """
-        return executer_requete_unique(requete, (utilisateur_id,))
+        return chargeurs.charger(
+            'etudiants', utilisateur_id, Etudiant._charger_lot,
+            lambda cle: executer_requete_unique(requete, (cle,))
+        )
+    
+    @staticmethod
+    def prevoir(utilisateur_ids):
+        """
+        Annonce les étudiants qui seront lus pendant la requête (chargement groupé)
+        
+        Args:
+            utilisateur_ids (iterable): IDs utilisateur des étudiants
+        """
+        chargeurs.prevoir('etudiants', utilisateur_ids, Etudiant._charger_lot)
+    
+    @staticmethod
+    def _charger_lot(utilisateur_ids):
+        """Charge un lot d'étudiants: {utilisateur_id: ligne}"""
+        requete = """
+            SELECT u.*, e.filiere_id, f.nom_filiere, f.niveau
+            FROM Etudiants e
+            JOIN Utilisateurs u ON e.utilisateur_id = u.id
+            JOIN Filieres f ON e.filiere_id = f.id
+            WHERE e.utilisateur_id IN ({})
+        """
+        return chargeurs.lignes_par_ids(requete, utilisateur_ids)
     
     @staticmethod
     def modifier(utilisateur_id, filiere_id):
@@ -475,6 +539,7 @@ class Etudiant:
             int: Nombre de lignes affectées
         """
         requete = "UPDATE Etudiants SET filiere_id = %s WHERE utilisateur_id = %s"
+        chargeurs.oublier('etudiants', utilisateur_id)
         return executer_requete(requete, (filiere_id, utilisateur_id))
 
 
@@ -690,7 +755,31 @@ class Cours:
             JOIN Filieres f ON c.filiere_id = f.id
             WHERE c.id = %s
         """
-        return executer_requete_unique(requete, (cours_id,))
+        return chargeurs.charger(
+            'cours', cours_id, Cours._charger_lot,
+            lambda cle: executer_requete_unique(requete, (cle,))
+        )
+    
+    @staticmethod
+    def prevoir(cours_ids):
+        """
+        Annonce les cours qui seront lus pendant la requête (chargement groupé)
+        
+        Args:
+            cours_ids (iterable): IDs des cours
+        """
+        chargeurs.prevoir('cours', cours_ids, Cours._charger_lot)
+    
+    @staticmethod
+    def _charger_lot(cours_ids):
+        """Charge un lot de cours: {id: ligne}"""
+        requete = """
+            SELECT c.*, f.nom_filiere, f.niveau
+            FROM Cours c
+            JOIN Filieres f ON c.filiere_id = f.id
+            WHERE c.id IN ({})
+        """
+        return chargeurs.lignes_par_ids(requete, cours_ids)
     
     @staticmethod
     def obtenir_par_filiere(filiere_id):
@@ -725,6 +814,7 @@ class Cours:
             SET nom_cours = %s, filiere_id = %s, type_cours = %s 
             WHERE id = %s
         """
+        chargeurs.oublier('cours', cours_id)
         return executer_requete(requete, (nom_cours, filiere_id, type_cours, cours_id))
     
     @staticmethod
@@ -739,6 +829,7 @@ class Cours:
             int: Nombre de lignes affectées
         """
         requete = "DELETE FROM Cours WHERE id = %s"
+        chargeurs.oublier('cours', cours_id)
         return executer_requete(requete, (cours_id,))
 
 
@@ -853,12 +944,15 @@ class EmploiDuTemps:
         return None
     
     @staticmethod
-    def obtenir_tous():
+    def obtenir_tous(flux=False):
         """
         Récupère tous les créneaux avec toutes les informations
         
+        Args:
+            flux (bool): True pour un générateur (lecture par lots)
+        
         Returns:
-            list: Liste de tous les créneaux
+            list: Liste de tous les créneaux (générateur si flux)
         """
         requete = """
             SELECT 
@@ -877,6 +971,8 @@ class EmploiDuTemps:
                 FIELD(edt.jour, 'Lundi', 'Mardi', 'Mercredi', 'Jeudi', 'Vendredi', 'Samedi'),
                 edt.heure_debut
         """
+        if flux:
+            return iterer_requete(requete)
         return executer_requete(requete, obtenir_resultats=True)
     
     @staticmethod
@@ -1298,7 +1394,12 @@ class Note:
             (etudiant_id, cours_id, type_evaluation, note, coefficient, date_evaluation, commentaire, saisi_par, statut)
             VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s)
         """
-        return executer_requete(requete, (etudiant_id, cours_id, type_evaluation, note, coefficient, date_evaluation, commentaire, saisi_par, statut))
+        note_id = executer_requete(requete, (etudiant_id, cours_id, type_evaluation, note, coefficient, date_evaluation, commentaire, saisi_par, statut))
+        if note_id:
+            evenements.publier(evenements.CANAL_NOTES, 'note_creee', {
+                'id': note_id, 'etudiant_id': etudiant_id, 'cours_id': cours_id, 'statut': statut
+            })
+        return note_id
     
     @staticmethod
     def obtenir_par_etudiant(etudiant_id, statut=None):
@@ -1422,7 +1523,10 @@ class Note:
             SET statut = 'VALIDÉ', valide_par = %s, date_validation = NOW()
             WHERE id = %s AND statut = 'EN_ATTENTE_DIRECTEUR'
         """
-        return executer_requete(requete, (directeur_id, note_id))
+        lignes = executer_requete(requete, (directeur_id, note_id))
+        if lignes:
+            evenements.publier(evenements.CANAL_NOTES, 'note_validee', {'id': note_id})
+        return lignes
     
     @staticmethod
     def modifier_note_non_validee(note_id, nouvelle_note, nouveau_coefficient=None, nouveau_commentaire=None):
@@ -1457,7 +1561,10 @@ class Note:
             SET {', '.join(updates)}
             WHERE id = %s AND statut IN ('EN_ATTENTE_DIRECTEUR', 'EN_REVISION')
         """
-        return executer_requete(requete, tuple(params))
+        lignes = executer_requete(requete, tuple(params))
+        if lignes:
+            evenements.publier(evenements.CANAL_NOTES, 'note_modifiee', {'id': note_id})
+        return lignes
     
     @staticmethod
     def mettre_en_revision(note_id):
@@ -1471,18 +1578,22 @@ class Note:
             int: Nombre de lignes affectées
         """
         requete = "UPDATE Notes SET statut = 'EN_REVISION' WHERE id = %s"
-        return executer_requete(requete, (note_id,))
+        lignes = executer_requete(requete, (note_id,))
+        if lignes:
+            evenements.publier(evenements.CANAL_NOTES, 'note_modifiee', {'id': note_id})
+        return lignes
     
     @staticmethod
-    def obtenir_par_cours(cours_id):
+    def obtenir_par_cours(cours_id, flux=False):
         """
         Récupère toutes les notes d'un cours
         
         Args:
             cours_id (int): ID du cours
+            flux (bool): True pour un générateur (lecture par lots)
         
         Returns:
-            list: Liste des notes du cours
+            list: Liste des notes du cours (générateur si flux)
         """
         requete = """
             SELECT n.*,
@@ -1495,6 +1606,8 @@ class Note:
             WHERE n.cours_id = %s
             ORDER BY u_etud.nom, u_etud.prenom, n.type_evaluation
         """
+        if flux:
+            return iterer_requete(requete, (cours_id,))
         return executer_requete(requete, (cours_id,), obtenir_resultats=True)
     
     @staticmethod
@@ -1636,12 +1749,15 @@ class Note:
         return executer_requete_unique(requete, (cours_id,))
     
     @staticmethod
-    def obtenir_toutes():
+    def obtenir_toutes(flux=False):
         """
         Récupère toutes les notes avec informations complètes
 
+        Args:
+            flux (bool): True pour un générateur (lecture par lots)
+
         Returns:
-            list: Liste de toutes les notes
+            list: Liste de toutes les notes (générateur si flux)
         """
         requete = """
             SELECT n.*,
@@ -1659,6 +1775,8 @@ class Note:
             LEFT JOIN Utilisateurs uv ON n.valide_par = uv.id
             ORDER BY n.date_creation DESC
         """
+        if flux:
+            return iterer_requete(requete)
         return executer_requete(requete, obtenir_resultats=True)
 
     @staticmethod
@@ -2236,7 +2354,12 @@ class Message:
             (expediteur_id, destinataire_id, type_message, sujet, contenu, note_id)
             VALUES (%s, %s, %s, %s, %s, %s)
         """
-        return executer_requete(requete, (expediteur_id, destinataire_id, type_message, sujet, contenu, note_id))
+        message_id = executer_requete(requete, (expediteur_id, destinataire_id, type_message, sujet, contenu, note_id))
+        if message_id:
+            evenements.publier(evenements.canal_utilisateur(destinataire_id), 'message', {
+                'id': message_id, 'type_message': type_message, 'note_id': note_id
+            })
+        return message_id
     
     @staticmethod
     def creer_signalement(etudiant_id, note_id, contenu):
@@ -2574,7 +2697,7 @@ class AuditUsage:
             user_agent (str, optional): User agent
         
         Returns:
-            int: ID de l'enregistrement créé
+            int: ID de l'enregistrement créé (None si l'écriture est différée)
         """
         import json
         meta_json = json.dumps(meta) if meta else None
@@ -2583,10 +2706,11 @@ class AuditUsage:
             INSERT INTO UsageAudit (user_id, action, meta, ip_address, user_agent)
             VALUES (%s, %s, %s, %s, %s)
         """
-        return executer_requete(requete, (user_id, action, meta_json, ip_address, user_agent))
+        from app.utils.journal_audit import enregistrer_audit
+        return enregistrer_audit(requete, (user_id, action, meta_json, ip_address, user_agent))
     
     @staticmethod
-    def obtenir_rapport_usage(date_debut=None, date_fin=None, user_id=None, action=None):
+    def obtenir_rapport_usage(date_debut=None, date_fin=None, user_id=None, action=None, flux=False):
         """
         Génère un rapport d'utilisation
         
@@ -2595,10 +2719,14 @@ class AuditUsage:
             date_fin (str, optional): Date de fin (YYYY-MM-DD)
             user_id (int, optional): Filtrer par utilisateur
             action (str, optional): Filtrer par action
+            flux (bool): True pour un générateur (lecture par lots)
         
         Returns:
-            list: Liste des enregistrements d'audit
+            list: Liste des enregistrements d'audit (générateur si flux)
         """
+        from app.utils.journal_audit import vider_journal_audit
+        vider_journal_audit()
+        
         requete = """
             SELECT a.*,
                    u.nom, u.prenom, u.matricule, u.role
@@ -2626,6 +2754,8 @@ class AuditUsage:
         
         requete += " ORDER BY a.created_at DESC"
         
+        if flux:
+            return iterer_requete(requete, tuple(params) if params else None)
         return executer_requete(requete, tuple(params) if params else None, obtenir_resultats=True)
     
     @staticmethod
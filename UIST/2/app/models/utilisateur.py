@@ -159,11 +159,15 @@ class AuditUsage:
             VALUES (?, ?, ?, ?, ?, ?)
         """
         
-        return executer_requete(query, (id_user, action, table_affectee, id_enregistrement, details, ip_address))
+        from app.utils.journal_audit import enregistrer_audit
+        return enregistrer_audit(query, (id_user, action, table_affectee, id_enregistrement, details, ip_address))
     
     @staticmethod
     def obtenir_tous(limit=100, offset=0):
         """Récupère les dernières actions d'audit"""
+        from app.utils.journal_audit import vider_journal_audit
+        vider_journal_audit()
+        
         query = """
             SELECT a.*, u.matricule, u.nom, u.prenom, u.role
             FROM audit_usage a
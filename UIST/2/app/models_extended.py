@@ -3,6 +3,7 @@ Modèles étendus pour UIST-2ITS
 Nouvelles tables: Notifications, AuditUsage, Bulletins, ImportNotes, Signalements
 """
 from app.db import executer_requete, executer_requete_unique
+from app.utils import evenements
 from datetime import datetime
 import json
 
@@ -34,10 +35,15 @@ class Notification:
             (destinataire_id, type_notification, titre, message, priorite, lien_action, metadata)
             VALUES (%s, %s, %s, %s, %s, %s, %s)
         """
-        return executer_requete(requete, (
+        notification_id = executer_requete(requete, (
             destinataire_id, type_notification, titre, message, 
             priorite, lien_action, metadata_json
         ))
+        if notification_id:
+            evenements.publier(evenements.canal_utilisateur(destinataire_id), 'notification', {
+                'id': notification_id, 'type_notification': type_notification, 'priorite': priorite
+            })
+        return notification_id
     
     @staticmethod
     def obtenir_non_lues(utilisateur_id, limit=50):
@@ -152,7 +158,7 @@ class AuditUsage:
             meta (dict): Métadonnées JSON
             
         Returns:
-            int: ID du log créé
+            int: ID du log créé (None si l'écriture est différée)
         """
         meta_json = json.dumps(meta) if meta else None
         
@@ -161,7 +167,8 @@ class AuditUsage:
             (user_id, action, description, ip_address, meta)
             VALUES (%s, %s, %s, %s, %s)
         """
-        return executer_requete(requete, (user_id, action, description, ip_address, meta_json))
+        from app.utils.journal_audit import enregistrer_audit
+        return enregistrer_audit(requete, (user_id, action, description, ip_address, meta_json))
     
     @staticmethod
     def obtenir_logs_utilisateur(user_id, limit=100):
@@ -383,7 +383,7 @@ class BulletinService:
         doc.build(elements)
     
     @staticmethod
-    def generer_bulletins_filiere(filiere_id, semestre, annee_academique, genere_par):
+    def generer_bulletins_filiere(filiere_id, semestre, annee_academique, genere_par, progression=None):
         """
         Génère les bulletins pour tous les étudiants d'une filière
         
@@ -392,6 +392,7 @@ class BulletinService:
             semestre (str): Semestre
             annee_academique (str): Année académique
             genere_par (int): ID de l'utilisateur
+            progression (callable): Appelée avec (traités, total) après chaque étudiant
             
         Returns:
             dict: Résultats de la génération
@@ -407,7 +408,7 @@ class BulletinService:
             'details': []
         }
         
-        for etudiant in etudiants:
+        for index, etudiant in enumerate(etudiants, start=1):
             success, message, pdf_path = BulletinService.generer_bulletin_pdf(
                 etudiant['utilisateur_id'],
                 semestre,
@@ -426,5 +427,8 @@ class BulletinService:
                 'success': success,
                 'message': message
             })
+            
+            if progression:
+                progression(index, resultats['total'])
         
         return resultats
\ No newline at end of file
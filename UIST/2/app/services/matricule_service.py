@@ -2,7 +2,6 @@
 Service de génération de matricules uniques
 """
 from datetime import datetime
-from app.db import executer_requete_unique
 
 class MatriculeService:
     """Service pour générer des matricules uniques selon le rôle"""
@@ -32,35 +31,43 @@ class MatriculeService:
         Returns:
             str: Matricule unique
         """
-        prefix = MatriculeService.PREFIXES.get(role, 'USR')
-        annee = datetime.now().year
+        return MatriculeService.generer_lot(role, 1)[0]
+    
+    @staticmethod
+    def generer_lot(role, nombre):
+        """
+        Génère nombre matricules consécutifs pour un rôle (imports en masse)
+        
+        Les numéros sont réservés en une seule fois dans la séquence
+        matricule_[PREFIX]_[ANNEE] : ni balayage de la table utilisateurs
+        ni doublon entre créations concurrentes.
         
-        # Trouver le dernier numéro pour ce rôle cette année
-        query = """
-            SELECT matricule
-            FROM utilisateurs
-            WHERE matricule LIKE ? AND role = ?
-            ORDER BY matricule DESC
-            LIMIT 1
+        Args:
+            role (str): Le rôle des utilisateurs
+            nombre (int): Nombre de matricules
+        
+        Returns:
+            list: Matricules uniques
         """
+        from app.utils.sequences import reserver_plage
+        
+        prefix = MatriculeService.PREFIXES.get(role, 'USR')
+        annee = datetime.now().year
+        debut = f"{prefix}{annee}"
         
-        pattern = f"{prefix}{annee}%"
-        dernier = executer_requete_unique(query, (pattern, role))
+        def dernier_numero(connexion):
+            # Reprise d'une base existante : plus grand numéro déjà attribué
+            ligne = connexion.execute("""
+                SELECT MAX(CAST(SUBSTR(matricule, ?) AS INTEGER))
+                FROM utilisateurs
+                WHERE matricule LIKE ? AND role = ?
+            """, (len(debut) + 1, f"{debut}%", role)).fetchone()
+            return ligne[0] if ligne else 0
         
-        if dernier:
-            # Extraire le numéro et incrémenter
-            try:
-                dernier_numero = int(dernier['matricule'][-3:])
-                nouveau_numero = dernier_numero + 1
-            except:
-                nouveau_numero = 1
-        else:
-            nouveau_numero = 1
+        premier, dernier = reserver_plage(f"matricule_{prefix}_{annee}", nombre, depart=dernier_numero)
         
         # Formater avec padding de zéros
-        matricule = f"{prefix}{annee}{nouveau_numero:03d}"
-        
-        return matricule
+        return [f"{debut}{numero:03d}" for numero in range(premier, dernier + 1)]
     
     @staticmethod
     def valider(matricule):
@@ -107,11 +107,144 @@ class NoteService:
             print(f"Erreur modification note: {e}")
             return (False, f"Erreur: {str(e)}")
     
+    # Taille des lots pour les clauses IN (limite de variables SQLite)
+    TAILLE_LOT_IMPORT = 500
+    
+    @staticmethod
+    def lire_feuille(fichier):
+        """
+        Parcourt la feuille active en flux (openpyxl read_only)
+        
+        Args:
+            fichier: Fichier Excel uploadé
+            
+        Yields:
+            tuple: (numéro de ligne Excel, valeurs) pour chaque ligne non vide après l'en-tête
+        """
+        import openpyxl
+        
+        wb = openpyxl.load_workbook(fichier, read_only=True, data_only=True)
+        try:
+            for row_idx, row in enumerate(wb.active.iter_rows(min_row=2, values_only=True), start=2):
+                if row and any(v is not None and str(v).strip() != '' for v in row):
+                    yield row_idx, row
+        finally:
+            wb.close()
+    
+    @staticmethod
+    def resoudre_matricules(matricules):
+        """
+        Résout des matricules en IDs utilisateur, une requête IN par lot
+        
+        Args:
+            matricules (iterable): Matricules à résoudre
+            
+        Returns:
+            dict: {matricule: id}
+        """
+        from app.db import executer_requete
+        
+        matricules = list(matricules)
+        resolus = {}
+        for debut in range(0, len(matricules), NoteService.TAILLE_LOT_IMPORT):
+            lot = matricules[debut:debut + NoteService.TAILLE_LOT_IMPORT]
+            requete = f"SELECT id, matricule FROM Utilisateurs WHERE matricule IN ({', '.join(['%s'] * len(lot))})"
+            for ligne in executer_requete(requete, tuple(lot), obtenir_resultats=True) or []:
+                resolus[ligne['matricule']] = ligne['id']
+        return resolus
+    
+    @staticmethod
+    def importer_lignes(lignes, cours_id, saisi_par, statut='EN_ATTENTE_DIRECTEUR'):
+        """
+        Moteur d'import : validation groupée puis insertion executemany
+        en une seule transaction ; chaque note insérée publie le même
+        événement note_creee que Note.creer (à la validation)
+        
+        Args:
+            lignes (iterable): dict {ligne, matricule, note, coefficient,
+                               type_evaluation, date_evaluation, commentaire}
+            cours_id (int): ID du cours
+            saisi_par (int): ID de l'utilisateur qui importe
+            statut (str): Statut initial des notes
+            
+        Returns:
+            dict: {'total', 'succes', 'echecs', 'erreurs': [str], 'rapport': [dict]}
+        """
+        import sqlite3
+        from app.db import executer_requete_multiple, transaction
+        from app.utils import evenements
+        
+        lignes = list(lignes)
+        etudiants = NoteService.resoudre_matricules({l['matricule'] for l in lignes if l.get('matricule')})
+        
+        rapport = []
+        a_inserer = []
+        
+        for l in lignes:
+            matricule = l.get('matricule')
+            try:
+                note_valeur = float(str(l.get('note')).replace(',', '.'))
+                coefficient = float(l.get('coefficient') or 1.0)
+            except (TypeError, ValueError):
+                rapport.append({'ligne': l['ligne'], 'matricule': matricule, 'message': 'Valeur numérique illisible'})
+                continue
+            
+            if not matricule:
+                message = 'Données manquantes'
+            elif not (0 <= note_valeur <= 20):
+                message = f'Note invalide ({note_valeur})'
+            elif coefficient <= 0:
+                message = f'Coefficient invalide ({coefficient})'
+            elif matricule not in etudiants:
+                message = f'Étudiant {matricule} non trouvé'
+            else:
+                a_inserer.append((
+                    etudiants[matricule], cours_id, l.get('type_evaluation') or 'DS',
+                    note_valeur, coefficient, l.get('date_evaluation') or datetime.now().date(),
+                    l.get('commentaire') or 'Importé depuis Excel', saisi_par, statut
+                ))
+                continue
+            
+            rapport.append({'ligne': l['ligne'], 'matricule': matricule, 'message': message})
+        
+        succes = 0
+        if a_inserer:
+            try:
+                with transaction() as connexion:
+                    # Verrou d'écriture pris : les notes d'ID > dernier_id sont les nôtres
+                    dernier_id = connexion.execute("SELECT COALESCE(MAX(id), 0) FROM notes").fetchone()[0]
+                    succes = executer_requete_multiple("""
+                        INSERT INTO Notes 
+                        (etudiant_id, cours_id, type_evaluation, note, coefficient, date_evaluation, commentaire, saisi_par, statut)
+                        VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s)
+                    """, a_inserer)
+                    for note in connexion.execute(
+                        "SELECT id, etudiant_id FROM notes WHERE id > ? ORDER BY id", (dernier_id,)
+                    ):
+                        evenements.publier(evenements.CANAL_NOTES, 'note_creee', {
+                            'id': note['id'], 'etudiant_id': note['etudiant_id'], 'cours_id': cours_id, 'statut': statut
+                        })
+            except sqlite3.Error as e:
+                print(f"Erreur lors de l'import des notes: {e}")
+                succes = 0
+            if not succes:
+                rapport.append({'ligne': None, 'matricule': None, 'message': 'Erreur lors de l\'insertion des notes'})
+        
+        return {
+            'total': len(lignes),
+            'succes': succes,
+            'echecs': len(lignes) - succes,
+            'erreurs': [f"Ligne {r['ligne']}: {r['message']}" if r['ligne'] else r['message'] for r in rapport],
+            'rapport': rapport
+        }
+    
     @staticmethod
     def importer_notes_excel(fichier, cours_id, enseignant_id, type_evaluation='DS', coefficient=1.0):
         """
         Importe des notes depuis un fichier Excel
         
+        Format: Matricule | - | - | Note (une ligne d'en-tête)
+        
         Args:
             fichier: Fichier Excel uploadé
             cours_id (int): ID du cours
@@ -122,98 +255,75 @@ class NoteService:
         Returns:
             dict: Résultats de l'import
         """
-        import openpyxl
-        from app.models import Note, Etudiant, ImportNote, Cours
+        from app.models import ImportNote, Cours
         
-        resultats = {
-            'total': 0,
-            'succes': 0,
-            'echecs': 0,
-            'erreurs': []
-        }
+        # Récupérer le cours pour la filière
+        cours = Cours.obtenir_par_id(cours_id)
+        if not cours:
+            return {
+                'total': 0,
+                'succes': 0,
+                'echecs': 0,
+                'erreurs': ['Cours non trouvé'],
+                'rapport': []
+            }
         
         try:
-            # Charger le fichier Excel
-            wb = openpyxl.load_workbook(fichier)
-            ws = wb.active
-            
-            # Récupérer le cours pour la filière
-            cours = Cours.obtenir_par_id(cours_id)
-            if not cours:
-                return {
-                    'total': 0,
-                    'succes': 0,
-                    'echecs': 0,
-                    'erreurs': ['Cours non trouvé']
+            resultats = NoteService.importer_lignes((
+                {
+                    'ligne': row_idx,
+                    'matricule': str(row[0]).strip() if row[0] else None,
+                    'note': row[3] if len(row) > 3 else None,
+                    'coefficient': coefficient,
+                    'type_evaluation': type_evaluation
                 }
-            
-            # Parcourir les lignes (en sautant l'en-tête)
-            for row_idx, row in enumerate(ws.iter_rows(min_row=2, values_only=True), start=2):
-                resultats['total'] += 1
-                
-                try:
-                    # Extraire les données
-                    matricule = str(row[0]).strip() if row[0] else None
-                    note_valeur = float(row[3]) if row[3] else None
-                    
-                    if not matricule or note_valeur is None:
-                        resultats['echecs'] += 1
-                        resultats['erreurs'].append(f"Ligne {row_idx}: Données manquantes")
-                        continue
-                    
-                    # Valider la note
-                    if not (0 <= note_valeur <= 20):
-                        resultats['echecs'] += 1
-                        resultats['erreurs'].append(f"Ligne {row_idx}: Note invalide ({note_valeur})")
-                        continue
-                    
-                    # Trouver l'étudiant
-                    from app.models import Utilisateur
-                    utilisateur = Utilisateur.obtenir_par_matricule(matricule)
-                    if not utilisateur:
-                        resultats['echecs'] += 1
-                        resultats['erreurs'].append(f"Ligne {row_idx}: Étudiant {matricule} non trouvé")
-                        continue
-                    
-                    # Créer la note
-                    note_id = Note.creer(
-                        etudiant_id=utilisateur['id'],
-                        cours_id=cours_id,
-                        type_evaluation=type_evaluation,
-                        note=note_valeur,
-                        coefficient=coefficient,
-                        date_evaluation=datetime.now().date(),
-                        commentaire=f"Importé depuis Excel",
-                        saisi_par=enseignant_id,
-                        statut='EN_ATTENTE_DIRECTEUR'
-                    )
-                    
-                    if note_id:
-                        resultats['succes'] += 1
-                    else:
-                        resultats['echecs'] += 1
-                        resultats['erreurs'].append(f"Ligne {row_idx}: Erreur création note")
-                        
-                except Exception as e:
-                    resultats['echecs'] += 1
-                    resultats['erreurs'].append(f"Ligne {row_idx}: {str(e)}")
-            
-            # Enregistrer l'historique d'import
-            if resultats['succes'] > 0:
-                ImportNote.creer(
-                    cours_id=cours_id,
-                    filiere_id=cours['filiere_id'],
-                    enseignant_id=enseignant_id,
-                    fichier_nom=fichier.filename,
-                    nombre_notes=resultats['succes'],
-                    role_initiateur='ENSEIGNANT'
-                )
-            
+                for row_idx, row in NoteService.lire_feuille(fichier)
+            ), cours_id, enseignant_id)
         except Exception as e:
-            resultats['erreurs'].append(f"Erreur lecture fichier: {str(e)}")
+            return {
+                'total': 0,
+                'succes': 0,
+                'echecs': 0,
+                'erreurs': [f"Erreur lecture fichier: {str(e)}"],
+                'rapport': []
+            }
+        
+        # Enregistrer l'historique d'import
+        if resultats['succes'] > 0:
+            ImportNote.creer(
+                cours_id=cours_id,
+                filiere_id=cours['filiere_id'],
+                enseignant_id=enseignant_id,
+                fichier_nom=fichier.filename,
+                nombre_notes=resultats['succes'],
+                role_initiateur='ENSEIGNANT'
+            )
         
         return resultats
     
+    @staticmethod
+    def importer_feuille_administration(fichier, cours_id, saisi_par):
+        """
+        Importe une feuille au format administration
+        
+        Format: Matiere | Eleve (matricule) | Note | Coefficient | TypeEvaluation | Date
+        
+        Returns:
+            dict: voir importer_lignes
+        """
+        return NoteService.importer_lignes((
+            {
+                'ligne': row_idx,
+                'matricule': str(row[1]).strip() if len(row) > 1 and row[1] else None,
+                'note': row[2] if len(row) > 2 else None,
+                'coefficient': row[3] if len(row) > 3 and row[3] else 1.0,
+                'type_evaluation': str(row[4]).strip() if len(row) > 4 and row[4] else 'CC',
+                'date_evaluation': str(row[5]).strip() if len(row) > 5 and row[5] else None
+            }
+            for row_idx, row in NoteService.lire_feuille(fichier)
+            if row[0]
+        ), cours_id, saisi_par)
+    
     @staticmethod
     def calculer_statistiques_cours(cours_id):
         """
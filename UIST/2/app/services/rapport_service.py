@@ -0,0 +1,97 @@
+"""
+Service du rapport d'usage du système
+Collecte des statistiques et export PDF, partagés par la route API et le
+travail de fond qui produit le PDF hors requête
+"""
+from datetime import datetime
+from reportlab.lib.pagesizes import letter
+from reportlab.lib.styles import getSampleStyleSheet
+from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, Table, TableStyle
+from reportlab.lib import colors
+import io
+
+
+class RapportUsageService:
+    """Service du rapport d'usage"""
+
+    @staticmethod
+    def collecter(debut=None, fin=None):
+        """
+        Rassemble les statistiques du rapport
+
+        Args:
+            debut (str): Début de période (optionnel)
+            fin (str): Fin de période (optionnel)
+
+        Returns:
+            dict: Données du rapport
+        """
+        from app.models import Utilisateur, ImportNote
+
+        stats_roles = Utilisateur.compter_par_role()
+        utilisateurs_actifs = Utilisateur.lister_avec_last_login()
+
+        # Statistiques bulletins (commenté car BulletinGeneration n'existe pas)
+        # bulletins_stats = BulletinGeneration.stats()
+        bulletins_stats = []
+
+        # Statistiques imports
+        imports_count = len(ImportNote.obtenir_historique())
+
+        # Statistiques audit (commenté car AuditUsage n'existe pas)
+        # audit_stats = AuditUsage.statistiques_actions(debut, fin)
+        audit_stats = []
+
+        return {
+            'generated_at': datetime.now().isoformat(),
+            'period': {'start': debut, 'end': fin},
+            'users_by_role': stats_roles,
+            'active_users': len([u for u in utilisateurs_actifs if u['effective_last_login']]),
+            'bulletins_generated': len(bulletins_stats) if bulletins_stats else 0,
+            'notes_imports': imports_count,
+            'audit_actions': audit_stats
+        }
+
+    @staticmethod
+    def generer_pdf(data):
+        """
+        Construit le PDF du rapport
+
+        Args:
+            data (dict): Données renvoyées par collecter()
+
+        Returns:
+            bytes: Contenu PDF
+        """
+        buffer = io.BytesIO()
+        doc = SimpleDocTemplate(buffer, pagesize=letter)
+        styles = getSampleStyleSheet()
+        elements = []
+
+        elements.append(Paragraph("RAPPORT D'USAGE DU SYSTÈME", styles['Heading1']))
+        elements.append(Spacer(1, 12))
+
+        # Statistiques générales
+        elements.append(Paragraph("Statistiques Générales", styles['Heading2']))
+        elements.append(Paragraph(f"Date de génération: {data['generated_at']}", styles['Normal']))
+        elements.append(Paragraph(f"Utilisateurs actifs: {data['active_users']}", styles['Normal']))
+        elements.append(Paragraph(f"Bulletins générés: {data['bulletins_generated']}", styles['Normal']))
+        elements.append(Paragraph(f"Imports de notes: {data['notes_imports']}", styles['Normal']))
+        elements.append(Spacer(1, 12))
+
+        # Utilisateurs par rôle
+        elements.append(Paragraph("Utilisateurs par Rôle", styles['Heading2']))
+        role_data = [['Rôle', 'Nombre']]
+        for stat in data['users_by_role']:
+            role_data.append([stat['role'], str(stat['count'])])
+        role_table = Table(role_data)
+        role_table.setStyle(TableStyle([
+            ('BACKGROUND', (0, 0), (-1, 0), colors.grey),
+            ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
+            ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
+            ('GRID', (0, 0), (-1, -1), 1, colors.black)
+        ]))
+        elements.append(role_table)
+
+        doc.build(elements)
+        return buffer.getvalue()
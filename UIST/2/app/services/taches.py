@@ -0,0 +1,141 @@
+"""
+Tâches de fond exécutées par app.utils.travaux
+Chaque tâche reçoit le contexte du travail (progression, annulation) puis
+les paramètres donnés à soumettre() ; sa valeur de retour est le résultat
+consultable via /api/travaux/<id>.
+"""
+import os
+from flask import current_app
+from app.utils.travaux import tache
+
+
+def chemin_fichier_travail(nom_fichier):
+    """Chemin d'un fichier déposé ou produit par un travail"""
+    dossier = current_app.config.get('TRAVAUX_DOSSIER', os.path.join('uploads', 'travaux'))
+    os.makedirs(dossier, exist_ok=True)
+    return os.path.join(dossier, nom_fichier)
+
+
+@tache('bulletins_filiere', max_tentatives=1)
+def generer_bulletins_filiere(travail, filiere_id, semestre, annee_academique, genere_par):
+    """Bulletins PDF de tous les étudiants d'une filière"""
+    from app.db import executer_requete
+    from app.gestionnaires.base import GestionnaireBase
+    from app.gestionnaires.bulletins import GestionnaireBulletins
+
+    etudiants = executer_requete("""
+        SELECT e.id_etudiant, u.nom, u.prenom, u.matricule
+        FROM etudiants e
+        JOIN utilisateurs u ON e.id_user = u.id_user
+        WHERE e.id_filiere = ?
+        ORDER BY u.nom, u.prenom, e.id_etudiant
+    """, (filiere_id,), obtenir_resultats=True) or []
+
+    resultats = {'total': len(etudiants), 'succes': 0, 'echecs': 0, 'details': []}
+    for index, etudiant in enumerate(etudiants, start=1):
+        succes, _, message = GestionnaireBulletins.generer_bulletin(
+            etudiant['id_etudiant'], semestre, annee_academique
+        )
+        resultats['succes' if succes else 'echecs'] += 1
+        resultats['details'].append({
+            'etudiant': f"{etudiant['nom']} {etudiant['prenom']}",
+            'matricule': etudiant['matricule'],
+            'success': succes,
+            'message': message
+        })
+        travail.progression(100 * index // len(etudiants), f"{index}/{len(etudiants)} bulletins")
+
+    GestionnaireBase.enregistrer_audit(
+        'generation_bulletins_filiere', 'bulletins', filiere_id,
+        f"{resultats['succes']}/{resultats['total']} bulletins {semestre} {annee_academique}",
+        utilisateur_id=genere_par
+    )
+    return resultats
+
+
+@tache('bulletin_etudiant', max_tentatives=1)
+def generer_bulletin_etudiant(travail, etudiant_id, semestre, annee_academique, genere_par):
+    """Bulletin PDF d'un étudiant"""
+    from app.gestionnaires.bulletins import GestionnaireBulletins
+
+    succes, chemin_pdf, message = GestionnaireBulletins.generer_bulletin(etudiant_id, semestre, annee_academique)
+    if not succes:
+        raise RuntimeError(message)
+    return {'chemin_pdf': chemin_pdf}
+
+
+@tache('import_notes', max_tentatives=1)
+def importer_notes(travail, fichier, nom_fichier, cours_id, filiere_id, utilisateur_id, role_initiateur=None):
+    """Import d'une feuille de notes déposée par admin.importer_notes_web"""
+    from app.models import ImportNote
+    from app.services.note_service import NoteService
+
+    travail.progression(5, 'Lecture du fichier')
+    resultats = NoteService.importer_feuille_administration(fichier, cours_id, utilisateur_id)
+
+    ImportNote.creer(
+        cours_id, filiere_id, utilisateur_id,
+        nom_fichier, resultats['succes'], role_initiateur
+    )
+    os.remove(fichier)
+
+    return {
+        'imported': resultats['succes'],
+        'errors': resultats['erreurs']
+    }
+
+
+@tache('promotion_niveau', max_tentatives=1)
+def promouvoir_niveau(travail, niveau_actuel, filiere_id=None, annee_academique=None, validateur_id=None):
+    """Promotion des étudiants d'un niveau au suivant"""
+    from app.blueprints.directeur.import_users import PromotionEtudiants
+
+    # Sans le décorateur de route (flash / redirect) : l'erreur remonte au travail
+    promouvoir = PromotionEtudiants.promouvoir_niveau.__wrapped__
+    return promouvoir(filiere_id, niveau_actuel, annee_academique, validateur_id=validateur_id)
+
+
+@tache('rapport_usage_pdf')
+def generer_rapport_usage_pdf(travail, debut=None, fin=None, utilisateur_id=None):
+    """Rapport d'usage PDF, téléchargé ensuite via /api/travaux/<id>/fichier"""
+    from app.models import AuditUsage
+    from app.services.rapport_service import RapportUsageService
+
+    travail.progression(10, 'Collecte des statistiques')
+    data = RapportUsageService.collecter(debut, fin)
+
+    travail.progression(60, 'Mise en page du PDF')
+    chemin = chemin_fichier_travail(f'rapport_usage_{travail.id_travail}.pdf')
+    with open(chemin, 'wb') as fichier:
+        fichier.write(RapportUsageService.generer_pdf(data))
+
+    if utilisateur_id:
+        AuditUsage.creer(utilisateur_id, 'USAGE_REPORT', meta={
+            'format': 'pdf',
+            'period': f"{debut} to {fin}" if debut and fin else 'all'
+        })
+    return {'fichier': chemin, 'nom': 'usage_report.pdf', 'mimetype': 'application/pdf'}
+
+
+@tache('stats_instantane', max_tentatives=1, periode='STATS_RAFRAICHISSEMENT_MINUTES')
+def rafraichir_instantane_stats(travail):
+    """Instantané stats_daily lu par les tableaux de bord (périodique)"""
+    from app.gestionnaires.statistiques import GestionnaireStatistiques
+
+    return {'indicateurs': GestionnaireStatistiques.calculer_instantane()}
+
+
+def deposer_fichier_travail(fichier):
+    """
+    Enregistre un fichier uploadé pour un travail (la requête se termine
+    avant que le travail ne le lise)
+
+    Returns:
+        str: Chemin du fichier déposé
+    """
+    import uuid
+
+    extension = os.path.splitext(fichier.filename or '')[1].lower()
+    chemin = chemin_fichier_travail(f'depot_{uuid.uuid4().hex}{extension}')
+    fichier.save(chemin)
+    return chemin
@@ -0,0 +1,136 @@
+"""
+Chargeurs par lots pour UIST-2ITS
+Registre par requête (flask.g) : les lignes lues sont mémorisées jusqu'à la
+fin de la requête et les identifiants annoncés avec prevoir() sont chargés
+ensemble par une seule requête WHERE ... IN (...)
+"""
+from flask import g, has_request_context
+from app.db import executer_requete
+
+# Identifiants par requête IN (limite de variables de SQLite : 999)
+TAILLE_LOT = 500
+
+class ChargeurLots:
+    """Mémo d'une table pour la requête courante, alimenté par lots"""
+
+    def __init__(self, nom, fonction_lot):
+        """
+        Args:
+            nom (str): Nom du chargeur
+            fonction_lot (callable): Fonction (liste d'IDs) -> {id: ligne}
+        """
+        self.nom = nom
+        self.fonction_lot = fonction_lot
+        self._resultats = {}
+        self._attente = set()
+        self.appels = 0
+        self.chargements = 0
+
+    def prevoir(self, cles):
+        """Annonce des IDs qui seront demandés (chargés au prochain accès)"""
+        self._attente.update(
+            cle for cle in cles if cle is not None and cle not in self._resultats
+        )
+
+    def charger(self, cle):
+        """
+        Retourne une copie de la ligne (ou None), en chargeant au passage
+        tous les IDs en attente
+        """
+        self.appels += 1
+        if cle not in self._resultats:
+            self._attente.add(cle)
+            cles = list(self._attente)
+            self._attente.clear()
+            for debut in range(0, len(cles), TAILLE_LOT):
+                lot = cles[debut:debut + TAILLE_LOT]
+                self.chargements += 1
+                trouves = self.fonction_lot(lot)
+                for id_lot in lot:
+                    self._resultats[id_lot] = trouves.get(id_lot)
+
+        ligne = self._resultats.get(cle)
+        return dict(ligne) if ligne is not None else None
+
+    def oublier(self, cle=None):
+        """Retire un ID du mémo (tous si cle est None)"""
+        if cle is None:
+            self._resultats.clear()
+        else:
+            self._resultats.pop(cle, None)
+
+def obtenir_chargeur(nom, fonction_lot):
+    """
+    Chargeur de la requête courante
+
+    Returns:
+        ChargeurLots ou None hors requête HTTP (scripts, tâches)
+    """
+    if not has_request_context():
+        return None
+    registre = g.setdefault('chargeurs', {})
+    if nom not in registre:
+        registre[nom] = ChargeurLots(nom, fonction_lot)
+    return registre[nom]
+
+def charger(nom, cle, fonction_lot, fonction_unitaire):
+    """
+    Lit une ligne par ID à travers le chargeur de la requête
+
+    Args:
+        nom (str): Nom du chargeur
+        cle (int): ID recherché
+        fonction_lot (callable): Chargement par lot (liste d'IDs) -> {id: ligne}
+        fonction_unitaire (callable): Chargement direct, utilisé hors requête HTTP
+
+    Returns:
+        dict: Ligne ou None
+    """
+    chargeur = obtenir_chargeur(nom, fonction_lot)
+    if chargeur is None:
+        return fonction_unitaire(cle)
+    return chargeur.charger(cle)
+
+def prevoir(nom, cles, fonction_lot):
+    """Annonce les IDs qui seront lus pendant la requête courante"""
+    chargeur = obtenir_chargeur(nom, fonction_lot)
+    if chargeur is not None:
+        chargeur.prevoir(cles)
+
+def oublier(nom, cle=None):
+    """Invalide le mémo de la requête courante après une écriture"""
+    if has_request_context() and nom in g.get('chargeurs', {}):
+        g.chargeurs[nom].oublier(cle)
+
+def lignes_par_ids(requete, ids, colonne='id'):
+    """
+    Exécute une requête dont la clause WHERE se termine par "IN ({})"
+
+    Args:
+        requete (str): Requête SQL avec un emplacement {} pour les marqueurs
+        ids (list): IDs recherchés
+        colonne (str): Colonne du résultat portant l'ID
+
+    Returns:
+        dict: {id: ligne}
+    """
+    marqueurs = ', '.join(['%s'] * len(ids))
+    lignes = executer_requete(requete.format(marqueurs), tuple(ids), obtenir_resultats=True) or []
+    return {ligne[colonne]: ligne for ligne in lignes}
+
+def statistiques_chargeurs():
+    """
+    Compteurs de la requête courante
+
+    Returns:
+        dict: {appels, chargements, requetes_evitees, details}
+    """
+    registre = g.get('chargeurs', {}) if has_request_context() else {}
+    appels = sum(c.appels for c in registre.values())
+    chargements = sum(c.chargements for c in registre.values())
+    return {
+        'appels': appels,
+        'chargements': chargements,
+        'requetes_evitees': appels - chargements,
+        'details': {nom: (c.appels, c.chargements) for nom, c in registre.items()}
+    }
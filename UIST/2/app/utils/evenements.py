@@ -0,0 +1,142 @@
+"""
+Bus d'événements en mémoire pour UIST-2ITS
+Les modèles publient sur des canaux ('notes', 'utilisateur:<id>') et chaque
+flux Server-Sent Events ouvert reçoit les événements de ses canaux au lieu
+d'interroger l'API toutes les 5 secondes.
+
+Le bus est local au processus : avec plusieurs workers, un client ne reçoit
+que les événements publiés par le worker qui sert son flux (le polling REST
+reste le mode de secours).
+"""
+import itertools
+import json
+import queue
+import threading
+
+from app.db import apres_validation
+
+# Événements en attente par abonné avant abandon (client trop lent)
+TAILLE_FILE_ABONNE = 100
+
+# Secondes sans événement avant l'envoi d'un commentaire de maintien
+INTERVALLE_MAINTIEN = 15
+
+CANAL_NOTES = 'notes'
+
+def canal_utilisateur(utilisateur_id):
+    """Canal personnel d'un utilisateur (messages, notifications)"""
+    return f'utilisateur:{utilisateur_id}'
+
+class Abonnement:
+    """File d'événements d'un flux ouvert"""
+
+    def __init__(self, canaux):
+        self.canaux = frozenset(canaux)
+        self.file = queue.Queue(maxsize=TAILLE_FILE_ABONNE)
+        self.perdus = 0
+
+    def recevoir(self, delai=INTERVALLE_MAINTIEN):
+        """
+        Attend le prochain événement
+
+        Returns:
+            dict: Événement ou None si le délai expire
+        """
+        try:
+            return self.file.get(timeout=delai)
+        except queue.Empty:
+            return None
+
+class BusEvenements:
+    """Publication / abonnement entre threads d'un même processus"""
+
+    def __init__(self):
+        self._abonnements = set()
+        self._verrou = threading.Lock()
+        self._compteur = itertools.count(1)
+
+    def abonner(self, canaux):
+        """Ouvre un abonnement aux canaux donnés"""
+        abonnement = Abonnement(canaux)
+        with self._verrou:
+            self._abonnements.add(abonnement)
+        return abonnement
+
+    def desabonner(self, abonnement):
+        """Ferme un abonnement (fin du flux)"""
+        with self._verrou:
+            self._abonnements.discard(abonnement)
+
+    def publier(self, canal, type_evenement, donnees=None):
+        """
+        Diffuse un événement aux abonnés du canal
+
+        Returns:
+            int: Nombre d'abonnés atteints
+        """
+        evenement = {
+            'id': next(self._compteur),
+            'canal': canal,
+            'type': type_evenement,
+            'donnees': donnees or {}
+        }
+        with self._verrou:
+            destinataires = [a for a in self._abonnements if canal in a.canaux]
+
+        atteints = 0
+        for abonnement in destinataires:
+            try:
+                abonnement.file.put_nowait(evenement)
+                atteints += 1
+            except queue.Full:
+                # Le client rechargera l'état complet à la reconnexion
+                abonnement.perdus += 1
+        return atteints
+
+    def nombre_abonnes(self):
+        """Nombre de flux ouverts"""
+        with self._verrou:
+            return len(self._abonnements)
+
+bus = BusEvenements()
+
+def publier(canal, type_evenement, donnees=None):
+    """
+    Publie un événement une fois l'écriture validée : immédiatement hors
+    transaction, à la validation du bloc transaction() sinon (rien n'est
+    publié en cas d'annulation)
+    """
+    apres_validation(lambda: bus.publier(canal, type_evenement, donnees))
+
+def formater_sse(evenement):
+    """Sérialise un événement au format text/event-stream"""
+    return (
+        f"id: {evenement['id']}\n"
+        f"event: {evenement['type']}\n"
+        f"data: {json.dumps(evenement['donnees'], default=str)}\n\n"
+    )
+
+def flux_sse(canaux, delai=INTERVALLE_MAINTIEN):
+    """
+    Générateur text/event-stream pour une réponse Flask
+
+    Ne garde ni contexte de requête ni connexion SQLite : un flux inactif
+    ne coûte qu'un thread en attente sur sa file.
+
+    Args:
+        canaux (list): Canaux écoutés
+        delai (int): Secondes entre deux commentaires de maintien
+    """
+    abonnement = bus.abonner(canaux)
+    try:
+        # Le client se reconnecte seul après 5 s si le flux est coupé
+        yield "retry: 5000\n\n"
+        yield formater_sse({'id': 0, 'type': 'connexion', 'donnees': {'canaux': sorted(canaux)}})
+        while True:
+            evenement = abonnement.recevoir(delai)
+            if evenement is None:
+                yield ": maintien\n\n"
+            else:
+                yield formater_sse(evenement)
+    finally:
+        bus.desabonner(abonnement)
@@ -111,4 +111,32 @@ def obtenir_endpoints_navigation(role):
         }
     }
     
-    return endpoints.get(role, {})
\ No newline at end of file
+    return endpoints.get(role, {})
+
+def generer_csv(entetes, lignes, taille_tampon=64 * 1024):
+    """
+    Produit un fichier CSV morceau par morceau, pour une réponse en flux
+    
+    Args:
+        entetes (list): Ligne d'en-tête
+        lignes (iterable): Lignes (listes de valeurs), idéalement un générateur
+        taille_tampon (int): Taille approximative des morceaux produits
+    
+    Yields:
+        str: Morceau du fichier CSV
+    """
+    import csv
+    import io
+    
+    tampon = io.StringIO()
+    writer = csv.writer(tampon)
+    writer.writerow(entetes)
+    
+    for ligne in lignes:
+        writer.writerow(ligne)
+        if tampon.tell() >= taille_tampon:
+            yield tampon.getvalue()
+            tampon.seek(0)
+            tampon.truncate()
+    
+    yield tampon.getvalue()
@@ -0,0 +1,201 @@
+"""
+Journal d'audit différé pour UIST-2ITS
+Les INSERT d'audit sont déposés dans une file bornée et écrits par un thread
+d'arrière-plan, par lots (executemany, un seul commit) toutes les
+AUDIT_INTERVALLE_MS ms ou dès AUDIT_LOT_TAILLE entrées. La file est vidée à
+l'arrêt du processus. File pleine : AUDIT_DEBORDEMENT = 'synchrone' écrit
+l'entrée dans la requête (aucune perte), 'abandon' la compte comme perdue.
+"""
+import atexit
+import itertools
+import os
+import queue
+import sqlite3
+import threading
+
+from app.db import apres_validation, executer_requete, obtenir_pool
+
+DEBORDEMENTS = ('synchrone', 'abandon')
+
+class JournalAudit:
+    """File d'attente des INSERT d'audit et thread d'écriture"""
+
+    def __init__(self, pool, taille_file=10000, taille_lot=200, intervalle_ms=250, debordement='synchrone'):
+        """
+        Args:
+            pool (PoolConnexions): Pool de la base d'audit
+            taille_file (int): Entrées en attente au maximum
+            taille_lot (int): Entrées par écriture
+            intervalle_ms (int): Attente maximale avant écriture
+            debordement (str): 'synchrone' ou 'abandon'
+        """
+        if debordement not in DEBORDEMENTS:
+            raise ValueError(f"AUDIT_DEBORDEMENT invalide: {debordement}")
+        self.pool = pool
+        self.taille_lot = taille_lot
+        self.intervalle = intervalle_ms / 1000
+        self.debordement = debordement
+        self._file = queue.Queue(maxsize=taille_file)
+        self._arret = threading.Event()
+        self._lot_pret = threading.Event()
+        self._verrou = threading.Lock()
+        self._thread = None
+        self._pid = None
+        self.ecrites = 0
+        self.perdues = 0
+        self.synchrones = 0
+
+    def ajouter(self, requete, parametres):
+        """
+        Dépose un INSERT
+
+        Returns:
+            bool: True si l'entrée est en file ou écrite, False si perdue
+        """
+        self._demarrer()
+        try:
+            self._file.put_nowait((requete, tuple(parametres)))
+            if self._file.qsize() >= self.taille_lot:
+                self._lot_pret.set()
+            return True
+        except queue.Full:
+            if self.debordement == 'abandon':
+                self.perdues += 1
+                return False
+            self.synchrones += 1
+            executer_requete(requete, parametres)
+            return True
+
+    def vider(self):
+        """Écrit immédiatement tout ce qui est en file"""
+        with self._verrou:
+            while True:
+                lot = self._prendre_lot()
+                if not lot:
+                    return
+                self._ecrire(lot)
+
+    def arreter(self):
+        """Arrête le thread puis écrit les entrées restantes"""
+        self._arret.set()
+        self._lot_pret.set()
+        if self._thread is not None and self._thread.is_alive():
+            self._thread.join(timeout=5)
+        self.vider()
+
+    def statistiques(self):
+        """Compteurs du journal"""
+        return {
+            'en_attente': self._file.qsize(),
+            'ecrites': self.ecrites,
+            'synchrones': self.synchrones,
+            'perdues': self.perdues
+        }
+
+    def _demarrer(self):
+        # Thread (re)créé dans chaque processus (workers forkés)
+        if self._thread is not None and self._thread.is_alive() and self._pid == os.getpid():
+            return
+        with self._verrou:
+            if self._thread is not None and self._thread.is_alive() and self._pid == os.getpid():
+                return
+            self._arret.clear()
+            self._pid = os.getpid()
+            self._thread = threading.Thread(target=self._boucle, name='journal-audit', daemon=True)
+            self._thread.start()
+
+    def _prendre_lot(self):
+        lot = []
+        try:
+            while len(lot) < self.taille_lot:
+                lot.append(self._file.get_nowait())
+        except queue.Empty:
+            pass
+        return lot
+
+    def _boucle(self):
+        # Réveil toutes les intervalle secondes, ou plus tôt dès qu'un lot est plein
+        while not self._arret.is_set():
+            self._lot_pret.wait(self.intervalle)
+            self._lot_pret.clear()
+            self.vider()
+
+    def _ecrire(self, lot):
+        """Un executemany par requête distincte, un seul commit ; entrée par entrée si le lot échoue"""
+        connexion = self.pool.acquerir()
+        try:
+            try:
+                connexion.execute('BEGIN IMMEDIATE')
+                for requete, groupe in itertools.groupby(lot, key=lambda entree: entree[0]):
+                    connexion.executemany(requete, [parametres for _, parametres in groupe])
+                connexion.commit()
+                self.ecrites += len(lot)
+                return
+            except sqlite3.Error as e:
+                connexion.rollback()
+                print(f"⚠️ Lot d'audit refusé ({len(lot)} entrées): {e}, écriture entrée par entrée")
+
+            # Un SAVEPOINT par entrée : seules les entrées fautives sont perdues
+            connexion.execute('BEGIN IMMEDIATE')
+            refusees = 0
+            for requete, parametres in lot:
+                connexion.execute('SAVEPOINT entree_audit')
+                try:
+                    connexion.execute(requete, parametres)
+                except sqlite3.Error as e:
+                    connexion.execute('ROLLBACK TO SAVEPOINT entree_audit')
+                    refusees += 1
+                    print(f"❌ Erreur journal d'audit (1 entrée): {e}")
+                connexion.execute('RELEASE SAVEPOINT entree_audit')
+            connexion.commit()
+            self.ecrites += len(lot) - refusees
+            self.perdues += refusees
+        except sqlite3.Error as e:
+            connexion.rollback()
+            self.perdues += len(lot)
+            print(f"❌ Erreur journal d'audit ({len(lot)} entrées): {e}")
+        finally:
+            self.pool.liberer(connexion)
+
+_journal = None
+
+def init_journal_audit(app):
+    """Active l'écriture différée si AUDIT_ASYNCHRONE est vrai"""
+    global _journal
+    if _journal is not None:
+        _journal.arreter()
+        _journal = None
+
+    if not app.config.get('AUDIT_ASYNCHRONE', False):
+        return
+
+    with app.app_context():
+        pool = obtenir_pool()
+
+    _journal = JournalAudit(
+        pool,
+        taille_file=app.config.get('AUDIT_FILE_TAILLE', 10000),
+        taille_lot=app.config.get('AUDIT_LOT_TAILLE', 200),
+        intervalle_ms=app.config.get('AUDIT_INTERVALLE_MS', 250),
+        debordement=app.config.get('AUDIT_DEBORDEMENT', 'synchrone')
+    )
+    atexit.register(_journal.arreter)
+
+def enregistrer_audit(requete, parametres):
+    """
+    INSERT d'audit : différé si le journal est actif, sinon exécuté tout de
+    suite (retourne alors l'ID inséré, None en mode différé)
+    
+    Dans un bloc transaction(), l'entrée n'est mise en file qu'à la
+    validation : une transaction annulée ne laisse pas de trace d'audit.
+    """
+    if _journal is None:
+        return executer_requete(requete, parametres)
+    journal = _journal
+    apres_validation(lambda: journal.ajouter(requete, parametres))
+    return None
+
+def vider_journal_audit():
+    """Écrit les entrées en attente (avant une lecture de l'audit)"""
+    if _journal is not None:
+        _journal.vider()
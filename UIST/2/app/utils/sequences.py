@@ -0,0 +1,81 @@
+"""
+Séquences nommées (matricules...) allouées par plages
+Une ligne par compteur dans la table sequences ; l'incrément se fait dans
+une transaction BEGIN IMMEDIATE, donc deux créations concurrentes
+obtiennent des plages disjointes sans balayer la table des utilisateurs.
+"""
+from datetime import datetime
+from app.db import executer_requete, executer_requete_unique, transaction
+
+SCHEMA_SEQUENCES = """
+    CREATE TABLE IF NOT EXISTS sequences (
+        nom VARCHAR(50) PRIMARY KEY,
+        valeur INTEGER NOT NULL DEFAULT 0,
+        date_maj DATETIME NOT NULL
+    )
+"""
+
+_table_prete = False
+
+
+def _preparer_table(connexion=None):
+    global _table_prete
+    if _table_prete:
+        return
+    if connexion is not None:
+        connexion.execute(SCHEMA_SEQUENCES)
+    else:
+        executer_requete(SCHEMA_SEQUENCES)
+    _table_prete = True
+
+
+def reserver_plage(nom, taille=1, depart=None):
+    """
+    Réserve taille valeurs consécutives d'un compteur
+
+    Un import de N utilisateurs réserve sa plage en une seule instruction.
+    Appelée dans un bloc transaction() existant, la plage n'est acquise
+    qu'au commit de ce bloc (et rendue s'il est annulé).
+
+    Args:
+        nom (str): Nom du compteur
+        taille (int): Nombre de valeurs à réserver
+        depart (callable): Reçoit la connexion et donne la dernière valeur
+                           déjà utilisée ; appelée une seule fois, à la
+                           création du compteur (reprise d'une base existante)
+
+    Returns:
+        tuple: (premiere, derniere) valeurs réservées, bornes incluses
+    """
+    if taille < 1:
+        raise ValueError('La taille de la plage doit être positive')
+
+    maintenant = datetime.utcnow().strftime('%Y-%m-%d %H:%M:%S')
+
+    with transaction() as connexion:
+        _preparer_table(connexion)
+
+        curseur = connexion.execute(
+            "UPDATE sequences SET valeur = valeur + ?, date_maj = ? WHERE nom = ?",
+            (taille, maintenant, nom)
+        )
+        if curseur.rowcount == 0:
+            # Première utilisation : le verrou d'écriture est déjà pris
+            initiale = (depart(connexion) if depart else 0) or 0
+            connexion.execute(
+                "INSERT INTO sequences (nom, valeur, date_maj) VALUES (?, ?, ?)",
+                (nom, initiale + taille, maintenant)
+            )
+
+        derniere = connexion.execute(
+            "SELECT valeur FROM sequences WHERE nom = ?", (nom,)
+        ).fetchone()[0]
+
+    return derniere - taille + 1, derniere
+
+
+def valeur_sequence(nom):
+    """Dernière valeur attribuée d'un compteur (0 s'il n'existe pas)"""
+    _preparer_table()
+    ligne = executer_requete_unique("SELECT valeur FROM sequences WHERE nom = ?", (nom,))
+    return ligne['valeur'] if ligne else 0
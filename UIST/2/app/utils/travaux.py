@@ -0,0 +1,471 @@
+"""
+Travaux de fond durables pour UIST-2ITS
+Les opérations longues (bulletins d'une filière, imports Excel, promotions,
+rapports PDF) sont enregistrées dans la table travaux puis exécutées par un
+pool de threads hors requête HTTP. La route renvoie l'ID du travail ; le
+client suit l'avancement via /api/travaux/<id>.
+
+La réservation d'un travail se fait dans une transaction BEGIN IMMEDIATE :
+plusieurs processus peuvent faire tourner un exécuteur sur la même base sans
+prendre deux fois le même travail. Un travail dont l'exécuteur ne donne plus
+signe de vie (bail expiré) est remis en file, ou passé en ECHEC s'il a
+épuisé ses tentatives ; un thread de battement renouvelle le bail tant que
+la tâche tourne. Les échecs sont retentés avec un délai exponentiel jusqu'à
+max_tentatives. Les écritures d'issue vérifient reserve_par : un exécuteur
+dont le bail a été repris n'écrase pas le résultat du suivant. Les tâches
+périodiques (@tache(..., periode=...)) se replanifient à chaque passage.
+"""
+import atexit
+import json
+import os
+import socket
+import sqlite3
+import threading
+import traceback
+from datetime import datetime, timedelta
+
+from app.db import apres_validation, executer_requete, executer_requete_unique, obtenir_pool, transaction
+
+STATUTS = ('EN_ATTENTE', 'EN_COURS', 'TERMINE', 'ECHEC', 'ANNULE')
+STATUTS_FINAUX = ('TERMINE', 'ECHEC', 'ANNULE')
+
+SCHEMA_TRAVAUX = """
+CREATE TABLE IF NOT EXISTS travaux (
+    id_travail INTEGER PRIMARY KEY AUTOINCREMENT,
+    type_travail VARCHAR(50) NOT NULL,
+    parametres TEXT,
+    statut TEXT CHECK(statut IN ('EN_ATTENTE', 'EN_COURS', 'TERMINE', 'ECHEC', 'ANNULE')) NOT NULL DEFAULT 'EN_ATTENTE',
+    progression INTEGER NOT NULL DEFAULT 0,
+    message TEXT,
+    resultat TEXT,
+    erreur TEXT,
+    tentatives INTEGER NOT NULL DEFAULT 0,
+    max_tentatives INTEGER NOT NULL DEFAULT 3,
+    annulation_demandee INTEGER NOT NULL DEFAULT 0,
+    disponible_a DATETIME NOT NULL DEFAULT CURRENT_TIMESTAMP,
+    reserve_par VARCHAR(100),
+    reserve_a DATETIME,
+    cree_par INTEGER,
+    date_creation DATETIME DEFAULT CURRENT_TIMESTAMP,
+    date_debut DATETIME,
+    date_fin DATETIME,
+    FOREIGN KEY (cree_par) REFERENCES utilisateurs(id_user) ON DELETE SET NULL
+);
+
+CREATE INDEX IF NOT EXISTS idx_travaux_file ON travaux(statut, disponible_a, id_travail);
+CREATE INDEX IF NOT EXISTS idx_travaux_cree_par ON travaux(cree_par, id_travail);
+"""
+
+# Fonctions de traitement par type de travail
+_taches = {}
+
+# Tâches périodiques : type de travail -> clé de configuration de la période (minutes)
+_periodiques = {}
+
+class TravailAnnule(Exception):
+    """Levée dans une tâche quand l'annulation a été demandée"""
+
+def tache(type_travail, max_tentatives=3, periode=None):
+    """
+    Décorateur d'enregistrement d'une tâche de fond
+
+    La fonction reçoit le contexte du travail puis ses paramètres ; sa
+    valeur de retour (sérialisable en JSON) devient le résultat du travail.
+
+    Usage:
+        @tache('bulletins_filiere')
+        def generer_bulletins_filiere(travail, filiere_id, semestre): ...
+
+    Args:
+        type_travail (str): Nom du type de travail
+        max_tentatives (int): Exécutions au maximum (1 = pas de reprise)
+        periode (str): Clé de configuration donnant la période en minutes ;
+                       la tâche est alors planifiée au démarrage de
+                       l'exécuteur, et chaque passage planifie le suivant
+    """
+    def decorator(f):
+        _taches[type_travail] = (f, max_tentatives)
+        if periode is not None:
+            _periodiques[type_travail] = periode
+        return f
+    return decorator
+
+def _maintenant():
+    return datetime.utcnow().strftime('%Y-%m-%d %H:%M:%S')
+
+def _decoder(travail):
+    if travail is None:
+        return None
+    for cle in ('parametres', 'resultat'):
+        if travail.get(cle):
+            travail[cle] = json.loads(travail[cle])
+    return travail
+
+class ContexteTravail:
+    """Accès d'une tâche à son travail : avancement et annulation"""
+
+    def __init__(self, travail):
+        self.id_travail = travail['id_travail']
+        self.type_travail = travail['type_travail']
+        self.tentative = travail['tentatives']
+        self.cree_par = travail['cree_par']
+        self.reserve_par = travail['reserve_par']
+
+    def progression(self, pourcentage, message=None):
+        """
+        Enregistre l'avancement (renouvelle aussi le bail du travail)
+
+        Raises:
+            TravailAnnule: Si l'annulation a été demandée
+        """
+        executer_requete("""
+            UPDATE travaux SET progression = ?, message = COALESCE(?, message), reserve_a = ?
+            WHERE id_travail = ? AND reserve_par = ?
+        """, (max(0, min(int(pourcentage), 100)), message, _maintenant(), self.id_travail, self.reserve_par))
+        self.verifier_annulation()
+
+    def verifier_annulation(self):
+        """Lève TravailAnnule si l'annulation a été demandée"""
+        ligne = executer_requete_unique(
+            "SELECT annulation_demandee FROM travaux WHERE id_travail = ?", (self.id_travail,)
+        )
+        if ligne and ligne['annulation_demandee']:
+            raise TravailAnnule()
+
+# ==================== FILE DES TRAVAUX ====================
+
+def soumettre(type_travail, parametres=None, cree_par=None, max_tentatives=None):
+    """
+    Met un travail en file
+
+    Args:
+        type_travail (str): Type enregistré avec @tache
+        parametres (dict): Arguments nommés de la tâche (JSON)
+        cree_par (int): ID de l'utilisateur demandeur
+        max_tentatives (int): Remplace la valeur de la tâche
+
+    Returns:
+        int: ID du travail
+    """
+    if type_travail not in _taches:
+        raise ValueError(f"Type de travail inconnu: {type_travail}")
+    if max_tentatives is None:
+        max_tentatives = _taches[type_travail][1]
+
+    id_travail = executer_requete("""
+        INSERT INTO travaux (type_travail, parametres, max_tentatives, cree_par, disponible_a)
+        VALUES (?, ?, ?, ?, ?)
+    """, (type_travail, json.dumps(parametres or {}, default=str), max_tentatives, cree_par, _maintenant()))
+
+    if _executeur is not None:
+        _executeur.demarrer()
+        apres_validation(_executeur.reveiller)
+    return id_travail
+
+def planifier(type_travail, delai_s=0, parametres=None):
+    """
+    Met un travail en file dans delai_s secondes, sauf si un travail du même
+    type y attend déjà (tâches périodiques : un seul passage en attente,
+    quel que soit le nombre de processus)
+
+    Returns:
+        int: ID du travail, None s'il y en avait déjà un en attente
+    """
+    if type_travail not in _taches:
+        raise ValueError(f"Type de travail inconnu: {type_travail}")
+    disponible_a = (datetime.utcnow() + timedelta(seconds=delai_s)).strftime('%Y-%m-%d %H:%M:%S')
+
+    with transaction() as connexion:
+        if connexion.execute(
+            "SELECT 1 FROM travaux WHERE type_travail = ? AND statut = 'EN_ATTENTE' LIMIT 1", (type_travail,)
+        ).fetchone():
+            return None
+        id_travail = connexion.execute("""
+            INSERT INTO travaux (type_travail, parametres, max_tentatives, disponible_a)
+            VALUES (?, ?, ?, ?)
+        """, (type_travail, json.dumps(parametres or {}, default=str), _taches[type_travail][1], disponible_a)).lastrowid
+
+    if _executeur is not None and delai_s <= 0:
+        apres_validation(_executeur.reveiller)
+    return id_travail
+
+def _periode_s(type_travail):
+    from flask import current_app
+    return 60 * current_app.config[_periodiques[type_travail]]
+
+def obtenir_travail(id_travail):
+    """
+    Returns:
+        dict: Travail (parametres et resultat décodés) ou None
+    """
+    return _decoder(executer_requete_unique(
+        "SELECT * FROM travaux WHERE id_travail = ?", (id_travail,)
+    ))
+
+def lister_travaux(cree_par=None, limite=20):
+    """Derniers travaux, éventuellement d'un utilisateur"""
+    requete = "SELECT * FROM travaux"
+    parametres = []
+    if cree_par is not None:
+        requete += " WHERE cree_par = ?"
+        parametres.append(cree_par)
+    requete += " ORDER BY id_travail DESC LIMIT ?"
+    parametres.append(limite)
+    return [_decoder(t) for t in executer_requete(requete, tuple(parametres), obtenir_resultats=True) or []]
+
+def annuler_travail(id_travail):
+    """
+    Annule un travail : immédiatement s'il est en file, à sa prochaine
+    progression() s'il est en cours
+
+    Returns:
+        bool: False si le travail est déjà terminé ou introuvable
+    """
+    with transaction() as connexion:
+        en_file = connexion.execute("""
+            UPDATE travaux SET statut = 'ANNULE', annulation_demandee = 1, date_fin = ?
+            WHERE id_travail = ? AND statut = 'EN_ATTENTE'
+        """, (_maintenant(), id_travail)).rowcount
+        en_cours = connexion.execute("""
+            UPDATE travaux SET annulation_demandee = 1
+            WHERE id_travail = ? AND statut = 'EN_COURS'
+        """, (id_travail,)).rowcount
+    return bool(en_file or en_cours)
+
+def reserver_travail(executeur, bail_s=300):
+    """
+    Prend le plus ancien travail disponible (ou dont le bail a expiré)
+
+    Args:
+        executeur (str): Identifiant de l'exécuteur
+        bail_s (int): Secondes sans battement avant remise en file
+
+    Returns:
+        dict: Travail réservé ou None
+    """
+    maintenant = _maintenant()
+    expiration = (datetime.utcnow() - timedelta(seconds=bail_s)).strftime('%Y-%m-%d %H:%M:%S')
+
+    with transaction() as connexion:
+        # Exécuteur disparu : échec définitif si les tentatives sont épuisées
+        # (tâches non idempotentes avec max_tentatives = 1), sinon reprise
+        connexion.execute("""
+            UPDATE travaux
+            SET statut = 'ECHEC', reserve_par = NULL, date_fin = ?,
+                erreur = COALESCE(erreur, 'Exécuteur interrompu (bail expiré)')
+            WHERE statut = 'EN_COURS' AND reserve_a < ? AND tentatives >= max_tentatives
+        """, (maintenant, expiration))
+        connexion.execute("""
+            UPDATE travaux SET statut = 'EN_ATTENTE', reserve_par = NULL
+            WHERE statut = 'EN_COURS' AND reserve_a < ? AND tentatives < max_tentatives
+        """, (expiration,))
+        ligne = connexion.execute("""
+            SELECT id_travail FROM travaux
+            WHERE statut = 'EN_ATTENTE' AND disponible_a <= ?
+            ORDER BY disponible_a, id_travail
+            LIMIT 1
+        """, (maintenant,)).fetchone()
+        if ligne is None:
+            return None
+        connexion.execute("""
+            UPDATE travaux
+            SET statut = 'EN_COURS', tentatives = tentatives + 1, reserve_par = ?,
+                reserve_a = ?, date_debut = COALESCE(date_debut, ?), erreur = NULL
+            WHERE id_travail = ?
+        """, (executeur, maintenant, maintenant, ligne['id_travail']))
+        travail = connexion.execute(
+            "SELECT * FROM travaux WHERE id_travail = ?", (ligne['id_travail'],)
+        ).fetchone()
+    return _decoder(dict(travail))
+
+class _Battement:
+    """Renouvelle le bail d'un travail à intervalle régulier pendant son exécution"""
+
+    def __init__(self, pool, id_travail, executeur, intervalle_s):
+        self.pool = pool
+        self.id_travail = id_travail
+        self.executeur = executeur
+        self.intervalle = intervalle_s
+        self._arret = threading.Event()
+        self._thread = threading.Thread(target=self._boucle, name=f'battement-{id_travail}', daemon=True)
+
+    def __enter__(self):
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self._arret.set()
+        self._thread.join()
+
+    def _boucle(self):
+        while not self._arret.wait(self.intervalle):
+            connexion = self.pool.acquerir()
+            try:
+                connexion.execute("""
+                    UPDATE travaux SET reserve_a = ?
+                    WHERE id_travail = ? AND reserve_par = ? AND statut = 'EN_COURS'
+                """, (_maintenant(), self.id_travail, self.executeur))
+                connexion.commit()
+            except sqlite3.Error as e:
+                connexion.rollback()
+                print(f"❌ Battement du travail {self.id_travail}: {e}")
+            finally:
+                self.pool.liberer(connexion)
+
+def executer_travail(travail, delai_reprise_s=30, bail_s=300):
+    """
+    Exécute un travail réservé et enregistre son issue
+
+    Le bail est renouvelé par un thread de battement (toutes les bail_s / 3
+    secondes) indépendamment des appels à progression().
+
+    Returns:
+        str: Statut final du passage ('TERMINE', 'ANNULE', 'ECHEC' ou 'EN_ATTENTE'
+             si retenté), None si le bail a été repris par un autre exécuteur
+    """
+    id_travail = travail['id_travail']
+    executeur = travail['reserve_par']
+    entree = _taches.get(travail['type_travail'])
+
+    def conclure(statut, requete, parametres):
+        # L'issue n'est écrite que si ce passage détient encore le travail
+        with transaction() as connexion:
+            modifie = connexion.execute(requete + " AND reserve_par = ? AND statut = 'EN_COURS'",
+                                        parametres + (id_travail, executeur)).rowcount
+        return statut if modifie else None
+
+    try:
+        if entree is None:
+            raise ValueError(f"Type de travail inconnu: {travail['type_travail']}")
+        if travail['type_travail'] in _periodiques:
+            # Passage suivant planifié avant l'exécution : un échec n'interrompt pas la série
+            planifier(travail['type_travail'], _periode_s(travail['type_travail']))
+        with _Battement(obtenir_pool(), id_travail, executeur, max(1, bail_s / 3)):
+            resultat = entree[0](ContexteTravail(travail), **(travail['parametres'] or {}))
+    except TravailAnnule:
+        return conclure('ANNULE', """
+            UPDATE travaux SET statut = 'ANNULE', reserve_par = NULL, date_fin = ?
+            WHERE id_travail = ?""", (_maintenant(),))
+    except Exception as e:
+        erreur = f"{e}\n{traceback.format_exc(limit=5)}"
+        if travail['tentatives'] < travail['max_tentatives'] and entree is not None:
+            # Reprise après 30 s, 60 s, 120 s...
+            delai = delai_reprise_s * 2 ** (travail['tentatives'] - 1)
+            reprise = (datetime.utcnow() + timedelta(seconds=delai)).strftime('%Y-%m-%d %H:%M:%S')
+            return conclure('EN_ATTENTE', """
+                UPDATE travaux SET statut = 'EN_ATTENTE', erreur = ?, reserve_par = NULL, disponible_a = ?
+                WHERE id_travail = ?""", (erreur, reprise))
+        return conclure('ECHEC', """
+            UPDATE travaux SET statut = 'ECHEC', erreur = ?, reserve_par = NULL, date_fin = ?
+            WHERE id_travail = ?""", (erreur, _maintenant()))
+
+    return conclure('TERMINE', """
+        UPDATE travaux SET statut = 'TERMINE', progression = 100, resultat = ?, reserve_par = NULL, date_fin = ?
+        WHERE id_travail = ?""", (json.dumps(resultat, default=str), _maintenant()))
+
+# ==================== EXÉCUTEUR ====================
+
+class ExecuteurTravaux:
+    """Pool de threads qui réservent et exécutent les travaux"""
+
+    def __init__(self, app, nb_threads=2, intervalle_s=2, bail_s=300, delai_reprise_s=30):
+        """
+        Args:
+            app: Application Flask (contexte des tâches)
+            nb_threads (int): Travaux exécutés en parallèle
+            intervalle_s (float): Attente entre deux consultations de la file vide
+            bail_s (int): Secondes sans battement avant remise en file
+            delai_reprise_s (int): Délai de la première reprise après échec
+        """
+        self.app = app
+        self.nb_threads = nb_threads
+        self.intervalle = intervalle_s
+        self.bail_s = bail_s
+        self.delai_reprise_s = delai_reprise_s
+        self._arret = threading.Event()
+        self._reveil = threading.Event()
+        self._verrou = threading.Lock()
+        self._threads = []
+        self._pid = None
+
+    def demarrer(self):
+        """Démarre les threads (recréés dans chaque processus forké, pas après arreter())"""
+        if self._pid == os.getpid() and (self._arret.is_set() or all(t.is_alive() for t in self._threads)):
+            return
+        with self._verrou:
+            if self._pid == os.getpid() and (self._arret.is_set() or all(t.is_alive() for t in self._threads)):
+                return
+            self._arret.clear()
+            self._pid = os.getpid()
+            self._threads = [
+                threading.Thread(target=self._boucle, args=(f'{socket.gethostname()}:{self._pid}:{i}',),
+                                 name=f'travaux-{i}', daemon=True)
+                for i in range(self.nb_threads)
+            ]
+            for thread in self._threads:
+                thread.start()
+
+    def reveiller(self):
+        """Signale un nouveau travail aux threads en attente"""
+        self._reveil.set()
+
+    def arreter(self, delai=10):
+        """Arrête les threads ; un travail en cours est repris après expiration du bail"""
+        self._arret.set()
+        self._reveil.set()
+        for thread in self._threads:
+            thread.join(timeout=delai)
+
+    def _boucle(self, nom):
+        while not self._arret.is_set():
+            try:
+                with self.app.app_context():
+                    travail = reserver_travail(nom, self.bail_s)
+                    if travail is not None:
+                        executer_travail(travail, self.delai_reprise_s, self.bail_s)
+                        continue
+            except sqlite3.Error as e:
+                print(f"❌ Erreur exécuteur de travaux {nom}: {e}")
+            self._reveil.wait(self.intervalle)
+            self._reveil.clear()
+
+_executeur = None
+
+def installer_travaux(chemin_db):
+    """Crée la table travaux sur une base existante (idempotent)"""
+    if not os.path.exists(chemin_db):
+        return
+    connexion = sqlite3.connect(chemin_db, timeout=5)
+    try:
+        connexion.executescript(SCHEMA_TRAVAUX)
+    finally:
+        connexion.close()
+
+def init_travaux(app):
+    """Crée la table et démarre l'exécuteur si TRAVAUX_ACTIFS est vrai"""
+    global _executeur
+    if _executeur is not None:
+        _executeur.arreter()
+        _executeur = None
+
+    # Enregistrement des tâches
+    from app.services import taches  # noqa: F401
+
+    installer_travaux(app.config['DB_PATH'])
+    if not app.config.get('TRAVAUX_ACTIFS', False):
+        return
+
+    _executeur = ExecuteurTravaux(
+        app,
+        nb_threads=app.config.get('TRAVAUX_THREADS', 2),
+        intervalle_s=app.config.get('TRAVAUX_INTERVALLE_S', 2),
+        bail_s=app.config.get('TRAVAUX_BAIL_S', 300),
+        delai_reprise_s=app.config.get('TRAVAUX_DELAI_REPRISE_S', 30)
+    )
+    _executeur.demarrer()
+    atexit.register(_executeur.arreter)
+
+    # Premier passage des tâches périodiques (ignoré si un autre processus l'a déjà planifié)
+    with app.app_context():
+        for type_travail in _periodiques:
+            planifier(type_travail)
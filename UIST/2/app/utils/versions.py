@@ -0,0 +1,183 @@
+"""
+Versions de ressources pour les GET conditionnels (ETag / 304)
+Chaque table suivie a un compteur d'écritures dans versions_tables, tenu à
+jour par des triggers SQLite : la version est donc la même pour tous les
+workers. Une réponse versionnée porte un ETag dérivé de ces compteurs ; un
+client qui renvoie le même ETag (If-None-Match) reçoit 304 sans que la vue
+ne soit exécutée, et les corps JSON déjà sérialisés sont gardés en mémoire
+par (endpoint, arguments, utilisateur, version). Les contrôles d'accès
+passent par le paramètre acces du décorateur : ils sont refaits à chaque
+requête, avant tout 304 ou corps en cache.
+"""
+import hashlib
+import os
+import sqlite3
+import threading
+from collections import OrderedDict
+from functools import wraps
+
+from flask import current_app, make_response, request, session
+from app.db import executer_requete
+
+# Corps sérialisés gardés par processus
+TAILLE_CACHE_REPONSES = 512
+
+_tables_installees = set()
+_verrou = threading.Lock()
+
+def installer_versions(chemin_db, tables):
+    """
+    Crée versions_tables et les triggers des tables données (idempotent).
+    Passe par une connexion dédiée pour ne pas valider la transaction en
+    cours de la requête.
+    """
+    a_installer = [t for t in tables if (chemin_db, t) not in _tables_installees]
+    if not a_installer or not os.path.exists(chemin_db):
+        return
+    with _verrou:
+        connexion = sqlite3.connect(chemin_db, timeout=5)
+        try:
+            connexion.execute("""
+                CREATE TABLE IF NOT EXISTS versions_tables (
+                    nom_table VARCHAR(64) PRIMARY KEY,
+                    version INTEGER NOT NULL DEFAULT 0
+                )
+            """)
+            existantes = {
+                ligne[0].lower() for ligne in
+                connexion.execute("SELECT name FROM sqlite_master WHERE type = 'table'")
+            }
+            for table in a_installer:
+                if table.lower() not in existantes:
+                    continue
+                for operation in ('INSERT', 'UPDATE', 'DELETE'):
+                    connexion.execute(f"""
+                        CREATE TRIGGER IF NOT EXISTS trg_version_{table}_{operation.lower()}
+                        AFTER {operation} ON {table}
+                        BEGIN
+                            INSERT INTO versions_tables (nom_table, version) VALUES ('{table}', 1)
+                            ON CONFLICT(nom_table) DO UPDATE SET version = version + 1;
+                        END
+                    """)
+                _tables_installees.add((chemin_db, table))
+            connexion.commit()
+        finally:
+            connexion.close()
+
+def version_tables(tables):
+    """
+    Compteurs d'écritures des tables
+
+    Returns:
+        tuple: Versions dans l'ordre des tables (0 si jamais écrite),
+               None si une table n'est pas suivie
+    """
+    chemin_db = current_app.config['DB_PATH']
+    installer_versions(chemin_db, tables)
+    if any((chemin_db, table) not in _tables_installees for table in tables):
+        return None
+    marqueurs = ', '.join(['?'] * len(tables))
+    lignes = executer_requete(
+        f"SELECT nom_table, version FROM versions_tables WHERE nom_table IN ({marqueurs})",
+        tuple(tables), obtenir_resultats=True
+    )
+    if lignes is None:
+        return None
+    versions = {ligne['nom_table']: ligne['version'] for ligne in lignes}
+    return tuple(versions.get(table, 0) for table in tables)
+
+class CacheReponses:
+    """Corps de réponse sérialisés, évincés du moins récemment utilisé"""
+
+    def __init__(self, taille_max=TAILLE_CACHE_REPONSES):
+        self.taille_max = taille_max
+        self._entrees = OrderedDict()  # cle -> (etag, corps, mimetype)
+        self._verrou = threading.Lock()
+
+    def obtenir(self, cle, etag):
+        """Corps en cache pour cette version, sinon None"""
+        with self._verrou:
+            entree = self._entrees.get(cle)
+            if entree is None or entree[0] != etag:
+                return None
+            self._entrees.move_to_end(cle)
+            return entree
+
+    def definir(self, cle, etag, corps, mimetype):
+        """Remplace l'entrée de la clé (une seule version gardée par clé)"""
+        with self._verrou:
+            self._entrees[cle] = (etag, corps, mimetype)
+            self._entrees.move_to_end(cle)
+            while len(self._entrees) > self.taille_max:
+                self._entrees.popitem(last=False)
+
+    def vider(self):
+        """Vide le cache"""
+        with self._verrou:
+            self._entrees.clear()
+
+cache_reponses = CacheReponses()
+
+def reponse_versionnee(*tables, acces=None):
+    """
+    Décorateur de vue GET : ETag, 304 sur If-None-Match et cache des corps
+
+    tables doit couvrir toutes les tables lues par la vue (jointures
+    comprises) : une écriture dans une table non listée ne change pas
+    l'ETag et laisserait servir un corps périmé. Le contrôle d'accès ne
+    doit pas être dans la vue, qu'un 304 ou un corps en cache court-circuite,
+    mais dans acces, appelé à chaque requête avec les arguments de la route.
+    Seules les réponses 200 sont mises en cache.
+
+    Usage:
+        @api_bp.route('/notes/etudiant/<int:etudiant_id>')
+        @role_required([...])
+        @reponse_versionnee('notes', 'cours', 'filieres', 'utilisateurs', acces=_acces_etudiant)
+        def obtenir_notes_etudiant(etudiant_id): ...
+
+    Args:
+        tables (str): Tables lues par la vue
+        acces (callable): Reçoit les arguments de la route ; retourne None
+                          si l'accès est autorisé, sinon la réponse de refus
+    """
+    def decorator(f):
+        @wraps(f)
+        def decorated_function(*args, **kwargs):
+            if acces is not None:
+                refus = acces(*args, **kwargs)
+                if refus is not None:
+                    return refus
+
+            cle = (
+                request.endpoint,
+                tuple(sorted(kwargs.items())),
+                tuple(sorted(request.args.items(multi=True))),
+                session.get('utilisateur_id')
+            )
+            versions = version_tables(tables)
+            if versions is None:
+                # Version inconnue : réponse ordinaire, sans ETag
+                return f(*args, **kwargs)
+
+            empreinte = repr((cle, versions)).encode()
+            etag = hashlib.sha1(empreinte).hexdigest()[:20]
+
+            if etag in request.if_none_match:
+                reponse = make_response('', 304)
+                reponse.set_etag(etag)
+                return reponse
+
+            entree = cache_reponses.obtenir(cle, etag)
+            if entree is not None:
+                reponse = current_app.response_class(entree[1], mimetype=entree[2])
+            else:
+                reponse = make_response(f(*args, **kwargs))
+                if reponse.status_code != 200 or reponse.is_streamed:
+                    return reponse
+                cache_reponses.definir(cle, etag, reponse.get_data(), reponse.mimetype)
+
+            reponse.set_etag(etag)
+            reponse.headers['Cache-Control'] = 'private, no-cache'
+            return reponse
+        return decorated_function
+    return decorator
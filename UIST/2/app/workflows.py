@@ -7,7 +7,7 @@ from app.exceptions import (
     WorkflowException, ValidationException, log_user_action, 
     check_note_workflow, validate_workflow_state
 )
-from app.db import executer_requete, executer_requete_unique
+from app.db import executer_requete, executer_requete_unique, transaction
 
 
 class WorkflowManager:
@@ -111,58 +111,60 @@ class WorkflowManager:
         new_status = 'VALIDEE' if action == 'valider' else 'REJETEE'
         check_note_workflow(note['statut'], new_status)
         
-        # 4. Mettre à jour la note
-        executer_requete("""
-            UPDATE Notes 
-            SET statut = %s, 
-                date_validation = NOW(),
-                validateur_id = %s,
-                commentaire_validation = %s
-            WHERE id = %s
-        """, (new_status, directeur_id, commentaire, note_id))
-        
-        # 5. Logger l'action
-        log_user_action(
-            f'note_{action}',
-            f"Note {note_id} {action}ée par le directeur",
-            {
-                'note_id': note_id, 
-                'directeur_id': directeur_id,
-                'action': action,
-                'commentaire': commentaire
-            }
-        )
-        
-        # 6. Notifications
-        # 6a. Notifier l'enseignant
-        WorkflowManager._create_notification(
-            'ENSEIGNANT',
-            f'note_{action}ed',
-            f"Votre note a été {action}ée",
-            {
-                'note_id': note_id,
-                'user_id': note['enseignant_id'],
-                'commentaire': commentaire
-            }
-        )
+        # 4 à 6 : mise à jour, notifications et statistiques validées ensemble
+        with transaction():
+            # 4. Mettre à jour la note
+            executer_requete("""
+                UPDATE Notes 
+                SET statut = %s, 
+                    date_validation = NOW(),
+                    validateur_id = %s,
+                    commentaire_validation = %s
+                WHERE id = %s
+            """, (new_status, directeur_id, commentaire, note_id))
+        
+            # 5. Logger l'action
+            log_user_action(
+                f'note_{action}',
+                f"Note {note_id} {action}ée par le directeur",
+                {
+                    'note_id': note_id, 
+                    'directeur_id': directeur_id,
+                    'action': action,
+                    'commentaire': commentaire
+                }
+            )
         
-        # 6b. Si validée, notifier l'étudiant
-        if action == 'valider':
+            # 6. Notifications
+            # 6a. Notifier l'enseignant
             WorkflowManager._create_notification(
-                'ETUDIANT',
-                'note_published',
-                f"Nouvelle note disponible",
+                'ENSEIGNANT',
+                f'note_{action}ed',
+                f"Votre note a été {action}ée",
                 {
                     'note_id': note_id,
-                    'user_id': note['etudiant_id']
+                    'user_id': note['enseignant_id'],
+                    'commentaire': commentaire
                 }
             )
+        
+            # 6b. Si validée, notifier l'étudiant
+            if action == 'valider':
+                WorkflowManager._create_notification(
+                    'ETUDIANT',
+                    'note_published',
+                    f"Nouvelle note disponible",
+                    {
+                        'note_id': note_id,
+                        'user_id': note['etudiant_id']
+                    }
+                )
             
-            # 6c. Mettre à jour les statistiques de l'étudiant
-            WorkflowManager._update_student_stats(note['etudiant_id'])
+                # 6c. Mettre à jour les statistiques de l'étudiant
+                WorkflowManager._update_student_stats(note['etudiant_id'])
             
-            # 6d. Vérifier si le bulletin peut être généré
-            WorkflowManager._check_bulletin_generation(note['etudiant_id'])
+                # 6d. Vérifier si le bulletin peut être généré
+                WorkflowManager._check_bulletin_generation(note['etudiant_id'])
         
         return {
             'success': True,
@@ -12,6 +12,29 @@ class Config:
     
     # Base de données SQLite3
     DB_PATH = os.getenv('DB_PATH', 'database/uist_2its.db')
+    DB_POOL_TAILLE = int(os.getenv('DB_POOL_TAILLE', 8))  # connexions gardées ouvertes
+    DB_BUSY_TIMEOUT_MS = int(os.getenv('DB_BUSY_TIMEOUT_MS', 5000))
+    DB_CACHE_SIZE_KO = int(os.getenv('DB_CACHE_SIZE_KO', 20000))  # cache de pages par connexion
+    DB_MMAP_SIZE = int(os.getenv('DB_MMAP_SIZE', 256 * 1024 * 1024))
+    DB_CACHE_REQUETES = int(os.getenv('DB_CACHE_REQUETES', 256))  # requêtes préparées par connexion
+    
+    # Journal d'audit : écriture différée par lots (app/utils/journal_audit.py)
+    AUDIT_ASYNCHRONE = os.getenv('AUDIT_ASYNCHRONE', '1') == '1'
+    AUDIT_FILE_TAILLE = int(os.getenv('AUDIT_FILE_TAILLE', 10000))
+    AUDIT_LOT_TAILLE = int(os.getenv('AUDIT_LOT_TAILLE', 200))
+    AUDIT_INTERVALLE_MS = int(os.getenv('AUDIT_INTERVALLE_MS', 250))
+    AUDIT_DEBORDEMENT = os.getenv('AUDIT_DEBORDEMENT', 'synchrone')  # ou 'abandon'
+    
+    # Travaux de fond : bulletins, imports, promotions, rapports (app/utils/travaux.py)
+    TRAVAUX_ACTIFS = os.getenv('TRAVAUX_ACTIFS', '1') == '1'
+    TRAVAUX_THREADS = int(os.getenv('TRAVAUX_THREADS', 2))
+    TRAVAUX_INTERVALLE_S = float(os.getenv('TRAVAUX_INTERVALLE_S', 2))
+    TRAVAUX_BAIL_S = int(os.getenv('TRAVAUX_BAIL_S', 300))  # sans battement -> remis en file (ou ECHEC si tentatives épuisées)
+    TRAVAUX_DELAI_REPRISE_S = int(os.getenv('TRAVAUX_DELAI_REPRISE_S', 30))  # doublé à chaque échec
+    TRAVAUX_DOSSIER = os.getenv('TRAVAUX_DOSSIER', 'uploads/travaux')
+    
+    # Instantanés stats_daily des tableaux de bord (recalculés par le travail périodique stats_instantane)
+    STATS_RAFRAICHISSEMENT_MINUTES = int(os.getenv('STATS_RAFRAICHISSEMENT_MINUTES', 15))
     
     # Session 
     SESSION_COOKIE_HTTPONLY = True
@@ -42,6 +65,8 @@ class TestConfig(Config):
     """Configuration pour les tests"""
     TESTING = True
     DB_PATH = 'database/test_uist_2its.db'
+    AUDIT_ASYNCHRONE = False
+    TRAVAUX_ACTIFS = False
 
 # Dictionnaire des configurations
 configurations = {
@@ -32,6 +32,7 @@ CREATE TABLE IF NOT EXISTS utilisateurs (
 CREATE INDEX IF NOT EXISTS idx_utilisateurs_role ON utilisateurs(role);
 CREATE INDEX IF NOT EXISTS idx_utilisateurs_email ON utilisateurs(email);
 CREATE INDEX IF NOT EXISTS idx_utilisateurs_matricule ON utilisateurs(matricule);
+CREATE INDEX IF NOT EXISTS idx_utilisateurs_nom_prenom ON utilisateurs(nom, prenom, id_user);
 
 CREATE TABLE IF NOT EXISTS audit_usage (
     id_audit INTEGER PRIMARY KEY AUTOINCREMENT,
@@ -215,6 +216,7 @@ CREATE TABLE IF NOT EXISTS notes (
 CREATE INDEX IF NOT EXISTS idx_notes_etudiant ON notes(id_etudiant);
 CREATE INDEX IF NOT EXISTS idx_notes_cours ON notes(id_cours);
 CREATE INDEX IF NOT EXISTS idx_notes_validation ON notes(statut_validation);
+CREATE INDEX IF NOT EXISTS idx_notes_date_saisie ON notes(date_saisie, id_note);
 
 CREATE TABLE IF NOT EXISTS bulletins (
     id_bulletin INTEGER PRIMARY KEY AUTOINCREMENT,
@@ -288,4 +290,56 @@ CREATE TABLE IF NOT EXISTS messages (
 );
 
 CREATE INDEX IF NOT EXISTS idx_messages_destinataire ON messages(id_destinataire);
-CREATE INDEX IF NOT EXISTS idx_messages_lu ON messages(lu);
\ No newline at end of file
+CREATE INDEX IF NOT EXISTS idx_messages_lu ON messages(lu);
+
+-- ==========================================================
+-- STATISTIQUES
+-- ==========================================================
+
+CREATE TABLE IF NOT EXISTS stats_daily (
+    jour DATE NOT NULL,
+    indicateur VARCHAR(50) NOT NULL,
+    cle VARCHAR(50) NOT NULL DEFAULT '',
+    valeur REAL NOT NULL DEFAULT 0,
+    date_maj DATETIME NOT NULL,
+    PRIMARY KEY (jour, indicateur, cle)
+);
+
+-- ==========================================================
+-- TRAVAUX DE FOND
+-- ==========================================================
+
+CREATE TABLE IF NOT EXISTS travaux (
+    id_travail INTEGER PRIMARY KEY AUTOINCREMENT,
+    type_travail VARCHAR(50) NOT NULL,
+    parametres TEXT,
+    statut TEXT CHECK(statut IN ('EN_ATTENTE', 'EN_COURS', 'TERMINE', 'ECHEC', 'ANNULE')) NOT NULL DEFAULT 'EN_ATTENTE',
+    progression INTEGER NOT NULL DEFAULT 0,
+    message TEXT,
+    resultat TEXT,
+    erreur TEXT,
+    tentatives INTEGER NOT NULL DEFAULT 0,
+    max_tentatives INTEGER NOT NULL DEFAULT 3,
+    annulation_demandee INTEGER NOT NULL DEFAULT 0,
+    disponible_a DATETIME NOT NULL DEFAULT CURRENT_TIMESTAMP,
+    reserve_par VARCHAR(100),
+    reserve_a DATETIME,
+    cree_par INTEGER,
+    date_creation DATETIME DEFAULT CURRENT_TIMESTAMP,
+    date_debut DATETIME,
+    date_fin DATETIME,
+    FOREIGN KEY (cree_par) REFERENCES utilisateurs(id_user) ON DELETE SET NULL
+);
+
+CREATE INDEX IF NOT EXISTS idx_travaux_file ON travaux(statut, disponible_a, id_travail);
+CREATE INDEX IF NOT EXISTS idx_travaux_cree_par ON travaux(cree_par, id_travail);
+
+-- ==========================================================
+-- SÉQUENCES (matricules)
+-- ==========================================================
+
+CREATE TABLE IF NOT EXISTS sequences (
+    nom VARCHAR(50) PRIMARY KEY,
+    valeur INTEGER NOT NULL DEFAULT 0,
+    date_maj DATETIME NOT NULL
+);
@@ -1,40 +1,104 @@
 /**
- * Système de Polling Temps Réel pour UniCampus
- * Gestion des mises à jour automatiques via API Flask
+ * Système de mises à jour Temps Réel pour UniCampus
+ * Flux Server-Sent Events (/api/evenements) : la liste est rechargée dès
+ * qu'un événement la concerne. Le bus d'événements est propre à chaque
+ * worker : une écriture traitée par un autre processus n'arrive pas dans le
+ * flux, donc un polling lent (GET conditionnel, 304 sans corps si rien n'a
+ * changé) tourne aussi pendant le flux. Polling normal si EventSource n'est
+ * pas disponible.
  */
 
+// Flux partagé par tous les pollers de la page
+const FluxEvenements = {
+    source: null,
+    
+    ecouter(types, callback) {
+        if (!window.EventSource) return false;
+        if (!this.source) {
+            this.source = new EventSource('/api/evenements');
+        }
+        // 'connexion' : (re)connexion du flux, l'état a pu changer entre-temps
+        ['connexion', ...types].forEach(type => this.source.addEventListener(type, callback));
+        return true;
+    },
+    
+    fermer() {
+        if (this.source) {
+            this.source.close();
+            this.source = null;
+        }
+    }
+};
+
+// GET conditionnel : null si la ressource n'a pas changé (304)
+async function fetchSiModifie(url, etats) {
+    const headers = etats.etag ? { 'If-None-Match': etats.etag } : {};
+    const response = await fetch(url, { headers });
+    if (response.status === 304) return null;
+    etats.etag = response.headers.get('ETag');
+    return response.json();
+}
+
 class NotesPoller {
-    constructor(interval = 5000) {
+    constructor(interval = 5000, intervalleAvecFlux = 30000) {
         this.interval = interval;
+        this.intervalleAvecFlux = intervalleAvecFlux;
         this.isRunning = false;
         this.pollTimer = null;
+        this.etats = { etag: null };
+        this.sse = false;
+        this.refreshTimer = null;
     }
     
     start() {
         if (this.isRunning) return;
         this.isRunning = true;
-        console.log('📡 Polling démarré - Intervalle:', this.interval, 'ms');
+        this.sse = FluxEvenements.ecouter(
+            ['note_creee', 'note_validee', 'note_modifiee'],
+            () => this.planifierRefresh()
+        );
+        console.log((this.sse ? '📡 Flux temps réel connecté, polling de contrôle' : '📡 Polling démarré')
+            + ' - Intervalle: ' + this.delaiPoll() + ' ms');
         this.poll();
     }
     
-    async poll() {
+    // Une rafale d'événements (import de notes : un par note) ne déclenche qu'un rechargement
+    planifierRefresh() {
+        if (this.refreshTimer) return;
+        this.refreshTimer = setTimeout(() => {
+            this.refreshTimer = null;
+            this.refresh();
+        }, 300);
+    }
+    
+    async refresh() {
         if (!this.isRunning) return;
         
         try {
-            const response = await fetch('/api/notes/en-attente');
-            const data = await response.json();
+            const data = await fetchSiModifie('/api/notes/en-attente', this.etats);
             
+            if (data === null) return;
             if (data.success) {
                 this.updateUI(data.notes, data.count);
             } else {
                 console.error('Erreur API:', data.error);
             }
         } catch (error) {
-            console.error('Erreur polling:', error);
+            console.error('Erreur rafraîchissement:', error);
         }
+    }
+    
+    async poll() {
+        if (!this.isRunning) return;
+        
+        await this.refresh();
         
-        // Planifier le prochain poll
-        this.pollTimer = setTimeout(() => this.poll(), this.interval);
+        // Planifier le prochain poll (lent quand le flux est connecté)
+        this.pollTimer = setTimeout(() => this.poll(), this.delaiPoll());
+    }
+    
+    delaiPoll() {
+        return this.sse ? this.intervalleAvecFlux : this.interval;
     }
     
     updateUI(notes, count) {
@@ -115,39 +179,49 @@ class NotesPoller {
             clearTimeout(this.pollTimer);
             this.pollTimer = null;
         }
-        console.log('⏸ Polling arrêté');
+        console.log('⏸ Mises à jour arrêtées');
     }
 }
 
 class MessagesPoller {
-    constructor(interval = 10000) {
+    constructor(interval = 10000, intervalleAvecFlux = 60000) {
         this.interval = interval;
+        this.intervalleAvecFlux = intervalleAvecFlux;
         this.isRunning = false;
         this.pollTimer = null;
+        this.etats = { etag: null };
+        this.sse = false;
     }
     
     start() {
         if (this.isRunning) return;
         this.isRunning = true;
-        console.log('📬 Polling messages démarré');
+        MessagesPoller.actif = this;
+        this.sse = FluxEvenements.ecouter(['message'], () => this.refresh());
+        console.log(this.sse ? '📬 Flux messages connecté, polling de contrôle' : '📬 Polling messages démarré');
         this.poll();
     }
     
-    async poll() {
+    async refresh() {
         if (!this.isRunning) return;
         
         try {
-            const response = await fetch('/api/messages/non-lus');
-            const data = await response.json();
+            const data = await fetchSiModifie('/api/messages/non-lus', this.etats);
             
-            if (data.success) {
+            if (data && data.success) {
                 this.updateUI(data.messages, data.count);
             }
         } catch (error) {
-            console.error('Erreur polling messages:', error);
+            console.error('Erreur rafraîchissement messages:', error);
         }
+    }
+    
+    async poll() {
+        if (!this.isRunning) return;
+        
+        await this.refresh();
         
-        this.pollTimer = setTimeout(() => this.poll(), this.interval);
+        this.pollTimer = setTimeout(() => this.poll(), this.sse ? this.intervalleAvecFlux : this.interval);
     }
     
     updateUI(messages, count) {
@@ -298,7 +372,8 @@ async function marquerLu(messageId) {
         const data = await response.json();
         
         if (data.success) {
-            // Le polling mettra à jour l'interface
+            // Pas d'événement pour une lecture : rafraîchir la liste ici
+            if (MessagesPoller.actif) MessagesPoller.actif.refresh();
         }
     } catch (error) {
         console.error('Erreur marquer lu:', error);
@@ -367,6 +442,7 @@ function createNotificationContainer() {
 // Export pour utilisation globale
 window.NotesPoller = NotesPoller;
 window.MessagesPoller = MessagesPoller;
+window.FluxEvenements = FluxEvenements;
 window.validerNote = validerNote;
 window.modifierNote = modifierNote;
 window.marquerLu = marquerLu;
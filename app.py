@@ -25,9 +25,21 @@ def create_app(config_name=None):
     app = Flask(__name__)
     app.config.from_object(config[config_name])
 
+    # Cache des entités de référence (avant tout accès à la base)
+    from helpers.cache import configurer_caches
+    configurer_caches(app.config['CACHE_REFERENCES_TAILLE'], app.config['CACHE_REFERENCES_TTL'])
+
     # Initialiser la base de données
     init_db(app)
 
+    # Journal d'audit différé (vidé à l'arrêt du processus)
+    from helpers.journal_audit import init_journal_audit
+    init_journal_audit(app)
+
+    # Exécuteur des travaux longs (génération de bulletins...)
+    from helpers.travaux import init_travaux
+    init_travaux(app)
+
     # Initialiser le planificateur de tâches automatiques
     init_scheduler(app)
 
@@ -40,6 +52,10 @@ def create_app(config_name=None):
     # Gestionnaires d'erreurs
     register_error_handlers(app)
 
+    # Compteur de requêtes évitées par les chargeurs par lots (mode debug)
+    from helpers.chargeurs import init_chargeurs
+    init_chargeurs(app)
+
     # Route d'accueil
     @app.route('/')
     def index():
@@ -0,0 +1,80 @@
+"""
+Benchmark du générateur automatique d'emploi du temps
+Instance synthétique : 50 filières, 200 enseignants, 80 salles (sans base de données)
+
+Usage: python benchmark_generateur_edt.py [graine]
+"""
+import sys
+import random
+import time as chrono
+
+from helpers.generateur_edt import SolveurEDT, PLAGES_HORAIRES, nombre_seances
+
+NB_FILIERES = 50
+NB_ENSEIGNANTS = 200
+NB_SALLES = 80
+COURS_PAR_FILIERE = 6
+JOURS = ['Lundi', 'Mardi', 'Mercredi', 'Jeudi', 'Vendredi']
+
+def construire_instance(graine):
+    """Génère séances, salles et indisponibilités aléatoires reproductibles"""
+    aleatoire = random.Random(graine)
+
+    salles = [
+        {'id_salle': i, 'capacite': aleatoire.choice([30, 40, 50, 60, 80, 120])}
+        for i in range(1, NB_SALLES + 1)
+    ]
+
+    seances = []
+    id_cours = 0
+    for id_filiere in range(1, NB_FILIERES + 1):
+        effectif = aleatoire.randint(20, 70)
+        for _ in range(COURS_PAR_FILIERE):
+            id_cours += 1
+            id_enseignant = aleatoire.randint(1, NB_ENSEIGNANTS)
+            for _ in range(nombre_seances(aleatoire.choice([2, 3, 4]))):
+                seances.append({
+                    'id_cours': id_cours,
+                    'id_enseignant': id_enseignant,
+                    'id_filiere': id_filiere,
+                    'effectif': effectif
+                })
+
+    # Chaque enseignant déclare en moyenne une demi-journée d'indisponibilité
+    occupations = set()
+    for id_enseignant in range(1, NB_ENSEIGNANTS + 1):
+        jour = aleatoire.choice(JOURS)
+        debut = aleatoire.choice([0, 2])
+        occupations.add(('enseignant', id_enseignant, jour, debut))
+        occupations.add(('enseignant', id_enseignant, jour, debut + 1))
+
+    return seances, salles, occupations
+
+def verifier(seances, placements, occupations):
+    """Contrôle qu'aucune ressource n'est utilisée deux fois sur une plage"""
+    pris = set(occupations)
+    for indice, (jour, plage, id_salle) in placements.items():
+        seance = seances[indice]
+        for cle in (('enseignant', seance['id_enseignant'], jour, plage),
+                    ('filiere', seance['id_filiere'], jour, plage),
+                    ('salle', id_salle, jour, plage)):
+            if cle in pris:
+                return False
+            pris.add(cle)
+    return True
+
+if __name__ == '__main__':
+    graine = int(sys.argv[1]) if len(sys.argv) > 1 else 42
+    seances, salles, occupations = construire_instance(graine)
+
+    debut = chrono.perf_counter()
+    resultat = SolveurEDT(seances, salles, JOURS, occupations).resoudre()
+    duree = chrono.perf_counter() - debut
+
+    print(f"Filières: {NB_FILIERES}, enseignants: {NB_ENSEIGNANTS}, salles: {NB_SALLES}")
+    print(f"Grille: {len(JOURS)} jours x {len(PLAGES_HORAIRES)} plages")
+    print(f"Séances: {len(seances)}")
+    print(f"Placées: {len(resultat['placements'])}")
+    print(f"Non placées: {len(resultat['non_placees'])}")
+    print(f"Sans conflit: {'oui' if verifier(seances, resultat['placements'], occupations) else 'NON'}")
+    print(f"Temps: {duree * 1000:.1f} ms")
@@ -14,29 +14,23 @@ directeur_bp = Blueprint('directeur', __name__)
 def dashboard():
     """Tableau de bord Directeur"""
     from models.filieres import lister_filieres_actives
-    from models.etudiants import Etudiant
     from models.presences import detecter_absences_critiques
+    from models.statistiques import obtenir_stats_courantes
     
-    # Notes en attente
-    notes_attente = lister_notes_en_attente()
-    
-    # Conflits EDT
-    from models.emploi_temps import obtenir_semaine_courante, lister_edt_par_semaine
-    semaine = obtenir_semaine_courante()
-    creneaux = lister_edt_par_semaine(semaine)
+    # Compteurs (dernier instantané stats_daily)
+    stats = obtenir_stats_courantes()
     
     # Étudiants en difficulté
     alertes_presences = detecter_absences_critiques(seuil=75)
     
     # Statistiques générales
     filieres = lister_filieres_actives()
-    total_etudiants = db.session.query(Etudiant).count()
     
     return render_template('directeur/dashboard.html',
-                         notes_attente_count=len(notes_attente),
+                         notes_attente_count=stats.get('notes_en_attente', 0),
                          alertes_presences=alertes_presences[:10],
                          total_filieres=len(filieres),
-                         total_etudiants=total_etudiants)
+                         total_etudiants=stats.get('etudiants_total', 0))
 
 @directeur_bp.route('/notes/validation')
 @verifier_role_autorise(['DIRECTEUR'])
@@ -44,20 +38,31 @@ def validation_notes():
     """Liste des notes à valider"""
     notes = lister_notes_en_attente()
     
-    # Enrichir avec infos étudiant et cours
-    from models.etudiants import obtenir_etudiant_par_id, obtenir_infos_completes_etudiant
-    from models.cours import obtenir_cours_par_id
+    # Enrichir avec infos étudiant et cours (chargés par lots)
+    from models.etudiants import Etudiant, obtenir_etudiant_par_id
+    from models.cours import Cours, obtenir_cours_par_id
+    from models.utilisateurs import Utilisateur, obtenir_utilisateur_par_id
+    from models.filieres import Filiere, obtenir_filiere_par_id
+    from helpers.chargeurs import prevoir
+    
+    prevoir(Etudiant, [note.id_etudiant for note in notes])
+    prevoir(Cours, [note.id_cours for note in notes])
+    etudiants = {note.id_etudiant: obtenir_etudiant_par_id(note.id_etudiant) for note in notes}
+    prevoir(Utilisateur, [e.id_user for e in etudiants.values() if e])
+    prevoir(Filiere, [e.id_filiere for e in etudiants.values() if e])
     
     notes_enrichies = []
     for note in notes:
-        infos_etudiant = obtenir_infos_completes_etudiant(note.id_etudiant)
+        etudiant = etudiants[note.id_etudiant]
         cours = obtenir_cours_par_id(note.id_cours)
+        user = obtenir_utilisateur_par_id(etudiant.id_user) if etudiant else None
+        filiere = obtenir_filiere_par_id(etudiant.id_filiere) if etudiant else None
         
-        if infos_etudiant and cours:
+        if user and filiere and cours:
             notes_enrichies.append({
                 'note': note,
-                'etudiant': infos_etudiant['user'],
-                'filiere': infos_etudiant['filiere'],
+                'etudiant': user,
+                'filiere': filiere,
                 'cours': cours
             })
     
@@ -87,14 +92,13 @@ def valider_note_route(note_id):
 @verifier_role_autorise(['DIRECTEUR'])
 def conflits_edt():
     """Gestion des conflits EDT"""
-    from models.emploi_temps import lister_edt_par_semaine, obtenir_semaine_courante
+    from models.emploi_temps import lister_edt_par_semaine, obtenir_semaine_courante, detecter_conflits_semaine
     
     semaine = request.args.get('semaine', obtenir_semaine_courante(), type=int)
     creneaux = lister_edt_par_semaine(semaine)
     
-    # Détecter les conflits
-    conflits_detectes = []
-    # TODO: Implémenter détection conflits en temps réel
+    # Détecter les conflits (balayage de toute la semaine)
+    conflits_detectes = detecter_conflits_semaine(semaine)
     
     return render_template('directeur/conflits.html', 
                          creneaux=creneaux,
@@ -106,10 +110,22 @@ def conflits_edt():
 def rapports_pedagogiques():
     """Génération de rapports pédagogiques"""
     from models.filieres import lister_filieres_actives
+    from models.notes import obtenir_progression_filiere
     
     filieres = lister_filieres_actives()
     
-    return render_template('directeur/rapports.html', filieres=filieres)
+    # Courbe de progression lue dans les cumuls mensuels
+    filiere_id = request.args.get('filiere_id', type=int)
+    progression = obtenir_progression_filiere(
+        filiere_id,
+        mois_debut=request.args.get('mois_debut') or None,
+        mois_fin=request.args.get('mois_fin') or None
+    )
+    
+    return render_template('directeur/rapports.html',
+                         filieres=filieres,
+                         filiere_id=filiere_id,
+                         progression=progression)
 
 @directeur_bp.route('/utilisateurs')
 @verifier_role_autorise(['DIRECTEUR'])
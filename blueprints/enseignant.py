@@ -39,9 +39,12 @@ def emploi_temps():
     
     creneaux = lister_edt_enseignant(enseignant.id_enseignant, semaine)
     
-    # Enrichir avec infos cours et salle
-    from models.cours import obtenir_cours_par_id
-    from models.salles import obtenir_salle_par_id
+    # Enrichir avec infos cours et salle (chargés par lots)
+    from models.cours import Cours, obtenir_cours_par_id
+    from models.salles import Salle, obtenir_salle_par_id
+    from helpers.chargeurs import prevoir
+    prevoir(Cours, [creneau.id_cours for creneau in creneaux])
+    prevoir(Salle, [creneau.id_salle for creneau in creneaux])
     
     creneaux_enrichis = []
     for creneau in creneaux:
@@ -124,7 +127,9 @@ def saisir_notes():
     
     # Extraire les cours uniques
     cours_ids = list(set([c.id_cours for c in creneaux]))
-    from models.cours import obtenir_cours_par_id
+    from models.cours import Cours, obtenir_cours_par_id
+    from helpers.chargeurs import prevoir
+    prevoir(Cours, cours_ids)
     mes_cours = [obtenir_cours_par_id(cid) for cid in cours_ids]
     
     return render_template('enseignant/saisie_notes.html',
@@ -24,8 +24,8 @@ def dashboard():
     infos = obtenir_infos_completes_etudiant(etudiant.id_etudiant)
     
     # Moyenne et rang
-    moyenne = calculer_moyenne_etudiant(etudiant.id_etudiant)
-    rang = calculer_rang_etudiant(etudiant.id_etudiant)
+    classement = calculer_classement_filiere(etudiant.id_filiere)
+    moyenne, rang = obtenir_moyenne_et_rang(etudiant.id_etudiant, classement)
     
     # Prochain cours
     semaine = obtenir_semaine_courante()
@@ -59,10 +59,12 @@ def mes_notes():
     
     notes = lister_notes_etudiant(etudiant.id_etudiant, seulement_validees=True)
     moyenne = calculer_moyenne_etudiant(etudiant.id_etudiant)
+    progression = obtenir_progression_etudiant(etudiant.id_etudiant)
     
     return render_template('etudiant/notes.html',
                          notes=notes,
-                         moyenne=moyenne)
+                         moyenne=moyenne,
+                         progression=progression)
 
 @etudiant_bp.route('/bulletins')
 @verifier_role_autorise(['ETUDIANT'])
@@ -96,8 +98,10 @@ def profil():
             if obtenir_utilisateur_par_email(nouvel_email):
                 flash('Email déjà utilisé', 'danger')
             else:
+                from models.utilisateurs import invalider_cache_utilisateurs
                 infos['user'].email = nouvel_email
                 db.session.commit()
+                invalider_cache_utilisateurs(infos['user'].id_user)
                 flash('Email mis à jour', 'success')
         
         flash('Profil mis à jour', 'success')
@@ -139,6 +139,67 @@ def emploi_temps():
                          filieres=filieres,
                          jours=list(JOURS_ORDRE.keys()))
 
+@gestion1_bp.route('/edt/generer', methods=['POST'])
+@verifier_role_autorise(['GESTION_1', 'DIRECTEUR'])
+def generer_edt():
+    """Générer automatiquement la semaine d'une filière"""
+    filiere_id = request.form.get('filiere_id', type=int)
+    semaine = request.form.get('semaine', obtenir_semaine_courante(), type=int)
+    
+    if not filiere_id:
+        flash('Veuillez choisir une filière', 'danger')
+        return redirect(url_for('gestion1.emploi_temps', semaine=semaine))
+    
+    result = generer_edt_automatique([filiere_id], semaine)
+    
+    if result['crees']:
+        creer_log_audit(
+            session['user_id'],
+            ACTIONS_AUDIT['CREATION_EDT'],
+            table_affectee='emploi_du_temps',
+            details=f"Génération automatique semaine {semaine}: {result['crees']} créneau(x)",
+            ip_address=obtenir_ip_utilisateur()
+        )
+    
+    if result['success']:
+        flash(result['message'], 'success')
+    else:
+        details = ', '.join(result['non_placees'])
+        flash(f"{result['message']}{': ' + details if details else ''}", 'danger')
+    
+    return redirect(url_for('gestion1.emploi_temps', semaine=semaine, filiere_id=filiere_id))
+
+@gestion1_bp.route('/edt/cloner', methods=['POST'])
+@verifier_role_autorise(['GESTION_1', 'DIRECTEUR'])
+def cloner_edt():
+    """Répéter une semaine sur les semaines suivantes"""
+    semaine = request.form.get('semaine', obtenir_semaine_courante(), type=int)
+    semaine_fin = request.form.get('semaine_fin', type=int)
+    filiere_id = request.form.get('filiere_id', type=int)
+    
+    if not semaine_fin:
+        flash('Veuillez indiquer la dernière semaine', 'danger')
+        return redirect(url_for('gestion1.emploi_temps', semaine=semaine, filiere_id=filiere_id))
+    
+    result = cloner_semaine(semaine, semaine_fin, filiere_id)
+    
+    if result['success']:
+        creer_log_audit(
+            session['user_id'],
+            ACTIONS_AUDIT['CREATION_EDT'],
+            table_affectee='creneaux_recurrents',
+            details=f"Clonage semaine {semaine} jusqu'à {semaine_fin}: {result['crees']} créneau(x)",
+            ip_address=obtenir_ip_utilisateur()
+        )
+        flash(result['message'], 'success')
+    elif result['conflits']:
+        conflits_msg = ', '.join([c['message'] for c in result['conflits']])
+        flash(f"CONFLITS DÉTECTÉS: {conflits_msg}", 'danger')
+    else:
+        flash(result['message'], 'danger')
+    
+    return redirect(url_for('gestion1.emploi_temps', semaine=semaine, filiere_id=filiere_id))
+
 @gestion1_bp.route('/edt/nouveau', methods=['GET', 'POST'])
 @verifier_role_autorise(['GESTION_1', 'DIRECTEUR'])
 def nouveau_creneau():
@@ -190,10 +251,14 @@ def nouveau_creneau():
     salles = lister_salles_disponibles()
     
     from models.enseignants import lister_tous_enseignants
-    from models.utilisateurs import obtenir_utilisateur_par_id
+    from models.utilisateurs import Utilisateur, obtenir_utilisateur_par_id
+    from helpers.chargeurs import prevoir
+    
+    enseignants = lister_tous_enseignants()
+    prevoir(Utilisateur, [ens.id_user for ens in enseignants])
     
     enseignants_data = []
-    for ens in lister_tous_enseignants():
+    for ens in enseignants:
         user = obtenir_utilisateur_par_id(ens.id_user)
         if user:
             enseignants_data.append({
@@ -20,15 +20,14 @@ def dashboard():
     
     filieres = lister_filieres_actives()
     
-    # Statistiques
-    total_etudiants = db.session.query(Etudiant).count()
-    total_parents = db.session.query(Parent).count()
-    notes_attente = len(lister_notes_en_attente())
+    # Statistiques (dernier instantané stats_daily)
+    from models.statistiques import obtenir_stats_courantes
+    stats = obtenir_stats_courantes()
     
     return render_template('gestion2/dashboard.html',
-                         total_etudiants=total_etudiants,
-                         total_parents=total_parents,
-                         notes_attente=notes_attente,
+                         total_etudiants=stats.get('etudiants_total', 0),
+                         total_parents=stats.get('parents_total', 0),
+                         notes_attente=stats.get('notes_en_attente', 0),
                          filieres=filieres)
 
 @gestion2_bp.route('/etudiants')
@@ -49,19 +48,30 @@ def liste_etudiants():
     if filiere_id:
         query = query.filter(Etudiant.id_filiere == filiere_id)
     
-    etudiants_data = query.order_by(Utilisateur.nom, Utilisateur.prenom).all()
+    # Page lue en SQL par curseur sur (nom, prénom, id)
+    from flask import current_app
+    from helpers.pagination import paginer_requete
+    resultat = paginer_requete(
+        query,
+        [Utilisateur.nom, Utilisateur.prenom, Etudiant.id_etudiant],
+        page=request.args.get('page', 1, type=int),
+        par_page=current_app.config['ITEMS_PER_PAGE'],
+        curseur=request.args.get('curseur')
+    )
     
     etudiants = [{
         'etudiant': etud,
         'user': user,
         'filiere': fil
-    } for etud, user, fil in etudiants_data]
+    } for etud, user, fil in resultat['elements']]
     
     filieres = lister_filieres_actives()
     
     return render_template('gestion2/etudiants.html', 
                          etudiants=etudiants,
-                         filieres=filieres)
+                         filieres=filieres,
+                         filiere_id=filiere_id,
+                         resultat=resultat)
 
 @gestion2_bp.route('/etudiants/nouveau', methods=['GET', 'POST'])
 @verifier_role_autorise(['GESTION_2', 'DIRECTEUR'])
@@ -102,6 +112,45 @@ def nouvel_etudiant():
     
     return render_template('gestion2/etudiant_form.html', filieres=filieres)
 
+@gestion2_bp.route('/etudiants/import', methods=['GET', 'POST'])
+@verifier_role_autorise(['GESTION_2', 'DIRECTEUR'])
+def import_etudiants():
+    """Import massif d'étudiants Excel (matricules réservés en une plage)"""
+    from models.filieres import lister_filieres_actives
+    filieres = lister_filieres_actives()
+    
+    if request.method == 'POST':
+        fichier = request.files.get('fichier_etudiants')
+        filiere_id = request.form.get('id_filiere', type=int)
+        mot_de_passe = request.form.get('mot_de_passe', '')
+        
+        if not fichier or not fichier.filename.lower().endswith('.xlsx'):
+            flash('Fichier Excel (.xlsx) requis', 'danger')
+            return redirect(url_for('gestion2.import_etudiants'))
+        
+        result = importer_etudiants_excel(fichier, filiere_id, mot_de_passe)
+        
+        if result['importes']:
+            matricules = result['matricules']
+            creer_log_audit(
+                session['user_id'],
+                ACTIONS_AUDIT['IMPORT_ETUDIANTS'],
+                table_affectee='etudiants',
+                details=f"{fichier.filename}: {result['importes']}/{result['total']} étudiants importés "
+                        f"({matricules[0]} à {matricules[-1]})",
+                ip_address=obtenir_ip_utilisateur()
+            )
+            flash(f"{result['importes']} étudiant(s) importé(s) sur {result['total']} "
+                  f"(matricules {matricules[0]} à {matricules[-1]})", 'success')
+        
+        if result['erreurs']:
+            flash(f"{len(result['erreurs'])} erreur(s): " + '; '.join(result['erreurs'][:10]), 'warning')
+        
+        return render_template('gestion2/import_etudiants.html', filieres=filieres,
+                             rapport=result['rapport'])
+    
+    return render_template('gestion2/import_etudiants.html', filieres=filieres)
+
 @gestion2_bp.route('/notes/saisie', methods=['GET', 'POST'])
 @verifier_role_autorise(['GESTION_2', 'DIRECTEUR'])
 def saisie_notes():
@@ -142,40 +191,95 @@ def saisie_notes():
 def import_notes():
     """Import massif de notes Excel"""
     if request.method == 'POST':
-        # TODO: Implémenter parsing Excel avec openpyxl
-        flash('Fonctionnalité import Excel en développement', 'info')
-        return redirect(url_for('gestion2.import_notes'))
+        fichier = request.files.get('fichier_notes')
+        
+        if not fichier or not fichier.filename.lower().endswith('.xlsx'):
+            flash('Fichier Excel (.xlsx) requis', 'danger')
+            return redirect(url_for('gestion2.import_notes'))
+        
+        result = importer_notes_excel(fichier)
+        
+        if result['importees']:
+            creer_log_audit(
+                session['user_id'],
+                ACTIONS_AUDIT['IMPORT_NOTES'],
+                table_affectee='notes',
+                details=f"{fichier.filename}: {result['importees']}/{result['total']} notes importées",
+                ip_address=obtenir_ip_utilisateur()
+            )
+            flash(f"{result['importees']} note(s) importée(s) sur {result['total']}", 'success')
+        
+        if result['erreurs']:
+            flash(f"{len(result['erreurs'])} erreur(s): " + '; '.join(result['erreurs'][:10]), 'warning')
+        
+        return render_template('gestion2/import_notes.html', rapport=result['rapport'])
     
     return render_template('gestion2/import_notes.html')
 
 @gestion2_bp.route('/bulletins/generer', methods=['GET', 'POST'])
 @verifier_role_autorise(['GESTION_2', 'DIRECTEUR'])
 def generer_bulletins():
-    """Générer bulletins pour une filière"""
+    """Générer bulletins pour une filière (travail de fond, suivi sur la page)"""
     if request.method == 'POST':
         filiere_id = int(request.form.get('id_filiere'))
         annee = request.form.get('annee_academique')
         semestre = request.form.get('semestre')
         
-        result = generer_bulletins_masse_filiere(filiere_id, annee, semestre)
+        from helpers.travaux import soumettre_travail
+        result = soumettre_travail('bulletins_filiere', {
+            'id_filiere': filiere_id,
+            'annee_academique': annee,
+            'semestre': semestre
+        }, cree_par=session['user_id'])
         
-        if result['success']:
-            creer_log_audit(
-                session['user_id'],
-                ACTIONS_AUDIT['GENERATION_BULLETIN'],
-                details=f"Filière {filiere_id}, {annee} {semestre}",
-                ip_address=obtenir_ip_utilisateur()
-            )
-            flash(f"{result['generes']} bulletins générés", 'success')
-        else:
-            flash(f"Erreurs: {len(result['erreurs'])}", 'warning')
+        if not result['success']:
+            flash(result['message'], 'danger')
+            return redirect(url_for('gestion2.generer_bulletins'))
         
-        return redirect(url_for('gestion2.generer_bulletins'))
+        creer_log_audit(
+            session['user_id'],
+            ACTIONS_AUDIT['GENERATION_BULLETIN'],
+            table_affectee='travaux',
+            id_enregistrement=result['travail_id'],
+            details=f"Filière {filiere_id}, {annee} {semestre}",
+            ip_address=obtenir_ip_utilisateur()
+        )
+        flash('Génération des bulletins lancée', 'info')
+        return redirect(url_for('gestion2.generer_bulletins', travail=result['travail_id']))
     
     from models.filieres import lister_filieres_actives
     filieres = lister_filieres_actives()
     
-    return render_template('gestion2/generer_bulletins.html', filieres=filieres)
+    return render_template('gestion2/generer_bulletins.html', filieres=filieres,
+                         travail_id=request.args.get('travail', type=int))
+
+@gestion2_bp.route('/travaux/<int:id_travail>')
+@verifier_role_autorise(['GESTION_2', 'DIRECTEUR'])
+def statut_travail(id_travail):
+    """État d'un travail (JSON, à interroger jusqu'à 'termine')"""
+    from flask import jsonify
+    from models.travaux import obtenir_travail
+    
+    travail = obtenir_travail(id_travail)
+    if travail is None or (travail.cree_par != session['user_id'] and session.get('role') != 'DIRECTEUR'):
+        return jsonify({'success': False, 'message': 'Travail introuvable'}), 404
+    
+    return jsonify({
+        'success': True,
+        'travail': {
+            'id': travail.id_travail,
+            'type': travail.type_travail,
+            'statut': travail.statut,
+            'termine': travail.statut in ('Termine', 'Echec'),
+            'etape': travail.etape,
+            'fait': travail.fait,
+            'total': travail.total,
+            'resultat': travail.resultat,
+            'erreur': travail.erreur,
+            'date_creation': travail.date_creation.isoformat(),
+            'date_fin': travail.date_fin.isoformat() if travail.date_fin else None
+        }
+    })
 
 @gestion2_bp.route('/parents')
 @verifier_role_autorise(['GESTION_2', 'DIRECTEUR'])
@@ -183,16 +287,26 @@ def liste_parents():
     """Liste des parents"""
     from models.utilisateurs import Utilisateur
     
-    parents_data = db.session.query(Parent, Utilisateur).join(
+    from flask import current_app
+    from helpers.pagination import paginer_requete
+    
+    query = db.session.query(Parent, Utilisateur).join(
         Utilisateur, Parent.id_user == Utilisateur.id_user
-    ).order_by(Utilisateur.nom, Utilisateur.prenom).all()
+    )
+    resultat = paginer_requete(
+        query,
+        [Utilisateur.nom, Utilisateur.prenom, Parent.id_parent],
+        page=request.args.get('page', 1, type=int),
+        par_page=current_app.config['ITEMS_PER_PAGE'],
+        curseur=request.args.get('curseur')
+    )
     
     parents = [{
         'parent': parent,
         'user': user
-    } for parent, user in parents_data]
+    } for parent, user in resultat['elements']]
     
-    return render_template('gestion2/parents.html', parents=parents)
+    return render_template('gestion2/parents.html', parents=parents, resultat=resultat)
 
 @gestion2_bp.route('/parents/nouveau', methods=['GET', 'POST'])
 @verifier_role_autorise(['GESTION_2', 'DIRECTEUR'])
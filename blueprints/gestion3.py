@@ -91,6 +91,19 @@ def presences_creneau(edt_id):
                          presences_existantes=presences_existantes,
                          statuts=STATUTS_PRESENCE_VALIDES)
 
+@gestion3_bp.route('/presences/occurrence/<int:id_recurrent>/<int:semaine>')
+@verifier_role_autorise(['GESTION_3', 'DIRECTEUR'])
+def presences_occurrence(id_recurrent, semaine):
+    """Matérialiser une occurrence récurrente puis marquer ses présences"""
+    from models.emploi_temps import materialiser_occurrence
+    
+    result = materialiser_occurrence(id_recurrent, semaine)
+    if not result['success']:
+        flash(result['message'], 'danger')
+        return redirect(url_for('gestion3.marquer_presences'))
+    
+    return redirect(url_for('gestion3.presences_creneau', edt_id=result['edt_id']))
+
 @gestion3_bp.route('/presences/statistiques')
 @verifier_role_autorise(['GESTION_3', 'DIRECTEUR'])
 def statistiques_presences():
@@ -61,14 +61,15 @@ def notes_enfant(etudiant_id):
     
     infos = obtenir_infos_completes_etudiant(etudiant_id)
     notes = lister_notes_etudiant(etudiant_id, seulement_validees=True)
-    moyenne = calculer_moyenne_etudiant(etudiant_id)
-    rang = calculer_rang_etudiant(etudiant_id)
+    moyenne, rang = obtenir_moyenne_et_rang(etudiant_id)
+    progression = obtenir_progression_etudiant(etudiant_id)
     
     return render_template('parent/notes_enfant.html',
                          infos=infos,
                          notes=notes,
                          moyenne=moyenne,
-                         rang=rang)
+                         rang=rang,
+                         progression=progression)
 
 @parent_bp.route('/enfant/<int:etudiant_id>/assiduite')
 @verifier_role_autorise(['PARENT'])
@@ -81,14 +82,22 @@ def assiduite_enfant(etudiant_id):
         flash('Accès non autorisé', 'danger')
         return abort(403)
     
-    from models.presences import calculer_taux_presence_etudiant
+    from models.presences import calculer_taux_presence_etudiant, calculer_taux_presence_par_cours
     
     infos = obtenir_infos_completes_etudiant(etudiant_id)
-    taux_data = calculer_taux_presence_etudiant(etudiant_id)
+    taux = calculer_taux_presence_etudiant(etudiant_id)
+    taux_data = {
+        'taux_presence': taux['taux'] if taux['total'] else None,
+        'presences': taux['presents'],
+        'absences': taux['absents'],
+        'retards': taux['retards'],
+        'total': taux['total']
+    }
     
     return render_template('parent/assiduite_enfant.html',
                          infos=infos,
-                         taux_data=taux_data)
+                         taux_data=taux_data,
+                         taux_par_cours=calculer_taux_presence_par_cours(etudiant_id))
 
 @parent_bp.route('/notifications')
 @verifier_role_autorise(['PARENT'])
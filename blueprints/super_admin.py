@@ -4,8 +4,7 @@ Blueprint Super Administrateur - Gouvernance système
 from flask import Blueprint, render_template, request, redirect, url_for, flash, session
 from helpers.auth import verifier_role_autorise, obtenir_ip_utilisateur
 from models.utilisateurs import *
-from models.audit import creer_log_audit, ACTIONS_AUDIT, lister_audit_par_periode, obtenir_statistiques_audit
-from datetime import datetime, timedelta
+from models.audit import creer_log_audit, ACTIONS_AUDIT, obtenir_statistiques_audit, compter_actions_audit
 
 super_admin_bp = Blueprint('super_admin', __name__)
 
@@ -13,43 +12,97 @@ super_admin_bp = Blueprint('super_admin', __name__)
 @verifier_role_autorise(['SUPER_ADMIN'])
 def dashboard():
     """Tableau de bord Super Admin"""
-    from sqlalchemy import func
-    from models.utilisateurs import Utilisateur
+    from models.statistiques import obtenir_stats_courantes
     
-    # Statistiques utilisateurs par rôle
-    stats_roles = db.session.query(
-        Utilisateur.role,
-        func.count(Utilisateur.id_user).label('count')
-    ).group_by(Utilisateur.role).all()
+    # Statistiques utilisateurs par rôle (dernier instantané stats_daily)
+    stats = obtenir_stats_courantes()
+    stats_roles = sorted(stats['utilisateurs_role'].items())
     
     # Statistiques audit
     stats_audit = obtenir_statistiques_audit()
     
-    # Connexions dernières 24h
-    hier = datetime.now() - timedelta(days=1)
-    logs_recents = lister_audit_par_periode(hier, datetime.now())
-    connexions_24h = len([l for l in logs_recents if l.action == ACTIONS_AUDIT['CONNEXION']])
+    # Connexions dernières 24h (compteurs horaires)
+    connexions_24h = compter_actions_audit(action=ACTIONS_AUDIT['CONNEXION'], periode='24h')
     
     return render_template('super_admin/dashboard.html',
                          stats_roles=stats_roles,
                          stats_audit=stats_audit,
                          connexions_24h=connexions_24h)
 
+@super_admin_bp.route('/statistiques/tendance')
+@verifier_role_autorise(['SUPER_ADMIN', 'DIRECTEUR'])
+def tendance_statistiques():
+    """Série quotidienne d'un indicateur stats_daily (JSON pour les graphiques)"""
+    from flask import jsonify
+    from models.statistiques import obtenir_tendance
+    
+    indicateur = request.args.get('indicateur', 'etudiants_total')
+    cle = request.args.get('cle', '')
+    jours = min(request.args.get('jours', 30, type=int), 366)
+    
+    return jsonify({
+        'indicateur': indicateur,
+        'cle': cle,
+        'serie': obtenir_tendance(indicateur, cle, jours)
+    })
+
+@super_admin_bp.route('/planificateur')
+@verifier_role_autorise(['SUPER_ADMIN'])
+def etat_planificateur():
+    """Leader courant et dernières exécutions des tâches planifiées (JSON)"""
+    from flask import jsonify
+    from models.planificateur import obtenir_bail, lister_executions
+    from scheduler import NOM_BAIL
+
+    bail = obtenir_bail(NOM_BAIL)
+    executions = lister_executions(
+        id_tache=request.args.get('tache'),
+        limite=min(request.args.get('limite', 50, type=int), 500)
+    )
+
+    return jsonify({
+        'leader': {
+            'proprietaire': bail.proprietaire,
+            'expire_le': bail.expire_le.isoformat()
+        } if bail else None,
+        'executions': [{
+            'tache': execution.id_tache,
+            'proprietaire': execution.proprietaire,
+            'statut': execution.statut,
+            'debut': execution.date_debut.isoformat(),
+            'fin': execution.date_fin.isoformat() if execution.date_fin else None,
+            'duree_ms': execution.duree_ms,
+            'lignes': execution.lignes,
+            'message': execution.message
+        } for execution in executions]
+    })
+
 @super_admin_bp.route('/utilisateurs')
 @verifier_role_autorise(['SUPER_ADMIN'])
 def liste_utilisateurs():
     """Liste tous les utilisateurs"""
     role_filtre = request.args.get('role')
     
+    query = db.session.query(Utilisateur)
     if role_filtre:
-        utilisateurs = lister_utilisateurs_par_role(role_filtre)
-    else:
-        utilisateurs = db.session.query(Utilisateur).order_by(Utilisateur.nom, Utilisateur.prenom).all()
+        # Même filtre que lister_utilisateurs_par_role
+        query = query.filter_by(role=role_filtre, est_actif=True)
+    
+    from flask import current_app
+    from helpers.pagination import paginer_requete
+    resultat = paginer_requete(
+        query,
+        [Utilisateur.nom, Utilisateur.prenom, Utilisateur.id_user],
+        page=request.args.get('page', 1, type=int),
+        par_page=current_app.config['ITEMS_PER_PAGE'],
+        curseur=request.args.get('curseur')
+    )
     
     return render_template('super_admin/utilisateurs.html',
-                         utilisateurs=utilisateurs,
+                         utilisateurs=resultat['elements'],
                          role_filtre=role_filtre,
-                         roles=ROLES_VALIDES)
+                         roles=ROLES_VALIDES,
+                         resultat=resultat)
 
 @super_admin_bp.route('/utilisateurs/nouveau', methods=['GET', 'POST'])
 @verifier_role_autorise(['SUPER_ADMIN'])
@@ -145,12 +198,20 @@ def audit():
     page = request.args.get('page', 1, type=int)
     limite = 50
     
+    # Entrées encore en file d'écriture
+    from helpers.journal_audit import vider_journal_audit
+    vider_journal_audit()
+    
     from models.audit import AuditUsage
     logs = db.session.query(AuditUsage).order_by(
         AuditUsage.date_action.desc()
     ).limit(limite).offset((page - 1) * limite).all()
     
-    # Enrichir avec noms utilisateurs
+    # Enrichir avec noms utilisateurs (chargés en un seul lot)
+    from models.utilisateurs import Utilisateur
+    from helpers.chargeurs import prevoir
+    prevoir(Utilisateur, [log.id_user for log in logs])
+    
     logs_enrichis = []
     for log in logs:
         user = obtenir_utilisateur_par_id(log.id_user)
@@ -171,4 +232,6 @@ def configuration():
         return redirect(url_for('super_admin.configuration'))
     
     from config import Config
-    return render_template('super_admin/configuration.html', config=Config)
+    from helpers.cache import statistiques_caches
+    return render_template('super_admin/configuration.html', config=Config,
+                         caches=statistiques_caches())
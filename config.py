@@ -32,6 +32,41 @@ class Config:
     MAX_CONTENT_LENGTH = int(os.getenv('MAX_CONTENT_LENGTH', 16 * 1024 * 1024))  # 16MB
     ALLOWED_EXTENSIONS = {'xlsx', 'xls', 'pdf'}
     
+    # Génération des bulletins PDF
+    BULLETINS_FOLDER = os.getenv('BULLETINS_FOLDER', os.path.join('static', 'bulletins'))
+    BULLETINS_WORKERS = int(os.getenv('BULLETINS_WORKERS', 0)) or None  # None = nombre de CPU
+    
+    # Cache des entités de référence (cours, filières, salles, utilisateurs)
+    CACHE_REFERENCES_TAILLE = int(os.getenv('CACHE_REFERENCES_TAILLE', 2048))
+    CACHE_REFERENCES_TTL = int(os.getenv('CACHE_REFERENCES_TTL', 300))  # secondes, 0 = désactivé
+    
+    # Journal d'audit : écriture différée par lots (helpers/journal_audit.py)
+    AUDIT_ASYNCHRONE = os.getenv('AUDIT_ASYNCHRONE', '1') == '1'
+    AUDIT_FILE_TAILLE = int(os.getenv('AUDIT_FILE_TAILLE', 10000))
+    AUDIT_LOT_TAILLE = int(os.getenv('AUDIT_LOT_TAILLE', 200))
+    AUDIT_INTERVALLE_MS = int(os.getenv('AUDIT_INTERVALLE_MS', 250))
+    AUDIT_DEBORDEMENT = os.getenv('AUDIT_DEBORDEMENT', 'synchrone')  # ou 'abandon'
+    
+    # Archivage de l'audit (tâche hebdomadaire)
+    AUDIT_RETENTION_JOURS = int(os.getenv('AUDIT_RETENTION_JOURS', 90))
+    AUDIT_ARCHIVE_DOSSIER = os.getenv('AUDIT_ARCHIVE_DOSSIER', 'archives/audit')
+    AUDIT_ARCHIVE_LOT = int(os.getenv('AUDIT_ARCHIVE_LOT', 5000))
+    
+    # Instantanés stats_daily des tableaux de bord
+    STATS_RAFRAICHISSEMENT_MINUTES = int(os.getenv('STATS_RAFRAICHISSEMENT_MINUTES', 15))
+    
+    # Planificateur : un seul processus leader exécute les tâches (bail en base)
+    SCHEDULER_ACTIF = os.getenv('SCHEDULER_ACTIF', '1') == '1'  # 0 = lancé à part (python scheduler.py)
+    SCHEDULER_BAIL_SECONDES = int(os.getenv('SCHEDULER_BAIL_SECONDES', 60))
+    SCHEDULER_BATTEMENT_SECONDES = int(os.getenv('SCHEDULER_BATTEMENT_SECONDES', 15))
+    SCHEDULER_HISTORIQUE_JOURS = int(os.getenv('SCHEDULER_HISTORIQUE_JOURS', 90))
+    
+    # Travaux longs (bulletins d'une filière) exécutés hors requête par un pool de threads
+    TRAVAUX_ACTIFS = os.getenv('TRAVAUX_ACTIFS', '1') == '1'
+    TRAVAUX_THREADS = int(os.getenv('TRAVAUX_THREADS', 1))
+    TRAVAUX_INTERVALLE_SECONDES = int(os.getenv('TRAVAUX_INTERVALLE_SECONDES', 2))
+    TRAVAUX_BAIL_SECONDES = int(os.getenv('TRAVAUX_BAIL_SECONDES', 120))  # sans battement : reprise
+    
     # Paramètres académiques
     ANNEE_ACADEMIQUE = os.getenv('ANNEE_ACADEMIQUE', '2025-2026')
     
@@ -68,6 +103,10 @@ class TestConfig(Config):
     """Configuration tests"""
     TESTING = True
     SQLALCHEMY_DATABASE_URI = 'sqlite:///:memory:'
+    CACHE_REFERENCES_TTL = 0
+    AUDIT_ASYNCHRONE = False
+    SCHEDULER_ACTIF = False
+    TRAVAUX_ACTIFS = False
 
 # Dictionnaire des configurations
 config = {
@@ -3,7 +3,7 @@ Configuration et initialisation de la base de données
 Architecture compatible SQLite/PostgreSQL/MySQL
 """
 from flask_sqlalchemy import SQLAlchemy
-from sqlalchemy import MetaData
+from sqlalchemy import MetaData, func
 
 # Convention de nommage pour les contraintes
 naming_convention = {
@@ -40,6 +40,10 @@ def init_db(app):
         import models.presences
         import models.bulletins
         import models.audit
+        import models.statistiques
+        import models.planificateur
+        import models.sequences
+        import models.travaux
         
         # Créer toutes les tables
         db.create_all()
@@ -47,6 +51,70 @@ def init_db(app):
         # Initialiser les données de base si nécessaire
         from helpers.init_data import initialiser_donnees_base
         initialiser_donnees_base()
+        
+        # Index et compteurs ajoutés après la création initiale des tables
+        from models.presences import initialiser_tables_presences
+        initialiser_tables_presences()
+        
+        from models.audit import initialiser_tables_audit
+        initialiser_tables_audit()
+        
+        from models.notes import initialiser_tables_notes
+        initialiser_tables_notes()
+
+def executer_upsert(table, lignes, cles, colonnes_maj=None, colonnes_inc=None, colonnes_min=None, colonnes_max=None):
+    """
+    INSERT ... ON CONFLICT en une seule instruction (sans commit)
+    
+    Args:
+        table: Table SQLAlchemy (Modele.__table__)
+        lignes: Liste de dict colonne -> valeur
+        cles: Colonnes de la contrainte d'unicité
+        colonnes_maj: Colonnes écrasées en cas de conflit (None = ignorer la ligne)
+        colonnes_inc: Colonnes additionnées à la valeur existante en cas de conflit (compteurs)
+        colonnes_min: Colonnes gardant le minimum de la valeur existante et de la nouvelle
+        colonnes_max: Colonnes gardant le maximum de la valeur existante et de la nouvelle
+    """
+    if not lignes:
+        return
+    
+    dialecte = db.session.get_bind().dialect.name
+    fusionner = colonnes_maj or colonnes_inc or colonnes_min or colonnes_max
+    
+    # min()/max() à deux arguments sont scalaires sous SQLite
+    plus_petit, plus_grand = (func.min, func.max) if dialecte == 'sqlite' else (func.least, func.greatest)
+    
+    def _fusion(nouvelles):
+        valeurs = {colonne: nouvelles[colonne] for colonne in colonnes_maj or []}
+        valeurs.update({colonne: table.c[colonne] + nouvelles[colonne] for colonne in colonnes_inc or []})
+        valeurs.update({colonne: plus_petit(table.c[colonne], nouvelles[colonne]) for colonne in colonnes_min or []})
+        valeurs.update({colonne: plus_grand(table.c[colonne], nouvelles[colonne]) for colonne in colonnes_max or []})
+        return valeurs
+    
+    if dialecte in ('sqlite', 'postgresql'):
+        if dialecte == 'sqlite':
+            from sqlalchemy.dialects.sqlite import insert
+        else:
+            from sqlalchemy.dialects.postgresql import insert
+        requete = insert(table)
+        if fusionner:
+            requete = requete.on_conflict_do_update(index_elements=cles, set_=_fusion(requete.excluded))
+        else:
+            requete = requete.on_conflict_do_nothing(index_elements=cles)
+    
+    elif dialecte in ('mysql', 'mariadb'):
+        from sqlalchemy.dialects.mysql import insert
+        requete = insert(table)
+        if fusionner:
+            valeurs = _fusion(requete.inserted)
+        else:
+            valeurs = {colonne: table.c[colonne] for colonne in cles[:1]}
+        requete = requete.on_duplicate_key_update(valeurs)
+    
+    else:
+        raise NotImplementedError(f"Upsert non supporté pour le dialecte {dialecte}")
+    
+    db.session.execute(requete, lignes)
 
 def get_db():
     """Retourne l'instance de la base de données"""
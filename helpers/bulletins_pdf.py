@@ -0,0 +1,179 @@
+"""
+Helper Bulletins PDF - Rendu ReportLab des bulletins de notes
+Le rendu est fait dans un pool de processus à partir de données simples
+(dict/list) pour ne jamais transporter d'objets SQLAlchemy hors du processus web
+"""
+import os
+import logging
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from datetime import datetime
+
+# Vérifier si ReportLab est disponible
+try:
+    from reportlab.lib.pagesizes import A4
+    from reportlab.lib import colors
+    from reportlab.lib.units import cm
+    from reportlab.lib.enums import TA_CENTER
+    from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
+    from reportlab.platypus import SimpleDocTemplate, Table, TableStyle, Paragraph, Spacer
+    REPORTLAB_AVAILABLE = True
+except ImportError:
+    REPORTLAB_AVAILABLE = False
+
+logger = logging.getLogger(__name__)
+
+def obtenir_appreciation(moyenne):
+    """Retourne l'appréciation correspondant à une moyenne sur 20"""
+    if moyenne is None:
+        return 'Non classé'
+    if moyenne >= 16:
+        return 'Très Bien'
+    if moyenne >= 14:
+        return 'Bien'
+    if moyenne >= 12:
+        return 'Assez Bien'
+    if moyenne >= 10:
+        return 'Passable'
+    return 'Insuffisant'
+
+def nom_fichier_bulletin(matricule, annee_academique, semestre):
+    """Construit le nom du fichier PDF d'un bulletin"""
+    return f"bulletin_{matricule}_{semestre}_{annee_academique}.pdf"
+
+def rendre_bulletin_pdf(donnees, dossier):
+    """
+    Génère le PDF d'un bulletin (exécuté dans un processus du pool)
+
+    Args:
+        donnees: dict avec id_bulletin, matricule, nom, prenom, filiere, niveau,
+                 annee_academique, semestre, lignes, moyenne, rang, effectif, total_credits
+        dossier: Dossier de destination
+
+    Returns:
+        tuple: (id_bulletin, chemin_pdf ou None, message d'erreur ou None)
+    """
+    try:
+        chemin = os.path.join(dossier, nom_fichier_bulletin(
+            donnees['matricule'], donnees['annee_academique'], donnees['semestre']
+        ))
+        # Écriture atomique : un PDF interrompu ne remplace jamais un PDF valide
+        chemin_tmp = chemin + '.tmp'
+
+        styles = getSampleStyleSheet()
+        style_titre = ParagraphStyle(
+            'Titre', parent=styles['Heading1'], fontSize=16,
+            textColor=colors.HexColor('#1A365D'), alignment=TA_CENTER
+        )
+        style_sous_titre = ParagraphStyle(
+            'SousTitre', parent=styles['Normal'], fontSize=13,
+            alignment=TA_CENTER, spaceAfter=12
+        )
+
+        elements = [
+            Paragraph("UNIVERSITÉ INTERNATIONALE DES SCIENCES ET TECHNOLOGIES", style_titre),
+            Paragraph(f"BULLETIN DE NOTES - {donnees['semestre']} - {donnees['annee_academique']}", style_sous_titre),
+            Spacer(1, 0.5 * cm)
+        ]
+
+        infos = Table([
+            ['Nom et Prénom:', f"{donnees['nom']} {donnees['prenom']}"],
+            ['Matricule:', donnees['matricule']],
+            ['Filière:', f"{donnees['filiere']} - {donnees['niveau']}"],
+            ['Année Académique:', donnees['annee_academique']]
+        ], colWidths=[5 * cm, 10 * cm])
+        infos.setStyle(TableStyle([
+            ('BACKGROUND', (0, 0), (0, -1), colors.HexColor('#E8F4F8')),
+            ('FONTNAME', (0, 0), (0, -1), 'Helvetica-Bold'),
+            ('GRID', (0, 0), (-1, -1), 0.5, colors.grey)
+        ]))
+        elements.extend([infos, Spacer(1, 0.8 * cm)])
+
+        lignes = [['Matière', 'Type', 'Note', 'Crédits']]
+        for ligne in donnees['lignes']:
+            lignes.append([
+                ligne['libelle'],
+                ligne['type_evaluation'],
+                f"{ligne['valeur_note']:.2f}",
+                str(ligne['credit'])
+            ])
+        notes = Table(lignes, colWidths=[7 * cm, 3 * cm, 2.5 * cm, 2.5 * cm])
+        notes.setStyle(TableStyle([
+            ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#1A365D')),
+            ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
+            ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+            ('ALIGN', (1, 1), (-1, -1), 'CENTER'),
+            ('GRID', (0, 0), (-1, -1), 0.5, colors.black)
+        ]))
+        elements.extend([notes, Spacer(1, 0.8 * cm)])
+
+        moyenne = donnees['moyenne']
+        rang = donnees['rang']
+        resultats = Table([
+            ['Moyenne Générale:', f"{moyenne:.2f}/20" if moyenne is not None else '-'],
+            ['Classement:', f"{rang}/{donnees['effectif']}" if rang is not None else '-'],
+            ['Crédits:', str(donnees['total_credits'])],
+            ['Appréciation:', obtenir_appreciation(moyenne)]
+        ], colWidths=[6 * cm, 6 * cm])
+        resultats.setStyle(TableStyle([
+            ('FONTNAME', (0, 0), (-1, -1), 'Helvetica-Bold'),
+            ('GRID', (0, 0), (-1, -1), 0.5, colors.grey)
+        ]))
+        elements.extend([
+            resultats,
+            Spacer(1, 1 * cm),
+            Paragraph(f"<i>Bulletin généré le {datetime.now().strftime('%d/%m/%Y à %H:%M')}</i>", styles['Normal'])
+        ])
+
+        doc = SimpleDocTemplate(chemin_tmp, pagesize=A4,
+                                rightMargin=2 * cm, leftMargin=2 * cm,
+                                topMargin=2 * cm, bottomMargin=2 * cm)
+        doc.build(elements)
+        os.replace(chemin_tmp, chemin)
+
+        return (donnees['id_bulletin'], chemin, None)
+
+    except Exception as e:
+        return (donnees['id_bulletin'], None, str(e))
+
+def generer_pdfs_bulletins(taches, dossier, nb_workers=None, progression=None):
+    """
+    Génère les PDF d'un lot de bulletins dans un pool de processus
+
+    Args:
+        taches: Liste de dict (voir rendre_bulletin_pdf)
+        dossier: Dossier de destination (BULLETINS_FOLDER)
+        nb_workers: Nombre de processus (défaut: nombre de CPU)
+        progression: Callback optionnel progression(etape, fait, total)
+
+    Returns:
+        dict: {'chemins': {id_bulletin: chemin}, 'erreurs': {id_bulletin: message}}
+    """
+    chemins = {}
+    erreurs = {}
+
+    if not taches:
+        return {'chemins': chemins, 'erreurs': erreurs}
+
+    if not REPORTLAB_AVAILABLE:
+        logger.warning("ReportLab non disponible. Installation recommandée: pip install reportlab==4.0.7")
+        return {
+            'chemins': chemins,
+            'erreurs': {t['id_bulletin']: 'ReportLab non disponible' for t in taches}
+        }
+
+    os.makedirs(dossier, exist_ok=True)
+
+    with ProcessPoolExecutor(max_workers=nb_workers) as pool:
+        futures = [pool.submit(rendre_bulletin_pdf, tache, dossier) for tache in taches]
+
+        for fait, future in enumerate(as_completed(futures), start=1):
+            id_bulletin, chemin, erreur = future.result()
+            if erreur:
+                erreurs[id_bulletin] = erreur
+            else:
+                chemins[id_bulletin] = chemin
+
+            if progression:
+                progression('pdf', fait, len(taches))
+
+    return {'chemins': chemins, 'erreurs': erreurs}
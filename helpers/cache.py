@@ -0,0 +1,205 @@
+"""
+Helper Cache - Cache LRU avec expiration pour les entités de référence
+(cours, filières, salles, utilisateurs)
+
+Le cache est local au processus : chaque worker a le sien, la durée de vie
+(TTL) borne le délai avant qu'une modification faite par un autre worker
+soit visible. Les fonctions creer_* / modifier_* invalident les entrées
+concernées dans le processus qui écrit.
+"""
+import threading
+import time
+from collections import OrderedDict
+
+# Valeurs par défaut, remplacées par configurer_caches() au démarrage
+TAILLE_MAX_DEFAUT = 2048
+TTL_DEFAUT = 300
+
+class CacheLRU:
+    """
+    Dictionnaire borné : l'entrée la moins récemment utilisée est évincée
+    au-delà de taille_max, et toute entrée plus vieille que ttl secondes
+    est considérée absente.
+    """
+
+    def __init__(self, nom, taille_max=TAILLE_MAX_DEFAUT, ttl=TTL_DEFAUT):
+        self.nom = nom
+        self.taille_max = taille_max
+        self.ttl = ttl
+        self._entrees = OrderedDict()  # cle -> (expiration, valeur)
+        self._verrou = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def obtenir(self, cle):
+        """
+        Returns:
+            tuple: (trouvé: bool, valeur)
+        """
+        with self._verrou:
+            entree = self._entrees.get(cle)
+            if entree is not None:
+                expiration, valeur = entree
+                if expiration > time.monotonic():
+                    self._entrees.move_to_end(cle)
+                    self.hits += 1
+                    return True, valeur
+                del self._entrees[cle]
+            self.misses += 1
+            return False, None
+
+    def definir(self, cle, valeur):
+        """Ajoute ou remplace une entrée"""
+        if self.ttl <= 0 or self.taille_max <= 0:
+            return
+        with self._verrou:
+            self._entrees[cle] = (time.monotonic() + self.ttl, valeur)
+            self._entrees.move_to_end(cle)
+            while len(self._entrees) > self.taille_max:
+                self._entrees.popitem(last=False)
+                self.evictions += 1
+
+    def invalider(self, cle=None):
+        """Retire une entrée (ou vide le cache si cle est None)"""
+        with self._verrou:
+            if cle is None:
+                self._entrees.clear()
+            else:
+                self._entrees.pop(cle, None)
+
+    def statistiques(self):
+        """Compteurs du cache"""
+        with self._verrou:
+            total = self.hits + self.misses
+            return {
+                'nom': self.nom,
+                'entrees': len(self._entrees),
+                'taille_max': self.taille_max,
+                'ttl': self.ttl,
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'taux_hit': round(self.hits / total * 100, 2) if total else 0
+            }
+
+_caches = {}
+_verrou_registre = threading.Lock()
+_parametres = {'taille_max': TAILLE_MAX_DEFAUT, 'ttl': TTL_DEFAUT}
+
+def obtenir_cache(nom):
+    """Retourne le cache nommé, créé à la première utilisation"""
+    with _verrou_registre:
+        cache = _caches.get(nom)
+        if cache is None:
+            cache = _caches[nom] = CacheLRU(nom, **_parametres)
+        return cache
+
+def configurer_caches(taille_max=TAILLE_MAX_DEFAUT, ttl=TTL_DEFAUT):
+    """Applique la configuration à tous les caches (existants et futurs)"""
+    with _verrou_registre:
+        _parametres.update(taille_max=taille_max, ttl=ttl)
+        for cache in _caches.values():
+            cache.taille_max = taille_max
+            cache.ttl = ttl
+            cache.invalider()
+
+def invalider_caches():
+    """Vide tous les caches"""
+    with _verrou_registre:
+        caches = list(_caches.values())
+    for cache in caches:
+        cache.invalider()
+
+def statistiques_caches():
+    """Compteurs de tous les caches"""
+    with _verrou_registre:
+        caches = list(_caches.values())
+    return [cache.statistiques() for cache in caches]
+
+# ============================================================================
+# ENTITÉS SQLALCHEMY
+# ============================================================================
+
+def _valeurs_colonnes(instance):
+    """Copie des colonnes d'une instance (seule forme stockée dans le cache)"""
+    from sqlalchemy import inspect
+
+    return {attr.key: getattr(instance, attr.key) for attr in inspect(instance).mapper.column_attrs}
+
+def _rattacher(modele, valeurs):
+    """
+    Reconstruit une instance à partir des valeurs en cache et la rattache
+    à la session courante sans requête (merge load=False)
+    """
+    from sqlalchemy.orm import make_transient_to_detached
+    from database import db
+
+    instance = modele(**valeurs)
+    make_transient_to_detached(instance)
+    return db.session.merge(instance, load=False)
+
+def entite_en_cache(nom_cache, modele, cle, chargeur):
+    """
+    Lecture à travers le cache d'une entité
+
+    Args:
+        nom_cache: Nom du cache
+        modele: Classe du modèle SQLAlchemy
+        cle: Clé de cache (ID, code...)
+        chargeur: Fonction sans argument qui charge l'entité depuis la base
+
+    Returns:
+        Instance attachée à la session courante ou None
+    """
+    cache = obtenir_cache(nom_cache)
+    trouve, valeurs = cache.obtenir(cle)
+    if trouve:
+        return _rattacher(modele, valeurs)
+
+    instance = chargeur()
+    if instance is not None:
+        cache.definir(cle, _valeurs_colonnes(instance))
+    return instance
+
+def liste_en_cache(nom_cache, modele, cle, chargeur):
+    """
+    Lecture à travers le cache d'une liste d'entités (même principe)
+
+    Returns:
+        Liste d'instances attachées à la session courante
+    """
+    cache = obtenir_cache(nom_cache)
+    trouve, lignes = cache.obtenir(cle)
+    if trouve:
+        return [_rattacher(modele, valeurs) for valeurs in lignes]
+
+    instances = chargeur()
+    cache.definir(cle, [_valeurs_colonnes(instance) for instance in instances])
+    return instances
+
+def entites_en_cache(nom_cache, modele, cles, chargeur_lot):
+    """
+    Lecture à travers le cache d'un lot d'entités
+
+    Args:
+        chargeur_lot: Fonction (clés absentes du cache) -> {clé: instance}
+
+    Returns:
+        dict: {clé: instance attachée à la session courante}
+    """
+    cache = obtenir_cache(nom_cache)
+    resultats = {}
+    manquantes = []
+    for cle in cles:
+        trouve, valeurs = cache.obtenir(cle)
+        if trouve:
+            resultats[cle] = _rattacher(modele, valeurs)
+        else:
+            manquantes.append(cle)
+
+    if manquantes:
+        for cle, instance in chargeur_lot(manquantes).items():
+            cache.definir(cle, _valeurs_colonnes(instance))
+            resultats[cle] = instance
+    return resultats
@@ -0,0 +1,180 @@
+"""
+Helper Chargeurs - Chargement par lots des entités pendant une requête
+
+Un registre de chargeurs est attaché à flask.g : chaque entité demandée
+pendant la requête est mémorisée, et les identifiants annoncés à l'avance
+avec prevoir() sont chargés ensemble par une seule requête WHERE id IN (...).
+Hors requête HTTP (scripts, planificateur), les fonctions obtenir_*_par_id
+gardent leur comportement d'origine.
+"""
+from flask import g, has_request_context
+
+# Identifiants par requête IN (limite de variables de SQLite : 999)
+TAILLE_LOT = 500
+
+class ChargeurLots:
+    """
+    Mémo par requête HTTP d'un type d'entité, alimenté par lots
+    """
+
+    def __init__(self, nom, fonction_lot, fonction_unitaire=None):
+        """
+        Args:
+            nom: Nom du chargeur (table)
+            fonction_lot: Fonction (liste de clés) -> {clé: entité}
+            fonction_unitaire: Fonction (clé) -> entité, utilisée quand une
+                               seule clé est à charger (passe par le cache)
+        """
+        self.nom = nom
+        self.fonction_lot = fonction_lot
+        self.fonction_unitaire = fonction_unitaire
+        self._resultats = {}
+        self._attente = set()
+        self.appels = 0
+        self.chargements = 0
+
+    def prevoir(self, cles):
+        """Annonce des clés qui seront demandées (chargées au prochain accès)"""
+        self._attente.update(
+            cle for cle in cles if cle is not None and cle not in self._resultats
+        )
+
+    def charger(self, cle):
+        """Retourne l'entité (ou None), en chargeant toutes les clés en attente"""
+        self.appels += 1
+        if cle not in self._resultats:
+            self._attente.add(cle)
+            self._executer()
+        return self._resultats.get(cle)
+
+    def charger_plusieurs(self, cles):
+        """Liste d'entités dans l'ordre des clés"""
+        cles = list(cles)
+        self.prevoir(cles)
+        return [self.charger(cle) for cle in cles]
+
+    def oublier(self, cle=None):
+        """Retire une clé du mémo (toutes si cle est None) après une écriture"""
+        if cle is None:
+            self._resultats.clear()
+        else:
+            self._resultats.pop(cle, None)
+
+    def _executer(self):
+        cles = list(self._attente)
+        self._attente.clear()
+
+        if len(cles) == 1 and self.fonction_unitaire is not None:
+            self.chargements += 1
+            self._resultats[cles[0]] = self.fonction_unitaire(cles[0])
+            return
+
+        for debut in range(0, len(cles), TAILLE_LOT):
+            lot = cles[debut:debut + TAILLE_LOT]
+            self.chargements += 1
+            trouves = self.fonction_lot(lot)
+            for cle in lot:
+                self._resultats[cle] = trouves.get(cle)
+
+def obtenir_chargeur(nom, fonction_lot, fonction_unitaire=None):
+    """
+    Chargeur de la requête courante, créé à la première utilisation
+
+    Returns:
+        ChargeurLots ou None hors requête HTTP
+    """
+    if not has_request_context():
+        return None
+    registre = g.setdefault('_chargeurs', {})
+    chargeur = registre.get(nom)
+    if chargeur is None:
+        chargeur = registre[nom] = ChargeurLots(nom, fonction_lot, fonction_unitaire)
+    elif fonction_unitaire is not None:
+        # Créé par prevoir() : les fonctions du modèle remplacent celles par défaut
+        chargeur.fonction_lot = fonction_lot
+        chargeur.fonction_unitaire = fonction_unitaire
+    return chargeur
+
+def statistiques_chargeurs():
+    """
+    Compteurs de la requête courante
+
+    Returns:
+        dict: {'appels', 'chargements', 'requetes_evitees', 'details': {nom: (appels, chargements)}}
+    """
+    registre = g.get('_chargeurs', {}) if has_request_context() else {}
+    appels = sum(c.appels for c in registre.values())
+    chargements = sum(c.chargements for c in registre.values())
+    return {
+        'appels': appels,
+        'chargements': chargements,
+        'requetes_evitees': appels - chargements,
+        'details': {nom: (c.appels, c.chargements) for nom, c in registre.items()}
+    }
+
+# ============================================================================
+# ENTITÉS SQLALCHEMY
+# ============================================================================
+
+def _lot_par_cle_primaire(modele, cles):
+    """Charge les entités d'une liste de clés primaires en une requête"""
+    from sqlalchemy import inspect
+    from database import db
+
+    colonne = inspect(modele).primary_key[0]
+    instances = db.session.query(modele).filter(colonne.in_(cles)).all()
+    return {getattr(instance, colonne.key): instance for instance in instances}
+
+def charger_entite(modele, cle, unitaire, nom_cache=None):
+    """
+    Lecture d'une entité par clé primaire à travers le chargeur de la requête
+
+    Args:
+        modele: Classe du modèle SQLAlchemy
+        cle: Valeur de la clé primaire
+        unitaire: Fonction (clé) -> entité, utilisée hors requête HTTP ou
+                  quand aucune autre clé n'est en attente
+        nom_cache: Cache de référence consulté avant la requête par lot (optionnel)
+    """
+    def lot(cles):
+        if nom_cache is None:
+            return _lot_par_cle_primaire(modele, cles)
+        from helpers.cache import entites_en_cache
+        return entites_en_cache(nom_cache, modele, cles, lambda manquantes: _lot_par_cle_primaire(modele, manquantes))
+
+    chargeur = obtenir_chargeur(modele.__tablename__, lot, unitaire)
+    if chargeur is None:
+        return unitaire(cle)
+    return chargeur.charger(cle)
+
+def prevoir(modele, cles):
+    """
+    Annonce les clés primaires qui seront lues dans la requête courante :
+    le prochain obtenir_*_par_id les chargera toutes en une requête
+    """
+    chargeur = obtenir_chargeur(
+        modele.__tablename__,
+        lambda lot: _lot_par_cle_primaire(modele, lot)
+    )
+    if chargeur is not None:
+        chargeur.prevoir(cles)
+
+def init_chargeurs(app):
+    """
+    Limite le registre à la requête HTTP et journalise en mode debug le
+    nombre de requêtes évitées par les chargeurs (en-tête X-Requetes-Evitees)
+    """
+    @app.teardown_request
+    def liberer_chargeurs(exception=None):
+        g.pop('_chargeurs', None)
+
+    @app.after_request
+    def compter_requetes_evitees(response):
+        if app.debug and '_chargeurs' in g:
+            stats = statistiques_chargeurs()
+            response.headers['X-Requetes-Evitees'] = str(stats['requetes_evitees'])
+            app.logger.debug(
+                "Chargeurs: %d appels, %d chargements, %d requêtes évitées %s",
+                stats['appels'], stats['chargements'], stats['requetes_evitees'], stats['details']
+            )
+        return response
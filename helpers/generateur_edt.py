@@ -0,0 +1,209 @@
+"""
+Helper Générateur EDT - Solveur de construction automatique d'emploi du temps
+Indépendant de la base de données : reçoit des séances, des salles et les
+plages déjà occupées, et retourne une affectation sans conflit (RG01)
+"""
+from datetime import time
+
+# Grille horaire utilisée par le générateur (plages de 2 heures)
+PLAGES_HORAIRES = [
+    (time(8, 0), time(10, 0)),
+    (time(10, 15), time(12, 15)),
+    (time(13, 30), time(15, 30)),
+    (time(15, 45), time(17, 45))
+]
+DUREE_PLAGE_HEURES = 2
+
+def nombre_seances(heures_hebdo):
+    """Nombre de plages nécessaires pour couvrir un volume horaire hebdomadaire"""
+    return max(1, -(-int(heures_hebdo) // DUREE_PLAGE_HEURES))
+
+def plages_chevauchees(heure_debut, heure_fin):
+    """Indices des plages de la grille qui chevauchent [heure_debut, heure_fin)"""
+    return [
+        indice for indice, (debut, fin) in enumerate(PLAGES_HORAIRES)
+        if not (heure_fin <= debut or fin <= heure_debut)
+    ]
+
+class SolveurEDT:
+    """
+    Construit une semaine sans conflit enseignant / salle / filière
+
+    1. Passe gloutonne : les séances les plus contraintes d'abord, chacune
+       placée sur la plage la moins pénalisante (étalement sur la semaine)
+       dans la plus petite salle suffisante.
+    2. Recherche locale : pour chaque séance restée sans place, on tente de
+       déplacer l'unique séance qui bloque une plage vers une autre plage libre.
+    """
+
+    def __init__(self, seances, salles, jours, occupations=None, budget=20000):
+        """
+        Args:
+            seances: Liste de dict {id_cours, id_enseignant, id_filiere, effectif}
+            salles: Liste de dict {id_salle, capacite}
+            jours: Jours utilisables (ex: ['Lundi', ..., 'Vendredi'])
+            occupations: Ensemble de tuples (dimension, id, jour, plage) déjà pris
+                         ou interdits (créneaux existants, indisponibilités)
+            budget: Nombre maximal de tentatives de déplacement en recherche locale
+        """
+        self.seances = seances
+        self.salles = sorted(salles, key=lambda s: (s['capacite'], s['id_salle']))
+        self.jours = list(jours)
+        self.plages = [(jour, plage) for jour in self.jours for plage in range(len(PLAGES_HORAIRES))]
+        self.occupe = set(occupations or ())
+        self.budget = budget
+        self.placements = {}  # indice séance -> (jour, plage, id_salle)
+        self._occupants = {}  # (dimension, id, jour, plage) -> indice séance
+        self._charge_jour = {}  # (id_filiere, jour) -> nombre de séances
+        self._cours_jour = {}  # (id_cours, jour) -> nombre de séances
+
+    # ------------------------------------------------------------------
+    # Occupation
+    # ------------------------------------------------------------------
+
+    def _salle_libre(self, seance, jour, plage):
+        """Plus petite salle libre de capacité suffisante"""
+        for salle in self.salles:
+            if salle['capacite'] >= seance['effectif'] and \
+                    ('salle', salle['id_salle'], jour, plage) not in self.occupe:
+                return salle['id_salle']
+        return None
+
+    def _personnes_libres(self, seance, jour, plage):
+        return ('enseignant', seance['id_enseignant'], jour, plage) not in self.occupe and \
+            ('filiere', seance['id_filiere'], jour, plage) not in self.occupe
+
+    def _placer(self, indice, jour, plage, id_salle):
+        seance = self.seances[indice]
+        for cle in (('enseignant', seance['id_enseignant'], jour, plage),
+                    ('filiere', seance['id_filiere'], jour, plage),
+                    ('salle', id_salle, jour, plage)):
+            self.occupe.add(cle)
+            self._occupants[cle] = indice
+        self.placements[indice] = (jour, plage, id_salle)
+        cle_charge = (seance['id_filiere'], jour)
+        self._charge_jour[cle_charge] = self._charge_jour.get(cle_charge, 0) + 1
+        cle_cours = (seance['id_cours'], jour)
+        self._cours_jour[cle_cours] = self._cours_jour.get(cle_cours, 0) + 1
+
+    def _retirer(self, indice):
+        seance = self.seances[indice]
+        jour, plage, id_salle = self.placements.pop(indice)
+        for cle in (('enseignant', seance['id_enseignant'], jour, plage),
+                    ('filiere', seance['id_filiere'], jour, plage),
+                    ('salle', id_salle, jour, plage)):
+            self.occupe.discard(cle)
+            self._occupants.pop(cle, None)
+        self._charge_jour[(seance['id_filiere'], jour)] -= 1
+        self._cours_jour[(seance['id_cours'], jour)] -= 1
+
+    # ------------------------------------------------------------------
+    # Passe gloutonne
+    # ------------------------------------------------------------------
+
+    def _penalite(self, seance, jour, plage):
+        """Favorise l'étalement : pas deux séances d'un cours le même jour"""
+        penalite = self._charge_jour.get((seance['id_filiere'], jour), 0)
+        if self._cours_jour.get((seance['id_cours'], jour), 0):
+            penalite += 10
+        return penalite
+
+    def _meilleure_plage(self, indice, exclure=None):
+        seance = self.seances[indice]
+        meilleure = None
+        for jour, plage in self.plages:
+            if (jour, plage) == exclure or not self._personnes_libres(seance, jour, plage):
+                continue
+            id_salle = self._salle_libre(seance, jour, plage)
+            if id_salle is None:
+                continue
+            score = self._penalite(seance, jour, plage)
+            if meilleure is None or score < meilleure[0]:
+                meilleure = (score, jour, plage, id_salle)
+                if score == 0:
+                    break
+        return meilleure[1:] if meilleure else None
+
+    def _ordre_contraintes(self):
+        """Séances des enseignants et filières les plus chargés, grands effectifs d'abord"""
+        charge_enseignant = {}
+        charge_filiere = {}
+        for seance in self.seances:
+            charge_enseignant[seance['id_enseignant']] = charge_enseignant.get(seance['id_enseignant'], 0) + 1
+            charge_filiere[seance['id_filiere']] = charge_filiere.get(seance['id_filiere'], 0) + 1
+        return sorted(
+            range(len(self.seances)),
+            key=lambda i: (
+                -charge_enseignant[self.seances[i]['id_enseignant']],
+                -charge_filiere[self.seances[i]['id_filiere']],
+                -self.seances[i]['effectif']
+            )
+        )
+
+    # ------------------------------------------------------------------
+    # Recherche locale
+    # ------------------------------------------------------------------
+
+    def _bloqueurs(self, seance, jour, plage):
+        """Séances placées qui empêchent la séance d'occuper la plage"""
+        bloqueurs = set()
+        for cle in (('enseignant', seance['id_enseignant'], jour, plage),
+                    ('filiere', seance['id_filiere'], jour, plage)):
+            if cle in self.occupe:
+                if cle not in self._occupants:
+                    return None  # occupation externe : non déplaçable
+                bloqueurs.add(self._occupants[cle])
+        if not bloqueurs and self._salle_libre(seance, jour, plage) is None:
+            for salle in self.salles:
+                cle = ('salle', salle['id_salle'], jour, plage)
+                if salle['capacite'] >= seance['effectif'] and cle in self._occupants:
+                    bloqueurs.add(self._occupants[cle])
+                    break
+        return bloqueurs
+
+    def _reparer(self, indice):
+        """Place une séance en déplaçant une unique séance bloquante"""
+        seance = self.seances[indice]
+        for jour, plage in self.plages:
+            if self.budget <= 0:
+                return False
+            bloqueurs = self._bloqueurs(seance, jour, plage)
+            if not bloqueurs or len(bloqueurs) != 1:
+                continue
+
+            self.budget -= 1
+            bloqueur = bloqueurs.pop()
+            ancien = self.placements[bloqueur]
+            self._retirer(bloqueur)
+
+            id_salle = self._salle_libre(seance, jour, plage) \
+                if self._personnes_libres(seance, jour, plage) else None
+            if id_salle is not None:
+                self._placer(indice, jour, plage, id_salle)
+                nouvelle = self._meilleure_plage(bloqueur, exclure=(jour, plage))
+                if nouvelle:
+                    self._placer(bloqueur, *nouvelle)
+                    return True
+                self._retirer(indice)
+
+            self._placer(bloqueur, *ancien)
+        return False
+
+    # ------------------------------------------------------------------
+
+    def resoudre(self):
+        """
+        Returns:
+            dict: {'placements': {indice: (jour, plage, id_salle)}, 'non_placees': [indices]}
+        """
+        non_placees = []
+        for indice in self._ordre_contraintes():
+            choix = self._meilleure_plage(indice)
+            if choix:
+                self._placer(indice, *choix)
+            else:
+                non_placees.append(indice)
+
+        restantes = [indice for indice in non_placees if not self._reparer(indice)]
+
+        return {'placements': dict(self.placements), 'non_placees': restantes}
@@ -0,0 +1,57 @@
+"""
+Helper Import Excel - Lecture en flux des feuilles de calcul
+Les classeurs sont ouverts en lecture seule : la mémoire reste constante
+quelle que soit la taille de la feuille
+"""
+import unicodedata
+
+# Vérifier si openpyxl est disponible
+try:
+    import openpyxl
+    OPENPYXL_AVAILABLE = True
+except ImportError:
+    openpyxl = None
+    OPENPYXL_AVAILABLE = False
+
+def normaliser_entete(valeur):
+    """Normalise un libellé de colonne: 'Code Cours' -> 'code_cours'"""
+    texte = unicodedata.normalize('NFKD', str(valeur or '')).encode('ascii', 'ignore').decode()
+    return '_'.join(texte.strip().lower().replace('-', ' ').split())
+
+def lire_lignes_excel(fichier, colonnes):
+    """
+    Parcourt la feuille active ligne par ligne
+
+    La première ligne est l'en-tête : les colonnes sont retrouvées par leur
+    nom (insensible à la casse et aux accents), sinon par leur position.
+    Les lignes vides sont ignorées.
+
+    Args:
+        fichier: Chemin ou objet fichier (.xlsx)
+        colonnes: Noms normalisés attendus, dans l'ordre par défaut
+
+    Yields:
+        dict: {'ligne': numéro Excel, <colonne>: valeur, ...}
+    """
+    if not OPENPYXL_AVAILABLE:
+        raise RuntimeError("openpyxl non disponible. Installation recommandée: pip install openpyxl==3.1.2")
+
+    classeur = openpyxl.load_workbook(fichier, read_only=True, data_only=True)
+    try:
+        lignes = classeur.active.iter_rows(values_only=True)
+        entete = [normaliser_entete(v) for v in next(lignes, ())]
+
+        positions = {
+            colonne: entete.index(colonne) if colonne in entete else indice
+            for indice, colonne in enumerate(colonnes)
+        }
+
+        for numero, valeurs in enumerate(lignes, start=2):
+            if not valeurs or all(v is None or str(v).strip() == '' for v in valeurs):
+                continue
+            donnee = {'ligne': numero}
+            for colonne, position in positions.items():
+                donnee[colonne] = valeurs[position] if position < len(valeurs) else None
+            yield donnee
+    finally:
+        classeur.close()
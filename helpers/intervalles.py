@@ -0,0 +1,77 @@
+"""
+Helper Intervalles - Liste triée d'intervalles horaires avec recherche de chevauchement
+Utilisée par l'index des conflits EDT (RG01)
+"""
+from bisect import bisect_left, bisect_right
+
+class ListeIntervalles:
+    """
+    Intervalles [debut, fin) triés par début
+
+    Un tableau des fins maximales cumulées permet d'arrêter la recherche
+    dès qu'aucun intervalle antérieur ne peut plus chevaucher. Une requête
+    coûte O(log n + m), où m est le nombre d'intervalles parcourus à rebours
+    avant cet arrêt : m <= k + 1 (k chevauchements retournés) quand les
+    fins croissent avec les débuts, mais un intervalle long placé tôt
+    maintient les fins maximales et m peut atteindre n. Ajout et retrait
+    coûtent O(n) (insertion dans les listes et recalcul des fins maximales).
+
+    Adapté aux listes de l'index EDT, une par (jour, ressource), qui ne
+    comptent que quelques créneaux ; pas un arbre d'intervalles.
+    """
+
+    def __init__(self):
+        self._debuts = []
+        self._elements = []  # (debut, fin, identifiant)
+        self._fins_max = []
+
+    def __len__(self):
+        return len(self._elements)
+
+    def _recalculer_fins_max(self, depuis):
+        """Recalcule les fins maximales cumulées à partir d'une position"""
+        del self._fins_max[depuis:]
+        fin_max = self._fins_max[-1] if self._fins_max else None
+        for _, fin, _ in self._elements[depuis:]:
+            fin_max = fin if fin_max is None or fin > fin_max else fin_max
+            self._fins_max.append(fin_max)
+
+    def ajouter(self, debut, fin, identifiant):
+        """Ajoute un intervalle"""
+        position = bisect_right(self._debuts, debut)
+        self._debuts.insert(position, debut)
+        self._elements.insert(position, (debut, fin, identifiant))
+        self._recalculer_fins_max(position)
+
+    def retirer(self, identifiant):
+        """Retire un intervalle par son identifiant (sans effet s'il est absent)"""
+        for position, element in enumerate(self._elements):
+            if element[2] == identifiant:
+                del self._debuts[position]
+                del self._elements[position]
+                self._recalculer_fins_max(position)
+                return True
+        return False
+
+    def chevauchements(self, debut, fin, exclure=None):
+        """
+        Retourne les identifiants des intervalles qui chevauchent [debut, fin)
+
+        Args:
+            debut, fin: Plage recherchée
+            exclure: Identifiant à ignorer (créneau en cours de modification)
+
+        Returns:
+            list d'identifiants
+        """
+        resultats = []
+        position = bisect_left(self._debuts, fin) - 1
+
+        while position >= 0 and self._fins_max[position] > debut:
+            _, fin_element, identifiant = self._elements[position]
+            if fin_element > debut and identifiant != exclure:
+                resultats.append(identifiant)
+            position -= 1
+
+        resultats.reverse()
+        return resultats
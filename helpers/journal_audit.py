@@ -0,0 +1,179 @@
+"""
+Helper Journal d'audit - Écriture différée et groupée des logs d'audit
+
+creer_log_audit() dépose l'entrée dans une file bornée en mémoire ; un
+thread d'arrière-plan la vide par lots (un INSERT executemany, la mise à
+jour des compteurs horaires et un seul commit) toutes les AUDIT_INTERVALLE_MS ms ou dès AUDIT_LOT_TAILLE
+entrées. La file est vidée à l'arrêt du processus. Quand la file est
+pleine, AUDIT_DEBORDEMENT décide : 'synchrone' écrit l'entrée directement
+(aucune perte, la requête attend), 'abandon' la compte comme perdue.
+"""
+import atexit
+import logging
+import os
+import queue
+import threading
+
+logger = logging.getLogger(__name__)
+
+DEBORDEMENTS = ('synchrone', 'abandon')
+
+class JournalAudit:
+    """File d'attente des entrées d'audit et thread d'écriture"""
+
+    def __init__(self, app, taille_file=10000, taille_lot=200, intervalle_ms=250, debordement='synchrone'):
+        if debordement not in DEBORDEMENTS:
+            raise ValueError(f"AUDIT_DEBORDEMENT invalide: {debordement}")
+        self.app = app
+        self.taille_lot = taille_lot
+        self.intervalle = intervalle_ms / 1000
+        self.debordement = debordement
+        self._file = queue.Queue(maxsize=taille_file)
+        self._arret = threading.Event()
+        self._lot_pret = threading.Event()
+        self._verrou = threading.Lock()
+        self._thread = None
+        self._pid = None
+        self.ecrites = 0
+        self.perdues = 0
+        self.synchrones = 0
+
+    def ajouter(self, valeurs):
+        """
+        Dépose une entrée (colonnes de audit_usage)
+
+        Returns:
+            bool: True si l'entrée est en file ou écrite, False si perdue
+        """
+        self._demarrer()
+        try:
+            self._file.put_nowait(valeurs)
+            if self._file.qsize() >= self.taille_lot:
+                self._lot_pret.set()
+            return True
+        except queue.Full:
+            if self.debordement == 'abandon':
+                self.perdues += 1
+                return False
+            self.synchrones += 1
+            self._ecrire([valeurs])
+            return True
+
+    def vider(self):
+        """Écrit immédiatement tout ce qui est en file"""
+        with self._verrou:
+            while True:
+                lot = self._prendre_lot()
+                if not lot:
+                    return
+                self._ecrire(lot)
+
+    def arreter(self):
+        """Arrête le thread puis écrit les entrées restantes"""
+        self._arret.set()
+        self._lot_pret.set()
+        if self._thread is not None and self._thread.is_alive():
+            self._thread.join(timeout=5)
+        self.vider()
+
+    def statistiques(self):
+        """Compteurs du journal"""
+        return {
+            'en_attente': self._file.qsize(),
+            'ecrites': self.ecrites,
+            'synchrones': self.synchrones,
+            'perdues': self.perdues
+        }
+
+    def _demarrer(self):
+        # Thread (re)créé dans chaque processus (workers forkés)
+        if self._thread is not None and self._thread.is_alive() and self._pid == os.getpid():
+            return
+        with self._verrou:
+            if self._thread is not None and self._thread.is_alive() and self._pid == os.getpid():
+                return
+            self._arret.clear()
+            self._pid = os.getpid()
+            self._thread = threading.Thread(target=self._boucle, name='journal-audit', daemon=True)
+            self._thread.start()
+
+    def _prendre_lot(self):
+        lot = []
+        try:
+            while len(lot) < self.taille_lot:
+                lot.append(self._file.get_nowait())
+        except queue.Empty:
+            pass
+        return lot
+
+    def _boucle(self):
+        # Réveil toutes les intervalle secondes, ou plus tôt dès qu'un lot est plein
+        while not self._arret.is_set():
+            self._lot_pret.wait(self.intervalle)
+            self._lot_pret.clear()
+            self.vider()
+
+    def _ecrire(self, lot):
+        """Un INSERT multi-lignes et un commit par lot ; entrée par entrée si le lot échoue"""
+        from database import db
+
+        try:
+            with self.app.app_context():
+                try:
+                    self._inserer(lot)
+                    self.ecrites += len(lot)
+                    return
+                except Exception as e:
+                    db.session.rollback()
+                    logger.warning("Lot d'audit de %d entrées refusé (%s), écriture entrée par entrée", len(lot), e)
+
+                # Seules les entrées fautives sont perdues
+                for entree in lot:
+                    try:
+                        self._inserer([entree])
+                        self.ecrites += 1
+                    except Exception as e:
+                        db.session.rollback()
+                        self.perdues += 1
+                        logger.error("Écriture d'une entrée d'audit impossible: %s", e)
+        except Exception as e:
+            self.perdues += len(lot)
+            logger.error("Écriture de %d entrées d'audit impossible: %s", len(lot), e)
+
+    def _inserer(self, entrees):
+        from database import db
+        from models.audit import AuditUsage, incrementer_stats_audit
+
+        db.session.execute(AuditUsage.__table__.insert(), entrees)
+        incrementer_stats_audit(entrees)
+        db.session.commit()
+
+_journal = None
+
+def init_journal_audit(app):
+    """Active l'écriture différée si AUDIT_ASYNCHRONE est vrai"""
+    global _journal
+    if _journal is not None:
+        _journal.arreter()
+        _journal = None
+
+    if not app.config.get('AUDIT_ASYNCHRONE', False):
+        return
+
+    _journal = JournalAudit(
+        app,
+        taille_file=app.config.get('AUDIT_FILE_TAILLE', 10000),
+        taille_lot=app.config.get('AUDIT_LOT_TAILLE', 200),
+        intervalle_ms=app.config.get('AUDIT_INTERVALLE_MS', 250),
+        debordement=app.config.get('AUDIT_DEBORDEMENT', 'synchrone')
+    )
+    atexit.register(_journal.arreter)
+
+def obtenir_journal():
+    """Journal actif ou None (écriture synchrone)"""
+    return _journal
+
+def vider_journal_audit():
+    """Écrit les entrées en attente (avant une lecture de l'audit)"""
+    if _journal is not None:
+        _journal.vider()
@@ -0,0 +1,106 @@
+"""
+Helper Pagination - Pagination côté SQL par curseur (keyset / seek)
+
+La page suivante est lue avec WHERE (nom, prenom, id) > (derniers affichés)
+au lieu d'un OFFSET : la page N coûte le même prix que la page 1. Le total
+n'est compté qu'à la première page puis transporté dans le curseur.
+"""
+import base64
+import json
+
+from sqlalchemy import tuple_
+
+def encoder_curseur(valeurs, sens, page, total):
+    """Curseur opaque transmis dans l'URL (?curseur=...)"""
+    contenu = json.dumps({'v': list(valeurs), 's': sens, 'p': page, 't': total}, separators=(',', ':'))
+    return base64.urlsafe_b64encode(contenu.encode()).decode().rstrip('=')
+
+def decoder_curseur(curseur):
+    """
+    Returns:
+        dict: {'v': valeurs, 's': 'apres'|'avant', 'p': page, 't': total} ou None si invalide
+    """
+    if not curseur:
+        return None
+    try:
+        contenu = json.loads(base64.urlsafe_b64decode(curseur + '=' * (-len(curseur) % 4)))
+        if (not isinstance(contenu, dict) or contenu.get('s') not in ('apres', 'avant')
+                or not isinstance(contenu.get('v'), list) or not isinstance(contenu.get('p'), int)):
+            return None
+        return contenu
+    except (ValueError, TypeError):
+        return None
+
+def paginer_requete(query, colonnes_tri, page=1, par_page=20, curseur=None, descendant=False):
+    """
+    Pagine une requête SQLAlchemy dans la base
+
+    Args:
+        query: Requête SQLAlchemy filtrée, sans order_by
+        colonnes_tri: Colonnes de tri (texte ou nombres, non nulles), la dernière
+                      doit être unique (clé primaire)
+        page: Numéro de page, utilisé sans curseur (OFFSET)
+        par_page: Nombre d'éléments par page
+        curseur: Curseur reçu d'une page précédente (prioritaire sur page)
+        descendant: Tri décroissant
+
+    Returns:
+        dict: {'elements', 'page', 'par_page', 'total', 'total_pages',
+               'a_page_precedente', 'a_page_suivante',
+               'curseur_precedent', 'curseur_suivant'}
+    """
+    page = max(page or 1, 1)
+    position = decoder_curseur(curseur)
+    if position and len(position['v']) != len(colonnes_tri):
+        position = None
+
+    # Total : compté une fois puis transporté par le curseur
+    if position and position.get('t') is not None:
+        total = position['t']
+    else:
+        total = query.order_by(None).count()
+
+    nb_entites = len(query.column_descriptions)
+    cle = tuple_(*colonnes_tri)
+    requete = query.add_columns(*colonnes_tri)
+
+    # "avant" : on lit à rebours depuis le premier élément affiché
+    inverse = bool(position) and position['s'] == 'avant'
+    decroissant = descendant != inverse
+
+    if position:
+        page = max(position['p'], 1)
+        valeurs = tuple_(*position['v'])
+        requete = requete.filter(cle < valeurs if decroissant else cle > valeurs)
+
+    requete = requete.order_by(*[c.desc() if decroissant else c.asc() for c in colonnes_tri])
+    if not position:
+        requete = requete.offset((page - 1) * par_page)
+    lignes = requete.limit(par_page + 1).all()
+
+    encore = len(lignes) > par_page
+    lignes = lignes[:par_page]
+    if inverse:
+        lignes.reverse()
+
+    elements = [ligne[0] if nb_entites == 1 else tuple(ligne[:nb_entites]) for ligne in lignes]
+    cles = [list(ligne[nb_entites:]) for ligne in lignes]
+
+    a_precedente = page > 1
+    a_suivante = encore if not inverse else True
+    if inverse:
+        a_precedente = encore
+
+    total_pages = (total + par_page - 1) // par_page if total else 0
+
+    return {
+        'elements': elements,
+        'page': page,
+        'par_page': par_page,
+        'total': total,
+        'total_pages': total_pages,
+        'a_page_precedente': a_precedente,
+        'a_page_suivante': a_suivante,
+        'curseur_precedent': encoder_curseur(cles[0], 'avant', page - 1, total) if cles and a_precedente else None,
+        'curseur_suivant': encoder_curseur(cles[-1], 'apres', page + 1, total) if cles and a_suivante else None
+    }
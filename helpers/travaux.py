@@ -0,0 +1,195 @@
+"""
+Helper Travaux - Exécution des opérations longues hors requête HTTP
+
+La route met le travail en file (models.travaux.creer_travail) et renvoie
+son ID ; le client suit l'avancement via la route de statut. Un pool de
+threads par processus réserve les travaux en base : plusieurs workers
+peuvent tourner sur la même base sans prendre deux fois le même travail.
+Pendant l'exécution, un thread de battement prolonge le bail toutes les
+TRAVAUX_BAIL_SECONDES / 3 secondes ; un travail dont l'exécuteur a disparu
+est repris (ou passé en échec s'il a épuisé ses tentatives).
+"""
+import atexit
+import logging
+import os
+import socket
+import threading
+
+logger = logging.getLogger(__name__)
+
+# Fonctions de traitement par type de travail : type -> (fonction, max_tentatives)
+TACHES = {}
+
+def tache(type_travail, max_tentatives=1):
+    """
+    Décorateur d'enregistrement d'une tâche
+
+    La fonction reçoit progression(etape, fait, total) puis les paramètres
+    du travail ; elle retourne un dict sérialisable en JSON.
+    """
+    def decorator(f):
+        TACHES[type_travail] = (f, max_tentatives)
+        return f
+    return decorator
+
+def soumettre_travail(type_travail, parametres=None, cree_par=None):
+    """
+    Met un travail en file et réveille l'exécuteur de ce processus
+
+    Returns:
+        dict: {'success': bool, 'message': str, 'travail_id': int}
+    """
+    from models.travaux import creer_travail
+
+    if type_travail not in TACHES:
+        return {'success': False, 'message': f'Type de travail inconnu: {type_travail}'}
+
+    result = creer_travail(type_travail, parametres, cree_par, max_tentatives=TACHES[type_travail][1])
+    if result['success'] and _executeur is not None:
+        _executeur.demarrer()
+        _executeur.reveiller()
+    return result
+
+class Battement:
+    """Prolonge le bail d'un travail à intervalle régulier pendant son exécution"""
+
+    def __init__(self, app, id_travail, executeur, intervalle):
+        self.app = app
+        self.id_travail = id_travail
+        self.executeur = executeur
+        self.intervalle = intervalle
+        self._arret = threading.Event()
+        self._thread = threading.Thread(target=self._boucle, name=f'battement-{id_travail}', daemon=True)
+
+    def __enter__(self):
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self._arret.set()
+        self._thread.join()
+
+    def _boucle(self):
+        from models.travaux import renouveler_travail
+
+        while not self._arret.wait(self.intervalle):
+            with self.app.app_context():
+                if not renouveler_travail(self.id_travail, self.executeur):
+                    logger.warning("Bail du travail %s perdu par %s", self.id_travail, self.executeur)
+                    return
+
+def executer_travail(app, travail, executeur, bail_secondes):
+    """
+    Exécute un travail réservé et enregistre son issue
+
+    Returns:
+        bool: True si l'issue a été enregistrée (False si le bail a été repris)
+    """
+    from models.travaux import renouveler_travail, terminer_travail
+
+    id_travail = travail['id_travail']
+    entree = TACHES.get(travail['type_travail'])
+
+    def progression(etape, fait, total):
+        renouveler_travail(id_travail, executeur, etape, fait, total)
+
+    try:
+        if entree is None:
+            raise ValueError(f"Type de travail inconnu: {travail['type_travail']}")
+        with Battement(app, id_travail, executeur, max(1, bail_secondes / 3)):
+            resultat = entree[0](progression, **(travail['parametres'] or {}))
+    except Exception as e:
+        logger.exception("Travail %s (%s) en échec", id_travail, travail['type_travail'])
+        return terminer_travail(id_travail, executeur, False, erreur=str(e))
+
+    return terminer_travail(id_travail, executeur, resultat.get('success', True), resultat=resultat)
+
+class ExecuteurTravaux:
+    """Pool de threads qui réservent et exécutent les travaux"""
+
+    def __init__(self, app, nb_threads=1, intervalle=2, bail_secondes=120):
+        self.app = app
+        self.nb_threads = nb_threads
+        self.intervalle = intervalle
+        self.bail_secondes = bail_secondes
+        self._arret = threading.Event()
+        self._reveil = threading.Event()
+        self._verrou = threading.Lock()
+        self._threads = []
+        self._pid = None
+
+    def demarrer(self):
+        # Threads (re)créés dans chaque processus (workers forkés)
+        if self._pid == os.getpid() and all(t.is_alive() for t in self._threads):
+            return
+        with self._verrou:
+            if self._pid == os.getpid() and all(t.is_alive() for t in self._threads):
+                return
+            self._arret.clear()
+            self._pid = os.getpid()
+            self._threads = [
+                threading.Thread(target=self._boucle, args=(f'{socket.gethostname()}:{self._pid}:{i}',),
+                                 name=f'travaux-{i}', daemon=True)
+                for i in range(self.nb_threads)
+            ]
+            for thread in self._threads:
+                thread.start()
+
+    def reveiller(self):
+        """Signale un nouveau travail aux threads en attente"""
+        self._reveil.set()
+
+    def arreter(self, delai=10):
+        """Arrête les threads ; un travail en cours est repris après expiration du bail"""
+        self._arret.set()
+        self._reveil.set()
+        for thread in self._threads:
+            thread.join(timeout=delai)
+
+    def _boucle(self, executeur):
+        from models.travaux import reserver_travail
+
+        while not self._arret.is_set():
+            try:
+                with self.app.app_context():
+                    travail = reserver_travail(executeur, self.bail_secondes)
+                    if travail is not None:
+                        executer_travail(self.app, travail, executeur, self.bail_secondes)
+                        continue
+            except Exception as e:
+                logger.error("Erreur de l'exécuteur de travaux %s: %s", executeur, e)
+            self._reveil.wait(self.intervalle)
+            self._reveil.clear()
+
+_executeur = None
+
+def init_travaux(app):
+    """Démarre l'exécuteur de travaux si TRAVAUX_ACTIFS est vrai"""
+    global _executeur
+    if _executeur is not None:
+        _executeur.arreter()
+        _executeur = None
+
+    if not app.config.get('TRAVAUX_ACTIFS', False):
+        return
+
+    _executeur = ExecuteurTravaux(
+        app,
+        nb_threads=app.config.get('TRAVAUX_THREADS', 1),
+        intervalle=app.config.get('TRAVAUX_INTERVALLE_SECONDES', 2),
+        bail_secondes=app.config.get('TRAVAUX_BAIL_SECONDES', 120)
+    )
+    _executeur.demarrer()
+    atexit.register(_executeur.arreter)
+
+# ============================================================================
+# TÂCHES
+# ============================================================================
+
+@tache('bulletins_filiere')
+def _generer_bulletins_filiere(progression, id_filiere, annee_academique, semestre):
+    """Bulletins et PDF d'une filière (reprenable : relancer reprend les PDF manquants)"""
+    from models.bulletins import generer_bulletins_masse_filiere
+
+    return generer_bulletins_masse_filiere(id_filiere, annee_academique, semestre,
+                                           generer_pdf=True, progression=progression)
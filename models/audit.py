@@ -2,7 +2,7 @@
 Modèle Audit - Traçabilité et logs système
 """
 from database import db
-from datetime import datetime
+from datetime import datetime, timedelta
 
 class AuditUsage(db.Model):
     """Table audit_usage - Traçabilité des actions"""
@@ -20,6 +20,30 @@ class AuditUsage(db.Model):
     def __repr__(self):
         return f'<Audit {self.action} - User {self.id_user}>'
 
+class AuditStatHeure(db.Model):
+    """Table audit_stats_heure - Nombre d'actions par heure, action et utilisateur, tenu à jour à l'écriture"""
+    __tablename__ = 'audit_stats_heure'
+    
+    heure = db.Column(db.DateTime, primary_key=True)
+    action = db.Column(db.String(100), primary_key=True, index=True)
+    id_user = db.Column(db.Integer, primary_key=True, index=True)
+    nb_actions = db.Column(db.Integer, nullable=False, default=0)
+    
+    def __repr__(self):
+        return f'<AuditStatHeure {self.heure} {self.action} - User {self.id_user}: {self.nb_actions}>'
+
+class AuditStatJour(db.Model):
+    """Table audit_stats_jour - Nombre d'actions par jour, action et utilisateur (heures compactées à l'archivage)"""
+    __tablename__ = 'audit_stats_jour'
+    
+    jour = db.Column(db.Date, primary_key=True)
+    action = db.Column(db.String(100), primary_key=True, index=True)
+    id_user = db.Column(db.Integer, primary_key=True, index=True)
+    nb_actions = db.Column(db.Integer, nullable=False, default=0)
+    
+    def __repr__(self):
+        return f'<AuditStatJour {self.jour} {self.action} - User {self.id_user}: {self.nb_actions}>'
+
 # ============================================================================
 # FONCTIONS PROCÉDURALES - AUDIT
 # ============================================================================
@@ -39,7 +63,25 @@ def creer_log_audit(id_user, action, table_affectee=None, id_enregistrement=None
     
     Returns:
         dict: {'success': bool, 'audit_id': int}
+              (audit_id vaut None quand l'écriture est différée)
     """
+    from helpers.journal_audit import obtenir_journal
+    
+    journal = obtenir_journal()
+    if journal is not None:
+        ajoutee = journal.ajouter({
+            'id_user': id_user,
+            'action': action,
+            'table_affectee': table_affectee,
+            'id_enregistrement': id_enregistrement,
+            'details': details,
+            'ip_address': ip_address,
+            'date_action': datetime.utcnow()
+        })
+        if not ajoutee:
+            return {'success': False, 'message': "File d'audit pleine, entrée abandonnée"}
+        return {'success': True, 'audit_id': None}
+    
     try:
         audit = AuditUsage(
             id_user=id_user,
@@ -47,10 +89,12 @@ def creer_log_audit(id_user, action, table_affectee=None, id_enregistrement=None
             table_affectee=table_affectee,
             id_enregistrement=id_enregistrement,
             details=details,
-            ip_address=ip_address
+            ip_address=ip_address,
+            date_action=datetime.utcnow()
         )
         
         db.session.add(audit)
+        incrementer_stats_audit([{'id_user': id_user, 'action': action, 'date_action': audit.date_action}])
         db.session.commit()
         
         return {
@@ -62,6 +106,31 @@ def creer_log_audit(id_user, action, table_affectee=None, id_enregistrement=None
         db.session.rollback()
         return {'success': False, 'message': f'Erreur: {str(e)}'}
 
+def incrementer_stats_audit(logs):
+    """
+    Ajoute des logs aux compteurs horaires (sans commit)
+    
+    Un INSERT ... ON CONFLICT par lot : les logs sont d'abord regroupés
+    par (heure, action, utilisateur).
+    
+    Args:
+        logs: Liste de dict avec 'id_user', 'action', 'date_action'
+    """
+    from collections import Counter
+    from database import executer_upsert
+    
+    comptes = Counter(
+        (log['date_action'].replace(minute=0, second=0, microsecond=0), log['action'], log['id_user'])
+        for log in logs
+    )
+    executer_upsert(
+        AuditStatHeure.__table__,
+        [{'heure': heure, 'action': action, 'id_user': id_user, 'nb_actions': nb}
+         for (heure, action, id_user), nb in comptes.items()],
+        cles=['heure', 'action', 'id_user'],
+        colonnes_inc=['nb_actions']
+    )
+
 def lister_audit_par_utilisateur(id_user, limite=100):
     """Liste les actions d'un utilisateur"""
     return db.session.query(AuditUsage).filter_by(
@@ -95,33 +164,249 @@ def lister_audit_par_periode(date_debut, date_fin):
         AuditUsage.date_action.desc()
     ).all()
 
-def obtenir_statistiques_audit():
+def _depuis(periode):
+    """Début de la période '24h', '7j' ou '30j' (None = depuis toujours)"""
+    if periode is None:
+        return None
+    if periode not in PERIODES_AUDIT:
+        raise ValueError(f"Période d'audit inconnue: {periode}")
+    return datetime.utcnow().replace(minute=0, second=0, microsecond=0) - PERIODES_AUDIT[periode]
+
+def _compter_par(colonne_heure, colonne_jour, depuis):
+    """Somme des compteurs horaires et journaliers groupée par une colonne"""
+    from collections import Counter
+    from sqlalchemy import func
+    
+    requete = db.session.query(colonne_heure, func.sum(AuditStatHeure.nb_actions))
+    if depuis is not None:
+        requete = requete.filter(AuditStatHeure.heure >= depuis)
+    comptes = Counter(dict(requete.group_by(colonne_heure).all()))
+    
+    requete = db.session.query(colonne_jour, func.sum(AuditStatJour.nb_actions))
+    if depuis is not None:
+        requete = requete.filter(AuditStatJour.jour >= depuis.date())
+    comptes.update(dict(requete.group_by(colonne_jour).all()))
+    return comptes
+
+def compter_actions_audit(action=None, id_user=None, periode='24h'):
     """
-    Récupère des statistiques sur l'audit
+    Nombre d'actions sur une période, lu dans les compteurs
+    
+    Args:
+        action: Filtrer sur une action (optionnel)
+        id_user: Filtrer sur un utilisateur (optionnel)
+        periode: '24h', '7j', '30j' ou None (tout l'historique)
     
     Returns:
-        dict avec statistiques
+        int
     """
     from sqlalchemy import func
     
-    total_actions = db.session.query(func.count(AuditUsage.id_audit)).scalar() or 0
+    depuis = _depuis(periode)
+    total = 0
+    for modele, colonne, borne in ((AuditStatHeure, AuditStatHeure.heure, depuis),
+                                   (AuditStatJour, AuditStatJour.jour, depuis.date() if depuis else None)):
+        requete = db.session.query(func.sum(modele.nb_actions))
+        if borne is not None:
+            requete = requete.filter(colonne >= borne)
+        if action is not None:
+            requete = requete.filter(modele.action == action)
+        if id_user is not None:
+            requete = requete.filter(modele.id_user == id_user)
+        total += requete.scalar() or 0
+    return total
+
+def obtenir_statistiques_audit(periode=None):
+    """
+    Récupère des statistiques sur l'audit
     
-    actions_par_type = db.session.query(
-        AuditUsage.action,
-        func.count(AuditUsage.id_audit).label('count')
-    ).group_by(AuditUsage.action).order_by(func.count(AuditUsage.id_audit).desc()).limit(10).all()
+    Calculées depuis les compteurs audit_stats_heure / audit_stats_jour :
+    le coût ne dépend pas du nombre de logs. Les compteurs journaliers
+    sont à la granularité du jour (une période '7j' peut inclure quelques
+    heures de plus pour les jours compactés).
+    
+    Args:
+        periode: '24h', '7j', '30j' ou None (tout l'historique)
     
-    utilisateurs_actifs = db.session.query(
-        AuditUsage.id_user,
-        func.count(AuditUsage.id_audit).label('count')
-    ).group_by(AuditUsage.id_user).order_by(func.count(AuditUsage.id_audit).desc()).limit(10).all()
+    Returns:
+        dict avec statistiques
+    """
+    depuis = _depuis(periode)
+    actions = _compter_par(AuditStatHeure.action, AuditStatJour.action, depuis)
+    utilisateurs = _compter_par(AuditStatHeure.id_user, AuditStatJour.id_user, depuis)
     
     return {
-        'total_actions': total_actions,
-        'actions_par_type': [{'action': a[0], 'count': a[1]} for a in actions_par_type],
-        'utilisateurs_actifs': [{'id_user': u[0], 'count': u[1]} for u in utilisateurs_actifs]
+        'total_actions': sum(actions.values()),
+        'actions_par_type': [{'action': a, 'count': c} for a, c in actions.most_common(10)],
+        'utilisateurs_actifs': [{'id_user': u, 'count': c} for u, c in utilisateurs.most_common(10)]
     }
 
+def reconstruire_stats_audit():
+    """
+    Recalcule les compteurs horaires depuis audit_usage (réparation)
+    
+    Les compteurs journaliers des logs déjà archivés sont conservés.
+    
+    Returns:
+        dict: {'success': bool, 'lignes_stats': int, 'message': str}
+    """
+    try:
+        db.session.query(AuditStatHeure).delete()
+        dernier_id = 0
+        while True:
+            logs = db.session.query(
+                AuditUsage.id_audit, AuditUsage.id_user, AuditUsage.action, AuditUsage.date_action
+            ).filter(
+                AuditUsage.id_audit > dernier_id,
+                AuditUsage.date_action.isnot(None)
+            ).order_by(AuditUsage.id_audit).limit(10000).all()
+            if not logs:
+                break
+            dernier_id = logs[-1].id_audit
+            incrementer_stats_audit([log._asdict() for log in logs])
+        db.session.commit()
+        
+        lignes = db.session.query(AuditStatHeure).count()
+        return {'success': True, 'lignes_stats': lignes, 'message': f'{lignes} compteurs horaires reconstruits'}
+    
+    except Exception as e:
+        db.session.rollback()
+        return {'success': False, 'lignes_stats': 0, 'message': f'Erreur: {str(e)}'}
+
+def initialiser_tables_audit():
+    """Mise à niveau d'une base déjà peuplée : compteurs horaires initiaux"""
+    if db.session.query(AuditStatHeure.heure).first() is None and \
+            db.session.query(AuditUsage.id_audit).first() is not None:
+        reconstruire_stats_audit()
+
+def archiver_logs_audit(date_limite, dossier_archives, taille_lot=5000):
+    """
+    Déplace les logs antérieurs à date_limite hors de audit_usage
+    
+    Par lots de taille_lot (ordre des id) : les lignes sont ajoutées au
+    fichier mensuel dossier_archives/audit_AAAA-MM.jsonl.gz puis supprimées ;
+    un commit par lot. Le fichier est écrit avant le commit : un lot
+    interrompu peut se retrouver deux fois dans l'archive, jamais perdu.
+    Les compteurs horaires antérieurs à date_limite sont ensuite compactés
+    dans audit_stats_jour.
+    
+    Args:
+        date_limite: Les logs avec date_action < date_limite sont archivés
+        dossier_archives: Répertoire des fichiers d'archive
+        taille_lot: Nombre de logs par lot
+    
+    Returns:
+        dict: {'success': bool, 'archives': int, 'lots': int, 'fichiers': list, 'message': str}
+    """
+    import gzip
+    import json
+    import os
+    from collections import defaultdict
+    
+    colonnes = [c.name for c in AuditUsage.__table__.columns]
+    archives = 0
+    lots = 0
+    fichiers = set()
+    
+    try:
+        os.makedirs(dossier_archives, exist_ok=True)
+        dernier_id = 0
+        
+        while True:
+            lignes = db.session.query(AuditUsage).filter(
+                AuditUsage.date_action < date_limite,
+                AuditUsage.id_audit > dernier_id
+            ).order_by(AuditUsage.id_audit).limit(taille_lot).all()
+            if not lignes:
+                break
+            dernier_id = lignes[-1].id_audit
+            
+            # 1. Fichiers mensuels (gzip accepte l'ajout d'un nouveau membre)
+            par_mois = defaultdict(list)
+            for log in lignes:
+                par_mois[log.date_action.strftime('%Y-%m')].append(log)
+            for mois, logs in par_mois.items():
+                chemin = os.path.join(dossier_archives, f'audit_{mois}.jsonl.gz')
+                with gzip.open(chemin, 'at', encoding='utf-8') as fichier:
+                    for log in logs:
+                        fichier.write(json.dumps(
+                            {colonne: getattr(log, colonne) for colonne in colonnes},
+                            default=str, ensure_ascii=False
+                        ) + '\n')
+                    fichier.flush()
+                    os.fsync(fichier.fileno())
+                fichiers.add(chemin)
+            
+            # 2. Suppression des lignes archivées
+            db.session.query(AuditUsage).filter(
+                AuditUsage.id_audit.in_([log.id_audit for log in lignes])
+            ).delete(synchronize_session=False)
+            db.session.commit()
+            db.session.expunge_all()
+            
+            archives += len(lignes)
+            lots += 1
+        
+        compacter_stats_audit(date_limite)
+        
+        return {
+            'success': True,
+            'archives': archives,
+            'lots': lots,
+            'fichiers': sorted(fichiers),
+            'message': f'{archives} logs archivés en {lots} lots'
+        }
+    
+    except Exception as e:
+        db.session.rollback()
+        return {
+            'success': False,
+            'archives': archives,
+            'lots': lots,
+            'fichiers': sorted(fichiers),
+            'message': f'Erreur: {str(e)}'
+        }
+
+def compacter_stats_audit(date_limite):
+    """
+    Regroupe par jour les compteurs horaires antérieurs à date_limite
+    
+    Les comptes sont ajoutés à audit_stats_jour puis les heures supprimées,
+    dans une seule transaction.
+    """
+    from collections import Counter
+    from database import executer_upsert
+    
+    heures = db.session.query(AuditStatHeure).filter(AuditStatHeure.heure < date_limite).all()
+    if not heures:
+        return
+    comptes = Counter()
+    for stat in heures:
+        comptes[(stat.heure.date(), stat.action, stat.id_user)] += stat.nb_actions
+    
+    try:
+        executer_upsert(
+            AuditStatJour.__table__,
+            [{'jour': jour, 'action': action, 'id_user': id_user, 'nb_actions': nb}
+             for (jour, action, id_user), nb in comptes.items()],
+            cles=['jour', 'action', 'id_user'],
+            colonnes_inc=['nb_actions']
+        )
+        db.session.query(AuditStatHeure).filter(
+            AuditStatHeure.heure < date_limite
+        ).delete(synchronize_session=False)
+        db.session.commit()
+    except Exception:
+        db.session.rollback()
+        raise
+
+# Périodes des statistiques d'audit
+PERIODES_AUDIT = {
+    '24h': timedelta(hours=24),
+    '7j': timedelta(days=7),
+    '30j': timedelta(days=30)
+}
+
 # Types d'actions communes pour l'audit
 ACTIONS_AUDIT = {
     'CONNEXION': 'Connexion utilisateur',
@@ -137,5 +422,6 @@ ACTIONS_AUDIT = {
     'FORCAGE_CONFLIT': 'Forçage création malgré conflit',
     'GENERATION_BULLETIN': 'Génération de bulletin',
     'IMPORT_NOTES': 'Import massif de notes',
+    'IMPORT_ETUDIANTS': "Import massif d'étudiants",
     'ACCES_NON_AUTORISE': 'Tentative accès non autorisé'
 }
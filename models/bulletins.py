@@ -16,6 +16,7 @@ class Bulletin(db.Model):
     rang = db.Column(db.Integer, nullable=True)
     total_credits = db.Column(db.Integer, nullable=True)
     chemin_pdf = db.Column(db.String(255), nullable=True)
+    empreinte_pdf = db.Column(db.String(64), nullable=True)  # SHA-256 du contenu rendu dans chemin_pdf
     date_generation = db.Column(db.DateTime, default=datetime.utcnow)
     
     def __repr__(self):
@@ -25,7 +26,7 @@ class Bulletin(db.Model):
 # FONCTIONS PROCÉDURALES - GESTION DES BULLETINS
 # ============================================================================
 
-def creer_bulletin(id_etudiant, annee_academique, semestre):
+def creer_bulletin(id_etudiant, annee_academique, semestre, classement=None):
     """
     Crée un bulletin pour un étudiant
     
@@ -33,12 +34,13 @@ def creer_bulletin(id_etudiant, annee_academique, semestre):
         id_etudiant: ID de l'étudiant
         annee_academique: Année académique (ex: 2025-2026)
         semestre: Semestre (S1, S2)
+        classement: Classement de la filière déjà calculé (optionnel)
     
     Returns:
         dict: {'success': bool, 'bulletin_id': int, 'message': str}
     """
     try:
-        from models.notes import calculer_moyenne_etudiant, calculer_rang_etudiant
+        from models.notes import calculer_classement_filiere, obtenir_moyenne_et_rang
         from models.cours import lister_cours_par_filiere
         from models.etudiants import obtenir_etudiant_par_id
         
@@ -47,8 +49,9 @@ def creer_bulletin(id_etudiant, annee_academique, semestre):
             return {'success': False, 'message': 'Étudiant introuvable'}
         
         # Calculer moyenne et rang
-        moyenne = calculer_moyenne_etudiant(id_etudiant, seulement_validees=True)
-        rang = calculer_rang_etudiant(id_etudiant)
+        if classement is None:
+            classement = calculer_classement_filiere(etudiant.id_filiere)
+        moyenne, rang = obtenir_moyenne_et_rang(id_etudiant, classement)
         
         # Calculer total crédits
         cours_filiere = lister_cours_par_filiere(etudiant.id_filiere)
@@ -118,6 +121,7 @@ def enregistrer_chemin_pdf(bulletin_id, chemin_pdf):
             return {'success': False, 'message': 'Bulletin introuvable'}
         
         bulletin.chemin_pdf = chemin_pdf
+        bulletin.empreinte_pdf = None  # Rendu hors génération de masse : contenu inconnu
         db.session.commit()
         
         return {'success': True, 'message': 'Chemin PDF enregistré'}
@@ -180,34 +184,212 @@ def lister_bulletins_filiere(id_filiere, annee_academique, semestre):
     
     return bulletins
 
-def generer_bulletins_masse_filiere(id_filiere, annee_academique, semestre):
+def _empreinte_contenu(contenu):
+    """Empreinte SHA-256 du contenu rendu d'un bulletin (lignes de notes comprises)"""
+    import hashlib
+    import json
+    
+    return hashlib.sha256(
+        json.dumps(contenu, sort_keys=True, ensure_ascii=False, default=str).encode('utf-8')
+    ).hexdigest()
+
+def generer_bulletins_masse_filiere(id_filiere, annee_academique, semestre,
+                                    generer_pdf=False, progression=None):
     """
     Génère les bulletins pour tous les étudiants d'une filière
     
+    Pipeline en trois étapes :
+    1. Préchargement en une requête chacun des étudiants, cours, notes validées
+       et bulletins existants de la filière
+    2. Calcul de toutes les lignes et upsert des bulletins dans une seule transaction
+    3. (optionnel) Rendu des PDF dans un pool de processus vers BULLETINS_FOLDER
+    
+    L'étape 3 est reprenable : un bulletin dont le PDF existe déjà et dont le
+    contenu rendu (lignes de notes, moyenne, rang, effectif...) a la même
+    empreinte n'est pas régénéré, il suffit donc de relancer la génération
+    après un échec partiel.
+    
     Args:
         id_filiere: ID de la filière
         annee_academique: Année académique
         semestre: Semestre
+        generer_pdf: Générer aussi les fichiers PDF
+        progression: Callback optionnel progression(etape, fait, total)
     
     Returns:
-        dict: {'success': bool, 'generes': int, 'erreurs': list}
+        dict: {'success': bool, 'generes': int, 'pdf_generes': int, 'erreurs': list}
     """
-    from models.etudiants import lister_etudiants_par_filiere
+    import os
+    from flask import current_app
+    from models.etudiants import Etudiant
+    from models.utilisateurs import Utilisateur
+    from models.filieres import obtenir_filiere_par_id
+    from models.cours import Cours
+    from models.notes import Note, classer_moyennes
     
-    etudiants = lister_etudiants_par_filiere(id_filiere)
-    generes = 0
-    erreurs = []
+    filiere = obtenir_filiere_par_id(id_filiere)
+    if not filiere:
+        return {'success': False, 'generes': 0, 'pdf_generes': 0, 'erreurs': ['Filière introuvable']}
+    nom_filiere, niveau = filiere.nom_filiere, filiere.niveau
     
-    for etudiant in etudiants:
-        result = creer_bulletin(etudiant.id_etudiant, annee_academique, semestre)
-        
-        if result['success']:
-            generes += 1
-        else:
-            erreurs.append(f"Étudiant {etudiant.id_etudiant}: {result['message']}")
-    
-    return {
-        'success': len(erreurs) == 0,
-        'generes': generes,
-        'erreurs': erreurs
+    # Étape 1 - Préchargement
+    etudiants = db.session.query(Etudiant, Utilisateur).join(
+        Utilisateur, Etudiant.id_user == Utilisateur.id_user
+    ).filter(Etudiant.id_filiere == id_filiere).all()
+    
+    cours_filiere = db.session.query(Cours).filter_by(
+        id_filiere=id_filiere, est_actif=True
+    ).all()
+    total_credits = sum(cours.credit for cours in cours_filiere)
+    
+    notes = db.session.query(Note, Cours).join(
+        Cours, Note.id_cours == Cours.id_cours
+    ).join(
+        Etudiant, Note.id_etudiant == Etudiant.id_etudiant
+    ).filter(
+        Etudiant.id_filiere == id_filiere,
+        Note.statut_validation == 'Valide'
+    ).order_by(Cours.libelle, Note.id_note).all()
+    
+    existants = {
+        bulletin.id_etudiant: bulletin
+        for bulletin in db.session.query(Bulletin).join(
+            Etudiant, Bulletin.id_etudiant == Etudiant.id_etudiant
+        ).filter(
+            Etudiant.id_filiere == id_filiere,
+            Bulletin.annee_academique == annee_academique,
+            Bulletin.semestre == semestre
+        ).all()
     }
+    
+    if progression:
+        progression('prechargement', len(etudiants), len(etudiants))
+    
+    # Étape 2 - Calcul et upsert en une transaction
+    lignes_par_etudiant = {}
+    sommes = {}
+    for note, cours in notes:
+        lignes_par_etudiant.setdefault(note.id_etudiant, []).append({
+            'libelle': cours.libelle,
+            'type_evaluation': note.type_evaluation,
+            'valeur_note': note.valeur_note,
+            'credit': cours.credit
+        })
+        total_pondere, credits = sommes.get(note.id_etudiant, (0.0, 0))
+        sommes[note.id_etudiant] = (total_pondere + note.valeur_note * cours.credit, credits + cours.credit)
+    
+    classement = classer_moyennes({
+        id_etudiant: round(total_pondere / credits, 2)
+        for id_etudiant, (total_pondere, credits) in sommes.items()
+        if credits > 0
+    })
+    
+    bulletins = {}
+    contenus = {}
+    try:
+        maintenant = datetime.utcnow()
+        for etudiant, user in etudiants:
+            moyenne, rang = classement.get(etudiant.id_etudiant, (None, None))
+            bulletin = existants.get(etudiant.id_etudiant)
+            
+            # Tout ce que le PDF affiche : son empreinte décide de sa réutilisation
+            contenu = {
+                'matricule': user.matricule,
+                'nom': user.nom,
+                'prenom': user.prenom,
+                'filiere': nom_filiere,
+                'niveau': niveau,
+                'annee_academique': annee_academique,
+                'semestre': semestre,
+                'lignes': lignes_par_etudiant.get(etudiant.id_etudiant, []),
+                'moyenne': moyenne,
+                'rang': rang,
+                'effectif': len(classement),
+                'total_credits': total_credits
+            }
+            contenus[etudiant.id_etudiant] = contenu
+            empreinte = _empreinte_contenu(contenu)
+            
+            if bulletin:
+                # Un PDF existant n'est conservé que si son contenu reste exact
+                if bulletin.empreinte_pdf != empreinte:
+                    bulletin.chemin_pdf = None
+                    bulletin.empreinte_pdf = empreinte
+                bulletin.moyenne_generale = moyenne
+                bulletin.rang = rang
+                bulletin.total_credits = total_credits
+                bulletin.date_generation = maintenant
+            else:
+                bulletin = Bulletin(
+                    id_etudiant=etudiant.id_etudiant,
+                    annee_academique=annee_academique,
+                    semestre=semestre,
+                    moyenne_generale=moyenne,
+                    rang=rang,
+                    total_credits=total_credits,
+                    empreinte_pdf=empreinte
+                )
+                db.session.add(bulletin)
+            
+            bulletins[etudiant.id_etudiant] = bulletin
+        
+        # Valeurs relues par l'étape 3, copiées avant que le commit n'expire les objets
+        db.session.flush()
+        instantanes = [{
+            'id_bulletin': bulletins[etudiant.id_etudiant].id_bulletin,
+            'chemin_pdf': bulletins[etudiant.id_etudiant].chemin_pdf,
+            'contenu': contenus[etudiant.id_etudiant]
+        } for etudiant, user in etudiants]
+        
+        db.session.commit()
+    
+    except Exception as e:
+        db.session.rollback()
+        return {'success': False, 'generes': 0, 'pdf_generes': 0, 'erreurs': [f'Erreur: {str(e)}']}
+    
+    if progression:
+        progression('calcul', len(bulletins), len(etudiants))
+    
+    resultat = {'success': True, 'generes': len(bulletins), 'pdf_generes': 0, 'erreurs': []}
+    
+    if not generer_pdf:
+        return resultat
+    
+    # Étape 3 - Rendu des PDF (uniquement ceux manquants ou périmés)
+    from helpers.bulletins_pdf import generer_pdfs_bulletins
+    
+    taches = []
+    matricules = {}
+    for instantane in instantanes:
+        matricules[instantane['id_bulletin']] = instantane['contenu']['matricule']
+        if instantane['chemin_pdf'] and os.path.exists(instantane['chemin_pdf']):
+            continue
+        
+        taches.append(dict(instantane['contenu'], id_bulletin=instantane['id_bulletin']))
+    
+    rendu = generer_pdfs_bulletins(
+        taches,
+        current_app.config.get('BULLETINS_FOLDER', os.path.join('static', 'bulletins')),
+        nb_workers=current_app.config.get('BULLETINS_WORKERS'),
+        progression=progression
+    )
+    
+    try:
+        # Mise à jour groupée par clé primaire (sans recharger les bulletins)
+        if rendu['chemins']:
+            from sqlalchemy import update
+            db.session.execute(update(Bulletin), [
+                {'id_bulletin': id_bulletin, 'chemin_pdf': chemin}
+                for id_bulletin, chemin in rendu['chemins'].items()
+            ])
+        db.session.commit()
+    except Exception as e:
+        db.session.rollback()
+        resultat['erreurs'].append(f'Erreur enregistrement PDF: {str(e)}')
+    
+    resultat['pdf_generes'] = len(rendu['chemins'])
+    for id_bulletin, message in rendu['erreurs'].items():
+        resultat['erreurs'].append(f"PDF {matricules.get(id_bulletin, id_bulletin)}: {message}")
+    resultat['success'] = len(resultat['erreurs']) == 0
+    
+    return resultat
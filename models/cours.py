@@ -71,8 +71,13 @@ def creer_cours(code_cours, libelle, credit, id_filiere):
         return {'success': False, 'message': f'Erreur: {str(e)}'}
 
 def obtenir_cours_par_id(cours_id):
-    """Récupère un cours par son ID"""
-    return db.session.get(Cours, cours_id)
+    """Récupère un cours par son ID (chargeur par lots de la requête, puis cache)"""
+    from helpers.cache import entite_en_cache
+    from helpers.chargeurs import charger_entite
+    
+    return charger_entite(Cours, cours_id, lambda cle: entite_en_cache(
+        'cours', Cours, cle, lambda: db.session.get(Cours, cle)
+    ), nom_cache='cours')
 
 def obtenir_cours_par_code(code_cours):
     """Récupère un cours par son code"""
@@ -131,8 +136,15 @@ def modifier_cours(cours_id, **kwargs):
                 setattr(cours, key, value)
         
         db.session.commit()
+        invalider_cache_cours(cours_id)
         return {'success': True, 'message': 'Cours modifié avec succès'}
     
     except Exception as e:
         db.session.rollback()
         return {'success': False, 'message': f'Erreur: {str(e)}'}
+
+def invalider_cache_cours(cours_id=None):
+    """Invalide le cache des cours après une écriture"""
+    from helpers.cache import obtenir_cache
+    
+    obtenir_cache('cours').invalider(cours_id)
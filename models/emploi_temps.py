@@ -3,6 +3,9 @@ Modèle Emploi du Temps - Planification des cours
 """
 from database import db
 from datetime import datetime, time
+from collections import namedtuple
+import threading
+from helpers.intervalles import ListeIntervalles
 
 class EmploiDuTemps(db.Model):
     """Table emploi_du_temps - Planning des cours"""
@@ -19,9 +22,48 @@ class EmploiDuTemps(db.Model):
     type_creneau = db.Column(db.String(20), default='Cours')  # Cours, TD, TP, Examen
     date_creation = db.Column(db.DateTime, default=datetime.utcnow)
     
+    # Renseigné sur les occurrences développées depuis un créneau récurrent
+    id_recurrent = None
+    
     def __repr__(self):
         return f'<EDT {self.jour} {self.heure_debut}-{self.heure_fin}>'
 
+class CreneauRecurrent(db.Model):
+    """Table creneaux_recurrents - Créneau modèle répété sur une plage de semaines"""
+    __tablename__ = 'creneaux_recurrents'
+    
+    id_recurrent = db.Column(db.Integer, primary_key=True, autoincrement=True)
+    id_cours = db.Column(db.Integer, db.ForeignKey('cours.id_cours'), nullable=False, index=True)
+    id_enseignant = db.Column(db.Integer, db.ForeignKey('enseignants.id_enseignant'), nullable=False, index=True)
+    id_salle = db.Column(db.Integer, db.ForeignKey('salles.id_salle'), nullable=False, index=True)
+    jour = db.Column(db.String(10), nullable=False)
+    heure_debut = db.Column(db.Time, nullable=False)
+    heure_fin = db.Column(db.Time, nullable=False)
+    semaine_debut = db.Column(db.Integer, nullable=False, index=True)
+    semaine_fin = db.Column(db.Integer, nullable=False, index=True)
+    type_creneau = db.Column(db.String(20), default='Cours')
+    date_creation = db.Column(db.DateTime, default=datetime.utcnow)
+    
+    def __repr__(self):
+        return f'<Récurrent {self.jour} {self.heure_debut}-{self.heure_fin} S{self.semaine_debut}-S{self.semaine_fin}>'
+
+class ExceptionCreneau(db.Model):
+    """
+    Table exceptions_creneaux - Écart d'une semaine par rapport au modèle
+    
+    Sans id_edt, l'occurrence est annulée ; avec id_edt, elle est remplacée
+    par un créneau concret (modification ou prise de présences).
+    """
+    __tablename__ = 'exceptions_creneaux'
+    __table_args__ = (db.UniqueConstraint('id_recurrent', 'semaine_numero'),)
+    
+    id_exception = db.Column(db.Integer, primary_key=True, autoincrement=True)
+    id_recurrent = db.Column(db.Integer, db.ForeignKey('creneaux_recurrents.id_recurrent'), nullable=False, index=True)
+    semaine_numero = db.Column(db.Integer, nullable=False, index=True)
+    id_edt = db.Column(db.Integer, db.ForeignKey('emploi_du_temps.id_edt'), nullable=True)
+    motif = db.Column(db.String(200))
+    date_creation = db.Column(db.DateTime, default=datetime.utcnow)
+
 # ============================================================================
 # FONCTIONS PROCÉDURALES - GESTION EDT
 # ============================================================================
@@ -86,6 +128,8 @@ def creer_creneau_edt(id_cours, id_enseignant, id_salle, jour, heure_debut,
         db.session.add(edt)
         db.session.commit()
         
+        _indexer_creneau_cree(edt)
+        
         message = 'Créneau créé avec succès'
         if alerte_dispo:
             message += ' (Attention: créé sur créneau indisponible enseignant)'
@@ -106,6 +150,9 @@ def verifier_conflits_edt(id_cours, id_enseignant, id_salle, jour,
     """
     Vérifie les conflits EDT selon RG01
     
+    S'appuie sur l'index d'intervalles de la semaine (voir obtenir_index_semaine)
+    au lieu de charger et comparer tous les créneaux du jour.
+    
     Returns:
         Liste de conflits détectés
     """
@@ -117,48 +164,807 @@ def verifier_conflits_edt(id_cours, id_enseignant, id_salle, jour,
     if not cours:
         return ['Cours introuvable']
     
-    # Requête pour détecter conflits
-    query = db.session.query(EmploiDuTemps).filter(
-        EmploiDuTemps.jour == jour,
-        EmploiDuTemps.semaine_numero == semaine_numero
-    )
+    index = obtenir_index_semaine(semaine_numero)
     
-    # Exclure un créneau spécifique (pour modifications)
-    if edt_id_exclusion:
-        query = query.filter(EmploiDuTemps.id_edt != edt_id_exclusion)
+    for _ in index.chevauchements('enseignant', jour, id_enseignant, heure_debut, heure_fin, edt_id_exclusion):
+        conflits.append({
+            'type': 'enseignant',
+            'message': 'Enseignant déjà occupé à ce créneau'
+        })
     
-    creneaux_existants = query.all()
+    for _ in index.chevauchements('salle', jour, id_salle, heure_debut, heure_fin, edt_id_exclusion):
+        conflits.append({
+            'type': 'salle',
+            'message': 'Salle déjà occupée à ce créneau'
+        })
     
-    for creneau in creneaux_existants:
-        # Vérifier chevauchement horaire
-        if heures_se_chevauchent(heure_debut, heure_fin, 
-                                 creneau.heure_debut, creneau.heure_fin):
-            
-            # Conflit enseignant
-            if creneau.id_enseignant == id_enseignant:
-                conflits.append({
-                    'type': 'enseignant',
-                    'message': 'Enseignant déjà occupé à ce créneau'
-                })
+    # Conflit filière (même filière = mêmes étudiants)
+    for _ in index.chevauchements('filiere', jour, cours.id_filiere, heure_debut, heure_fin, edt_id_exclusion):
+        conflits.append({
+            'type': 'filiere',
+            'message': 'Filière déjà en cours à ce créneau'
+        })
+    
+    return conflits
+
+# ============================================================================
+# INDEX D'INTERVALLES PAR SEMAINE (RG01)
+# ============================================================================
+
+class IndexEDTSemaine:
+    """
+    Index en mémoire des créneaux d'une semaine
+    
+    Une liste d'intervalles par (jour, enseignant), (jour, salle) et
+    (jour, filière) permet de trouver les chevauchements en O(log n).
+    """
+    
+    def __init__(self, semaine_numero, signature=None):
+        self.semaine_numero = semaine_numero
+        self.signature = signature
+        self._listes = {}
+        self._cles_creneau = {}  # id_edt -> clés indexées
+    
+    def ajouter(self, id_edt, id_enseignant, id_salle, id_filiere, jour, heure_debut, heure_fin):
+        """Ajoute un créneau dans les trois dimensions de l'index"""
+        cles = [
+            ('enseignant', jour, id_enseignant),
+            ('salle', jour, id_salle),
+            ('filiere', jour, id_filiere)
+        ]
+        for cle in cles:
+            self._listes.setdefault(cle, ListeIntervalles()).ajouter(heure_debut, heure_fin, id_edt)
+        self._cles_creneau[id_edt] = cles
+    
+    def retirer(self, id_edt):
+        """Retire un créneau de l'index"""
+        for cle in self._cles_creneau.pop(id_edt, []):
+            liste = self._listes.get(cle)
+            if liste is not None:
+                liste.retirer(id_edt)
+                if not liste:
+                    del self._listes[cle]
+    
+    def chevauchements(self, dimension, jour, identifiant, heure_debut, heure_fin, exclure=None):
+        """
+        Retourne les IDs des créneaux qui chevauchent la plage
+        
+        Args:
+            dimension: 'enseignant', 'salle' ou 'filiere'
+            jour: Jour de la semaine
+            identifiant: ID de l'enseignant, de la salle ou de la filière
+            heure_debut, heure_fin: Plage horaire
+            exclure: ID de créneau à ignorer
+        """
+        liste = self._listes.get((dimension, jour, identifiant))
+        if liste is None:
+            return []
+        return liste.chevauchements(heure_debut, heure_fin, exclure)
+
+_index_semaines = {}
+_verrou_index = threading.Lock()
+
+def _signature_semaine(semaine_numero):
+    """
+    Empreinte peu coûteuse des créneaux d'une semaine
+    
+    Permet de détecter les écritures faites par un autre processus
+    (plusieurs workers) sans recharger toute la semaine.
+    """
+    from sqlalchemy import func
+    
+    creneaux = tuple(db.session.query(
+        func.count(EmploiDuTemps.id_edt),
+        func.max(EmploiDuTemps.id_edt),
+        func.max(EmploiDuTemps.date_creation)
+    ).filter(EmploiDuTemps.semaine_numero == semaine_numero).one())
+    
+    recurrents = tuple(db.session.query(
+        func.count(CreneauRecurrent.id_recurrent),
+        func.max(CreneauRecurrent.id_recurrent)
+    ).filter(
+        CreneauRecurrent.semaine_debut <= semaine_numero,
+        CreneauRecurrent.semaine_fin >= semaine_numero
+    ).one())
+    
+    exceptions = tuple(db.session.query(
+        func.count(ExceptionCreneau.id_exception),
+        func.max(ExceptionCreneau.id_exception)
+    ).filter(ExceptionCreneau.semaine_numero == semaine_numero).one())
+    
+    return creneaux + (recurrents + exceptions,)
+
+def _construire_index_semaine(semaine_numero, signature):
+    """Construit l'index d'une semaine en une seule requête"""
+    index = IndexEDTSemaine(semaine_numero, signature)
+    
+    for creneau in _charger_creneaux_semaine(semaine_numero):
+        index.ajouter(creneau.id_edt, creneau.id_enseignant, creneau.id_salle, creneau.id_filiere,
+                      creneau.jour, creneau.heure_debut, creneau.heure_fin)
+    
+    return index
+
+def obtenir_index_semaine(semaine_numero):
+    """
+    Retourne l'index d'intervalles d'une semaine, reconstruit si périmé
+    
+    Args:
+        semaine_numero: Numéro de la semaine
+    
+    Returns:
+        IndexEDTSemaine
+    """
+    signature = _signature_semaine(semaine_numero)
+    
+    with _verrou_index:
+        index = _index_semaines.get(semaine_numero)
+        if index is not None and index.signature == signature:
+            return index
+    
+    index = _construire_index_semaine(semaine_numero, signature)
+    
+    with _verrou_index:
+        _index_semaines[semaine_numero] = index
+    
+    return index
+
+def _indexer_creneau_cree(edt):
+    """Met à jour incrémentalement l'index après création d'un créneau"""
+    from models.cours import obtenir_cours_par_id
+    
+    with _verrou_index:
+        index = _index_semaines.get(edt.semaine_numero)
+    if index is None:
+        return
+    
+    cours = obtenir_cours_par_id(edt.id_cours)
+    signature = _signature_semaine(edt.semaine_numero)
+    
+    with _verrou_index:
+        # Une autre écriture s'est intercalée : reconstruction au prochain accès
+        if index.signature is None or signature[0] != index.signature[0] + 1 \
+                or signature[3] != index.signature[3]:
+            _index_semaines.pop(edt.semaine_numero, None)
+            return
+        index.ajouter(edt.id_edt, edt.id_enseignant, edt.id_salle, cours.id_filiere,
+                      edt.jour, edt.heure_debut, edt.heure_fin)
+        index.signature = signature
+
+def _desindexer_creneau(id_edt, semaine_numero):
+    """Met à jour incrémentalement l'index après suppression d'un créneau"""
+    with _verrou_index:
+        index = _index_semaines.get(semaine_numero)
+    if index is None:
+        return
+    
+    signature = _signature_semaine(semaine_numero)
+    
+    with _verrou_index:
+        if index.signature is None or signature[0] != index.signature[0] - 1 \
+                or signature[3] != index.signature[3]:
+            _index_semaines.pop(semaine_numero, None)
+            return
+        index.retirer(id_edt)
+        index.signature = signature
+
+def invalider_index_edt(semaine_numero=None):
+    """Invalide l'index d'une semaine (ou de toutes les semaines)"""
+    with _verrou_index:
+        if semaine_numero is None:
+            _index_semaines.clear()
+        else:
+            _index_semaines.pop(semaine_numero, None)
+
+# Ligne minimale utilisée par l'index, le balayage et le générateur ;
+# id_edt est négatif (-id_recurrent) pour une occurrence de créneau récurrent
+CreneauBrut = namedtuple('CreneauBrut', [
+    'id_edt', 'id_enseignant', 'id_salle', 'id_filiere', 'code_cours',
+    'jour', 'heure_debut', 'heure_fin', 'semaine_numero'
+])
+
+def _charger_creneaux_semaines(semaine_debut, semaine_fin):
+    """
+    Charge les créneaux concrets et les occurrences récurrentes d'une plage
+    de semaines en trois requêtes, quel que soit le nombre de semaines
+    
+    Returns:
+        Liste de CreneauBrut
+    """
+    from models.cours import Cours
+    
+    creneaux = [
+        CreneauBrut(*ligne) for ligne in db.session.query(
+            EmploiDuTemps.id_edt, EmploiDuTemps.id_enseignant, EmploiDuTemps.id_salle,
+            Cours.id_filiere, Cours.code_cours, EmploiDuTemps.jour,
+            EmploiDuTemps.heure_debut, EmploiDuTemps.heure_fin, EmploiDuTemps.semaine_numero
+        ).join(
+            Cours, EmploiDuTemps.id_cours == Cours.id_cours
+        ).filter(
+            EmploiDuTemps.semaine_numero >= semaine_debut,
+            EmploiDuTemps.semaine_numero <= semaine_fin
+        ).all()
+    ]
+    
+    modeles = db.session.query(
+        CreneauRecurrent.id_recurrent, CreneauRecurrent.id_enseignant, CreneauRecurrent.id_salle,
+        Cours.id_filiere, Cours.code_cours, CreneauRecurrent.jour,
+        CreneauRecurrent.heure_debut, CreneauRecurrent.heure_fin,
+        CreneauRecurrent.semaine_debut, CreneauRecurrent.semaine_fin
+    ).join(
+        Cours, CreneauRecurrent.id_cours == Cours.id_cours
+    ).filter(
+        CreneauRecurrent.semaine_debut <= semaine_fin,
+        CreneauRecurrent.semaine_fin >= semaine_debut
+    ).all()
+    
+    if not modeles:
+        return creneaux
+    
+    exceptions = set(db.session.query(
+        ExceptionCreneau.id_recurrent, ExceptionCreneau.semaine_numero
+    ).filter(
+        ExceptionCreneau.semaine_numero >= semaine_debut,
+        ExceptionCreneau.semaine_numero <= semaine_fin
+    ).all())
+    
+    for modele in modeles:
+        for semaine in range(max(modele.semaine_debut, semaine_debut),
+                             min(modele.semaine_fin, semaine_fin) + 1):
+            if (modele.id_recurrent, semaine) in exceptions:
+                continue
+            creneaux.append(CreneauBrut(
+                -modele.id_recurrent, modele.id_enseignant, modele.id_salle,
+                modele.id_filiere, modele.code_cours, modele.jour,
+                modele.heure_debut, modele.heure_fin, semaine
+            ))
+    
+    return creneaux
+
+def _charger_creneaux_semaine(semaine_numero):
+    """Créneaux concrets et occurrences récurrentes d'une semaine"""
+    return _charger_creneaux_semaines(semaine_numero, semaine_numero)
+
+def detecter_conflits_semaine(semaine_numero):
+    """
+    Détecte tous les conflits RG01 d'une semaine par balayage
+    
+    Les créneaux sont chargés en une requête et triés une seule fois par
+    (jour, heure_debut) ; chaque créneau n'est comparé qu'aux créneaux encore
+    en cours à son début. Chaque paire en conflit est émise une seule fois.
+    
+    Args:
+        semaine_numero: Numéro de la semaine
+    
+    Returns:
+        Liste de dict {type, types, id_edt, id_edt_conflit, jour, horaire, details}
+        (un id négatif désigne l'occurrence du créneau récurrent -id)
+    """
+    creneaux = _charger_creneaux_semaine(semaine_numero)
+    creneaux.sort(key=lambda c: (JOURS_ORDRE.get(c.jour, len(JOURS_ORDRE)), c.heure_debut, c.id_edt))
+    
+    libelles = {
+        'enseignant': 'Enseignant',
+        'salle': 'Salle',
+        'filiere': 'Filière'
+    }
+    conflits = []
+    actifs = []
+    jour_courant = None
+    
+    for creneau in creneaux:
+        if creneau.jour != jour_courant:
+            jour_courant = creneau.jour
+            actifs = []
+        
+        actifs = [a for a in actifs if a.heure_fin > creneau.heure_debut]
+        
+        for actif in actifs:
+            types = []
+            if actif.id_enseignant == creneau.id_enseignant:
+                types.append('enseignant')
+            if actif.id_salle == creneau.id_salle:
+                types.append('salle')
+            if actif.id_filiere == creneau.id_filiere:
+                types.append('filiere')
             
-            # Conflit salle
-            if creneau.id_salle == id_salle:
+            if types:
+                debut = max(actif.heure_debut, creneau.heure_debut)
+                fin = min(actif.heure_fin, creneau.heure_fin)
                 conflits.append({
-                    'type': 'salle',
-                    'message': 'Salle déjà occupée à ce créneau'
+                    'type': types[0],
+                    'types': types,
+                    'id_edt': creneau.id_edt,
+                    'id_edt_conflit': actif.id_edt,
+                    'jour': creneau.jour,
+                    'horaire': f"{debut.strftime('%H:%M')}-{fin.strftime('%H:%M')}",
+                    'details': f"{actif.code_cours} / {creneau.code_cours} "
+                               f"({', '.join(libelles[t] for t in types)})"
                 })
-            
-            # Conflit filière (même filière = mêmes étudiants)
-            from models.cours import obtenir_cours_par_id
-            cours_existant = obtenir_cours_par_id(creneau.id_cours)
-            if cours_existant and cours_existant.id_filiere == cours.id_filiere:
+        
+        actifs.append(creneau)
+    
+    return conflits
+
+def generer_edt_automatique(ids_filieres, semaine_numero, besoins_horaires=None,
+                            affectations=None, jours=None, enregistrer=True,
+                            accepter_partiel=False):
+    """
+    Génère automatiquement la semaine d'une ou plusieurs filières
+    
+    Contraintes prises en compte : créneaux déjà planifiés de la semaine
+    (toutes filières), indisponibilités déclarées des enseignants et
+    capacité des salles (Salle.capacite >= Filiere.effectif_prevu).
+    Les créneaux produits sont insérés en une seule transaction.
+    
+    Args:
+        ids_filieres: Liste d'IDs de filières à planifier
+        semaine_numero: Numéro de la semaine
+        besoins_horaires: dict {id_cours: heures hebdo} (défaut: crédits du cours)
+        affectations: dict {id_cours: id_enseignant} (défaut: dernier enseignant
+                      ayant assuré le cours dans l'EDT)
+        jours: Jours utilisables (défaut: Lundi à Vendredi)
+        enregistrer: False pour une simulation sans écriture
+        accepter_partiel: Enregistrer même si certaines séances n'ont pu être placées
+    
+    Returns:
+        dict: {'success': bool, 'crees': int, 'creneaux': list, 'non_placees': list, 'message': str}
+    """
+    from models.cours import Cours
+    from models.filieres import Filiere
+    from models.salles import Salle
+    from models.etudiants import Etudiant
+    from models.enseignants import DisponibiliteEnseignant
+    from helpers.generateur_edt import SolveurEDT, PLAGES_HORAIRES, nombre_seances, plages_chevauchees
+    from sqlalchemy import func
+    
+    besoins_horaires = besoins_horaires or {}
+    affectations = dict(affectations or {})
+    jours = jours or [jour for jour in JOURS_ORDRE if jour != 'Samedi']
+    
+    filieres = db.session.query(Filiere).filter(Filiere.id_filiere.in_(ids_filieres)).all()
+    if not filieres:
+        return {'success': False, 'crees': 0, 'creneaux': [], 'non_placees': [], 'message': 'Aucune filière trouvée'}
+    
+    # Effectif : prévu, ou effectif réel s'il est supérieur
+    inscrits = dict(db.session.query(
+        Etudiant.id_filiere, func.count(Etudiant.id_etudiant)
+    ).filter(Etudiant.id_filiere.in_(ids_filieres)).group_by(Etudiant.id_filiere).all())
+    effectifs = {
+        f.id_filiere: max(f.effectif_prevu or 0, inscrits.get(f.id_filiere, 0))
+        for f in filieres
+    }
+    
+    cours_liste = db.session.query(Cours).filter(
+        Cours.id_filiere.in_(ids_filieres), Cours.est_actif == True
+    ).all()
+    
+    # Enseignant par défaut : le plus récent ayant assuré le cours
+    manquants = [c.id_cours for c in cours_liste if c.id_cours not in affectations]
+    if manquants:
+        for id_cours, id_enseignant in db.session.query(
+            EmploiDuTemps.id_cours, EmploiDuTemps.id_enseignant
+        ).filter(EmploiDuTemps.id_cours.in_(manquants)).order_by(EmploiDuTemps.date_creation).all():
+            affectations[id_cours] = id_enseignant
+    
+    seances = []
+    non_placees = []
+    for cours in cours_liste:
+        if cours.id_cours not in affectations:
+            non_placees.append(f"{cours.code_cours}: aucun enseignant affecté")
+            continue
+        for _ in range(nombre_seances(besoins_horaires.get(cours.id_cours, cours.credit))):
+            seances.append({
+                'id_cours': cours.id_cours,
+                'code_cours': cours.code_cours,
+                'id_enseignant': affectations[cours.id_cours],
+                'id_filiere': cours.id_filiere,
+                'effectif': effectifs[cours.id_filiere]
+            })
+    
+    salles = [
+        {'id_salle': id_salle, 'capacite': capacite}
+        for id_salle, capacite in db.session.query(Salle.id_salle, Salle.capacite).filter(
+            Salle.est_disponible == True
+        ).all()
+    ]
+    
+    # Occupations existantes de la semaine projetées sur la grille
+    occupations = set()
+    for existant in _charger_creneaux_semaine(semaine_numero):
+        for plage in plages_chevauchees(existant.heure_debut, existant.heure_fin):
+            occupations.add(('enseignant', existant.id_enseignant, existant.jour, plage))
+            occupations.add(('salle', existant.id_salle, existant.jour, plage))
+            occupations.add(('filiere', existant.id_filiere, existant.jour, plage))
+    
+    enseignants = {seance['id_enseignant'] for seance in seances}
+    if enseignants:
+        for dispo in db.session.query(DisponibiliteEnseignant).filter(
+            DisponibiliteEnseignant.id_enseignant.in_(enseignants),
+            DisponibiliteEnseignant.est_disponible == False
+        ).all():
+            for plage in plages_chevauchees(dispo.heure_debut, dispo.heure_fin):
+                occupations.add(('enseignant', dispo.id_enseignant, dispo.jour, plage))
+    
+    resultat = SolveurEDT(seances, salles, jours, occupations).resoudre()
+    
+    for indice in resultat['non_placees']:
+        non_placees.append(f"{seances[indice]['code_cours']}: aucune plage compatible")
+    
+    creneaux = []
+    for indice, (jour, plage, id_salle) in sorted(resultat['placements'].items()):
+        seance = seances[indice]
+        heure_debut, heure_fin = PLAGES_HORAIRES[plage]
+        creneaux.append(EmploiDuTemps(
+            id_cours=seance['id_cours'],
+            id_enseignant=seance['id_enseignant'],
+            id_salle=id_salle,
+            jour=jour,
+            heure_debut=heure_debut,
+            heure_fin=heure_fin,
+            semaine_numero=semaine_numero,
+            type_creneau='Cours'
+        ))
+    
+    complet = not non_placees
+    if not enregistrer or (not complet and not accepter_partiel):
+        return {
+            'success': complet,
+            'crees': 0,
+            'creneaux': creneaux,
+            'non_placees': non_placees,
+            'message': 'Simulation terminée' if complet else f'{len(non_placees)} séance(s) non placée(s)'
+        }
+    
+    try:
+        db.session.add_all(creneaux)
+        db.session.commit()
+    except Exception as e:
+        db.session.rollback()
+        return {'success': False, 'crees': 0, 'creneaux': [], 'non_placees': non_placees, 'message': f'Erreur: {str(e)}'}
+    
+    invalider_index_edt(semaine_numero)
+    
+    return {
+        'success': complet,
+        'crees': len(creneaux),
+        'creneaux': creneaux,
+        'non_placees': non_placees,
+        'message': f'{len(creneaux)} créneau(x) généré(s)'
+    }
+
+# ============================================================================
+# CRÉNEAUX RÉCURRENTS - MODÈLE + EXCEPTIONS PAR SEMAINE
+# ============================================================================
+
+def _developper_occurrence(modele, semaine_numero):
+    """Occurrence non persistée d'un créneau récurrent pour une semaine"""
+    edt = EmploiDuTemps(
+        id_cours=modele.id_cours,
+        id_enseignant=modele.id_enseignant,
+        id_salle=modele.id_salle,
+        jour=modele.jour,
+        heure_debut=modele.heure_debut,
+        heure_fin=modele.heure_fin,
+        semaine_numero=semaine_numero,
+        type_creneau=modele.type_creneau,
+        date_creation=modele.date_creation
+    )
+    edt.id_recurrent = modele.id_recurrent
+    return edt
+
+def _requete_modeles_semaine(semaine_numero):
+    """Modèles actifs sur la semaine et sans exception pour celle-ci"""
+    return db.session.query(CreneauRecurrent).outerjoin(
+        ExceptionCreneau,
+        (ExceptionCreneau.id_recurrent == CreneauRecurrent.id_recurrent) &
+        (ExceptionCreneau.semaine_numero == semaine_numero)
+    ).filter(
+        CreneauRecurrent.semaine_debut <= semaine_numero,
+        CreneauRecurrent.semaine_fin >= semaine_numero,
+        ExceptionCreneau.id_exception.is_(None)
+    )
+
+def verifier_conflits_plage(creneaux, semaine_debut, semaine_fin):
+    """
+    Vérifie RG01 pour des créneaux répétés sur toute une plage de semaines
+    
+    Les occupations de toutes les semaines sont chargées en une fois et
+    indexées par (dimension, jour, id) : chaque créneau candidat est testé
+    une seule fois contre l'ensemble de la plage.
+    
+    Args:
+        creneaux: Liste de dict {id_enseignant, id_salle, id_filiere, jour,
+                  heure_debut, heure_fin, libelle}
+        semaine_debut, semaine_fin: Plage de semaines (incluses)
+    
+    Returns:
+        Liste de dict {type, libelle, jour, horaire, semaines, message}
+    """
+    listes = {}
+    
+    def _ajouter(dimension, jour, identifiant, heure_debut, heure_fin, semaine):
+        listes.setdefault((dimension, jour, identifiant), ListeIntervalles()).ajouter(
+            heure_debut, heure_fin, semaine
+        )
+    
+    for existant in _charger_creneaux_semaines(semaine_debut, semaine_fin):
+        _ajouter('enseignant', existant.jour, existant.id_enseignant,
+                 existant.heure_debut, existant.heure_fin, existant.semaine_numero)
+        _ajouter('salle', existant.jour, existant.id_salle,
+                 existant.heure_debut, existant.heure_fin, existant.semaine_numero)
+        _ajouter('filiere', existant.jour, existant.id_filiere,
+                 existant.heure_debut, existant.heure_fin, existant.semaine_numero)
+    
+    messages = {
+        'enseignant': 'Enseignant déjà occupé',
+        'salle': 'Salle déjà occupée',
+        'filiere': 'Filière déjà en cours'
+    }
+    semaines_plage = range(semaine_debut, semaine_fin + 1)
+    conflits = []
+    
+    for creneau in creneaux:
+        for dimension in ('enseignant', 'salle', 'filiere'):
+            identifiant = creneau[f'id_{dimension}']
+            liste = listes.get((dimension, creneau['jour'], identifiant))
+            semaines = sorted(set(liste.chevauchements(creneau['heure_debut'], creneau['heure_fin']))) \
+                if liste is not None else []
+            if semaines:
                 conflits.append({
-                    'type': 'filiere',
-                    'message': 'Filière déjà en cours à ce créneau'
+                    'type': dimension,
+                    'libelle': creneau.get('libelle'),
+                    'jour': creneau['jour'],
+                    'horaire': f"{creneau['heure_debut'].strftime('%H:%M')}-{creneau['heure_fin'].strftime('%H:%M')}",
+                    'semaines': semaines,
+                    'message': f"{messages[dimension]} ({creneau.get('libelle') or creneau['jour']}, "
+                               f"semaine(s) {', '.join(str(n) for n in semaines)})"
                 })
+        
+        # Les candidats sont aussi confrontés entre eux
+        for dimension in ('enseignant', 'salle', 'filiere'):
+            for semaine in semaines_plage:
+                _ajouter(dimension, creneau['jour'], creneau[f'id_{dimension}'],
+                         creneau['heure_debut'], creneau['heure_fin'], semaine)
     
     return conflits
 
+def creer_creneau_recurrent(id_cours, id_enseignant, id_salle, jour, heure_debut,
+                            heure_fin, semaine_debut, semaine_fin, type_creneau='Cours'):
+    """
+    Crée un créneau répété chaque semaine de semaine_debut à semaine_fin
+    Vérifie RG01 sur toute la plage
+    
+    Returns:
+        dict: {'success': bool, 'id_recurrent': int, 'message': str, 'conflits': list}
+    """
+    from models.cours import obtenir_cours_par_id
+    
+    try:
+        if semaine_fin < semaine_debut:
+            return {'success': False, 'message': 'Plage de semaines invalide'}
+        
+        cours = obtenir_cours_par_id(id_cours)
+        if not cours:
+            return {'success': False, 'message': 'Cours introuvable'}
+        
+        conflits = verifier_conflits_plage([{
+            'id_enseignant': id_enseignant,
+            'id_salle': id_salle,
+            'id_filiere': cours.id_filiere,
+            'jour': jour,
+            'heure_debut': heure_debut,
+            'heure_fin': heure_fin,
+            'libelle': cours.code_cours
+        }], semaine_debut, semaine_fin)
+        
+        if conflits:
+            return {'success': False, 'message': 'Conflits détectés', 'conflits': conflits}
+        
+        modele = CreneauRecurrent(
+            id_cours=id_cours,
+            id_enseignant=id_enseignant,
+            id_salle=id_salle,
+            jour=jour,
+            heure_debut=heure_debut,
+            heure_fin=heure_fin,
+            semaine_debut=semaine_debut,
+            semaine_fin=semaine_fin,
+            type_creneau=type_creneau
+        )
+        db.session.add(modele)
+        db.session.commit()
+        
+        return {'success': True, 'id_recurrent': modele.id_recurrent, 'message': 'Créneau récurrent créé'}
+    
+    except Exception as e:
+        db.session.rollback()
+        return {'success': False, 'message': f'Erreur: {str(e)}'}
+
+def cloner_semaine(semaine_source, semaine_fin, id_filiere=None):
+    """
+    Répète les créneaux de la semaine source sur les semaines suivantes
+    
+    Chaque créneau concret de la semaine source devient un créneau récurrent
+    couvrant semaine_source+1..semaine_fin (une ligne au lieu d'une par
+    semaine). Les conflits sont vérifiés sur toute la plage en une passe ;
+    rien n'est écrit si un seul conflit est trouvé.
+    
+    Args:
+        semaine_source: Semaine de référence (N)
+        semaine_fin: Dernière semaine à couvrir (M)
+        id_filiere: Limiter le clonage à une filière (optionnel)
+    
+    Returns:
+        dict: {'success': bool, 'crees': int, 'message': str, 'conflits': list}
+    """
+    from models.cours import Cours
+    
+    try:
+        semaine_debut = semaine_source + 1
+        if semaine_fin < semaine_debut:
+            return {'success': False, 'crees': 0, 'message': 'Plage de semaines invalide', 'conflits': []}
+        
+        requete = db.session.query(EmploiDuTemps, Cours.id_filiere, Cours.code_cours).join(
+            Cours, EmploiDuTemps.id_cours == Cours.id_cours
+        ).filter(EmploiDuTemps.semaine_numero == semaine_source)
+        if id_filiere:
+            requete = requete.filter(Cours.id_filiere == id_filiere)
+        sources = requete.all()
+        
+        if not sources:
+            return {'success': False, 'crees': 0, 'message': 'Aucun créneau à cloner', 'conflits': []}
+        
+        conflits = verifier_conflits_plage([
+            {
+                'id_enseignant': edt.id_enseignant,
+                'id_salle': edt.id_salle,
+                'id_filiere': filiere,
+                'jour': edt.jour,
+                'heure_debut': edt.heure_debut,
+                'heure_fin': edt.heure_fin,
+                'libelle': code_cours
+            }
+            for edt, filiere, code_cours in sources
+        ], semaine_debut, semaine_fin)
+        
+        if conflits:
+            return {
+                'success': False,
+                'crees': 0,
+                'message': f'{len(conflits)} conflit(s) détecté(s)',
+                'conflits': conflits
+            }
+        
+        db.session.add_all([
+            CreneauRecurrent(
+                id_cours=edt.id_cours,
+                id_enseignant=edt.id_enseignant,
+                id_salle=edt.id_salle,
+                jour=edt.jour,
+                heure_debut=edt.heure_debut,
+                heure_fin=edt.heure_fin,
+                semaine_debut=semaine_debut,
+                semaine_fin=semaine_fin,
+                type_creneau=edt.type_creneau
+            )
+            for edt, _, _ in sources
+        ])
+        db.session.commit()
+        
+        return {
+            'success': True,
+            'crees': len(sources),
+            'message': f'{len(sources)} créneau(x) répété(s) des semaines {semaine_debut} à {semaine_fin}',
+            'conflits': []
+        }
+    
+    except Exception as e:
+        db.session.rollback()
+        return {'success': False, 'crees': 0, 'message': f'Erreur: {str(e)}', 'conflits': []}
+
+def annuler_occurrence(id_recurrent, semaine_numero, motif=None):
+    """Annule une occurrence d'un créneau récurrent (ex: jour férié)"""
+    try:
+        modele = db.session.get(CreneauRecurrent, id_recurrent)
+        if not modele or not modele.semaine_debut <= semaine_numero <= modele.semaine_fin:
+            return {'success': False, 'message': 'Occurrence introuvable'}
+        
+        exception = db.session.query(ExceptionCreneau).filter_by(
+            id_recurrent=id_recurrent, semaine_numero=semaine_numero
+        ).first()
+        if exception:
+            return {'success': False, 'message': 'Cette occurrence a déjà une exception'}
+        
+        db.session.add(ExceptionCreneau(
+            id_recurrent=id_recurrent, semaine_numero=semaine_numero, motif=motif
+        ))
+        db.session.commit()
+        
+        return {'success': True, 'message': 'Occurrence annulée'}
+    
+    except Exception as e:
+        db.session.rollback()
+        return {'success': False, 'message': f'Erreur: {str(e)}'}
+
+def materialiser_occurrence(id_recurrent, semaine_numero, **modifications):
+    """
+    Remplace une occurrence récurrente par un créneau concret
+    
+    Nécessaire pour rattacher des présences (clé id_edt) ou pour modifier
+    une seule semaine (salle, enseignant, jour, horaires). Idempotent :
+    retourne le créneau déjà matérialisé s'il existe.
+    
+    Args:
+        id_recurrent: ID du créneau récurrent
+        semaine_numero: Semaine de l'occurrence
+        **modifications: id_salle, id_enseignant, jour, heure_debut, heure_fin
+    
+    Returns:
+        dict: {'success': bool, 'edt_id': int, 'message': str, 'conflits': list}
+    """
+    try:
+        modele = db.session.get(CreneauRecurrent, id_recurrent)
+        if not modele or not modele.semaine_debut <= semaine_numero <= modele.semaine_fin:
+            return {'success': False, 'message': 'Occurrence introuvable'}
+        
+        exception = db.session.query(ExceptionCreneau).filter_by(
+            id_recurrent=id_recurrent, semaine_numero=semaine_numero
+        ).first()
+        if exception:
+            if exception.id_edt:
+                return {'success': True, 'edt_id': exception.id_edt, 'message': 'Créneau déjà matérialisé'}
+            return {'success': False, 'message': 'Occurrence annulée'}
+        
+        edt = _developper_occurrence(modele, semaine_numero)
+        edt.date_creation = datetime.utcnow()
+        for champ in ('id_salle', 'id_enseignant', 'jour', 'heure_debut', 'heure_fin'):
+            if modifications.get(champ) is not None:
+                setattr(edt, champ, modifications[champ])
+        
+        if modifications:
+            conflits = verifier_conflits_edt(
+                edt.id_cours, edt.id_enseignant, edt.id_salle, edt.jour,
+                edt.heure_debut, edt.heure_fin, semaine_numero,
+                edt_id_exclusion=-id_recurrent
+            )
+            if conflits:
+                return {'success': False, 'message': 'Conflits détectés', 'conflits': conflits}
+        
+        db.session.add(edt)
+        db.session.flush()
+        db.session.add(ExceptionCreneau(
+            id_recurrent=id_recurrent, semaine_numero=semaine_numero, id_edt=edt.id_edt
+        ))
+        db.session.commit()
+        
+        invalider_index_edt(semaine_numero)
+        
+        return {'success': True, 'edt_id': edt.id_edt, 'message': 'Créneau matérialisé'}
+    
+    except Exception as e:
+        db.session.rollback()
+        return {'success': False, 'message': f'Erreur: {str(e)}'}
+
+def supprimer_creneau_recurrent(id_recurrent):
+    """
+    Supprime un créneau récurrent et ses exceptions
+    Les créneaux déjà matérialisés (avec présences) sont conservés
+    """
+    try:
+        modele = db.session.get(CreneauRecurrent, id_recurrent)
+        if not modele:
+            return {'success': False, 'message': 'Créneau récurrent introuvable'}
+        
+        db.session.query(ExceptionCreneau).filter_by(id_recurrent=id_recurrent).delete()
+        db.session.delete(modele)
+        db.session.commit()
+        
+        return {'success': True, 'message': 'Créneau récurrent supprimé'}
+    
+    except Exception as e:
+        db.session.rollback()
+        return {'success': False, 'message': f'Erreur: {str(e)}'}
+
 def heures_se_chevauchent(debut1, fin1, debut2, fin2):
     """
     Vérifie si deux plages horaires se chevauchent
@@ -177,17 +983,29 @@ def obtenir_creneau_par_id(edt_id):
     return db.session.get(EmploiDuTemps, edt_id)
 
 def lister_edt_par_semaine(semaine_numero):
-    """Liste tous les créneaux d'une semaine"""
-    return db.session.query(EmploiDuTemps).filter_by(
+    """Liste tous les créneaux d'une semaine (occurrences récurrentes incluses)"""
+    creneaux = db.session.query(EmploiDuTemps).filter_by(
         semaine_numero=semaine_numero
-    ).order_by(EmploiDuTemps.jour, EmploiDuTemps.heure_debut).all()
+    ).all()
+    creneaux.extend(
+        _developper_occurrence(modele, semaine_numero)
+        for modele in _requete_modeles_semaine(semaine_numero).all()
+    )
+    return sorted(creneaux, key=lambda c: (c.jour, c.heure_debut))
 
 def lister_edt_enseignant(id_enseignant, semaine_numero):
-    """Liste l'EDT d'un enseignant pour une semaine"""
-    return db.session.query(EmploiDuTemps).filter_by(
+    """Liste l'EDT d'un enseignant pour une semaine (occurrences récurrentes incluses)"""
+    creneaux = db.session.query(EmploiDuTemps).filter_by(
         id_enseignant=id_enseignant,
         semaine_numero=semaine_numero
-    ).order_by(EmploiDuTemps.jour, EmploiDuTemps.heure_debut).all()
+    ).all()
+    creneaux.extend(
+        _developper_occurrence(modele, semaine_numero)
+        for modele in _requete_modeles_semaine(semaine_numero).filter(
+            CreneauRecurrent.id_enseignant == id_enseignant
+        ).all()
+    )
+    return sorted(creneaux, key=lambda c: (c.jour, c.heure_debut))
 
 def lister_edt_filiere(id_filiere, semaine_numero):
     """
@@ -214,10 +1032,26 @@ def lister_edt_filiere(id_filiere, semaine_numero):
     ).filter(
         Cours.id_filiere == id_filiere,
         EmploiDuTemps.semaine_numero == semaine_numero
-    ).order_by(
-        EmploiDuTemps.jour, EmploiDuTemps.heure_debut
     ).all()
     
+    modeles = _requete_modeles_semaine(semaine_numero).join(
+        Cours, CreneauRecurrent.id_cours == Cours.id_cours
+    ).join(
+        Enseignant, CreneauRecurrent.id_enseignant == Enseignant.id_enseignant
+    ).join(
+        Utilisateur, Enseignant.id_user == Utilisateur.id_user
+    ).join(
+        Salle, CreneauRecurrent.id_salle == Salle.id_salle
+    ).filter(
+        Cours.id_filiere == id_filiere
+    ).add_entity(Cours).add_entity(Utilisateur).add_entity(Salle).all()
+    
+    results.extend(
+        (_developper_occurrence(modele, semaine_numero), cours, enseignant_user, salle)
+        for modele, cours, enseignant_user, salle in modeles
+    )
+    results.sort(key=lambda r: (r[0].jour, r[0].heure_debut))
+    
     edt = []
     for creneau, cours, enseignant_user, salle in results:
         edt.append({
@@ -234,8 +1068,10 @@ def supprimer_creneau_edt(edt_id):
     try:
         edt = obtenir_creneau_par_id(edt_id)
         if edt:
+            semaine_numero = edt.semaine_numero
             db.session.delete(edt)
             db.session.commit()
+            _desindexer_creneau(edt_id, semaine_numero)
             return {'success': True, 'message': 'Créneau supprimé'}
         return {'success': False, 'message': 'Créneau introuvable'}
     
@@ -78,8 +78,10 @@ def creer_enseignant(id_user, specialite=None, telephone=None, date_recrutement=
         return {'success': False, 'message': f'Erreur: {str(e)}'}
 
 def obtenir_enseignant_par_id(enseignant_id):
-    """Récupère un enseignant par son ID"""
-    return db.session.get(Enseignant, enseignant_id)
+    """Récupère un enseignant par son ID (chargeur par lots de la requête)"""
+    from helpers.chargeurs import charger_entite
+    
+    return charger_entite(Enseignant, enseignant_id, lambda cle: db.session.get(Enseignant, cle))
 
 def obtenir_enseignant_par_user_id(user_id):
     """Récupère un enseignant par l'ID utilisateur"""
@@ -72,8 +72,10 @@ def creer_etudiant(id_user, id_filiere, date_naissance=None, adresse=None):
         return {'success': False, 'message': f'Erreur: {str(e)}'}
 
 def obtenir_etudiant_par_id(etudiant_id):
-    """Récupère un étudiant par son ID"""
-    return db.session.get(Etudiant, etudiant_id)
+    """Récupère un étudiant par son ID (chargeur par lots de la requête)"""
+    from helpers.chargeurs import charger_entite
+    
+    return charger_entite(Etudiant, etudiant_id, lambda cle: db.session.get(Etudiant, cle))
 
 def obtenir_etudiant_par_user_id(user_id):
     """Récupère un étudiant par l'ID utilisateur"""
@@ -153,3 +155,162 @@ def modifier_etudiant(etudiant_id, **kwargs):
     except Exception as e:
         db.session.rollback()
         return {'success': False, 'message': f'Erreur: {str(e)}'}
+
+def _lire_date(valeur):
+    """Date Excel (date/datetime) ou texte AAAA-MM-JJ / JJ/MM/AAAA ; None si vide"""
+    from datetime import date
+    
+    if valeur is None or str(valeur).strip() == '':
+        return None
+    if isinstance(valeur, datetime):
+        return valeur.date()
+    if isinstance(valeur, date):
+        return valeur
+    for format_date in ('%Y-%m-%d', '%d/%m/%Y'):
+        try:
+            return datetime.strptime(str(valeur).strip(), format_date).date()
+        except ValueError:
+            continue
+    raise ValueError(f"Date illisible ({valeur})")
+
+def importer_etudiants_masse(donnees_etudiants, id_filiere, mot_de_passe_initial, tout_ou_rien=False):
+    """
+    Import massif d'étudiants dans une filière
+    
+    Les emails sont vérifiés en une requête IN par lot, toutes les lignes
+    sont validées avant écriture, puis les matricules de toutes les lignes
+    valides sont réservés en une fois (generer_matricules) et les comptes
+    et profils insérés dans une seule transaction. Le mot de passe initial,
+    commun au lot, n'est haché qu'une fois.
+    
+    Args:
+        donnees_etudiants: Itérable de dict avec nom, prenom, email,
+                           date_naissance, adresse et éventuellement ligne
+        id_filiere: ID de la filière d'inscription
+        mot_de_passe_initial: Mot de passe des comptes créés
+        tout_ou_rien: N'importer aucun étudiant si une ligne est en erreur
+    
+    Returns:
+        dict: {'success': bool, 'total': int, 'importes': int, 'matricules': list,
+               'erreurs': list, 'rapport': list de dict {ligne, nom, email, message}}
+    """
+    from werkzeug.security import generate_password_hash
+    from models.filieres import obtenir_filiere_par_id
+    from models.notes import _resoudre_par_lots
+    from models.utilisateurs import Utilisateur, generer_matricules
+    
+    donnees = []
+    for idx, donnee in enumerate(donnees_etudiants):
+        donnee = dict(donnee)
+        donnee.setdefault('ligne', idx + 1)
+        for champ in ('nom', 'prenom', 'email', 'adresse'):
+            donnee[champ] = str(donnee.get(champ) or '').strip()
+        donnees.append(donnee)
+    
+    resultat = {'success': False, 'total': len(donnees), 'importes': 0, 'matricules': [], 'erreurs': [], 'rapport': []}
+    
+    if not obtenir_filiere_par_id(id_filiere):
+        resultat['erreurs'].append('Filière inexistante')
+        return resultat
+    if not mot_de_passe_initial:
+        resultat['erreurs'].append('Mot de passe initial requis')
+        return resultat
+    
+    existants = _resoudre_par_lots(
+        Utilisateur.email, (Utilisateur.id_user,),
+        {d['email'] for d in donnees if d['email']}
+    )
+    
+    rapport = resultat['rapport']
+    valides = []
+    emails_vus = set()
+    
+    def _erreur(donnee, message):
+        rapport.append({
+            'ligne': donnee['ligne'],
+            'nom': f"{donnee['nom']} {donnee['prenom']}".strip(),
+            'email': donnee['email'],
+            'message': message
+        })
+    
+    for donnee in donnees:
+        try:
+            date_naissance = _lire_date(donnee.get('date_naissance'))
+        except ValueError as e:
+            _erreur(donnee, str(e))
+            continue
+        
+        if not donnee['nom'] or not donnee['prenom']:
+            _erreur(donnee, 'Nom et prénom requis')
+        elif '@' not in donnee['email']:
+            _erreur(donnee, f"Email invalide ({donnee['email']})")
+        elif donnee['email'] in existants:
+            _erreur(donnee, 'Email déjà utilisé')
+        elif donnee['email'] in emails_vus:
+            _erreur(donnee, 'Email en double dans le fichier')
+        else:
+            emails_vus.add(donnee['email'])
+            valides.append((donnee, date_naissance))
+    
+    resultat['erreurs'] = [f"Ligne {r['ligne']}: {r['message']}" for r in rapport]
+    resultat['success'] = len(rapport) == 0
+    
+    if not valides or (rapport and tout_ou_rien):
+        return resultat
+    
+    try:
+        # Plage réservée en une instruction ; une plage non utilisée laisse un trou, pas un doublon
+        matricules = generer_matricules('ETUDIANT', len(valides))
+        mot_de_passe = generate_password_hash(mot_de_passe_initial)
+        
+        utilisateurs = [Utilisateur(
+            matricule=matricule,
+            nom=donnee['nom'],
+            prenom=donnee['prenom'],
+            email=donnee['email'],
+            mot_de_passe=mot_de_passe,
+            role='ETUDIANT'
+        ) for matricule, (donnee, _) in zip(matricules, valides)]
+        db.session.add_all(utilisateurs)
+        db.session.flush()
+        
+        db.session.add_all([Etudiant(
+            id_user=utilisateur.id_user,
+            id_filiere=id_filiere,
+            date_naissance=date_naissance,
+            adresse=donnee['adresse'] or None
+        ) for utilisateur, (donnee, date_naissance) in zip(utilisateurs, valides)])
+        db.session.commit()
+        
+        resultat['importes'] = len(valides)
+        resultat['matricules'] = matricules
+    except Exception as e:
+        db.session.rollback()
+        resultat['success'] = False
+        resultat['erreurs'].append(f'Erreur: {str(e)}')
+    
+    return resultat
+
+def importer_etudiants_excel(fichier, id_filiere, mot_de_passe_initial, tout_ou_rien=False):
+    """
+    Import massif d'étudiants depuis un fichier Excel (.xlsx)
+    
+    Colonnes: Nom, Prenom, Email, Date_Naissance (optionnelle), Adresse (optionnelle)
+    
+    Returns:
+        dict: voir importer_etudiants_masse
+    """
+    from helpers.import_excel import lire_lignes_excel
+    
+    try:
+        lignes = lire_lignes_excel(fichier, ['nom', 'prenom', 'email', 'date_naissance', 'adresse'])
+        return importer_etudiants_masse(lignes, id_filiere, mot_de_passe_initial, tout_ou_rien=tout_ou_rien)
+    except Exception as e:
+        return {
+            'success': False,
+            'total': 0,
+            'importes': 0,
+            'matricules': [],
+            'erreurs': [f'Erreur lecture fichier: {str(e)}'],
+            'rapport': []
+        }
@@ -50,6 +50,7 @@ def creer_filiere(code_filiere, nom_filiere, niveau, effectif_prevu=30):
         
         db.session.add(filiere)
         db.session.commit()
+        invalider_cache_filieres()
         
         return {
             'success': True,
@@ -62,16 +63,25 @@ def creer_filiere(code_filiere, nom_filiere, niveau, effectif_prevu=30):
         return {'success': False, 'message': f'Erreur: {str(e)}'}
 
 def obtenir_filiere_par_id(filiere_id):
-    """Récupère une filière par son ID"""
-    return db.session.get(Filiere, filiere_id)
+    """Récupère une filière par son ID (chargeur par lots de la requête, puis cache)"""
+    from helpers.cache import entite_en_cache
+    from helpers.chargeurs import charger_entite
+    
+    return charger_entite(Filiere, filiere_id, lambda cle: entite_en_cache(
+        'filieres', Filiere, cle, lambda: db.session.get(Filiere, cle)
+    ), nom_cache='filieres')
 
 def obtenir_filiere_par_code(code_filiere):
     """Récupère une filière par son code"""
     return db.session.query(Filiere).filter_by(code_filiere=code_filiere).first()
 
 def lister_filieres_actives():
-    """Liste toutes les filières actives"""
-    return db.session.query(Filiere).filter_by(est_active=True).order_by(Filiere.niveau, Filiere.nom_filiere).all()
+    """Liste toutes les filières actives (lecture à travers le cache)"""
+    from helpers.cache import liste_en_cache
+    
+    return liste_en_cache('filieres', Filiere, 'actives', lambda: db.session.query(Filiere).filter_by(
+        est_active=True
+    ).order_by(Filiere.niveau, Filiere.nom_filiere).all())
 
 def lister_filieres_par_niveau(niveau):
     """Liste les filières d'un niveau donné"""
@@ -98,10 +108,17 @@ def modifier_filiere(filiere_id, **kwargs):
                 setattr(filiere, key, value)
         
         db.session.commit()
+        invalider_cache_filieres()
         return {'success': True, 'message': 'Filière modifiée avec succès'}
     
     except Exception as e:
         db.session.rollback()
         return {'success': False, 'message': f'Erreur: {str(e)}'}
 
+def invalider_cache_filieres():
+    """Invalide le cache des filières (entrées par ID et liste des actives)"""
+    from helpers.cache import obtenir_cache
+    
+    obtenir_cache('filieres').invalider()
+
 NIVEAUX_VALIDES = ['L1', 'L2', 'L3', 'M1', 'M2']
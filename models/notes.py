@@ -22,6 +22,22 @@ class Note(db.Model):
     def __repr__(self):
         return f'<Note {self.valeur_note}/20 - Etudiant {self.id_etudiant}>'
 
+class MoyenneMensuelle(db.Model):
+    """Table moyennes_mensuelles - Cumul des notes validées par étudiant, cours et mois de saisie"""
+    __tablename__ = 'moyennes_mensuelles'
+    
+    id_etudiant = db.Column(db.Integer, db.ForeignKey('etudiants.id_etudiant'), primary_key=True)
+    id_cours = db.Column(db.Integer, db.ForeignKey('cours.id_cours'), primary_key=True, index=True)
+    mois = db.Column(db.String(7), primary_key=True, index=True)  # AAAA-MM
+    somme_ponderee = db.Column(db.Float, nullable=False, default=0)  # Σ note × crédit
+    somme_credits = db.Column(db.Float, nullable=False, default=0)
+    nb_notes = db.Column(db.Integer, nullable=False, default=0)
+    note_min = db.Column(db.Float, nullable=True)
+    note_max = db.Column(db.Float, nullable=True)
+    
+    def __repr__(self):
+        return f'<MoyenneMensuelle {self.id_etudiant}/{self.id_cours} {self.mois}: {self.nb_notes} notes>'
+
 # ============================================================================
 # FONCTIONS PROCÉDURALES - GESTION DES NOTES
 # ============================================================================
@@ -103,6 +119,7 @@ def valider_note(note_id, id_validateur):
         note.id_validateur = id_validateur
         note.date_validation = datetime.utcnow()
         
+        _cumuler_moyennes_mensuelles([note])
         db.session.commit()
         
         return {'success': True, 'message': 'Note validée avec succès'}
@@ -204,6 +221,102 @@ def calculer_moyenne_etudiant(id_etudiant, seulement_validees=True):
     
     return None
 
+def calculer_moyennes_filiere(id_filiere, seulement_validees=True):
+    """
+    Calcule en une seule requête groupée les moyennes pondérées
+    de tous les étudiants d'une filière
+    
+    Args:
+        id_filiere: ID de la filière
+        seulement_validees: Ne compter que les notes validées
+    
+    Returns:
+        dict: {id_etudiant: moyenne} (étudiants sans note absents du dict)
+    """
+    from models.cours import Cours
+    from models.etudiants import Etudiant
+    from sqlalchemy import func
+    
+    query = db.session.query(
+        Note.id_etudiant,
+        func.sum(Note.valeur_note * Cours.credit).label('total_pondere'),
+        func.sum(Cours.credit).label('total_credits')
+    ).join(
+        Cours, Note.id_cours == Cours.id_cours
+    ).join(
+        Etudiant, Note.id_etudiant == Etudiant.id_etudiant
+    ).filter(Etudiant.id_filiere == id_filiere)
+    
+    if seulement_validees:
+        query = query.filter(Note.statut_validation == 'Valide')
+    
+    moyennes = {}
+    for id_etudiant, total_pondere, total_credits in query.group_by(Note.id_etudiant).all():
+        if total_credits and total_credits > 0:
+            moyennes[id_etudiant] = round(total_pondere / total_credits, 2)
+    
+    return moyennes
+
+def classer_moyennes(moyennes):
+    """
+    Classe un ensemble de moyennes
+    
+    Le rang suit la convention "compétition" : les ex-aequo partagent
+    le même rang et le rang suivant est sauté (1, 2, 2, 4).
+    
+    Args:
+        moyennes: dict {id_etudiant: moyenne}
+    
+    Returns:
+        dict: {id_etudiant: (moyenne, rang)}
+    """
+    classement = {}
+    rang = 0
+    moyenne_precedente = None
+    tries = sorted(moyennes.items(), key=lambda item: item[1], reverse=True)
+    
+    for position, (id_etudiant, moyenne) in enumerate(tries, start=1):
+        if moyenne != moyenne_precedente:
+            rang = position
+            moyenne_precedente = moyenne
+        classement[id_etudiant] = (moyenne, rang)
+    
+    return classement
+
+def calculer_classement_filiere(id_filiere):
+    """
+    Calcule moyenne et rang de tous les étudiants d'une filière
+    
+    Args:
+        id_filiere: ID de la filière
+    
+    Returns:
+        dict: {id_etudiant: (moyenne, rang)} pour les étudiants ayant une moyenne
+    """
+    return classer_moyennes(calculer_moyennes_filiere(id_filiere))
+
+def obtenir_moyenne_et_rang(id_etudiant, classement=None):
+    """
+    Retourne la moyenne et le rang d'un étudiant
+    
+    Args:
+        id_etudiant: ID de l'étudiant
+        classement: Classement de la filière déjà calculé (optionnel)
+    
+    Returns:
+        tuple: (moyenne, rang) ou (None, None) si pas de notes validées
+    """
+    if classement is None:
+        from models.etudiants import obtenir_etudiant_par_id
+        
+        etudiant = obtenir_etudiant_par_id(id_etudiant)
+        if not etudiant:
+            return (None, None)
+        
+        classement = calculer_classement_filiere(etudiant.id_filiere)
+    
+    return classement.get(id_etudiant, (None, None))
+
 def calculer_rang_etudiant(id_etudiant):
     """
     Calcule le rang d'un étudiant dans sa filière
@@ -211,82 +324,352 @@ def calculer_rang_etudiant(id_etudiant):
     Returns:
         int: Rang (1 = meilleur)
     """
-    from models.etudiants import obtenir_etudiant_par_id
+    return obtenir_moyenne_et_rang(id_etudiant)[1]
+
+# Taille des lots pour les clauses IN (limite de variables SQLite)
+TAILLE_LOT_IMPORT = 500
+
+def _resoudre_par_lots(colonne_cle, colonnes, valeurs, jointures=()):
+    """Résout un ensemble de clés en une requête IN par lot de TAILLE_LOT_IMPORT"""
+    valeurs = list(valeurs)
+    resolues = {}
+    for debut in range(0, len(valeurs), TAILLE_LOT_IMPORT):
+        requete = db.session.query(colonne_cle, *colonnes)
+        for cible, condition in jointures:
+            requete = requete.join(cible, condition)
+        for cle, *reste in requete.filter(colonne_cle.in_(valeurs[debut:debut + TAILLE_LOT_IMPORT])).all():
+            resolues[cle] = tuple(reste)
+    return resolues
+
+def importer_notes_masse(donnees_notes, tout_ou_rien=False):
+    """
+    Import massif de notes depuis une liste
     
-    etudiant = obtenir_etudiant_par_id(id_etudiant)
-    if not etudiant:
-        return None
+    Les matricules et les codes cours sont résolus en une requête IN
+    chacun, toutes les lignes sont validées avant écriture puis insérées
+    par executemany dans une seule transaction.
     
-    moyenne_etudiant = calculer_moyenne_etudiant(id_etudiant)
-    if moyenne_etudiant is None:
-        return None
+    Args:
+        donnees_notes: Itérable de dict avec matricule, code_cours, note,
+                       type_evaluation, commentaire et éventuellement ligne
+        tout_ou_rien: N'importer aucune note si une ligne est en erreur
     
-    # Compter combien d'étudiants de la même filière ont une meilleure moyenne
+    Returns:
+        dict: {'success': bool, 'total': int, 'importees': int,
+               'erreurs': list, 'rapport': list de dict {ligne, matricule, code_cours, message}}
+    """
+    from sqlalchemy import insert
     from models.etudiants import Etudiant
-    etudiants_filiere = db.session.query(Etudiant).filter_by(
-        id_filiere=etudiant.id_filiere
-    ).all()
+    from models.utilisateurs import Utilisateur
+    from models.cours import Cours
     
-    rang = 1
-    for autre_etudiant in etudiants_filiere:
-        if autre_etudiant.id_etudiant == id_etudiant:
-            continue
+    donnees = []
+    for idx, donnee in enumerate(donnees_notes):
+        donnee = dict(donnee)
+        donnee.setdefault('ligne', idx + 1)
+        donnee['matricule'] = str(donnee.get('matricule') or '').strip()
+        donnee['code_cours'] = str(donnee.get('code_cours') or '').strip()
+        donnees.append(donnee)
+    
+    etudiants = _resoudre_par_lots(
+        Utilisateur.matricule, (Etudiant.id_etudiant, Etudiant.id_filiere),
+        {d['matricule'] for d in donnees if d['matricule']},
+        jointures=((Etudiant, Etudiant.id_user == Utilisateur.id_user),)
+    )
+    cours = _resoudre_par_lots(
+        Cours.code_cours, (Cours.id_cours, Cours.id_filiere),
+        {d['code_cours'] for d in donnees if d['code_cours']}
+    )
+    
+    rapport = []
+    lignes = []
+    maintenant = datetime.utcnow()
+    
+    def _erreur(donnee, message):
+        rapport.append({
+            'ligne': donnee['ligne'],
+            'matricule': donnee['matricule'],
+            'code_cours': donnee['code_cours'],
+            'message': message
+        })
+    
+    for donnee in donnees:
+        etudiant = etudiants.get(donnee['matricule'])
+        cours_trouve = cours.get(donnee['code_cours'])
+        type_evaluation = donnee.get('type_evaluation') or 'Examen'
+        
+        try:
+            valeur = float(str(donnee.get('note')).replace(',', '.'))
+        except (TypeError, ValueError):
+            valeur = None
         
-        moyenne_autre = calculer_moyenne_etudiant(autre_etudiant.id_etudiant)
-        if moyenne_autre and moyenne_autre > moyenne_etudiant:
-            rang += 1
+        if not etudiant:
+            _erreur(donnee, f"Matricule {donnee['matricule']} introuvable")
+        elif not cours_trouve:
+            _erreur(donnee, f"Code cours {donnee['code_cours']} introuvable")
+        elif valeur is None:
+            _erreur(donnee, f"Note illisible ({donnee.get('note')})")
+        elif not (0 <= valeur <= 20):
+            _erreur(donnee, 'Note doit être entre 0 et 20')
+        elif type_evaluation not in TYPES_EVALUATION_VALIDES:
+            _erreur(donnee, f"Type d'évaluation invalide ({type_evaluation})")
+        elif etudiant[1] != cours_trouve[1]:
+            _erreur(donnee, 'Étudiant pas inscrit dans cette filière')
+        else:
+            lignes.append({
+                'id_etudiant': etudiant[0],
+                'id_cours': cours_trouve[0],
+                'valeur_note': valeur,
+                'type_evaluation': type_evaluation,
+                'statut_validation': 'En attente',
+                'date_saisie': maintenant,
+                'commentaire': donnee.get('commentaire')
+            })
+    
+    erreurs = [f"Ligne {r['ligne']}: {r['message']}" for r in rapport]
+    resultat = {
+        'success': len(rapport) == 0,
+        'total': len(donnees),
+        'importees': 0,
+        'erreurs': erreurs,
+        'rapport': rapport
+    }
     
-    return rang
+    if not lignes or (rapport and tout_ou_rien):
+        return resultat
+    
+    try:
+        db.session.execute(insert(Note.__table__), lignes)
+        db.session.commit()
+        resultat['importees'] = len(lignes)
+    except Exception as e:
+        db.session.rollback()
+        resultat['success'] = False
+        resultat['erreurs'].append(f'Erreur: {str(e)}')
+    
+    return resultat
 
-def importer_notes_masse(donnees_notes):
+def importer_notes_excel(fichier, tout_ou_rien=False):
     """
-    Import massif de notes depuis une liste
+    Import massif de notes depuis un fichier Excel (.xlsx)
+    
+    Colonnes: Matricule, Code_Cours, Note, Type_Evaluation, Commentaire (optionnelle)
+    
+    Returns:
+        dict: voir importer_notes_masse
+    """
+    from helpers.import_excel import lire_lignes_excel
+    
+    try:
+        lignes = lire_lignes_excel(
+            fichier, ['matricule', 'code_cours', 'note', 'type_evaluation', 'commentaire']
+        )
+        return importer_notes_masse(lignes, tout_ou_rien=tout_ou_rien)
+    except Exception as e:
+        return {
+            'success': False,
+            'total': 0,
+            'importees': 0,
+            'erreurs': [f'Erreur lecture fichier: {str(e)}'],
+            'rapport': []
+        }
+
+# ============================================================================
+# FONCTIONS PROCÉDURALES - MOYENNES MENSUELLES
+# ============================================================================
+
+def _expression_mois(colonne):
+    """Expression SQL 'AAAA-MM' d'une colonne date selon le dialecte"""
+    from sqlalchemy import func
+    
+    dialecte = db.session.get_bind().dialect.name
+    if dialecte == 'sqlite':
+        return func.strftime('%Y-%m', colonne)
+    if dialecte == 'postgresql':
+        return func.to_char(colonne, 'YYYY-MM')
+    return func.date_format(colonne, '%Y-%m')
+
+def _cumuler_moyennes_mensuelles(notes):
+    """
+    Ajoute des notes qui viennent d'être validées aux cumuls mensuels (sans commit)
+    
+    Args:
+        notes: Liste d'objets Note (mois pris sur date_saisie)
+    """
+    from database import executer_upsert
+    from models.cours import Cours
+    
+    if not notes:
+        return
+    
+    credits = dict(db.session.query(Cours.id_cours, Cours.credit).filter(
+        Cours.id_cours.in_({note.id_cours for note in notes})
+    ).all())
+    
+    lignes = {}
+    for note in notes:
+        cle = (note.id_etudiant, note.id_cours, (note.date_saisie or datetime.utcnow()).strftime('%Y-%m'))
+        credit = credits.get(note.id_cours, 0)
+        ligne = lignes.setdefault(cle, {
+            'id_etudiant': cle[0], 'id_cours': cle[1], 'mois': cle[2],
+            'somme_ponderee': 0, 'somme_credits': 0, 'nb_notes': 0,
+            'note_min': note.valeur_note, 'note_max': note.valeur_note
+        })
+        ligne['somme_ponderee'] += note.valeur_note * credit
+        ligne['somme_credits'] += credit
+        ligne['nb_notes'] += 1
+        ligne['note_min'] = min(ligne['note_min'], note.valeur_note)
+        ligne['note_max'] = max(ligne['note_max'], note.valeur_note)
+    
+    executer_upsert(
+        MoyenneMensuelle.__table__,
+        list(lignes.values()),
+        cles=['id_etudiant', 'id_cours', 'mois'],
+        colonnes_inc=['somme_ponderee', 'somme_credits', 'nb_notes'],
+        colonnes_min=['note_min'],
+        colonnes_max=['note_max']
+    )
+
+def reconstruire_moyennes_mensuelles(mois_debut=None):
+    """
+    Recalcule les cumuls mensuels depuis la table notes (job mensuel, réparation)
     
     Args:
-        donnees_notes: Liste de dict avec matricule, code_cours, note, type_evaluation
+        mois_debut: 'AAAA-MM' ; seuls les mois >= mois_debut sont recalculés
+                    (None = tout l'historique)
     
     Returns:
-        dict: {'success': bool, 'importees': int, 'erreurs': list}
+        dict: {'success': bool, 'lignes': int, 'message': str}
     """
-    importees = 0
-    erreurs = []
+    from sqlalchemy import func
+    from models.cours import Cours
     
-    for idx, donnee in enumerate(donnees_notes):
-        try:
-            from models.etudiants import obtenir_etudiant_par_matricule
-            from models.cours import obtenir_cours_par_code
-            
-            etudiant = obtenir_etudiant_par_matricule(donnee['matricule'])
-            cours = obtenir_cours_par_code(donnee['code_cours'])
-            
-            if not etudiant:
-                erreurs.append(f"Ligne {idx+1}: Matricule {donnee['matricule']} introuvable")
-                continue
-            
-            if not cours:
-                erreurs.append(f"Ligne {idx+1}: Code cours {donnee['code_cours']} introuvable")
-                continue
-            
-            result = saisir_note(
-                etudiant.id_etudiant,
-                cours.id_cours,
-                float(donnee['note']),
-                donnee.get('type_evaluation', 'Examen')
+    mois = _expression_mois(Note.date_saisie)
+    
+    try:
+        query = db.session.query(
+            Note.id_etudiant,
+            Note.id_cours,
+            mois,
+            func.sum(Note.valeur_note * Cours.credit),
+            func.sum(Cours.credit),
+            func.count(Note.id_note),
+            func.min(Note.valeur_note),
+            func.max(Note.valeur_note)
+        ).join(
+            Cours, Note.id_cours == Cours.id_cours
+        ).filter(Note.statut_validation == 'Valide')
+        
+        suppression = db.session.query(MoyenneMensuelle)
+        if mois_debut:
+            query = query.filter(mois >= mois_debut)
+            suppression = suppression.filter(MoyenneMensuelle.mois >= mois_debut)
+        
+        cumuls = query.group_by(Note.id_etudiant, Note.id_cours, mois).all()
+        
+        suppression.delete(synchronize_session=False)
+        db.session.add_all([
+            MoyenneMensuelle(
+                id_etudiant=id_etudiant,
+                id_cours=id_cours,
+                mois=mois_note,
+                somme_ponderee=somme_ponderee or 0,
+                somme_credits=somme_credits or 0,
+                nb_notes=nb_notes,
+                note_min=note_min,
+                note_max=note_max
             )
-            
-            if result['success']:
-                importees += 1
-            else:
-                erreurs.append(f"Ligne {idx+1}: {result['message']}")
+            for id_etudiant, id_cours, mois_note, somme_ponderee, somme_credits, nb_notes, note_min, note_max in cumuls
+        ])
+        db.session.commit()
         
-        except Exception as e:
-            erreurs.append(f"Ligne {idx+1}: Erreur {str(e)}")
+        return {'success': True, 'lignes': len(cumuls), 'message': f'{len(cumuls)} cumuls mensuels recalculés'}
     
-    return {
-        'success': len(erreurs) == 0,
-        'importees': importees,
-        'erreurs': erreurs
-    }
+    except Exception as e:
+        db.session.rollback()
+        return {'success': False, 'lignes': 0, 'message': f'Erreur: {str(e)}'}
+
+def initialiser_tables_notes():
+    """Mise à niveau d'une base déjà peuplée : cumuls mensuels initiaux"""
+    if db.session.query(MoyenneMensuelle.id_etudiant).first() is None and \
+            db.session.query(Note.id_note).filter(Note.statut_validation == 'Valide').first() is not None:
+        reconstruire_moyennes_mensuelles()
+
+def _series_progression(query, mois_debut=None, mois_fin=None):
+    """Regroupe une requête sur moyennes_mensuelles par mois et calcule les moyennes"""
+    from sqlalchemy import func
+    
+    if mois_debut:
+        query = query.filter(MoyenneMensuelle.mois >= mois_debut)
+    if mois_fin:
+        query = query.filter(MoyenneMensuelle.mois <= mois_fin)
+    
+    lignes = query.with_entities(
+        MoyenneMensuelle.mois,
+        func.sum(MoyenneMensuelle.somme_ponderee),
+        func.sum(MoyenneMensuelle.somme_credits),
+        func.sum(MoyenneMensuelle.nb_notes),
+        func.min(MoyenneMensuelle.note_min),
+        func.max(MoyenneMensuelle.note_max)
+    ).group_by(MoyenneMensuelle.mois).order_by(MoyenneMensuelle.mois).all()
+    
+    progression = []
+    cumul_pondere = cumul_credits = 0
+    for mois, somme_ponderee, somme_credits, nb_notes, note_min, note_max in lignes:
+        cumul_pondere += somme_ponderee or 0
+        cumul_credits += somme_credits or 0
+        progression.append({
+            'mois': mois,
+            'moyenne': round(somme_ponderee / somme_credits, 2) if somme_credits else None,
+            'moyenne_cumulee': round(cumul_pondere / cumul_credits, 2) if cumul_credits else None,
+            'nb_notes': nb_notes,
+            'note_min': note_min,
+            'note_max': note_max
+        })
+    
+    return progression
+
+def obtenir_progression_etudiant(id_etudiant, id_cours=None, mois_debut=None, mois_fin=None):
+    """
+    Courbe de progression mensuelle d'un étudiant (lue dans moyennes_mensuelles)
+    
+    Args:
+        id_etudiant: ID de l'étudiant
+        id_cours: Limiter à un cours (None = tous les cours, pondérés par crédits)
+        mois_debut: 'AAAA-MM' inclus (optionnel)
+        mois_fin: 'AAAA-MM' inclus (optionnel)
+    
+    Returns:
+        list: [{'mois', 'moyenne', 'moyenne_cumulee', 'nb_notes', 'note_min', 'note_max'}, ...]
+              par mois croissant (moyenne_cumulee calculée depuis le premier mois retourné)
+    """
+    query = db.session.query(MoyenneMensuelle).filter(MoyenneMensuelle.id_etudiant == id_etudiant)
+    if id_cours is not None:
+        query = query.filter(MoyenneMensuelle.id_cours == id_cours)
+    
+    return _series_progression(query, mois_debut, mois_fin)
+
+def obtenir_progression_filiere(id_filiere=None, mois_debut=None, mois_fin=None):
+    """
+    Courbe de progression mensuelle d'une filière (ou de l'établissement)
+    
+    Args:
+        id_filiere: ID de la filière (None = toutes les filières)
+        mois_debut: 'AAAA-MM' inclus (optionnel)
+        mois_fin: 'AAAA-MM' inclus (optionnel)
+    
+    Returns:
+        list: Même format que obtenir_progression_etudiant
+    """
+    from models.cours import Cours
+    
+    query = db.session.query(MoyenneMensuelle)
+    if id_filiere is not None:
+        query = query.join(
+            Cours, MoyenneMensuelle.id_cours == Cours.id_cours
+        ).filter(Cours.id_filiere == id_filiere)
+    
+    return _series_progression(query, mois_debut, mois_fin)
 
 TYPES_EVALUATION_VALIDES = ['Examen', 'Controle', 'TP', 'TD', 'Projet']
 STATUTS_VALIDATION = ['En attente', 'Valide', 'Rejeté']
@@ -0,0 +1,182 @@
+"""
+Modèle Planificateur - Bail du processus leader et historique des exécutions
+"""
+from database import db
+from datetime import datetime, timedelta
+
+class BailPlanificateur(db.Model):
+    """Table scheduler_bail - Processus autorisé à exécuter les tâches planifiées"""
+    __tablename__ = 'scheduler_bail'
+
+    nom = db.Column(db.String(50), primary_key=True)
+    proprietaire = db.Column(db.String(100), nullable=False)  # hôte:pid:jeton
+    expire_le = db.Column(db.DateTime, nullable=False)
+    date_maj = db.Column(db.DateTime, default=datetime.utcnow)
+
+    def __repr__(self):
+        return f'<BailPlanificateur {self.nom}: {self.proprietaire} jusqu\'à {self.expire_le}>'
+
+class ExecutionTache(db.Model):
+    """Table scheduler_executions - Historique des exécutions des tâches planifiées"""
+    __tablename__ = 'scheduler_executions'
+
+    id_execution = db.Column(db.Integer, primary_key=True, autoincrement=True)
+    id_tache = db.Column(db.String(50), nullable=False)
+    proprietaire = db.Column(db.String(100), nullable=False)
+    statut = db.Column(db.String(20), nullable=False, default='En cours')  # En cours, Succes, Echec
+    date_debut = db.Column(db.DateTime, nullable=False, default=datetime.utcnow, index=True)
+    date_fin = db.Column(db.DateTime, nullable=True)
+    duree_ms = db.Column(db.Integer, nullable=True)
+    lignes = db.Column(db.Integer, nullable=True)  # Lignes traitées
+    message = db.Column(db.Text, nullable=True)  # Résumé ou erreur
+
+    __table_args__ = (
+        db.Index('ix_scheduler_executions_tache', 'id_tache', 'date_debut'),
+    )
+
+    def __repr__(self):
+        return f'<ExecutionTache {self.id_tache} {self.statut} {self.date_debut}>'
+
+STATUTS_EXECUTION = ['En cours', 'Succes', 'Echec']
+
+# ============================================================================
+# FONCTIONS PROCÉDURALES - BAIL DU LEADER
+# ============================================================================
+
+def acquerir_bail(nom, proprietaire, duree_secondes):
+    """
+    Prend ou renouvelle le bail (une seule instruction UPDATE conditionnelle)
+
+    Le bail est accordé s'il est libre, expiré ou déjà détenu par
+    proprietaire ; il est alors prolongé de duree_secondes. Deux processus
+    concurrents ne peuvent pas l'obtenir ensemble : la base sérialise les
+    mises à jour de la ligne. Les horloges des serveurs doivent être
+    synchronisées à une fraction de duree_secondes près.
+
+    Args:
+        nom: Nom du bail (un par planificateur)
+        proprietaire: Identifiant unique du processus
+        duree_secondes: Durée de validité sans renouvellement
+
+    Returns:
+        bool: True si proprietaire détient le bail
+    """
+    from sqlalchemy import or_
+    from database import executer_upsert
+
+    maintenant = datetime.utcnow()
+    expiration = maintenant + timedelta(seconds=duree_secondes)
+
+    try:
+        # Première prise : la ligne n'existe pas encore (ignorée si déjà là)
+        executer_upsert(
+            BailPlanificateur.__table__,
+            [{'nom': nom, 'proprietaire': proprietaire, 'expire_le': expiration, 'date_maj': maintenant}],
+            cles=['nom']
+        )
+        acquis = db.session.query(BailPlanificateur).filter(
+            BailPlanificateur.nom == nom,
+            or_(
+                BailPlanificateur.proprietaire == proprietaire,
+                BailPlanificateur.expire_le < maintenant
+            )
+        ).update({
+            'proprietaire': proprietaire,
+            'expire_le': expiration,
+            'date_maj': maintenant
+        }, synchronize_session=False)
+        db.session.commit()
+        return acquis == 1
+
+    except Exception:
+        db.session.rollback()
+        return False
+
+def liberer_bail(nom, proprietaire):
+    """Rend le bail (arrêt propre) : un autre processus le reprend sans attendre l'expiration"""
+    try:
+        db.session.query(BailPlanificateur).filter_by(
+            nom=nom, proprietaire=proprietaire
+        ).delete(synchronize_session=False)
+        db.session.commit()
+    except Exception:
+        db.session.rollback()
+
+def obtenir_bail(nom):
+    """Retourne le bail courant (ou None)"""
+    return db.session.get(BailPlanificateur, nom)
+
+# ============================================================================
+# FONCTIONS PROCÉDURALES - HISTORIQUE DES EXÉCUTIONS
+# ============================================================================
+
+def debuter_execution(id_tache, proprietaire):
+    """
+    Enregistre le début d'une exécution (commit immédiat : visible pendant la tâche)
+
+    Returns:
+        int: ID de l'exécution
+    """
+    execution = ExecutionTache(id_tache=id_tache, proprietaire=proprietaire, date_debut=datetime.utcnow())
+    db.session.add(execution)
+    db.session.commit()
+    return execution.id_execution
+
+def terminer_execution(id_execution, succes, lignes=None, message=None):
+    """
+    Enregistre la fin d'une exécution
+
+    Args:
+        id_execution: ID renvoyé par debuter_execution
+        succes: Résultat de la tâche
+        lignes: Nombre de lignes traitées (optionnel)
+        message: Résumé ou message d'erreur
+    """
+    try:
+        db.session.rollback()  # État laissé par une tâche en échec
+        execution = db.session.get(ExecutionTache, id_execution)
+        if execution is None:
+            return
+
+        execution.date_fin = datetime.utcnow()
+        execution.duree_ms = int((execution.date_fin - execution.date_debut).total_seconds() * 1000)
+        execution.statut = 'Succes' if succes else 'Echec'
+        execution.lignes = lignes
+        execution.message = message
+        db.session.commit()
+
+    except Exception:
+        db.session.rollback()
+
+def lister_executions(id_tache=None, limite=50):
+    """
+    Dernières exécutions des tâches planifiées
+
+    Args:
+        id_tache: Filtrer sur une tâche (optionnel)
+        limite: Nombre maximum d'exécutions
+
+    Returns:
+        Liste d'ExecutionTache, plus récentes d'abord
+    """
+    query = db.session.query(ExecutionTache)
+    if id_tache:
+        query = query.filter(ExecutionTache.id_tache == id_tache)
+    return query.order_by(ExecutionTache.date_debut.desc()).limit(limite).all()
+
+def purger_executions(date_limite):
+    """
+    Supprime l'historique antérieur à date_limite
+
+    Returns:
+        int: Nombre d'exécutions supprimées
+    """
+    try:
+        supprimees = db.session.query(ExecutionTache).filter(
+            ExecutionTache.date_debut < date_limite
+        ).delete(synchronize_session=False)
+        db.session.commit()
+        return supprimees
+    except Exception:
+        db.session.rollback()
+        return 0
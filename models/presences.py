@@ -7,6 +7,9 @@ from datetime import datetime, date
 class Presence(db.Model):
     """Table presences - Pointage des présences"""
     __tablename__ = 'presences'
+    __table_args__ = (
+        db.Index('ux_presences_pointage', 'id_edt', 'id_etudiant', 'date_pointage', unique=True),
+    )
     
     id_presence = db.Column(db.Integer, primary_key=True, autoincrement=True)
     id_edt = db.Column(db.Integer, db.ForeignKey('emploi_du_temps.id_edt'), nullable=False, index=True)
@@ -18,6 +21,35 @@ class Presence(db.Model):
     def __repr__(self):
         return f'<Presence {self.statut} - EDT {self.id_edt}>'
 
+class CompteurPresence(db.Model):
+    """Table compteurs_presences - Totaux de pointage par étudiant, tenus à jour à l'écriture"""
+    __tablename__ = 'compteurs_presences'
+    
+    id_etudiant = db.Column(db.Integer, db.ForeignKey('etudiants.id_etudiant'), primary_key=True)
+    nb_presents = db.Column(db.Integer, nullable=False, default=0)
+    nb_absents = db.Column(db.Integer, nullable=False, default=0)
+    nb_retards = db.Column(db.Integer, nullable=False, default=0)
+    nb_total = db.Column(db.Integer, nullable=False, default=0)
+    date_maj = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    
+    def __repr__(self):
+        return f'<CompteurPresence {self.id_etudiant}: {self.nb_presents}/{self.nb_total}>'
+
+class PresenceStat(db.Model):
+    """Table presence_stats - Totaux de pointage par étudiant, cours et semaine"""
+    __tablename__ = 'presence_stats'
+    
+    id_etudiant = db.Column(db.Integer, db.ForeignKey('etudiants.id_etudiant'), primary_key=True)
+    id_cours = db.Column(db.Integer, db.ForeignKey('cours.id_cours'), primary_key=True, index=True)
+    semaine_numero = db.Column(db.Integer, primary_key=True)
+    nb_presents = db.Column(db.Integer, nullable=False, default=0)
+    nb_absents = db.Column(db.Integer, nullable=False, default=0)
+    nb_retards = db.Column(db.Integer, nullable=False, default=0)
+    nb_total = db.Column(db.Integer, nullable=False, default=0)
+    
+    def __repr__(self):
+        return f'<PresenceStat {self.id_etudiant}/{self.id_cours} S{self.semaine_numero}>'
+
 # ============================================================================
 # FONCTIONS PROCÉDURALES - GESTION DES PRÉSENCES
 # ============================================================================
@@ -48,6 +80,7 @@ def marquer_presence(id_edt, id_etudiant, statut, commentaire=None):
         
         if existing:
             # Mise à jour du statut
+            _ajuster_compteurs_presence(id_edt, id_etudiant, existing.statut, statut)
             existing.statut = statut
             existing.commentaire = commentaire
             db.session.commit()
@@ -65,6 +98,7 @@ def marquer_presence(id_edt, id_etudiant, statut, commentaire=None):
         )
         
         db.session.add(presence)
+        _ajuster_compteurs_presence(id_edt, id_etudiant, None, statut)
         db.session.commit()
         
         return {
@@ -77,36 +111,278 @@ def marquer_presence(id_edt, id_etudiant, statut, commentaire=None):
         db.session.rollback()
         return {'success': False, 'message': f'Erreur: {str(e)}'}
 
-def marquer_presences_masse(id_edt, presences_data):
+# Colonne du compteur incrémentée pour chaque statut
+COLONNES_COMPTEUR_STATUT = {
+    'Present': 'nb_presents',
+    'Absent': 'nb_absents',
+    'Retard': 'nb_retards'
+}
+
+def _incrementer_compteur(modele, cles, ancien_statut, nouveau_statut):
+    """
+    Déplace une unité d'une colonne de statut à l'autre sur une ligne de compteur
+    
+    Les incréments sont des expressions SQL (col = col + 1) évaluées au
+    flush : deux pointages concurrents ne se perdent pas.
+    """
+    compteur = db.session.get(modele, cles)
+    if compteur is None:
+        compteur = modele(nb_presents=0, nb_absents=0, nb_retards=0, nb_total=0, **cles)
+        db.session.add(compteur)
+        db.session.flush()
+    
+    if ancien_statut is None:
+        compteur.nb_total = modele.nb_total + 1
+    else:
+        colonne = COLONNES_COMPTEUR_STATUT[ancien_statut]
+        setattr(compteur, colonne, getattr(modele, colonne) - 1)
+    
+    colonne = COLONNES_COMPTEUR_STATUT[nouveau_statut]
+    setattr(compteur, colonne, getattr(modele, colonne) + 1)
+    
+    # Un second ajustement de la même ligne avant flush écraserait celui-ci
+    db.session.flush()
+
+def _ajuster_compteurs_presence(id_edt, id_etudiant, ancien_statut, nouveau_statut, creneau=None):
+    """
+    Répercute un pointage sur les compteurs (sans commit)
+    
+    Args:
+        id_edt: ID du créneau pointé
+        id_etudiant: ID de l'étudiant
+        ancien_statut: Statut remplacé (None pour un nouveau pointage)
+        nouveau_statut: Statut enregistré
+        creneau: Tuple (id_cours, semaine_numero) déjà connu, sinon lu depuis l'EDT
+    """
+    if id_etudiant is None or ancien_statut == nouveau_statut:
+        return
+    
+    if creneau is None:
+        from models.emploi_temps import EmploiDuTemps
+        creneau = db.session.query(
+            EmploiDuTemps.id_cours, EmploiDuTemps.semaine_numero
+        ).filter(EmploiDuTemps.id_edt == id_edt).first()
+    
+    _incrementer_compteur(CompteurPresence, {'id_etudiant': id_etudiant}, ancien_statut, nouveau_statut)
+    
+    if creneau is not None:
+        id_cours, semaine_numero = creneau
+        _incrementer_compteur(PresenceStat, {
+            'id_etudiant': id_etudiant,
+            'id_cours': id_cours,
+            'semaine_numero': semaine_numero
+        }, ancien_statut, nouveau_statut)
+
+def reconstruire_compteurs_presences():
+    """
+    Recalcule tous les compteurs depuis la table presences (réparation)
+    
+    Returns:
+        dict: {'success': bool, 'etudiants': int, 'lignes_stats': int, 'message': str}
+    """
+    from sqlalchemy import func, case
+    from models.emploi_temps import EmploiDuTemps
+    
+    sommes = (
+        func.sum(case((Presence.statut == 'Present', 1), else_=0)),
+        func.sum(case((Presence.statut == 'Absent', 1), else_=0)),
+        func.sum(case((Presence.statut == 'Retard', 1), else_=0)),
+        func.count(Presence.id_presence)
+    )
+    
+    try:
+        par_etudiant = db.session.query(Presence.id_etudiant, *sommes).filter(
+            Presence.id_etudiant.isnot(None)
+        ).group_by(Presence.id_etudiant).all()
+        
+        par_cours_semaine = db.session.query(
+            Presence.id_etudiant, EmploiDuTemps.id_cours, EmploiDuTemps.semaine_numero, *sommes
+        ).join(
+            EmploiDuTemps, Presence.id_edt == EmploiDuTemps.id_edt
+        ).filter(
+            Presence.id_etudiant.isnot(None)
+        ).group_by(
+            Presence.id_etudiant, EmploiDuTemps.id_cours, EmploiDuTemps.semaine_numero
+        ).all()
+        
+        db.session.query(CompteurPresence).delete()
+        db.session.query(PresenceStat).delete()
+        db.session.add_all([
+            CompteurPresence(
+                id_etudiant=id_etudiant,
+                nb_presents=presents,
+                nb_absents=absents,
+                nb_retards=retards,
+                nb_total=total
+            )
+            for id_etudiant, presents, absents, retards, total in par_etudiant
+        ])
+        db.session.add_all([
+            PresenceStat(
+                id_etudiant=id_etudiant,
+                id_cours=id_cours,
+                semaine_numero=semaine_numero,
+                nb_presents=presents,
+                nb_absents=absents,
+                nb_retards=retards,
+                nb_total=total
+            )
+            for id_etudiant, id_cours, semaine_numero, presents, absents, retards, total in par_cours_semaine
+        ])
+        db.session.commit()
+        
+        return {
+            'success': True,
+            'etudiants': len(par_etudiant),
+            'lignes_stats': len(par_cours_semaine),
+            'message': 'Compteurs reconstruits'
+        }
+    
+    except Exception as e:
+        db.session.rollback()
+        return {'success': False, 'etudiants': 0, 'lignes_stats': 0, 'message': f'Erreur: {str(e)}'}
+
+def initialiser_tables_presences():
+    """
+    Mise à niveau d'une base déjà peuplée : index unique de pointage
+    (create_all ne modifie pas une table existante) et compteurs initiaux
+    """
+    for index in Presence.__table__.indexes:
+        if index.name == 'ux_presences_pointage':
+            index.create(db.engine, checkfirst=True)
+    
+    compteurs_vides = db.session.query(CompteurPresence.id_etudiant).first() is None or \
+        db.session.query(PresenceStat.id_etudiant).first() is None
+    if compteurs_vides and db.session.query(Presence.id_presence).first() is not None:
+        reconstruire_compteurs_presences()
+
+def marquer_presences_masse(id_edt, presences_data, date_pointage=None):
     """
     Marque les présences pour tous les étudiants d'un créneau
     
+    L'appel complet tient en une transaction : lecture des pointages déjà
+    saisis, un INSERT ... ON CONFLICT DO UPDATE pour toute la liste, puis
+    mise à jour groupée des compteurs.
+    
     Args:
         id_edt: ID du créneau EDT
-        presences_data: Liste de dict {'id_etudiant': int, 'statut': str}
+        presences_data: Liste de dict {'id_etudiant': int, 'statut': str, 'commentaire': str}
+        date_pointage: Date de l'appel (défaut: aujourd'hui)
     
     Returns:
         dict: {'success': bool, 'marquees': int, 'erreurs': list}
     """
-    marquees = 0
+    from database import executer_upsert
+    from sqlalchemy import update, bindparam
+    from models.etudiants import Etudiant
+    from models.emploi_temps import EmploiDuTemps
+    
+    date_pointage = date_pointage or date.today()
     erreurs = []
     
+    creneau = db.session.query(
+        EmploiDuTemps.id_cours, EmploiDuTemps.semaine_numero
+    ).filter(EmploiDuTemps.id_edt == id_edt).first()
+    if creneau is None:
+        return {'success': False, 'marquees': 0, 'erreurs': ['Créneau introuvable']}
+    
+    ids_demandes = {data['id_etudiant'] for data in presences_data}
+    ids_connus = {
+        id_etudiant for (id_etudiant,) in db.session.query(Etudiant.id_etudiant).filter(
+            Etudiant.id_etudiant.in_(ids_demandes)
+        ).all()
+    } if ids_demandes else set()
+    
+    # Une ligne par étudiant : la dernière saisie l'emporte
+    pointages = {}
     for data in presences_data:
-        result = marquer_presence(
-            id_edt,
-            data['id_etudiant'],
-            data['statut'],
-            data.get('commentaire')
+        if data['statut'] not in STATUTS_PRESENCE_VALIDES:
+            erreurs.append(f"Étudiant {data['id_etudiant']}: Statut invalide")
+        elif data['id_etudiant'] not in ids_connus:
+            erreurs.append(f"Étudiant {data['id_etudiant']}: Étudiant introuvable")
+        else:
+            pointages[data['id_etudiant']] = {
+                'id_edt': id_edt,
+                'id_etudiant': data['id_etudiant'],
+                'statut': data['statut'],
+                'date_pointage': date_pointage,
+                'commentaire': data.get('commentaire')
+            }
+    
+    if not pointages:
+        return {'success': len(erreurs) == 0, 'marquees': 0, 'erreurs': erreurs}
+    
+    try:
+        anciens = dict(db.session.query(Presence.id_etudiant, Presence.statut).filter(
+            Presence.id_edt == id_edt,
+            Presence.date_pointage == date_pointage,
+            Presence.id_etudiant.in_(pointages.keys())
+        ).all())
+        
+        executer_upsert(
+            Presence.__table__,
+            list(pointages.values()),
+            cles=['id_edt', 'id_etudiant', 'date_pointage'],
+            colonnes_maj=['statut', 'commentaire']
         )
         
-        if result['success']:
-            marquees += 1
-        else:
-            erreurs.append(f"Étudiant {data['id_etudiant']}: {result['message']}")
+        # Variations de compteurs, identiques pour les deux tables
+        deltas = []
+        for id_etudiant, pointage in pointages.items():
+            ancien = anciens.get(id_etudiant)
+            if ancien == pointage['statut']:
+                continue
+            delta = {'b_id_etudiant': id_etudiant, 'b_nb_presents': 0, 'b_nb_absents': 0,
+                     'b_nb_retards': 0, 'b_nb_total': 0 if ancien else 1}
+            if ancien:
+                delta['b_' + COLONNES_COMPTEUR_STATUT[ancien]] -= 1
+            delta['b_' + COLONNES_COMPTEUR_STATUT[pointage['statut']]] += 1
+            deltas.append(delta)
+        
+        if deltas:
+            id_cours, semaine_numero = creneau
+            vides = {'nb_presents': 0, 'nb_absents': 0, 'nb_retards': 0, 'nb_total': 0}
+            executer_upsert(
+                CompteurPresence.__table__,
+                [dict(vides, id_etudiant=d['b_id_etudiant']) for d in deltas],
+                cles=['id_etudiant']
+            )
+            executer_upsert(
+                PresenceStat.__table__,
+                [dict(vides, id_etudiant=d['b_id_etudiant'], id_cours=id_cours,
+                      semaine_numero=semaine_numero) for d in deltas],
+                cles=['id_etudiant', 'id_cours', 'semaine_numero']
+            )
+            
+            for modele, filtre in (
+                (CompteurPresence, []),
+                (PresenceStat, [PresenceStat.id_cours == id_cours,
+                                PresenceStat.semaine_numero == semaine_numero])
+            ):
+                table = modele.__table__
+                db.session.execute(
+                    update(table).where(
+                        table.c.id_etudiant == bindparam('b_id_etudiant'), *filtre
+                    ).values({
+                        colonne: table.c[colonne] + bindparam('b_' + colonne)
+                        for colonne in ('nb_presents', 'nb_absents', 'nb_retards', 'nb_total')
+                    }),
+                    deltas
+                )
+        
+        db.session.commit()
+    
+    except Exception as e:
+        db.session.rollback()
+        return {
+            'success': False,
+            'marquees': 0,
+            'erreurs': erreurs + [f"Étudiant {id_etudiant}: Erreur: {str(e)}" for id_etudiant in pointages]
+        }
     
     return {
         'success': len(erreurs) == 0,
-        'marquees': marquees,
+        'marquees': len(pointages),
         'erreurs': erreurs
     }
 
@@ -137,61 +413,110 @@ def lister_presences_creneau(id_edt):
     
     return presences
 
+def _taux(presents, total):
+    return round((presents / total) * 100, 2) if total else 0
+
 def calculer_taux_presence_etudiant(id_etudiant):
     """
-    Calcule le taux de présence d'un étudiant
+    Calcule le taux de présence d'un étudiant (lecture du compteur)
     
     Returns:
-        dict: {'taux': float, 'presents': int, 'total': int}
+        dict: {'taux': float, 'presents': int, 'absents': int, 'retards': int, 'total': int}
     """
-    from sqlalchemy import func
+    compteur = db.session.get(CompteurPresence, id_etudiant)
     
-    total = db.session.query(func.count(Presence.id_presence)).filter(
-        Presence.id_etudiant == id_etudiant
-    ).scalar() or 0
+    if compteur is None or compteur.nb_total == 0:
+        return {'taux': 0, 'presents': 0, 'absents': 0, 'retards': 0, 'total': 0}
     
-    if total == 0:
-        return {'taux': 0, 'presents': 0, 'total': 0}
+    return {
+        'taux': _taux(compteur.nb_presents, compteur.nb_total),
+        'presents': compteur.nb_presents,
+        'absents': compteur.nb_absents,
+        'retards': compteur.nb_retards,
+        'total': compteur.nb_total
+    }
+
+def calculer_taux_presence_par_cours(id_etudiant, semaine_debut=None, semaine_fin=None):
+    """
+    Taux de présence d'un étudiant cours par cours (table presence_stats)
     
-    presents = db.session.query(func.count(Presence.id_presence)).filter(
-        Presence.id_etudiant == id_etudiant,
-        Presence.statut == 'Present'
-    ).scalar() or 0
+    Args:
+        id_etudiant: ID de l'étudiant
+        semaine_debut, semaine_fin: Limiter à une plage de semaines (optionnel)
     
-    taux = round((presents / total) * 100, 2) if total > 0 else 0
+    Returns:
+        Liste de dict {id_cours, code_cours, libelle, taux, presents, absents, retards, total}
+    """
+    from sqlalchemy import func
+    from models.cours import Cours
     
-    return {
-        'taux': taux,
-        'presents': presents,
-        'total': total
-    }
+    requete = db.session.query(
+        PresenceStat.id_cours, Cours.code_cours, Cours.libelle,
+        func.sum(PresenceStat.nb_presents), func.sum(PresenceStat.nb_absents),
+        func.sum(PresenceStat.nb_retards), func.sum(PresenceStat.nb_total)
+    ).join(
+        Cours, PresenceStat.id_cours == Cours.id_cours
+    ).filter(PresenceStat.id_etudiant == id_etudiant)
+    
+    if semaine_debut is not None:
+        requete = requete.filter(PresenceStat.semaine_numero >= semaine_debut)
+    if semaine_fin is not None:
+        requete = requete.filter(PresenceStat.semaine_numero <= semaine_fin)
+    
+    return [
+        {
+            'id_cours': id_cours,
+            'code_cours': code_cours,
+            'libelle': libelle,
+            'taux': _taux(presents, total),
+            'presents': presents,
+            'absents': absents,
+            'retards': retards,
+            'total': total
+        }
+        for id_cours, code_cours, libelle, presents, absents, retards, total in requete.group_by(
+            PresenceStat.id_cours, Cours.code_cours, Cours.libelle
+        ).order_by(Cours.code_cours).all()
+    ]
 
 def calculer_statistiques_presences_filiere(id_filiere):
     """
     Calcule les statistiques de présence pour une filière
     
+    Une requête : étudiants de la filière joints à leur compteur.
+    
     Returns:
         Liste de dict avec infos par étudiant
     """
-    from models.etudiants import lister_etudiants_par_filiere, obtenir_infos_completes_etudiant
+    from models.etudiants import Etudiant
+    from models.utilisateurs import Utilisateur
     
-    etudiants = lister_etudiants_par_filiere(id_filiere)
-    statistiques = []
+    resultats = db.session.query(Utilisateur, CompteurPresence).select_from(Etudiant).join(
+        Utilisateur, Etudiant.id_user == Utilisateur.id_user
+    ).outerjoin(
+        CompteurPresence, CompteurPresence.id_etudiant == Etudiant.id_etudiant
+    ).filter(Etudiant.id_filiere == id_filiere).all()
     
-    for etudiant in etudiants:
-        infos = obtenir_infos_completes_etudiant(etudiant.id_etudiant)
-        if not infos:
-            continue
-        
-        taux_data = calculer_taux_presence_etudiant(etudiant.id_etudiant)
+    statistiques = []
+    for user, compteur in resultats:
+        presents = compteur.nb_presents if compteur else 0
+        absents = compteur.nb_absents if compteur else 0
+        retards = compteur.nb_retards if compteur else 0
+        total = compteur.nb_total if compteur else 0
+        taux = _taux(presents, total)
         
         statistiques.append({
-            'matricule': infos['user'].matricule,
-            'nom': infos['user'].nom,
-            'prenom': infos['user'].prenom,
-            'taux': taux_data['taux'],
-            'presents': taux_data['presents'],
-            'total': taux_data['total']
+            'matricule': user.matricule,
+            'nom': user.nom,
+            'prenom': user.prenom,
+            'nom_complet': f"{user.nom} {user.prenom}",
+            'taux': taux,
+            'taux_presence': taux,
+            'presents': presents,
+            'absents': absents,
+            'retards': retards,
+            'total': total,
+            'total_seances': total
         })
     
     # Trier par taux décroissant
@@ -203,6 +528,8 @@ def detecter_absences_critiques(seuil=75):
     """
     Détecte les étudiants avec taux de présence < seuil
     
+    Une seule requête sur les compteurs de présence, seuil appliqué en SQL.
+    
     Args:
         seuil: Seuil en pourcentage (défaut 75%)
     
@@ -211,28 +538,36 @@ def detecter_absences_critiques(seuil=75):
     """
     from models.etudiants import Etudiant
     from models.utilisateurs import Utilisateur
+    from models.filieres import Filiere
     
-    etudiants = db.session.query(Etudiant).all()
-    alertes = []
+    resultats = db.session.query(
+        CompteurPresence.id_etudiant, Utilisateur.matricule, Utilisateur.nom,
+        Utilisateur.prenom, Filiere.nom_filiere,
+        CompteurPresence.nb_presents, CompteurPresence.nb_total
+    ).join(
+        Etudiant, CompteurPresence.id_etudiant == Etudiant.id_etudiant
+    ).join(
+        Utilisateur, Etudiant.id_user == Utilisateur.id_user
+    ).join(
+        Filiere, Etudiant.id_filiere == Filiere.id_filiere
+    ).filter(
+        CompteurPresence.nb_total > 0,
+        CompteurPresence.nb_presents * 100 < seuil * CompteurPresence.nb_total
+    ).order_by(
+        # Trier par taux croissant (pires en premier)
+        (CompteurPresence.nb_presents * 1.0 / CompteurPresence.nb_total)
+    ).all()
     
-    for etudiant in etudiants:
-        taux_data = calculer_taux_presence_etudiant(etudiant.id_etudiant)
-        
-        if taux_data['total'] > 0 and taux_data['taux'] < seuil:
-            infos = obtenir_infos_completes_etudiant(etudiant.id_etudiant)
-            if infos:
-                alertes.append({
-                    'id_etudiant': etudiant.id_etudiant,
-                    'matricule': infos['user'].matricule,
-                    'nom': infos['user'].nom,
-                    'prenom': infos['user'].prenom,
-                    'filiere': infos['filiere'].nom_filiere,
-                    'taux': taux_data['taux']
-                })
-    
-    # Trier par taux croissant (pires en premier)
-    alertes.sort(key=lambda x: x['taux'])
-    
-    return alertes
+    return [
+        {
+            'id_etudiant': id_etudiant,
+            'matricule': matricule,
+            'nom': nom,
+            'prenom': prenom,
+            'filiere': nom_filiere,
+            'taux': _taux(presents, total)
+        }
+        for id_etudiant, matricule, nom, prenom, nom_filiere, presents, total in resultats
+    ]
 
 STATUTS_PRESENCE_VALIDES = ['Present', 'Absent', 'Retard']
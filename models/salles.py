@@ -70,8 +70,13 @@ def creer_salle(nom_salle, capacite, batiment=None, equipements=None):
         return {'success': False, 'message': f'Erreur: {str(e)}'}
 
 def obtenir_salle_par_id(salle_id):
-    """Récupère une salle par son ID"""
-    return db.session.get(Salle, salle_id)
+    """Récupère une salle par son ID (chargeur par lots de la requête, puis cache)"""
+    from helpers.cache import entite_en_cache
+    from helpers.chargeurs import charger_entite
+    
+    return charger_entite(Salle, salle_id, lambda cle: entite_en_cache(
+        'salles', Salle, cle, lambda: db.session.get(Salle, cle)
+    ), nom_cache='salles')
 
 def lister_salles_disponibles():
     """Liste toutes les salles disponibles"""
@@ -109,8 +114,15 @@ def modifier_salle(salle_id, **kwargs):
                 setattr(salle, key, value)
         
         db.session.commit()
+        invalider_cache_salles(salle_id)
         return {'success': True, 'message': 'Salle modifiée avec succès'}
     
     except Exception as e:
         db.session.rollback()
         return {'success': False, 'message': f'Erreur: {str(e)}'}
+
+def invalider_cache_salles(salle_id=None):
+    """Invalide l'entrée d'une salle dans le cache (toutes si salle_id est None)"""
+    from helpers.cache import obtenir_cache
+    
+    obtenir_cache('salles').invalider(salle_id)
@@ -0,0 +1,177 @@
+"""
+Modèle Statistiques - Instantanés quotidiens des indicateurs des tableaux de bord
+"""
+from database import db
+from datetime import datetime, date, timedelta
+
+class StatJour(db.Model):
+    """Table stats_daily - Valeur d'un indicateur pour un jour (une ligne par indicateur et clé)"""
+    __tablename__ = 'stats_daily'
+
+    jour = db.Column(db.Date, primary_key=True)
+    indicateur = db.Column(db.String(50), primary_key=True)
+    cle = db.Column(db.String(50), primary_key=True, default='')  # rôle, id filière... ('' = global)
+    valeur = db.Column(db.Float, nullable=False, default=0)
+    date_maj = db.Column(db.DateTime, default=datetime.utcnow)
+
+    def __repr__(self):
+        return f'<StatJour {self.jour} {self.indicateur}[{self.cle}]: {self.valeur}>'
+
+# Indicateurs détaillés par clé (les autres sont globaux)
+INDICATEURS_PAR_CLE = ('utilisateurs_role', 'etudiants_filiere')
+
+# ============================================================================
+# FONCTIONS PROCÉDURALES - STATISTIQUES
+# ============================================================================
+
+def _mesurer():
+    """
+    Calcule les indicateurs courants (requêtes d'agrégation uniquement)
+
+    Returns:
+        list: Tuples (indicateur, cle, valeur)
+    """
+    from sqlalchemy import func
+    from models.utilisateurs import Utilisateur
+    from models.etudiants import Etudiant
+    from models.enseignants import Enseignant
+    from models.parents import Parent
+    from models.notes import Note
+    from models.presences import CompteurPresence, _taux
+    from models.emploi_temps import EmploiDuTemps, obtenir_semaine_courante
+
+    mesures = []
+
+    for role, nombre in db.session.query(
+        Utilisateur.role, func.count(Utilisateur.id_user)
+    ).group_by(Utilisateur.role).all():
+        mesures.append(('utilisateurs_role', role, nombre))
+
+    for id_filiere, nombre in db.session.query(
+        Etudiant.id_filiere, func.count(Etudiant.id_etudiant)
+    ).group_by(Etudiant.id_filiere).all():
+        mesures.append(('etudiants_filiere', str(id_filiere), nombre))
+
+    mesures.append(('etudiants_total', '', db.session.query(func.count(Etudiant.id_etudiant)).scalar() or 0))
+    mesures.append(('enseignants_total', '', db.session.query(func.count(Enseignant.id_enseignant)).scalar() or 0))
+    mesures.append(('parents_total', '', db.session.query(func.count(Parent.id_parent)).scalar() or 0))
+
+    mesures.append(('notes_en_attente', '', db.session.query(func.count(Note.id_note)).filter(
+        Note.statut_validation == 'En attente'
+    ).scalar() or 0))
+
+    # Taux de présence depuis les compteurs tenus à jour à l'écriture
+    # (même définition que le taux par étudiant : présents / total)
+    presents, total = db.session.query(
+        func.sum(CompteurPresence.nb_presents),
+        func.sum(CompteurPresence.nb_total)
+    ).one()
+    mesures.append(('taux_presence', '', _taux(presents or 0, total or 0)))
+
+    mesures.append(('creneaux_semaine', '', db.session.query(func.count(EmploiDuTemps.id_edt)).filter(
+        EmploiDuTemps.semaine_numero == obtenir_semaine_courante()
+    ).scalar() or 0))
+    mesures.append(('creneaux_total', '', db.session.query(func.count(EmploiDuTemps.id_edt)).scalar() or 0))
+
+    return mesures
+
+def calculer_stats_jour(jour=None):
+    """
+    Enregistre l'instantané du jour (remplace celui déjà pris ce jour-là)
+
+    Appelée chaque nuit pour ouvrir le jour, puis à intervalle régulier
+    pour le rafraîchir : les tableaux de bord ne lisent que cet instantané.
+
+    Args:
+        jour: Date de l'instantané (défaut: aujourd'hui)
+
+    Returns:
+        dict: {'success': bool, 'indicateurs': int, 'message': str}
+    """
+    from database import executer_upsert
+
+    jour = jour or date.today()
+    maintenant = datetime.utcnow()
+
+    try:
+        mesures = _mesurer()
+        executer_upsert(
+            StatJour.__table__,
+            [{'jour': jour, 'indicateur': indicateur, 'cle': cle, 'valeur': valeur, 'date_maj': maintenant}
+             for indicateur, cle, valeur in mesures],
+            cles=['jour', 'indicateur', 'cle'],
+            colonnes_maj=['valeur', 'date_maj']
+        )
+        # Clés disparues depuis le dernier rafraîchissement (rôle, filière vidés) ;
+        # comparées par clé et non par date_maj, arrondie à la seconde par MySQL
+        mesurees = {(indicateur, cle) for indicateur, cle, _ in mesures}
+        disparues = [
+            cles for cles in db.session.query(StatJour.indicateur, StatJour.cle).filter(StatJour.jour == jour)
+            if tuple(cles) not in mesurees
+        ]
+        if disparues:
+            from sqlalchemy import tuple_
+            db.session.query(StatJour).filter(
+                StatJour.jour == jour,
+                tuple_(StatJour.indicateur, StatJour.cle).in_([tuple(cles) for cles in disparues])
+            ).delete(synchronize_session=False)
+        db.session.commit()
+
+        return {'success': True, 'indicateurs': len(mesures), 'message': f'{len(mesures)} indicateurs enregistrés'}
+
+    except Exception as e:
+        db.session.rollback()
+        return {'success': False, 'indicateurs': 0, 'message': f'Erreur: {str(e)}'}
+
+def obtenir_stats_courantes():
+    """
+    Dernier instantané des indicateurs (lecture seule)
+
+    L'instantané est tenu à jour par la tâche refresh_daily_stats du
+    planificateur ; date_maj indique son âge. Sans instantané, les
+    indicateurs sont absents et 'jour' / 'date_maj' valent None.
+
+    Returns:
+        dict: {indicateur: valeur} pour les indicateurs globaux,
+              {indicateur: {cle: valeur}} pour INDICATEURS_PAR_CLE,
+              plus 'jour' et 'date_maj'
+    """
+    from sqlalchemy import func
+
+    dernier_jour = db.session.query(func.max(StatJour.jour)).scalar()
+    derniere_maj = db.session.query(func.max(StatJour.date_maj)).filter(
+        StatJour.jour == dernier_jour
+    ).scalar()
+
+    stats = {indicateur: {} for indicateur in INDICATEURS_PAR_CLE}
+    for ligne in db.session.query(StatJour).filter(StatJour.jour == dernier_jour).all():
+        if ligne.indicateur in INDICATEURS_PAR_CLE:
+            stats[ligne.indicateur][ligne.cle] = int(ligne.valeur)
+        elif ligne.indicateur == 'taux_presence':
+            stats[ligne.indicateur] = ligne.valeur
+        else:
+            stats[ligne.indicateur] = int(ligne.valeur)
+
+    stats['jour'] = dernier_jour
+    stats['date_maj'] = derniere_maj
+    return stats
+
+def obtenir_tendance(indicateur, cle='', jours=30):
+    """
+    Série quotidienne d'un indicateur (graphiques de tendance)
+
+    Args:
+        indicateur: Nom de l'indicateur
+        cle: Rôle, id filière... ('' pour un indicateur global)
+        jours: Nombre de jours
+
+    Returns:
+        list: [{'jour': 'AAAA-MM-JJ', 'valeur': float}, ...] par date croissante
+    """
+    debut = date.today() - timedelta(days=jours - 1)
+    lignes = db.session.query(StatJour.jour, StatJour.valeur).filter(
+        StatJour.indicateur == indicateur,
+        StatJour.cle == str(cle),
+        StatJour.jour >= debut
+    ).order_by(StatJour.jour).all()
+    return [{'jour': jour.isoformat(), 'valeur': valeur} for jour, valeur in lignes]
@@ -0,0 +1,197 @@
+"""
+Modèle Travaux - File durable des opérations longues (bulletins d'une filière...)
+"""
+from database import db
+from datetime import datetime, timedelta
+
+class Travail(db.Model):
+    """Table travaux - Opération longue exécutée hors requête HTTP"""
+    __tablename__ = 'travaux'
+
+    id_travail = db.Column(db.Integer, primary_key=True, autoincrement=True)
+    type_travail = db.Column(db.String(50), nullable=False)
+    parametres = db.Column(db.JSON, nullable=True)
+    statut = db.Column(db.String(20), nullable=False, default='En attente')  # En attente, En cours, Termine, Echec
+    etape = db.Column(db.String(50), nullable=True)  # Étape en cours (progression)
+    fait = db.Column(db.Integer, nullable=False, default=0)
+    total = db.Column(db.Integer, nullable=False, default=0)
+    resultat = db.Column(db.JSON, nullable=True)
+    erreur = db.Column(db.Text, nullable=True)
+    tentatives = db.Column(db.Integer, nullable=False, default=0)
+    max_tentatives = db.Column(db.Integer, nullable=False, default=1)
+    reserve_par = db.Column(db.String(100), nullable=True)  # hôte:pid:thread
+    reserve_a = db.Column(db.DateTime, nullable=True)  # Dernier battement
+    cree_par = db.Column(db.Integer, db.ForeignKey('utilisateurs.id_user', ondelete='SET NULL'), nullable=True)
+    date_creation = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
+    date_debut = db.Column(db.DateTime, nullable=True)
+    date_fin = db.Column(db.DateTime, nullable=True)
+
+    __table_args__ = (
+        db.Index('ix_travaux_file', 'statut', 'id_travail'),
+        db.Index('ix_travaux_cree_par', 'cree_par', 'id_travail'),
+    )
+
+    def __repr__(self):
+        return f'<Travail {self.id_travail} {self.type_travail} {self.statut}>'
+
+STATUTS_TRAVAIL = ['En attente', 'En cours', 'Termine', 'Echec']
+
+# ============================================================================
+# FONCTIONS PROCÉDURALES - FILE DES TRAVAUX
+# ============================================================================
+
+def creer_travail(type_travail, parametres=None, cree_par=None, max_tentatives=1):
+    """
+    Met un travail en file (commit immédiat)
+
+    Args:
+        type_travail: Type de travail (voir helpers.travaux)
+        parametres: Arguments nommés de la tâche (JSON)
+        cree_par: ID de l'utilisateur demandeur
+        max_tentatives: Exécutions au maximum (1 = pas de reprise)
+
+    Returns:
+        dict: {'success': bool, 'message': str, 'travail_id': int}
+    """
+    try:
+        travail = Travail(
+            type_travail=type_travail,
+            parametres=parametres or {},
+            cree_par=cree_par,
+            max_tentatives=max_tentatives,
+            date_creation=datetime.utcnow()
+        )
+        db.session.add(travail)
+        db.session.commit()
+        return {'success': True, 'message': 'Travail en file', 'travail_id': travail.id_travail}
+
+    except Exception as e:
+        db.session.rollback()
+        return {'success': False, 'message': f'Erreur: {str(e)}'}
+
+def obtenir_travail(id_travail):
+    """Retourne un travail par son ID (ou None)"""
+    return db.session.get(Travail, id_travail)
+
+def reserver_travail(executeur, bail_secondes):
+    """
+    Prend le plus ancien travail en attente (ou dont le bail a expiré)
+
+    Un travail en cours sans battement depuis bail_secondes est repris s'il
+    lui reste des tentatives, sinon passé en échec. La réservation est un
+    UPDATE conditionnel sur le statut lu : si un autre exécuteur a pris le
+    même travail entre-temps, l'UPDATE ne modifie rien et on réessaie.
+
+    Args:
+        executeur: Identifiant unique de l'exécuteur
+        bail_secondes: Secondes sans battement avant reprise
+
+    Returns:
+        dict: {'id_travail', 'type_travail', 'parametres', 'cree_par'} ou None
+    """
+    maintenant = datetime.utcnow()
+    expiration = maintenant - timedelta(seconds=bail_secondes)
+
+    try:
+        # Exécuteur disparu : échec définitif si les tentatives sont épuisées
+        db.session.query(Travail).filter(
+            Travail.statut == 'En cours',
+            Travail.reserve_a < expiration,
+            Travail.tentatives >= Travail.max_tentatives
+        ).update({
+            'statut': 'Echec',
+            'reserve_par': None,
+            'date_fin': maintenant,
+            'erreur': 'Exécuteur interrompu (bail expiré)'
+        }, synchronize_session=False)
+        db.session.commit()
+
+        for _ in range(5):
+            candidat = db.session.query(Travail.id_travail, Travail.statut).filter(
+                db.or_(
+                    Travail.statut == 'En attente',
+                    db.and_(Travail.statut == 'En cours', Travail.reserve_a < expiration,
+                            Travail.tentatives < Travail.max_tentatives)
+                )
+            ).order_by(Travail.id_travail).first()
+            if candidat is None:
+                return None
+
+            filtre = [Travail.id_travail == candidat.id_travail, Travail.statut == candidat.statut]
+            if candidat.statut == 'En cours':
+                filtre.append(Travail.reserve_a < expiration)
+
+            pris = db.session.query(Travail).filter(*filtre).update({
+                'statut': 'En cours',
+                'tentatives': Travail.tentatives + 1,
+                'reserve_par': executeur,
+                'reserve_a': maintenant,
+                'date_debut': db.func.coalesce(Travail.date_debut, maintenant)
+            }, synchronize_session=False)
+            db.session.commit()
+
+            if pris == 1:
+                travail = db.session.query(
+                    Travail.id_travail, Travail.type_travail, Travail.parametres, Travail.cree_par
+                ).filter(Travail.id_travail == candidat.id_travail).one()
+                db.session.commit()
+                return dict(travail._mapping)
+        return None
+
+    except Exception:
+        db.session.rollback()
+        raise
+
+def renouveler_travail(id_travail, executeur, etape=None, fait=None, total=None):
+    """
+    Prolonge le bail d'un travail en cours et enregistre son avancement
+
+    Returns:
+        bool: False si le travail n'est plus détenu par executeur
+    """
+    valeurs = {'reserve_a': datetime.utcnow()}
+    if etape is not None:
+        valeurs.update({'etape': etape, 'fait': fait or 0, 'total': total or 0})
+
+    try:
+        modifie = db.session.query(Travail).filter(
+            Travail.id_travail == id_travail,
+            Travail.reserve_par == executeur,
+            Travail.statut == 'En cours'
+        ).update(valeurs, synchronize_session=False)
+        db.session.commit()
+        return modifie == 1
+
+    except Exception:
+        db.session.rollback()
+        return False
+
+def terminer_travail(id_travail, executeur, succes, resultat=None, erreur=None):
+    """
+    Enregistre l'issue d'un travail si executeur le détient encore
+
+    Un exécuteur dont le bail a expiré (travail repris par un autre)
+    n'écrase pas le statut ni le résultat du suivant.
+
+    Returns:
+        bool: True si l'issue a été enregistrée
+    """
+    try:
+        db.session.rollback()  # État laissé par une tâche en échec
+        modifie = db.session.query(Travail).filter(
+            Travail.id_travail == id_travail,
+            Travail.reserve_par == executeur,
+            Travail.statut == 'En cours'
+        ).update({
+            'statut': 'Termine' if succes else 'Echec',
+            'resultat': resultat,
+            'erreur': erreur,
+            'reserve_par': None,
+            'date_fin': datetime.utcnow()
+        }, synchronize_session=False)
+        db.session.commit()
+        return modifie == 1
+
+    except Exception:
+        db.session.rollback()
+        return False
@@ -11,6 +11,10 @@ class Utilisateur(db.Model):
     Table utilisateurs - Authentification et rôles
     """
     __tablename__ = 'utilisateurs'
+    __table_args__ = (
+        # Parcours des listes paginées par curseur (nom, prénom, id)
+        db.Index('ix_utilisateurs_nom_prenom', 'nom', 'prenom', 'id_user'),
+    )
     
     id_user = db.Column(db.Integer, primary_key=True, autoincrement=True)
     matricule = db.Column(db.String(20), unique=True, nullable=False, index=True)
@@ -81,13 +85,20 @@ def obtenir_utilisateur_par_id(user_id):
     """
     Récupère un utilisateur par son ID
     
+    Lecture à travers le chargeur par lots de la requête, puis le cache
+    
     Args:
         user_id: ID de l'utilisateur
     
     Returns:
         Utilisateur ou None
     """
-    return db.session.get(Utilisateur, user_id)
+    from helpers.cache import entite_en_cache
+    from helpers.chargeurs import charger_entite
+    
+    return charger_entite(Utilisateur, user_id, lambda cle: entite_en_cache(
+        'utilisateurs', Utilisateur, cle, lambda: db.session.get(Utilisateur, cle)
+    ), nom_cache='utilisateurs')
 
 def obtenir_utilisateur_par_email(email):
     """
@@ -137,6 +148,7 @@ def mettre_a_jour_derniere_connexion(user_id):
     if user:
         user.derniere_connexion = datetime.utcnow()
         db.session.commit()
+        invalider_cache_utilisateurs(user_id)
 
 def lister_utilisateurs_par_role(role):
     """
@@ -167,6 +179,7 @@ def desactiver_utilisateur(user_id):
         
         user.est_actif = False
         db.session.commit()
+        invalider_cache_utilisateurs(user_id)
         return {'success': True, 'message': 'Utilisateur désactivé'}
     
     except Exception as e:
@@ -190,12 +203,24 @@ def reactiver_utilisateur(user_id):
         
         user.est_actif = True
         db.session.commit()
+        invalider_cache_utilisateurs(user_id)
         return {'success': True, 'message': 'Utilisateur réactivé'}
     
     except Exception as e:
         db.session.rollback()
         return {'success': False, 'message': f'Erreur: {str(e)}'}
 
+def invalider_cache_utilisateurs(user_id=None):
+    """
+    Invalide l'entrée d'un utilisateur dans le cache
+    
+    Args:
+        user_id: ID de l'utilisateur (None pour vider tout le cache)
+    """
+    from helpers.cache import obtenir_cache
+    
+    obtenir_cache('utilisateurs').invalider(user_id)
+
 def generer_matricule(role, annee=None):
     """
     Génère un matricule unique au format UIST-YYYY-XXXXX
@@ -207,16 +232,43 @@ def generer_matricule(role, annee=None):
     Returns:
         str: Matricule généré
     """
+    return generer_matricules(role, 1, annee)[0]
+
+def generer_matricules(role, nombre, annee=None):
+    """
+    Génère nombre matricules consécutifs (imports en masse)
+    
+    Les numéros viennent de la séquence matricule_UIST_YYYY, réservée en
+    une seule instruction : pas de balayage de la table utilisateurs ni de
+    doublon entre créations concurrentes.
+    
+    Args:
+        role: Rôle des utilisateurs
+        nombre: Nombre de matricules
+        annee: Année (par défaut année courante)
+    
+    Returns:
+        list: Matricules générés
+    """
+    from models.sequences import reserver_plage
+    
     if annee is None:
         annee = datetime.now().year
     
-    # Compter le nombre d'utilisateurs de ce rôle cette année
     prefix = f"UIST-{annee}-"
-    count = db.session.query(Utilisateur).filter(
-        Utilisateur.matricule.like(f"{prefix}%")
-    ).count()
     
-    return f"{prefix}{count + 1:05d}"
+    def dernier_numero():
+        # Reprise d'une base existante : plus grand numéro déjà attribué cette année
+        dernier = db.session.query(db.func.max(Utilisateur.matricule)).filter(
+            Utilisateur.matricule.like(f"{prefix}%")
+        ).scalar()
+        try:
+            return int(dernier[len(prefix):]) if dernier else 0
+        except ValueError:
+            return 0
+    
+    premier, dernier = reserver_plage(f"matricule_UIST_{annee}", nombre, depart=dernier_numero)
+    return [f"{prefix}{numero:05d}" for numero in range(premier, dernier + 1)]
 
 # Constantes pour les rôles et niveaux hiérarchiques
 ROLES_VALIDES = [
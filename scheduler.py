@@ -1,32 +1,74 @@
 """
 Planificateur de tâches automatiques pour la mise à jour de la base de données
 Utilise APScheduler pour exécuter des tâches en arrière-plan
+
+Plusieurs processus (workers gunicorn, planificateur autonome) peuvent
+démarrer un planificateur : seul le détenteur du bail scheduler_bail
+exécute les tâches, les autres restent en attente et reprennent le bail
+s'il n'est plus renouvelé. Chaque exécution est historisée dans
+scheduler_executions.
+
+Lancement autonome (workers web démarrés avec SCHEDULER_ACTIF=0) :
+    python scheduler.py
+La configuration est choisie par FLASK_ENV comme pour les workers, mais
+vaut 'production' par défaut (et non 'development') : un processus lancé
+sans FLASK_ENV ne tourne pas sur la configuration de développement.
 """
 import logging
+import os
+import socket
+import time
+import uuid
 from datetime import datetime
 
 # Vérifier si APScheduler est disponible
 try:
     from apscheduler.schedulers.background import BackgroundScheduler
+    from apscheduler.schedulers.blocking import BlockingScheduler
     from apscheduler.triggers.cron import CronTrigger
     from apscheduler.triggers.interval import IntervalTrigger
     APSCHEDULER_AVAILABLE = True
 except ImportError:
     APSCHEDULER_AVAILABLE = False
     BackgroundScheduler = None
+    BlockingScheduler = None
     CronTrigger = None
     IntervalTrigger = None
 
 # Configuration du logger
 logger = logging.getLogger(__name__)
 
+# Nom du bail partagé par tous les processus
+NOM_BAIL = 'planificateur'
+
+# Identifiant de ce processus auprès du bail, par PID (un fork ne l'hérite pas)
+_identite = {}
+
+# Dernier état connu du bail pour ce processus (journalisation des transitions)
+_leader = False
+
+def _proprietaire():
+    """Identifiant hôte:pid:jeton de ce processus"""
+    pid = os.getpid()
+    if pid not in _identite:
+        _identite.clear()
+        _identite[pid] = f"{socket.gethostname()}:{pid}:{uuid.uuid4().hex[:8]}"
+    return _identite[pid]
+
 def init_scheduler(app):
     """
     Initialise le planificateur de tâches automatiques
 
+    Ne fait rien si SCHEDULER_ACTIF est désactivé (workers web d'un
+    déploiement qui lance `python scheduler.py` à part).
+
     Args:
         app: Instance Flask
     """
+    if not app.config.get('SCHEDULER_ACTIF', True):
+        logger.info("Planificateur désactivé dans ce processus (SCHEDULER_ACTIF=0)")
+        return
+
     if not APSCHEDULER_AVAILABLE:
         logger.warning("APScheduler non disponible. Installation recommandée: pip install APScheduler==3.10.4")
         return
@@ -38,11 +80,18 @@ def init_scheduler(app):
 
     # Démarrage du planificateur
     scheduler.start()
-    logger.info("Planificateur de tâches automatiques démarré")
+    logger.info(f"Planificateur de tâches automatiques démarré ({_proprietaire()})")
 
     # Arrêt propre lors de l'arrêt de l'application
     import atexit
-    atexit.register(lambda: scheduler.shutdown())
+    atexit.register(lambda: _arreter(scheduler, app))
+
+def _arreter(scheduler, app):
+    """Arrête le planificateur et rend le bail pour une reprise immédiate"""
+    scheduler.shutdown(wait=False)
+    with app.app_context():
+        from models.planificateur import liberer_bail
+        liberer_bail(NOM_BAIL, _proprietaire())
 
 def _configure_jobs(scheduler, app):
     """
@@ -52,131 +101,220 @@ def _configure_jobs(scheduler, app):
         scheduler: Instance du planificateur
         app: Instance Flask pour accéder au contexte
     """
-    with app.app_context():
-        # Mise à jour des statistiques quotidiennes - tous les jours à 2h00
+    def ajouter(fonction, trigger, id_tache, nom):
         scheduler.add_job(
-            func=_update_daily_stats,
-            trigger=CronTrigger(hour=2, minute=0),
-            id='update_daily_stats',
-            name='Mise à jour des statistiques quotidiennes',
+            func=_executer_tache,
+            args=[app, id_tache, fonction],
+            trigger=trigger,
+            id=id_tache,
+            name=nom,
+            max_instances=1,
+            coalesce=True,
             replace_existing=True
         )
 
-        # Nettoyage des sessions expirées - toutes les heures
+    with app.app_context():
+        # Renouvellement du bail du leader
         scheduler.add_job(
-            func=_cleanup_expired_sessions,
-            trigger=IntervalTrigger(hours=1),
-            id='cleanup_sessions',
-            name='Nettoyage des sessions expirées',
+            func=_renouveler_bail,
+            args=[app],
+            trigger=IntervalTrigger(seconds=app.config.get('SCHEDULER_BATTEMENT_SECONDES', 15)),
+            id='renouveler_bail',
+            name='Renouvellement du bail du planificateur',
+            next_run_time=datetime.now(),
             replace_existing=True
         )
 
+        # Mise à jour des statistiques quotidiennes - tous les jours à 2h00
+        ajouter(_update_daily_stats, CronTrigger(hour=2, minute=0),
+                'update_daily_stats', 'Mise à jour des statistiques quotidiennes')
+
+        # Rafraîchissement de l'instantané du jour - toutes les 15 minutes
+        ajouter(_update_daily_stats, IntervalTrigger(minutes=app.config.get('STATS_RAFRAICHISSEMENT_MINUTES', 15)),
+                'refresh_daily_stats', 'Rafraîchissement des statistiques du jour')
+
+        # Nettoyage des sessions expirées - toutes les heures
+        ajouter(_cleanup_expired_sessions, IntervalTrigger(hours=1),
+                'cleanup_sessions', 'Nettoyage des sessions expirées')
+
         # Archivage des logs d'audit - tous les dimanches à 3h00
-        scheduler.add_job(
-            func=_archive_audit_logs,
-            trigger=CronTrigger(day_of_week='sun', hour=3, minute=0),
-            id='archive_audit_logs',
-            name='Archivage des logs d\'audit',
-            replace_existing=True
-        )
+        ajouter(_archive_audit_logs, CronTrigger(day_of_week='sun', hour=3, minute=0),
+                'archive_audit_logs', 'Archivage des logs d\'audit')
 
         # Mise à jour des moyennes mensuelles - 1er de chaque mois à 4h00
-        scheduler.add_job(
-            func=_update_monthly_averages,
-            trigger=CronTrigger(day=1, hour=4, minute=0),
-            id='update_monthly_averages',
-            name='Mise à jour des moyennes mensuelles',
-            replace_existing=True
-        )
+        ajouter(_update_monthly_averages, CronTrigger(day=1, hour=4, minute=0),
+                'update_monthly_averages', 'Mise à jour des moyennes mensuelles')
+
+        # Reconstruction des compteurs de présence - tous les dimanches à 3h30
+        ajouter(_rebuild_presence_stats, CronTrigger(day_of_week='sun', hour=3, minute=30),
+                'rebuild_presence_stats', 'Reconstruction des compteurs de présence')
 
         # Synchronisation des données externes - toutes les 6 heures
-        scheduler.add_job(
-            func=_sync_external_data,
-            trigger=IntervalTrigger(hours=6),
-            id='sync_external_data',
-            name='Synchronisation des données externes',
-            replace_existing=True
-        )
+        ajouter(_sync_external_data, IntervalTrigger(hours=6),
+                'sync_external_data', 'Synchronisation des données externes')
 
         logger.info("Toutes les tâches automatiques ont été configurées")
 
-def _update_daily_stats():
-    """Met à jour les statistiques quotidiennes"""
-    try:
-        from database import db
-        from models.etudiants import Etudiant
-        from models.enseignants import Enseignant
-        from models.parents import Parent
-        from models.utilisateurs import Utilisateur
+def _renouveler_bail(app):
+    """Prend ou prolonge le bail ; journalise les changements de leader"""
+    global _leader
 
-        # Statistiques des utilisateurs actifs
-        total_students = db.session.query(Etudiant).join(Utilisateur).filter(Utilisateur.est_actif == True).count()
-        total_teachers = db.session.query(Enseignant).join(Utilisateur).filter(Utilisateur.est_actif == True).count()
-        total_parents = db.session.query(Parent).join(Utilisateur).filter(Utilisateur.est_actif == True).count()
+    try:
+        with app.app_context():
+            from models.planificateur import acquerir_bail
 
-        # Mise à jour d'une table de statistiques (si elle existe)
-        # Ici on pourrait créer une table stats_daily pour stocker ces données
+            leader = acquerir_bail(NOM_BAIL, _proprietaire(), app.config.get('SCHEDULER_BAIL_SECONDES', 60))
 
-        logger.info(f"Statistiques quotidiennes mises à jour: {total_students} étudiants, {total_teachers} enseignants, {total_parents} parents")
+        if leader != _leader:
+            if leader:
+                logger.info(f"Planificateur leader: {_proprietaire()}")
+            else:
+                logger.info(f"Planificateur en attente (bail détenu par un autre processus): {_proprietaire()}")
+        _leader = leader
+        return leader
 
     except Exception as e:
-        logger.error(f"Erreur lors de la mise à jour des statistiques quotidiennes: {str(e)}")
+        logger.error(f"Erreur lors du renouvellement du bail du planificateur: {str(e)}")
+        _leader = False
+        return False
 
-def _cleanup_expired_sessions():
-    """Nettoie les sessions utilisateur expirées"""
-    try:
-        from flask import session
-        # Cette fonction pourrait nettoyer les sessions expirées
-        # Dans un vrai système, on utiliserait Redis ou une base de données pour les sessions
+def _executer_tache(app, id_tache, fonction):
+    """
+    Exécute une tâche si ce processus détient le bail, et l'historise
 
-        logger.info("Nettoyage des sessions expirées effectué")
+    Le bail est vérifié (et prolongé) au moment du déclenchement : un
+    processus qui l'a perdu depuis le dernier battement n'exécute rien.
 
-    except Exception as e:
-        logger.error(f"Erreur lors du nettoyage des sessions: {str(e)}")
+    Args:
+        app: Instance Flask
+        id_tache: Identifiant de la tâche (historique)
+        fonction: Tâche, appelée dans le contexte applicatif ; retourne
+                  un dict {'success', 'message', 'lignes'}
+    """
+    if not _renouveler_bail(app):
+        logger.debug(f"Tâche {id_tache} ignorée: ce processus n'est pas leader")
+        return
 
-def _archive_audit_logs():
-    """Archive les anciens logs d'audit"""
-    try:
-        from database import db
-        from models.audit import AuditUsage
-        from datetime import datetime, timedelta
+    with app.app_context():
+        from models.planificateur import debuter_execution, terminer_execution
+
+        try:
+            id_execution = debuter_execution(id_tache, _proprietaire())
+        except Exception as e:
+            logger.error(f"Historique indisponible pour {id_tache}: {str(e)}")
+            id_execution = None
+
+        debut = time.monotonic()
+        try:
+            result = fonction(app)
+        except Exception as e:
+            result = {'success': False, 'message': f'Erreur: {str(e)}'}
+
+        if result['success']:
+            logger.info(f"{id_tache}: {result['message']} ({time.monotonic() - debut:.1f}s)")
+        else:
+            logger.error(f"{id_tache}: {result['message']}")
+
+        if id_execution is not None:
+            terminer_execution(id_execution, result['success'], result.get('lignes'), result['message'])
+
+def _update_daily_stats(app):
+    """Enregistre l'instantané stats_daily du jour"""
+    from models.statistiques import calculer_stats_jour
+
+    result = calculer_stats_jour()
+    result['lignes'] = result['indicateurs']
+    return result
+
+def _cleanup_expired_sessions(app):
+    """Nettoie les sessions utilisateur expirées et l'historique des tâches"""
+    from datetime import timedelta
+    from models.planificateur import purger_executions
+
+    # Les sessions Flask sont signées côté client : rien à nettoyer en base.
+    # Dans un vrai système, on utiliserait Redis ou une base de données pour les sessions
+
+    supprimees = purger_executions(
+        datetime.utcnow() - timedelta(days=app.config.get('SCHEDULER_HISTORIQUE_JOURS', 90))
+    )
+    return {'success': True, 'lignes': supprimees, 'message': f'{supprimees} exécutions anciennes purgées'}
+
+def _archive_audit_logs(app):
+    """Archive les logs d'audit au-delà de la durée de rétention"""
+    from datetime import timedelta
+    from helpers.journal_audit import vider_journal_audit
+    from models.audit import archiver_logs_audit
+
+    vider_journal_audit()
+    cutoff_date = datetime.utcnow() - timedelta(days=app.config.get('AUDIT_RETENTION_JOURS', 90))
+    result = archiver_logs_audit(
+        cutoff_date,
+        app.config.get('AUDIT_ARCHIVE_DOSSIER', 'archives/audit'),
+        taille_lot=app.config.get('AUDIT_ARCHIVE_LOT', 5000)
+    )
+    result['lignes'] = result['archives']
+    return result
+
+def _update_monthly_averages(app):
+    """
+    Recalcule les cumuls mensuels du mois écoulé et du mois courant
 
-        # Archiver les logs de plus de 90 jours
-        cutoff_date = datetime.utcnow() - timedelta(days=90)
+    valider_note les tient à jour au fil de l'eau ; ce passage corrige
+    les écarts éventuels sans relire tout l'historique des notes.
+    """
+    from datetime import timedelta
+    from models.notes import reconstruire_moyennes_mensuelles
 
-        # Ici on pourrait déplacer les anciens logs vers une table d'archive
-        # ou les exporter vers des fichiers
+    debut_mois = datetime.utcnow().replace(day=1)
+    mois_precedent = (debut_mois - timedelta(days=1)).strftime('%Y-%m')
+    return reconstruire_moyennes_mensuelles(mois_debut=mois_precedent)
 
-        logger.info("Archivage des logs d'audit effectué")
+def _rebuild_presence_stats(app):
+    """Reconstruit les compteurs de présence depuis la table presences"""
+    from models.presences import reconstruire_compteurs_presences
 
-    except Exception as e:
-        logger.error(f"Erreur lors de l'archivage des logs d'audit: {str(e)}")
+    result = reconstruire_compteurs_presences()
+    result['lignes'] = result['etudiants'] + result['lignes_stats']
+    return result
 
-def _update_monthly_averages():
-    """Met à jour les moyennes mensuelles"""
-    try:
-        from database import db
-        from models.notes import Note
-        from models.etudiants import Etudiant
-        from models.cours import Cours
+def _sync_external_data(app):
+    """Synchronise les données avec des sources externes"""
+    # Ici on pourrait synchroniser avec:
+    # - API externes (emploi du temps, notes, etc.)
+    # - Fichiers Excel uploadés
+    # - Autres systèmes d'information
 
-        # Calcul des moyennes mensuelles par étudiant et par cours
-        # Cette fonction pourrait mettre à jour une table de statistiques mensuelles
+    return {'success': True, 'lignes': 0, 'message': 'Synchronisation des données externes effectuée'}
 
-        logger.info("Mise à jour des moyennes mensuelles effectuée")
+def lancer_planificateur_autonome():
+    """
+    Point d'entrée du planificateur dédié (processus séparé des workers web)
 
-    except Exception as e:
-        logger.error(f"Erreur lors de la mise à jour des moyennes mensuelles: {str(e)}")
+    L'application est créée sans planificateur d'arrière-plan puis les
+    tâches tournent dans un BlockingScheduler jusqu'à l'arrêt du processus.
+    """
+    if not APSCHEDULER_AVAILABLE:
+        logger.error("APScheduler non disponible. Installation requise: pip install APScheduler==3.10.4")
+        return
 
-def _sync_external_data():
-    """Synchronise les données avec des sources externes"""
-    try:
-        # Ici on pourrait synchroniser avec:
-        # - API externes (emploi du temps, notes, etc.)
-        # - Fichiers Excel uploadés
-        # - Autres systèmes d'information
+    # Lu par config.py à l'import : à positionner avant create_app
+    os.environ['SCHEDULER_ACTIF'] = '0'
+    from app import create_app
 
-        logger.info("Synchronisation des données externes effectuée")
+    app = create_app(os.environ.get('FLASK_ENV', 'production'))
+    scheduler = BlockingScheduler()
+    _configure_jobs(scheduler, app)
 
-    except Exception as e:
-        logger.error(f"Erreur lors de la synchronisation des données externes: {str(e)}")
+    logger.info(f"Planificateur autonome démarré ({_proprietaire()})")
+    try:
+        scheduler.start()
+    except (KeyboardInterrupt, SystemExit):
+        pass
+    finally:
+        with app.app_context():
+            from models.planificateur import liberer_bail
+            liberer_bail(NOM_BAIL, _proprietaire())
+
+if __name__ == '__main__':
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s %(levelname)s %(name)s: %(message)s')
+    lancer_planificateur_autonome()